@@ -0,0 +1,229 @@
+"""
+Precomputed listing aggregates for the analytics tab.
+
+Two summary tables are kept up to date as cause lists are stored:
+
+    agg_listing_counts    cases per list day, court complex, list type and section
+    agg_advocate_counts   listings per advocate, list day and court complex
+
+Only the latest fetch of a list counts. agg_current_lists remembers which
+cause list currently stands for each (day, complex, court, list type, site);
+when a list is fetched again its predecessor's counts are subtracted and the
+new ones added, so a refetch never double counts and no update scans more
+than the rows of the two lists involved. Dashboards then read the small
+summary tables instead of cause_list_rows.
+"""
+import datetime
+import re
+import sqlite3
+
+import pandas as pd
+
+import court_sites
+
+_ADVOCATE_SEPARATORS = re.compile(r"[,;\n]+")
+
+
+def setup_analytics_tables(conn):
+    cursor = conn.cursor()
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS agg_current_lists (
+        list_day TEXT NOT NULL,
+        court_complex TEXT NOT NULL,
+        court_number TEXT NOT NULL,
+        list_type TEXT NOT NULL,
+        site TEXT NOT NULL,
+        cause_list_id INTEGER NOT NULL,
+        PRIMARY KEY (list_day, court_complex, court_number, list_type, site)
+    )
+    """)
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS agg_listing_counts (
+        list_day TEXT NOT NULL,
+        court_complex TEXT NOT NULL,
+        list_type TEXT NOT NULL,
+        section TEXT NOT NULL,
+        cases INTEGER NOT NULL,
+        PRIMARY KEY (list_day, court_complex, list_type, section)
+    )
+    """)
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS agg_advocate_counts (
+        advocate TEXT NOT NULL,
+        list_day TEXT NOT NULL,
+        court_complex TEXT NOT NULL,
+        listings INTEGER NOT NULL,
+        PRIMARY KEY (advocate, list_day, court_complex)
+    )
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_agg_advocate_day ON agg_advocate_counts (list_day)")
+
+
+def list_day(list_date, site_key):
+    """ISO day of a list date as typed into the site's form; the text itself if it does not parse"""
+    try:
+        date_format = court_sites.get_site(site_key).date_format
+    except KeyError:
+        date_format = "%d/%m/%Y"
+    for candidate in (list_date, list_date.replace('-', '/')):
+        try:
+            return datetime.datetime.strptime(candidate, date_format).date().isoformat()
+        except (ValueError, AttributeError):
+            continue
+    return str(list_date)
+
+
+def advocate_names(advocate_text):
+    """The individual advocates in a cause list cell"""
+    names = []
+    for part in _ADVOCATE_SEPARATORS.split(advocate_text or ""):
+        name = " ".join(part.split()).strip(" .-")
+        if name:
+            names.append(name.upper())
+    return names
+
+
+def _apply(cursor, cause_list_id, day, court_complex, list_type, sign):
+    """Add (sign=1) or subtract (sign=-1) one stored list's rows to the aggregates"""
+    section_counts = cursor.execute(
+        "SELECT COALESCE(section, 'Cases'), COUNT(*) FROM cause_list_rows WHERE cause_list_id = ? GROUP BY 1",
+        (cause_list_id,)
+    ).fetchall()
+    cursor.executemany(
+        """INSERT INTO agg_listing_counts (list_day, court_complex, list_type, section, cases)
+           VALUES (?, ?, ?, ?, ?)
+           ON CONFLICT(list_day, court_complex, list_type, section) DO UPDATE SET cases = cases + excluded.cases""",
+        [(day, court_complex, list_type, section, sign * count) for section, count in section_counts]
+    )
+
+    advocate_counts = {}
+    for (advocate_text,) in cursor.execute(
+        "SELECT advocate_text FROM cause_list_rows WHERE cause_list_id = ?", (cause_list_id,)
+    ).fetchall():
+        for name in advocate_names(advocate_text):
+            advocate_counts[name] = advocate_counts.get(name, 0) + 1
+    cursor.executemany(
+        """INSERT INTO agg_advocate_counts (advocate, list_day, court_complex, listings)
+           VALUES (?, ?, ?, ?)
+           ON CONFLICT(advocate, list_day, court_complex) DO UPDATE SET listings = listings + excluded.listings""",
+        [(name, day, court_complex, sign * count) for name, count in advocate_counts.items()]
+    )
+    if sign < 0:
+        cursor.execute("DELETE FROM agg_listing_counts WHERE cases <= 0")
+        cursor.execute("DELETE FROM agg_advocate_counts WHERE listings <= 0")
+
+
+def _list_key(cursor, cause_list_id):
+    row = cursor.execute(
+        "SELECT list_date, court_complex, COALESCE(court_number, ''), list_type, COALESCE(site, ?) FROM cause_lists WHERE id = ?",
+        (court_sites.DEFAULT_SITE, cause_list_id)
+    ).fetchone()
+    if not row:
+        return None
+    list_date, court_complex, court_number, list_type, site = row
+    return (list_day(list_date, site), court_complex, court_number, list_type, site)
+
+
+def record_cause_list(cursor, cause_list_id):
+    """Make a freshly stored list (rows included) the current one for its key and update the aggregates"""
+    key = _list_key(cursor, cause_list_id)
+    if key is None:
+        return
+    day, court_complex, _, list_type, _ = key
+    current = cursor.execute(
+        """SELECT cause_list_id FROM agg_current_lists
+           WHERE list_day = ? AND court_complex = ? AND court_number = ? AND list_type = ? AND site = ?""",
+        key
+    ).fetchone()
+    if current and current[0] > cause_list_id:
+        return  # A later fetch of the same list is already counted
+    if current:
+        _apply(cursor, current[0], day, court_complex, list_type, -1)
+    cursor.execute(
+        """INSERT INTO agg_current_lists (list_day, court_complex, court_number, list_type, site, cause_list_id)
+           VALUES (?, ?, ?, ?, ?, ?)
+           ON CONFLICT(list_day, court_complex, court_number, list_type, site) DO UPDATE SET cause_list_id = excluded.cause_list_id""",
+        key + (cause_list_id,)
+    )
+    _apply(cursor, cause_list_id, day, court_complex, list_type, 1)
+
+
+def forget_cause_list_rows(cursor, cause_list_id):
+    """Subtract a list's current rows before they are replaced (re-parsing); record_cause_list adds the new ones"""
+    key = _list_key(cursor, cause_list_id)
+    if key is None:
+        return
+    day, court_complex, _, list_type, _ = key
+    cursor.execute("DELETE FROM agg_current_lists WHERE cause_list_id = ?", (cause_list_id,))
+    if cursor.rowcount:
+        _apply(cursor, cause_list_id, day, court_complex, list_type, -1)
+
+
+def rebuild(conn):
+    """Recompute every aggregate from the stored lists; returns how many lists were counted"""
+    cursor = conn.cursor()
+    for table in ("agg_current_lists", "agg_listing_counts", "agg_advocate_counts"):
+        cursor.execute(f"DELETE FROM {table}")
+    cause_list_ids = [row[0] for row in cursor.execute(
+        "SELECT DISTINCT cause_list_id FROM cause_list_rows ORDER BY cause_list_id"
+    ).fetchall()]
+    for cause_list_id in cause_list_ids:
+        record_cause_list(cursor, cause_list_id)
+    return cursor.execute("SELECT COUNT(*) FROM agg_current_lists").fetchone()[0]
+
+
+def backfill_if_empty(conn):
+    """Build the aggregates once for databases that have lists stored from before they existed"""
+    has_aggregates = conn.execute("SELECT 1 FROM agg_current_lists LIMIT 1").fetchone()
+    has_rows = conn.execute("SELECT 1 FROM cause_list_rows LIMIT 1").fetchone()
+    if has_rows and not has_aggregates:
+        rebuild(conn)
+
+
+def listing_counts(db_file, start_day=None, end_day=None, complexes=None):
+    """agg_listing_counts rows in a day range, optionally for some complexes"""
+    query = "SELECT list_day, court_complex, list_type, section, cases FROM agg_listing_counts WHERE 1 = 1"
+    params = []
+    if start_day:
+        query += " AND list_day >= ?"
+        params.append(start_day)
+    if end_day:
+        query += " AND list_day <= ?"
+        params.append(end_day)
+    if complexes:
+        query += f" AND court_complex IN ({','.join('?' * len(complexes))})"
+        params += list(complexes)
+    conn = sqlite3.connect(db_file)
+    df = pd.read_sql_query(query + " ORDER BY list_day", conn, params=params)
+    conn.close()
+    return df
+
+
+def top_advocates(db_file, start_day=None, end_day=None, complexes=None, limit=20):
+    """Advocates with the most listings in a day range, with the days they were listed on"""
+    query = """SELECT advocate, SUM(listings) AS listings, COUNT(DISTINCT list_day) AS days_listed
+               FROM agg_advocate_counts WHERE 1 = 1"""
+    params = []
+    if start_day:
+        query += " AND list_day >= ?"
+        params.append(start_day)
+    if end_day:
+        query += " AND list_day <= ?"
+        params.append(end_day)
+    if complexes:
+        query += f" AND court_complex IN ({','.join('?' * len(complexes))})"
+        params += list(complexes)
+    query += " GROUP BY advocate ORDER BY listings DESC LIMIT ?"
+    params.append(limit)
+    conn = sqlite3.connect(db_file)
+    df = pd.read_sql_query(query, conn, params=params)
+    conn.close()
+    return df
+
+
+def day_range(db_file):
+    """(first day, last day) with aggregates, or (None, None)"""
+    conn = sqlite3.connect(db_file)
+    row = conn.execute("SELECT MIN(list_day), MAX(list_day) FROM agg_listing_counts").fetchone()
+    conn.close()
+    return row
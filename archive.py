@@ -0,0 +1,347 @@
+"""
+Long-term archive of old history in partitioned Parquet files.
+
+Cause lists (with their rows, watchlist matches and the page snapshots only
+they use) and case status lookups (with their structured details) that were
+fetched more than --older-than-days ago are moved out of case_data.db into
+Parquet datasets, so the SQLite file only holds recent, hot data:
+
+    archive/cause_lists/list_month=2025-01/complex=Saket_Courts_Complex/batch7-0.parquet
+    archive/cause_list_rows/list_month=2025-01/complex=Saket_Courts_Complex/batch7-0.parquet
+    archive/watchlist_matches/list_month=2025-01/complex=Saket_Courts_Complex/batch7-0.parquet
+    archive/page_snapshots/first_month=2025-01/batch7-0.parquet
+    archive/queries/fetch_month=2025-01/batch8-0.parquet   (case_details, case_hearings, case_orders alike)
+
+    python archive.py --older-than-days 180
+    python archive.py --older-than-days 90 --archive /data/court_archive --vacuum
+
+Each batch is recorded in archive_batches before its files are written and
+marked done in the same transaction that deletes its rows from SQLite. Files
+of a batch that never finished are removed on the next run, so an interrupted
+run neither loses rows nor archives them twice.
+
+The archive is queried with DuckDB (optional: pip install duckdb), which reads
+the partition columns from the directory names and skips the months and
+complexes a query does not touch. An archived list's counts are subtracted
+from the analytics summaries in the transaction that deletes its rows, so the
+summaries only cover lists still in the database (as a rebuild would) and a
+refetch of an archived list is counted once.
+"""
+import argparse
+import glob
+import os
+import re
+import sqlite3
+import time
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+import analytics
+
+try:
+    import duckdb
+except ImportError:  # Only needed to query the archive; archiving itself uses pyarrow
+    duckdb = None
+
+ARCHIVE_DIR = os.environ.get("COURT_ARCHIVE_DIR", os.path.join(os.getcwd(), "archive"))
+BATCH_SIZE = 50
+
+# dataset -> hive partition columns
+DATASETS = {
+    "cause_lists": ["list_month", "complex"],
+    "cause_list_rows": ["list_month", "complex"],
+    "watchlist_matches": ["list_month", "complex"],
+    "page_snapshots": ["first_month"],
+    "queries": ["fetch_month"],
+    "case_details": ["fetch_month"],
+    "case_hearings": ["fetch_month"],
+    "case_orders": ["fetch_month"],
+}
+
+_ARROW_TYPES = {"INTEGER": pa.int64(), "REAL": pa.float64(), "BLOB": pa.binary()}
+_NON_ALNUM = re.compile(r"[^A-Za-z0-9]+")
+
+
+def setup_archive_tables(conn):
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS archive_batches (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        kind TEXT NOT NULL,
+        first_id INTEGER NOT NULL,
+        last_id INTEGER NOT NULL,
+        items INTEGER NOT NULL,
+        state TEXT NOT NULL,
+        started DATETIME DEFAULT CURRENT_TIMESTAMP,
+        finished DATETIME
+    )
+    """)
+
+
+def table_exists(conn, table):
+    return conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)).fetchone() is not None
+
+
+def partition_slug(text):
+    return _NON_ALNUM.sub("_", str(text or "")).strip("_") or "unknown"
+
+
+def read_table(conn, table, where, params):
+    """Rows of a SQLite table as an Arrow table typed from the declared column types"""
+    columns = [(row[1], row[2].split()[0].upper() if row[2] else "") for row in conn.execute(f"PRAGMA table_info({table})")]
+    rows = conn.execute(f"SELECT {', '.join(name for name, _ in columns)} FROM {table} WHERE {where}", params).fetchall()
+    return pa.table({
+        name: pa.array([row[i] for row in rows], type=_ARROW_TYPES.get(declared, pa.string()))
+        for i, (name, declared) in enumerate(columns)
+    })
+
+
+def with_columns(table, values_by_column):
+    for name, values in values_by_column.items():
+        table = table.append_column(name, pa.array(values, type=pa.string()))
+    return table
+
+
+def write_dataset(table, archive_dir, name, batch_id):
+    if table.num_rows == 0:
+        return
+    partitioning = ds.partitioning(pa.schema([(column, pa.string()) for column in DATASETS[name]]), flavor="hive")
+    ds.write_dataset(table, os.path.join(archive_dir, name), format="parquet", partitioning=partitioning,
+                     basename_template=f"batch{batch_id}-{{i}}.parquet", existing_data_behavior="overwrite_or_ignore")
+
+
+def begin_batch(conn, kind, ids):
+    cursor = conn.execute(
+        "INSERT INTO archive_batches (kind, first_id, last_id, items, state) VALUES (?, ?, ?, ?, 'writing')",
+        (kind, ids[0], ids[-1], len(ids))
+    )
+    conn.commit()
+    return cursor.lastrowid
+
+
+def discard_unfinished(conn, archive_dir):
+    """Remove the files of batches whose rows were never deleted from SQLite"""
+    for (batch_id,) in conn.execute("SELECT id FROM archive_batches WHERE state = 'writing'").fetchall():
+        for path in glob.glob(os.path.join(archive_dir, "**", f"batch{batch_id}-*.parquet"), recursive=True):
+            os.remove(path)
+        conn.execute("UPDATE archive_batches SET state = 'discarded', finished = CURRENT_TIMESTAMP WHERE id = ?", (batch_id,))
+    conn.commit()
+
+
+def archive_cause_list_batch(conn, archive_dir, ids):
+    """Move one batch of cause lists, their rows, watchlist matches and unshared snapshots; returns rows moved"""
+    batch_id = begin_batch(conn, "cause_list", ids)
+    marks = ",".join("?" * len(ids))
+
+    lists = read_table(conn, "cause_lists", f"id IN ({marks})", ids)
+    by_id = {}
+    for cause_list_id, list_date, site, court_complex, list_type in zip(
+        *(lists.column(name).to_pylist() for name in ("id", "list_date", "site", "court_complex", "list_type"))
+    ):
+        day = analytics.list_day(list_date, site)
+        by_id[cause_list_id] = (day, day[:7] if re.match(r"\d{4}-\d{2}", day) else "unknown",
+                                partition_slug(court_complex), court_complex, list_type)
+    list_ids = lists.column("id").to_pylist()
+    lists = with_columns(lists, {
+        "list_day": [by_id[i][0] for i in list_ids],
+        "list_month": [by_id[i][1] for i in list_ids],
+        "complex": [by_id[i][2] for i in list_ids],
+    })
+
+    rows = read_table(conn, "cause_list_rows", f"cause_list_id IN ({marks})", ids)
+    row_list_ids = rows.column("cause_list_id").to_pylist()
+    rows = with_columns(rows, {
+        # Denormalized so archived rows can be filtered without joining
+        "court_complex": [by_id[i][3] for i in row_list_ids],
+        "list_type": [by_id[i][4] for i in row_list_ids],
+        "list_day": [by_id[i][0] for i in row_list_ids],
+        "list_month": [by_id[i][1] for i in row_list_ids],
+        "complex": [by_id[i][2] for i in row_list_ids],
+    })
+
+    snapshot_ids = [row[0] for row in conn.execute(
+        f"""SELECT DISTINCT snapshot_id FROM cause_lists WHERE id IN ({marks}) AND snapshot_id IS NOT NULL
+            AND snapshot_id NOT IN (SELECT snapshot_id FROM cause_lists WHERE id NOT IN ({marks}) AND snapshot_id IS NOT NULL)""",
+        ids + ids
+    )]
+    snapshot_marks = ",".join("?" * len(snapshot_ids)) or "NULL"
+    page_snapshots = read_table(conn, "page_snapshots", f"id IN ({snapshot_marks})", snapshot_ids)
+    page_snapshots = with_columns(page_snapshots, {
+        "first_month": [(first_seen or "unknown")[:7] for first_seen in page_snapshots.column("first_seen").to_pylist()],
+    })
+
+    write_dataset(lists, archive_dir, "cause_lists", batch_id)
+    write_dataset(rows, archive_dir, "cause_list_rows", batch_id)
+    write_dataset(page_snapshots, archive_dir, "page_snapshots", batch_id)
+
+    if table_exists(conn, "watchlist_matches"):
+        matches = read_table(conn, "watchlist_matches", f"cause_list_id IN ({marks})", ids)
+        match_list_ids = matches.column("cause_list_id").to_pylist()
+        matches = with_columns(matches, {
+            "list_month": [by_id[i][1] for i in match_list_ids],
+            "complex": [by_id[i][2] for i in match_list_ids],
+        })
+        write_dataset(matches, archive_dir, "watchlist_matches", batch_id)
+
+    cursor = conn.cursor()
+    if table_exists(conn, "agg_current_lists"):
+        # Subtract the lists while their rows are still here, so a later refetch of the same list is counted once
+        for cause_list_id in ids:
+            analytics.forget_cause_list_rows(cursor, cause_list_id)
+    if table_exists(conn, "watchlist_matches"):
+        cursor.execute(f"DELETE FROM watchlist_matches WHERE cause_list_id IN ({marks})", ids)
+    cursor.execute(f"DELETE FROM cause_list_rows WHERE cause_list_id IN ({marks})", ids)
+    cursor.execute(f"DELETE FROM cause_lists WHERE id IN ({marks})", ids)
+    cursor.execute(f"DELETE FROM page_snapshots WHERE id IN ({snapshot_marks})", snapshot_ids)
+    cursor.execute("UPDATE archive_batches SET state = 'done', finished = CURRENT_TIMESTAMP WHERE id = ?", (batch_id,))
+    conn.commit()
+    return rows.num_rows
+
+
+def archive_query_batch(conn, archive_dir, ids):
+    """Move one batch of case status lookups and their structured details"""
+    batch_id = begin_batch(conn, "case_status", ids)
+    marks = ",".join("?" * len(ids))
+
+    queries = read_table(conn, "queries", f"id IN ({marks})", ids)
+    month_by_id = {
+        query_id: (timestamp or "unknown")[:7]
+        for query_id, timestamp in zip(queries.column("id").to_pylist(), queries.column("timestamp").to_pylist())
+    }
+    queries = with_columns(queries, {"fetch_month": [month_by_id[i] for i in queries.column("id").to_pylist()]})
+    write_dataset(queries, archive_dir, "queries", batch_id)
+
+    cursor = conn.cursor()
+    for table in ("case_details", "case_hearings", "case_orders"):
+        if not table_exists(conn, table):
+            continue
+        details = read_table(conn, table, f"query_id IN ({marks})", ids)
+        details = with_columns(details, {"fetch_month": [month_by_id[i] for i in details.column("query_id").to_pylist()]})
+        write_dataset(details, archive_dir, table, batch_id)
+        cursor.execute(f"DELETE FROM {table} WHERE query_id IN ({marks})", ids)
+    cursor.execute(f"DELETE FROM queries WHERE id IN ({marks})", ids)
+    cursor.execute("UPDATE archive_batches SET state = 'done', finished = CURRENT_TIMESTAMP WHERE id = ?", (batch_id,))
+    conn.commit()
+
+
+def run(db_file, archive_dir=None, older_than_days=180, batch_size=BATCH_SIZE, vacuum=False, progress=print):
+    """Archive everything fetched before the cut-off; returns (cause lists, rows, case lookups) moved"""
+    archive_dir = archive_dir or ARCHIVE_DIR
+    conn = sqlite3.connect(db_file)
+    setup_archive_tables(conn)
+    discard_unfinished(conn, archive_dir)
+    cutoff = conn.execute("SELECT datetime('now', ?)", (f"-{int(older_than_days)} days",)).fetchone()[0]
+
+    lists_moved = rows_moved = queries_moved = 0
+    if table_exists(conn, "cause_lists"):
+        while True:
+            ids = [row[0] for row in conn.execute(
+                "SELECT id FROM cause_lists WHERE timestamp < ? ORDER BY id LIMIT ?", (cutoff, batch_size)
+            )]
+            if not ids:
+                break
+            rows_moved += archive_cause_list_batch(conn, archive_dir, ids)
+            lists_moved += len(ids)
+            progress(f"cause lists: {lists_moved} archived ({rows_moved} rows)")
+    if table_exists(conn, "queries"):
+        while True:
+            ids = [row[0] for row in conn.execute(
+                "SELECT id FROM queries WHERE timestamp < ? ORDER BY id LIMIT ?", (cutoff, batch_size)
+            )]
+            if not ids:
+                break
+            archive_query_batch(conn, archive_dir, ids)
+            queries_moved += len(ids)
+            progress(f"case status lookups: {queries_moved} archived")
+
+    if vacuum and (lists_moved or queries_moved):
+        # Give the freed pages back to the file system
+        conn.execute("VACUUM")
+    conn.close()
+    return lists_moved, rows_moved, queries_moved
+
+
+def archive_summary(archive_dir=None):
+    """{dataset: (files, bytes)} for the datasets that have files"""
+    archive_dir = archive_dir or ARCHIVE_DIR
+    summary = {}
+    for name in DATASETS:
+        files = glob.glob(os.path.join(archive_dir, name, "**", "*.parquet"), recursive=True)
+        if files:
+            summary[name] = (len(files), sum(os.path.getsize(path) for path in files))
+    return summary
+
+
+def duckdb_available():
+    return duckdb is not None
+
+
+def connect(archive_dir=None):
+    """In-memory DuckDB connection with one view per archived dataset"""
+    archive_dir = archive_dir or ARCHIVE_DIR
+    conn = duckdb.connect()
+    for name in archive_summary(archive_dir):
+        pattern = os.path.join(archive_dir, name, "**", "*.parquet").replace("'", "''")
+        conn.execute(f"CREATE VIEW {name} AS SELECT * FROM read_parquet('{pattern}', hive_partitioning = true, union_by_name = true)")
+    return conn
+
+
+def search_cause_list_rows(text=None, start_day=None, end_day=None, archive_dir=None, limit=500):
+    """Archived listings whose case, party or advocate text contains text, newest first"""
+    conn = connect(archive_dir)
+    query = """SELECT list_day, court_complex, list_type, section, case_text, party_text, advocate_text
+               FROM cause_list_rows WHERE 1 = 1"""
+    params = []
+    if text:
+        query += " AND (party_text ILIKE ? OR advocate_text ILIKE ? OR case_text ILIKE ?)"
+        params += [f"%{text}%"] * 3
+    # The month bounds let DuckDB skip whole partitions
+    if start_day:
+        query += " AND list_month >= ? AND list_day >= ?"
+        params += [start_day[:7], start_day]
+    if end_day:
+        query += " AND list_month <= ? AND list_day <= ?"
+        params += [end_day[:7], end_day]
+    query += " ORDER BY list_day DESC LIMIT ?"
+    params.append(limit)
+    try:
+        return conn.execute(query, params).df()
+    finally:
+        conn.close()
+
+
+def search_queries(text, archive_dir=None, limit=500):
+    """Archived case status lookups by case number or party name, newest first"""
+    conn = connect(archive_dir)
+    try:
+        return conn.execute(
+            """SELECT timestamp, case_type, case_number, case_year, parties, filing_date, case_status
+               FROM queries WHERE case_number = ? OR parties ILIKE ?
+               ORDER BY timestamp DESC LIMIT ?""",
+            [text, f"%{text}%", limit]
+        ).df()
+    finally:
+        conn.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", default="case_data.db")
+    parser.add_argument("--archive", default=None, help=f"Archive directory (default: {ARCHIVE_DIR}, or COURT_ARCHIVE_DIR)")
+    parser.add_argument("--older-than-days", type=int, default=180, help="Archive history fetched more than this many days ago")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="Cause lists or lookups per batch and per transaction")
+    parser.add_argument("--vacuum", action="store_true", help="Compact the database file afterwards")
+    parser.add_argument("--quiet", action="store_true", help="Only print the final summary")
+    args = parser.parse_args(argv)
+
+    size_before = os.path.getsize(args.db) if os.path.exists(args.db) else 0
+    started = time.perf_counter()
+    lists_moved, rows_moved, queries_moved = run(args.db, args.archive, args.older_than_days, args.batch_size, args.vacuum,
+                                                 progress=(lambda message: None) if args.quiet else print)
+    size_after = os.path.getsize(args.db) if os.path.exists(args.db) else 0
+    print(f"Done: {lists_moved} cause lists ({rows_moved} rows) and {queries_moved} case status lookups archived "
+          f"in {time.perf_counter() - started:.1f}s; {args.db} {size_before / 1024 / 1024:.1f} MB -> {size_after / 1024 / 1024:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+Peak and retained memory of the fetch pipeline, measured with tracemalloc.
+
+Runs the in-process part of a cause list fetch (parse, normalize, store the
+rows, watchlist match, build the result frame, CSV and optionally PDF export)
+on a page generated like benchmarks/mock_court.py serves it, and the parse of
+a case status page. Prints the peak of every stage, the peak of a whole
+fetch and what stays allocated per fetch while its result is kept, the way
+the app keeps results in session state.
+
+    python benchmarks/bench_memory.py --rows 5000 --fetches 3
+    python benchmarks/bench_memory.py --rows 2000 --pdf --max-peak-mb 40   # exits 1 above the budget
+
+The frame's string columns live in Arrow buffers, which tracemalloc does not
+see; they are reported separately from pyarrow's allocator. tracemalloc slows
+Python down several times, so the times printed are only useful relative to
+each other.
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pyarrow as pa  # noqa: E402
+
+import mock_court  # noqa: E402
+import case_parser  # noqa: E402
+import cause_list_parser  # noqa: E402
+import pdf_reports  # noqa: E402
+import watchlist  # noqa: E402
+
+MB = 1024 * 1024
+WATCH_ENTRIES = [(1, "party", "Mock Party 17"), (2, "advocate", "Adv 5"), (3, "case", "CS/38/2016")]
+
+
+class StageMeter:
+    """Peak traced memory of each stage, above what was allocated when the fetch started"""
+
+    def __init__(self):
+        self.base = tracemalloc.get_traced_memory()[0]
+        self.arrow_base = pa.total_allocated_bytes()
+        self.stages = []
+        self.fetch_peak = 0
+        tracemalloc.reset_peak()
+
+    def stage(self, name, started):
+        current, peak = tracemalloc.get_traced_memory()
+        self.stages.append((name, (peak - self.base) / MB, (current - self.base) / MB,
+                            (pa.total_allocated_bytes() - self.arrow_base) / MB, time.perf_counter() - started))
+        self.fetch_peak = max(self.fetch_peak, peak - self.base)
+        tracemalloc.reset_peak()
+        return time.perf_counter()
+
+
+def cause_list_fetch(raw_html, conn, watch_index, with_pdf):
+    """One fetch's processing as process_cause_list_page and the result view do it; returns the kept result"""
+    meter = StageMeter()
+    started = time.perf_counter()
+    rows, headers, notes = cause_list_parser.parse_cause_list_page(raw_html)
+    started = meter.stage("parse", started)
+    rows, headers, _ = cause_list_parser.normalize_table(rows, headers)
+    started = meter.stage("normalize", started)
+    cause_list_parser.store_rows(conn.cursor(), 1, headers, rows)
+    conn.rollback()
+    started = meter.stage("store rows", started)
+    matches = watchlist.match_rows(watch_index, headers, rows)
+    started = meter.stage("watchlist", started)
+    df = cause_list_parser.to_frame(rows, headers)
+    del rows
+    started = meter.stage("frame", started)
+    result = {"df": df, "matches": matches, "csv": df.to_csv(index=False).encode("utf-8")}
+    started = meter.stage("csv", started)
+    if with_pdf:
+        result["pdf"] = pdf_reports.get_renderer().cause_list_pdf(df, "Mock Courts Complex", "15/01/2025", "Civil")
+        meter.stage("pdf", started)
+    return meter, result
+
+
+def case_status_fetch(raw_html):
+    meter = StageMeter()
+    started = time.perf_counter()
+    record = case_parser.parse_case_page(raw_html).to_dict()
+    meter.stage("parse case page", started)
+    return meter, record
+
+
+def print_stages(meter):
+    print(f"  {'stage':<18}{'peak MB':>10}{'after MB':>10}{'arrow MB':>10}{'ms':>10}")
+    for name, peak, current, arrow, seconds in meter.stages:
+        print(f"  {name:<18}{peak:>10.2f}{current:>10.2f}{arrow:>10.2f}{seconds * 1000:>10.0f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=2000, help="Rows in the generated cause list")
+    parser.add_argument("--fetches", type=int, default=3, help="Cause list fetches to run, keeping every result")
+    parser.add_argument("--pdf", action="store_true", help="Also build the PDF export (slow under tracemalloc)")
+    parser.add_argument("--max-peak-mb", type=float, help="Exit with status 1 if a fetch peaks above this")
+    parser.add_argument("--max-retained-mb", type=float, help="Exit with status 1 if a kept result holds more than this")
+    args = parser.parse_args(argv)
+
+    raw_html = "<html><body>" + mock_court.cause_list_fragment("Mock Courts Complex", "15/01/2025", "Civil", args.rows) + "</body></html>"
+    case_html = "<html><body>" + mock_court.case_status_fragment("CS", "1234", "2021") + "</body></html>"
+    conn = sqlite3.connect(":memory:")
+    conn.execute("""CREATE TABLE cause_list_rows (cause_list_id, row_index, section, case_text, party_text, advocate_text,
+                                                  key_type, key_number, key_year, cells)""")
+    watch_index = watchlist.WatchlistIndex(WATCH_ENTRIES)
+
+    print(f"Cause list page: {args.rows} rows, {len(raw_html) / MB:.2f} MB of HTML")
+    # Untraced warm-up so lazy imports and one-time caches are not counted as per-fetch memory
+    warm_up_html = "<html><body>" + mock_court.cause_list_fragment("Mock Courts Complex", "15/01/2025", "Civil", 20) + "</body></html>"
+    tracemalloc.start()
+    cause_list_fetch(warm_up_html, conn, watch_index, args.pdf)
+    case_status_fetch(case_html)
+    tracemalloc.stop()
+    tracemalloc.start()
+    kept = []
+    peaks = []
+    retained = []
+    for fetch in range(args.fetches):
+        before = tracemalloc.get_traced_memory()[0] + pa.total_allocated_bytes()
+        meter, result = cause_list_fetch(raw_html, conn, watch_index, args.pdf)
+        kept.append(result)
+        peaks.append(meter.fetch_peak / MB)
+        retained.append((tracemalloc.get_traced_memory()[0] + pa.total_allocated_bytes() - before) / MB)
+        if fetch == 0:
+            print_stages(meter)
+    meter, _ = case_status_fetch(case_html)
+    print("Case status page:")
+    print_stages(meter)
+    tracemalloc.stop()
+
+    print(f"Per cause list fetch: peak {max(peaks):.2f} MB, kept result {max(retained):.2f} MB "
+          f"({len(kept)} results kept: {sum(retained):.2f} MB)")
+    failed = False
+    if args.max_peak_mb is not None and max(peaks) > args.max_peak_mb:
+        print(f"FAIL: peak {max(peaks):.2f} MB is above --max-peak-mb {args.max_peak_mb}")
+        failed = True
+    if args.max_retained_mb is not None and max(retained) > args.max_retained_mb:
+        print(f"FAIL: kept result {max(retained):.2f} MB is above --max-retained-mb {args.max_retained_mb}")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
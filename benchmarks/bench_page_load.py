@@ -0,0 +1,150 @@
+"""
+Page-ready time and bytes transferred with and without resource blocking.
+
+Serves recorded court pages from a local directory (or a generated sample
+page when --pages is not given) and loads them in headless Chrome twice per
+run: once as before (no blocking, 'normal' page-load strategy) and once
+with a blocking profile and the 'eager' strategy used by the scrapers.
+
+    python benchmarks/bench_page_load.py --pages recorded/ --path cause_list.html --runs 5
+"""
+import argparse
+import functools
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import browser  # noqa: E402
+
+SAMPLE_PAGE = """<!DOCTYPE html>
+<html><head>
+<link rel="stylesheet" href="style.css">
+<style>@font-face { font-family: Court; src: url(court.woff2); } body { font-family: Court; }</style>
+</head><body>
+<img src="banner.jpg" alt="banner"><img src="logo.png" alt="logo">
+<form>
+  <select id="court_complex_code"><option>Dwarka Courts Complex</option></select>
+  <img id="captcha_image" src="securimage_show.php">
+  <input id="captcha" type="text">
+</form>
+<table><tr><th>Serial Number</th><th>Case</th></tr><tr><td>1</td><td>T P (CRL)/19/2025</td></tr></table>
+</body></html>
+"""
+
+PAGE_STATS_JS = """
+var nav = performance.getEntriesByType('navigation')[0];
+var resources = performance.getEntriesByType('resource');
+var captcha = document.querySelector('img[src*="captcha"], img[src*="securimage"]');
+return {
+    dom_ready_ms: nav ? nav.domContentLoadedEventEnd : null,
+    bytes: (nav ? nav.transferSize : 0) + resources.reduce(function (sum, r) { return sum + (r.transferSize || 0); }, 0),
+    resources: resources.length,
+    captcha_loaded: captcha ? (captcha.complete && captcha.naturalWidth > 0) : null
+};
+"""
+
+
+def write_sample_pages(directory):
+    with open(os.path.join(directory, "index.html"), "w") as f:
+        f.write(SAMPLE_PAGE)
+    with open(os.path.join(directory, "style.css"), "w") as f:
+        f.write("body { margin: 0; }\n" * 2000)
+    # Tiny valid PNG for the CAPTCHA; padded binaries for the heavy assets
+    png = bytes.fromhex(
+        "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+        "1f15c4890000000d49444154789c6360000002000154a24f5d0000000049454e44ae426082"
+    )
+    with open(os.path.join(directory, "securimage_show.php"), "wb") as f:
+        f.write(png)
+    for name, size in [("logo.png", 300_000), ("banner.jpg", 600_000), ("court.woff2", 150_000)]:
+        with open(os.path.join(directory, name), "wb") as f:
+            f.write(png + os.urandom(size))
+
+
+class RecordedPageHandler(SimpleHTTPRequestHandler):
+    latency = 0.0
+
+    def guess_type(self, path):
+        if path.endswith("securimage_show.php"):
+            return "image/png"
+        return super().guess_type(path)
+
+    def end_headers(self):
+        self.send_header("Cache-Control", "no-store")
+        super().end_headers()
+
+    def do_GET(self):
+        if self.latency:
+            time.sleep(self.latency)
+        super().do_GET()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(directory, latency):
+    handler = functools.partial(RecordedPageHandler, directory=directory)
+    RecordedPageHandler.latency = latency
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def measure(url, profile, page_load_strategy):
+    driver = browser.new_driver(profile=profile, page_load_strategy=page_load_strategy, headless=True)
+    try:
+        start = time.perf_counter()
+        driver.get(url)
+        ready = time.perf_counter() - start
+        # Let the CAPTCHA finish so its presence can be checked in both modes
+        time.sleep(0.5)
+        stats = driver.execute_script(PAGE_STATS_JS)
+        stats["get_returned_ms"] = ready * 1000
+        return stats
+    finally:
+        driver.quit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", help="Directory of recorded pages (default: generated sample page)")
+    parser.add_argument("--path", default="index.html", help="Page to load, relative to --pages")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--profile", default="lean", choices=sorted(browser.BLOCKING_PROFILES))
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds of delay added to every request")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as sample_dir:
+        directory = args.pages
+        if not directory:
+            write_sample_pages(sample_dir)
+            directory = sample_dir
+        server = serve(directory, args.latency)
+        url = f"http://127.0.0.1:{server.server_address[1]}/{args.path}"
+
+        modes = [("before", "off", "normal"), ("after", args.profile, "eager")]
+        results = {name: [] for name, _, _ in modes}
+        for _ in range(args.runs):
+            for name, profile, strategy in modes:
+                results[name].append(measure(url, profile, strategy))
+        server.shutdown()
+
+    print(f"{'mode':<8}{'get() ms':>12}{'DOM ready ms':>14}{'KB transferred':>16}{'resources':>11}  captcha")
+    for name, _, _ in modes:
+        runs = results[name]
+        print(f"{name:<8}"
+              f"{statistics.median(r['get_returned_ms'] for r in runs):>12.1f}"
+              f"{statistics.median(r['dom_ready_ms'] or 0 for r in runs):>14.1f}"
+              f"{statistics.median(r['bytes'] for r in runs) / 1024:>16.1f}"
+              f"{statistics.median(r['resources'] for r in runs):>11.0f}"
+              f"  {'loaded' if all(r['captcha_loaded'] for r in runs) else 'MISSING'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+End-to-end load test of the scrapers against the local mock court.
+
+Starts benchmarks/mock_court.py in-process with the simulated user enabled,
+points the app at it (COURT_ECOURTS_URL, COURT_SITES_FILE) and runs
+--fetches case status or cause list fetches on --concurrency threads, each
+going through the same scheduler, browser pool, circuit breaker and parser
+as the Streamlit app. Reports throughput, latency percentiles and failures
+by kind, so changes to waits, pooling or parsing can be compared under
+injected latency and failure.
+
+By default the scheduler's per-host limits are lifted for the mock so the
+pipeline itself is measured; --respect-limits keeps the production limits.
+
+    python benchmarks/load_test.py --flow case --fetches 20 --concurrency 4 --latency 0.2 --error-rate 0.05
+"""
+import argparse
+import datetime
+import json
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import mock_court  # noqa: E402
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+def failure_kind(message, resilience):
+    """Map a scraper error message back to a resilience failure label"""
+    text = (message or "").lower()
+    for kind, label in resilience.FAILURE_LABELS.items():
+        if label.lower() in text:
+            return kind
+    if "captcha" in text:
+        return resilience.CAPTCHA_WRONG
+    if "failing repeatedly" in text:
+        return "circuit_open"
+    return resilience.UNKNOWN
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--flow", choices=["case", "cause_list"], default="case")
+    parser.add_argument("--fetches", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=2)
+    parser.add_argument("--reuse-sessions", action="store_true",
+                        help="Give each worker a session key so its browser stays open between fetches")
+    parser.add_argument("--respect-limits", action="store_true", help="Keep the production per-host rate limits")
+    parser.add_argument("--show-browser", action="store_true", help="Run Chrome with a visible window")
+    mock_court.add_arguments(parser)
+    args = parser.parse_args()
+    args.auto_solve = True
+
+    server = mock_court.serve(args)
+    work_dir = tempfile.mkdtemp(prefix="court_load_")
+    sites_file = os.path.join(work_dir, "sites.json")
+    with open(sites_file, "w", encoding="utf-8") as f:
+        json.dump(mock_court.sites_config(server.base_url), f)
+
+    # Read at import time by court_case, court_sites and browser
+    os.environ["COURT_ECOURTS_URL"] = server.base_url + mock_court.ECOURTS_PATH
+    os.environ["COURT_SITES_FILE"] = sites_file
+    os.environ["COURT_BROWSER_PROFILES"] = os.path.join(work_dir, "profiles")
+    os.environ.setdefault("COURT_HEADLESS", "0" if args.show_browser else "1")
+    # The app keeps its database in the working directory
+    os.chdir(work_dir)
+
+    # Importing the app runs its page once in bare mode; keep Streamlit's warnings about that out of the report
+    logging.disable(logging.WARNING)
+
+    import browser
+    import court_case
+    import resilience
+    import scheduler
+
+    fetch_scheduler = scheduler.get_scheduler()
+    host = server.base_url.split("://", 1)[1]
+    if not args.respect_limits:
+        fetch_scheduler.host_limits[host] = (args.concurrency, 60_000, args.concurrency)
+    pool = browser.get_pool()
+    pool.max_browsers = max(pool.max_browsers, args.concurrency)
+
+    site = None
+    if args.flow == "cause_list":
+        import court_sites
+        site = court_sites.get_site("mock")
+
+    def run_fetch(index):
+        session_key = f"load-{threading.current_thread().name}" if args.reuse_sessions else None
+        start = time.perf_counter()
+        if args.flow == "case":
+            request = ("case", "Delhi", "South West", "Dwarka Courts", mock_court.CASE_TYPES[0], str(1000 + index), "2024")
+            data, response = fetch_scheduler.run(
+                court_case.ECOURTS_URL, request,
+                lambda: court_case.fetch_case_data(mock_court.CASE_TYPES[0], str(1000 + index), "2024",
+                                                   "Delhi", "South West", "Dwarka Courts", session_key=session_key)
+            )
+            ok = bool(data)
+        else:
+            list_date = site.format_date(datetime.date(2025, 1, 1) + datetime.timedelta(days=index))
+            complex_name = site.complexes[0]
+            request = ("cause_list", "mock", complex_name, "", list_date, "Civil")
+            raw_html, response = fetch_scheduler.run(
+                site.url, request,
+                lambda: court_case.fetch_cause_list("mock", complex_name, "", list_date, "Civil", session_key=session_key)
+            )
+            ok = False
+            if raw_html:
+                result, response = court_case.process_cause_list_page("mock", raw_html, complex_name, "", list_date, "Civil")
+                ok = result is not None
+        return time.perf_counter() - start, ok, None if ok else response
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        outcomes = list(executor.map(run_fetch, range(args.fetches)))
+    elapsed = time.perf_counter() - started
+    pool.close_all()
+    server.shutdown()
+
+    latencies = [seconds for seconds, ok, _ in outcomes if ok]
+    failures = {}
+    for _, ok, message in outcomes:
+        if not ok:
+            kind = failure_kind(message, resilience)
+            failures[kind] = failures.get(kind, 0) + 1
+
+    print(f"flow={args.flow} fetches={args.fetches} concurrency={args.concurrency} "
+          f"latency={args.latency}s jitter={args.jitter}s slow={args.slow_rate}@{args.slow_latency}s "
+          f"errors={args.error_rate} captcha_failures={args.captcha_failure_rate}")
+    print(f"wall time           {elapsed:9.1f} s")
+    print(f"throughput          {len(latencies) / elapsed * 60:9.2f} successful fetches/min")
+    print(f"succeeded           {len(latencies):9d} of {args.fetches}")
+    if latencies:
+        print(f"latency p50         {statistics.median(latencies):9.2f} s")
+        print(f"latency p95         {percentile(latencies, 0.95):9.2f} s")
+        print(f"latency p99         {percentile(latencies, 0.99):9.2f} s")
+        print(f"latency max         {max(latencies):9.2f} s")
+    for kind, count in sorted(failures.items()):
+        print(f"failed: {kind:<11} {count:9d}")
+    print(f"mock server         {json.dumps(server.stats, sort_keys=True)}")
+    print(f"scheduler           {json.dumps(fetch_scheduler.stats())}")
+
+
+if __name__ == "__main__":
+    main()
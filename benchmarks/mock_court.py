@@ -0,0 +1,424 @@
+"""
+Local stand-in for the two court websites.
+
+Serves a case status page with the element IDs the scraper drives on
+services.ecourts.gov.in (leftPaneMenuCS, sess_state_code, sess_dist_code,
+court_complex_code, casenumber-tabMenu, case_type, search_case_no,
+search_case_year, case_no_res) and a dcourts.gov.in style cause list page.
+Dropdowns are filled by XHR as on the real sites, the CAPTCHA is always
+MOCK_CAPTCHA, and results are generated from the request or replayed from
+recorded fragments (--pages DIR with case_status.html / cause_list.html).
+
+With --auto-solve the pages play the user: once the scraper has filled the
+form and it has stayed unchanged for --think-time seconds, the page types
+the CAPTCHA and submits, so fetches complete without anyone at the browser.
+
+Latency and failures are injected per request and are reproducible with
+--seed: --latency/--jitter on every request, --slow-rate requests get
+--slow-latency extra, --error-rate page loads return a 503 page and
+--captcha-failure-rate submissions are answered with "Invalid Captcha".
+
+    python benchmarks/mock_court.py --port 8765 --auto-solve --latency 0.2 --error-rate 0.05
+"""
+import argparse
+import json
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlparse
+
+ECOURTS_PATH = "/ecourtindia_v6/"
+CAUSE_LIST_PATH = "/cause-list-⁄-daily-board/"
+MOCK_CAPTCHA = "7K3QX"
+
+STATES = {"Delhi": {"South West": ["Dwarka Courts", "Dwarka Courts Complex"], "New Delhi": ["Patiala House Court Complex"]},
+          "Haryana": {"Gurugram": ["District Court Gurugram"]}}
+CASE_TYPES = [
+    "CS (COMM) - CIVIL SUIT (COMMERCIAL)", "CA - CRIMINAL APPEAL", "CR Cases - CRIMINAL CASE",
+    "CS - CIVIL SUIT FOR DJ ADJ", "CT Cases - COMPLAINT CASES", "EX - EXECUTION", "SC - SESSIONS CASE",
+]
+CAUSE_LIST_COMPLEXES = [
+    "Patiala House Court Complex", "Tis Hazari Courts Complex", "Karkardooma Courts Complex",
+    "Rohini Courts Complex", "Dwarka Courts Complex", "Saket Courts Complex", "Rouse Avenue Courts Complex",
+]
+
+CAPTCHA_SVG = f"""<svg xmlns="http://www.w3.org/2000/svg" width="120" height="40">
+<rect width="120" height="40" fill="#eee"/><text x="12" y="28" font-size="22" font-family="monospace">{MOCK_CAPTCHA}</text></svg>"""
+
+# Shared by both pages: submit once the form has been filled and left alone for THINK_MS
+AUTO_USER_JS = """
+var AUTO_SOLVE = %(auto_solve)s, THINK_MS = %(think_ms)d;
+var lastSignature = '', stableSince = 0, submittedSignature = null;
+function autoUser(signature, submit) {
+    if (!AUTO_SOLVE) return;
+    var now = Date.now();
+    if (signature !== lastSignature) { lastSignature = signature; stableSince = now; return; }
+    if (signature && signature !== submittedSignature && now - stableSince >= THINK_MS) {
+        submittedSignature = signature;
+        submit();
+    }
+}
+function post(url, data, done) {
+    var xhr = new XMLHttpRequest();
+    xhr.open('POST', url);
+    xhr.setRequestHeader('Content-Type', 'application/x-www-form-urlencoded');
+    xhr.onload = function () { done(xhr.responseText); };
+    xhr.send(Object.keys(data).map(function (k) { return k + '=' + encodeURIComponent(data[k]); }).join('&'));
+}
+function getJSON(url, done) {
+    var xhr = new XMLHttpRequest();
+    xhr.open('GET', url);
+    xhr.onload = function () { done(JSON.parse(xhr.responseText)); };
+    xhr.send();
+}
+function fillSelect(el, options) {
+    el.innerHTML = '<option value="">Select</option>' + options.map(function (o, i) {
+        return '<option value="' + (i + 1) + '">' + o + '</option>';
+    }).join('');
+}
+function selectedText(el) { return el.selectedIndex > 0 ? el.options[el.selectedIndex].text : ''; }
+"""
+
+ECOURTS_PAGE = """<!DOCTYPE html>
+<html><head><title>eCourts Services (mock)</title>
+<style>.hidden { display: none; } #validateError { display: none; }</style></head>
+<body>
+<a id="leftPaneMenuCS" href="#" onclick="document.getElementById('cs_panel').className=''; return false;">Case Status</a>
+<div id="cs_panel" class="hidden">
+  <select id="sess_state_code"><option value="">Select State</option>%(state_options)s</select>
+  <select id="sess_dist_code"><option value="">Select District</option></select>
+  <select id="court_complex_code"><option value="">Select Court Complex</option></select>
+  <div id="validateError" class="modal"><button class="btn-close">x</button></div>
+  <a id="casenumber-tabMenu" href="#" onclick="document.getElementById('case_number_tab').className=''; return false;">Case Number</a>
+  <div id="case_number_tab" class="hidden">
+    <select id="case_type"><option value="">Select Case Type</option></select>
+    <input id="search_case_no" type="text" name="search_case_no">
+    <select id="search_case_year"><option value="">Year</option>%(year_options)s</select>
+    <img id="captcha_image" src="/securimage_show.php">
+    <input id="case_captcha_code" type="text" name="case_captcha_code">
+    <button id="go_button" type="button" onclick="submitCase()">Go</button>
+  </div>
+  <div id="result_holder"></div>
+</div>
+<script>
+%(auto_user_js)s
+var state = document.getElementById('sess_state_code');
+var district = document.getElementById('sess_dist_code');
+var complex = document.getElementById('court_complex_code');
+state.addEventListener('change', function () {
+    getJSON('%(base)sdistricts?state=' + encodeURIComponent(selectedText(state)), function (o) { fillSelect(district, o); });
+});
+district.addEventListener('change', function () {
+    getJSON('%(base)scomplexes?state=' + encodeURIComponent(selectedText(state)) + '&district=' + encodeURIComponent(selectedText(district)),
+            function (o) { fillSelect(complex, o); });
+});
+complex.addEventListener('change', function () {
+    getJSON('%(base)scase_types', function (o) { fillSelect(document.getElementById('case_type'), o); });
+});
+function refreshCaptcha() {
+    var img = document.getElementById('captcha_image');
+    img.src = img.src.split('?')[0] + '?' + Date.now();
+}
+function submitCase() {
+    var result = document.getElementById('case_no_res');
+    if (result) result.parentNode.removeChild(result);
+    post('%(base)scase_status', {
+        case_type: selectedText(document.getElementById('case_type')),
+        case_no: document.getElementById('search_case_no').value,
+        case_year: selectedText(document.getElementById('search_case_year')),
+        captcha: document.getElementById('case_captcha_code').value
+    }, function (html) {
+        var div = document.createElement('div');
+        div.id = 'case_no_res';
+        div.innerHTML = html;
+        document.getElementById('result_holder').appendChild(div);
+    });
+}
+setInterval(function () {
+    var fields = [selectedText(document.getElementById('case_type')), document.getElementById('search_case_no').value,
+                  selectedText(document.getElementById('search_case_year'))];
+    autoUser(fields.every(Boolean) ? fields.join('|') : '', function () {
+        document.getElementById('case_captcha_code').value = '%(captcha)s';
+        submitCase();
+    });
+}, 200);
+</script>
+</body></html>
+"""
+
+CAUSE_LIST_PAGE = """<!DOCTYPE html>
+<html><head><title>Cause List / Daily Board (mock)</title></head>
+<body>
+<h2>Cause List / Daily Board</h2>
+<form id="cause_list_form" onsubmit="return false;">
+  <label for="type_complex"><input type="radio" id="type_complex" name="search_by" value="court_complex"> Court Complex</label>
+  <label for="type_establishment"><input type="radio" id="type_establishment" name="search_by" value="court_establishment"> Court Establishment</label>
+  <select id="court_complex" name="court_complex"><option value="">Select Court Complex</option>%(complex_options)s</select>
+  <select id="court_list" name="court"><option value="">Select Court</option></select>
+  <input id="date" name="date" type="text" placeholder="Cause List Date">
+  <label for="type_civil"><input type="radio" id="type_civil" name="cause_list_type" value="civ"> Civil</label>
+  <label for="type_criminal"><input type="radio" id="type_criminal" name="cause_list_type" value="cri"> Criminal</label>
+  <img id="siwp_captcha_image" src="/securimage_show.php?_siwp_captcha">
+  <input id="siwp_captcha_value" name="siwp_captcha_value" type="text">
+  <button type="button" onclick="submitCauseList()">Submit</button>
+</form>
+<div id="cause_list_results"></div>
+<script>
+%(auto_user_js)s
+var complex = document.getElementById('court_complex');
+complex.addEventListener('change', function () {
+    getJSON('%(base)scourts?complex=' + encodeURIComponent(selectedText(complex)), function (o) {
+        fillSelect(document.getElementById('court_list'), o);
+    });
+});
+function listType() {
+    var checked = document.querySelector('input[name="cause_list_type"]:checked');
+    return checked ? checked.parentNode.innerText.trim() : '';
+}
+function submitCauseList() {
+    post('%(base)sresults', {
+        complex: selectedText(complex),
+        court: selectedText(document.getElementById('court_list')),
+        date: document.getElementById('date').value,
+        list_type: listType(),
+        captcha: document.getElementById('siwp_captcha_value').value
+    }, function (html) { document.getElementById('cause_list_results').innerHTML = html; });
+}
+setInterval(function () {
+    var fields = [selectedText(complex), document.getElementById('date').value, listType()];
+    autoUser(fields.every(Boolean) ? fields.join('|') : '', function () {
+        document.getElementById('siwp_captcha_value').value = '%(captcha)s';
+        submitCauseList();
+    });
+}, 200);
+</script>
+</body></html>
+"""
+
+ERROR_PAGE = "<html><body><h1>503 Service Unavailable</h1><p>The server is temporarily unable to service your request.</p></body></html>"
+INVALID_CAPTCHA = '<div class="alert alert-danger">Invalid Captcha</div>'
+
+
+def case_status_fragment(case_type, case_no, case_year):
+    """A case_no_res body in the shape case_parser expects, derived from the request"""
+    number = int(case_no) if str(case_no).isdigit() else 1
+    year = int(case_year) if str(case_year).isdigit() else 2024
+    hearings = "".join(
+        f"<tr><td>Judge {number % 7 + 1}</td><td>{(i * 3) % 28 + 1:02d}-{i % 12 + 1:02d}-{year}</td>"
+        f"<td>{(i * 3 + 14) % 28 + 1:02d}-{(i + 1) % 12 + 1:02d}-{year}</td><td>{'Evidence' if i % 2 else 'Arguments'}</td></tr>"
+        for i in range(number % 9 + 3)
+    )
+    orders = "".join(
+        f"<tr><td>{i + 1}</td><td>{(i * 5) % 28 + 1:02d}-{i % 12 + 1:02d}-{year}</td><td><a href='#'>Order {i + 1}</a></td></tr>"
+        for i in range(number % 4 + 1)
+    )
+    return f"""
+<table class="case_details_table">
+<tr><td>Case Type:</td><td>{case_type}</td></tr>
+<tr><td>Filing Number:</td><td>{number}/{year}</td></tr>
+<tr><td>Filing Date:</td><td>12-01-{year}</td></tr>
+<tr><td>Registration Number:</td><td>{number}/{year}</td></tr>
+<tr><td>Registration Date:</td><td>15-01-{year}</td></tr>
+<tr><td>CNR Number:</td><td>DLSW01{number:06d}{year}</td></tr>
+</table>
+<table class="case_status_table">
+<tr><td>First Hearing Date:</td><td>02-02-{year}</td></tr>
+<tr><td>Next Hearing Date:</td><td>{number % 28 + 1:02d}-11-{year + 2}</td></tr>
+<tr><td>Case Status:</td><td>{'Disposed' if number % 5 == 0 else 'Pending'}</td></tr>
+<tr><td>Case Stage:</td><td>Evidence</td></tr>
+<tr><td>Court Number and Judge:</td><td>{number % 7 + 1}-Additional District Judge</td></tr>
+</table>
+<span class="Petitioner_Advocate_table">1) Mock Petitioner {number} Advocate- Adv {number % 50}</span>
+<span class="Respondent_Advocate_table">1) Mock Respondent {number}</span>
+<table class="acts_table"><tr><th>Under Act(s)</th><th>Under Section(s)</th></tr><tr><td>Indian Penal Code</td><td>420</td></tr></table>
+<table class="history_table"><tr><th>Judge</th><th>Business on Date</th><th>Hearing Date</th><th>Purpose of hearing</th></tr>{hearings}</table>
+<table class="order_table"><tr><th>Order Number</th><th>Order on</th><th>Order Details</th></tr>{orders}</table>
+"""
+
+
+def cause_list_fragment(complex_name, list_date, list_type, rows, sections=3):
+    """Section headings followed by cause list tables with the standard dcourts headers"""
+    parts = []
+    per_section = max(1, rows // sections)
+    serial = 0
+    for section in range(sections):
+        parts.append(f"<h3>{['Fresh Matters', 'Regular Matters', 'Final Arguments', 'Evidence'][section % 4]}</h3>")
+        parts.append("<table><tr><th>Serial Number</th><th>Case Type/Case Number/Case Year</th><th>Party Name</th><th>Advocate</th></tr>")
+        for _ in range(per_section if section < sections - 1 else rows - serial):
+            serial += 1
+            case_type = "CS" if list_type.lower().startswith("civ") else "CR Cases"
+            parts.append(f"<tr><td>{serial}</td><td>{case_type}/{serial * 37 % 9000 + 1}/{2015 + serial % 10}</td>"
+                         f"<td>Mock Party {serial} Vs {complex_name.split()[0]} {list_date}</td><td>Adv {serial % 60}</td></tr>")
+        parts.append("</table>")
+    return "".join(parts)
+
+
+class MockCourtHandler(BaseHTTPRequestHandler):
+    config = None
+    rng = None
+    rng_lock = threading.Lock()
+    stats = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def roll(self, rate):
+        with self.rng_lock:
+            return self.rng.random() < rate
+
+    def delay(self):
+        config = self.config
+        with self.rng_lock:
+            seconds = config.latency + self.rng.uniform(0, config.jitter)
+            if self.rng.random() < config.slow_rate:
+                seconds += config.slow_latency
+        if seconds:
+            time.sleep(seconds)
+
+    def respond(self, body, content_type="text/html; charset=utf-8", status=200):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(data)
+
+    def count(self, name):
+        with self.rng_lock:
+            self.stats[name] = self.stats.get(name, 0) + 1
+
+    def recorded(self, name):
+        if self.config.pages:
+            path = os.path.join(self.config.pages, name)
+            if os.path.exists(path):
+                with open(path, encoding="utf-8") as f:
+                    return f.read()
+        return None
+
+    def page_vars(self, base):
+        return {
+            "base": base,
+            "captcha": MOCK_CAPTCHA,
+            "auto_user_js": AUTO_USER_JS % {"auto_solve": "true" if self.config.auto_solve else "false",
+                                            "think_ms": int(self.config.think_time * 1000)},
+        }
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        path = unquote(url.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        self.delay()
+
+        if path in (ECOURTS_PATH, CAUSE_LIST_PATH) and self.roll(self.config.error_rate):
+            self.count("injected_errors")
+            return self.respond(ERROR_PAGE, status=503)
+
+        if path == ECOURTS_PATH:
+            self.count("page_loads")
+            values = self.page_vars(ECOURTS_PATH)
+            values["state_options"] = "".join(f'<option value="{i + 1}">{s}</option>' for i, s in enumerate(STATES))
+            values["year_options"] = "".join(f'<option value="{y}">{y}</option>' for y in range(2026, 1989, -1))
+            return self.respond(ECOURTS_PAGE % values)
+        if path == ECOURTS_PATH + "districts":
+            return self.respond(json.dumps(list(STATES.get(query.get("state"), {}))), "application/json")
+        if path == ECOURTS_PATH + "complexes":
+            return self.respond(json.dumps(STATES.get(query.get("state"), {}).get(query.get("district"), [])), "application/json")
+        if path == ECOURTS_PATH + "case_types":
+            return self.respond(json.dumps(CASE_TYPES), "application/json")
+        if path == CAUSE_LIST_PATH:
+            self.count("page_loads")
+            values = self.page_vars(CAUSE_LIST_PATH)
+            values["complex_options"] = "".join(f'<option value="{i + 1}">{c}</option>' for i, c in enumerate(CAUSE_LIST_COMPLEXES))
+            return self.respond(CAUSE_LIST_PAGE % values)
+        if path == CAUSE_LIST_PATH + "courts":
+            courts = [f"{i} Ms. Mock Judge {i} - Additional Sessions Judge" for i in range(1, 9)]
+            return self.respond(json.dumps(courts), "application/json")
+        if path == "/securimage_show.php":
+            return self.respond(CAPTCHA_SVG, "image/svg+xml")
+        self.respond("<html><body>Not found</body></html>", status=404)
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        path = unquote(url.path)
+        length = int(self.headers.get("Content-Length") or 0)
+        form = {key: values[0] for key, values in parse_qs(self.rfile.read(length).decode("utf-8")).items()}
+        self.delay()
+
+        if path not in (ECOURTS_PATH + "case_status", CAUSE_LIST_PATH + "results"):
+            return self.respond("Not found", status=404)
+        if form.get("captcha") != MOCK_CAPTCHA or self.roll(self.config.captcha_failure_rate):
+            self.count("captcha_rejected")
+            return self.respond(INVALID_CAPTCHA)
+
+        self.count("results")
+        if path == ECOURTS_PATH + "case_status":
+            return self.respond(self.recorded("case_status.html")
+                                or case_status_fragment(form.get("case_type", ""), form.get("case_no", ""), form.get("case_year", "")))
+        return self.respond(self.recorded("cause_list.html")
+                            or cause_list_fragment(form.get("complex", ""), form.get("date", ""), form.get("list_type", ""),
+                                                   self.config.rows))
+
+
+def serve(config, host="127.0.0.1", port=0):
+    """Start the mock server in a background thread; returns the server (server.base_url is its root URL)"""
+    handler = type("ConfiguredMockCourtHandler", (MockCourtHandler,), {
+        "config": config,
+        "rng": random.Random(config.seed),
+        "stats": {},
+    })
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    server.base_url = f"http://{host}:{server.server_address[1]}"
+    server.stats = handler.stats
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def add_arguments(parser):
+    parser.add_argument("--pages", help="Directory with recorded case_status.html / cause_list.html result fragments")
+    parser.add_argument("--rows", type=int, default=200, help="Rows in a generated cause list")
+    parser.add_argument("--auto-solve", action="store_true", help="Let the page type the CAPTCHA and submit once the form is filled")
+    parser.add_argument("--think-time", type=float, default=1.5, help="Seconds the filled form stays untouched before the simulated user submits")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Up to this many extra random seconds per request")
+    parser.add_argument("--slow-rate", type=float, default=0.0, help="Fraction of requests that are slow")
+    parser.add_argument("--slow-latency", type=float, default=3.0, help="Extra seconds for a slow request")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of page loads answered with a 503 page")
+    parser.add_argument("--captcha-failure-rate", type=float, default=0.0, help="Fraction of submissions rejected as 'Invalid Captcha'")
+    parser.add_argument("--seed", type=int, default=1)
+
+
+def sites_config(base_url):
+    """court_sites JSON entry pointing the cause list adapter at the mock"""
+    return [{
+        "key": "mock",
+        "name": "Mock District Courts",
+        "url": base_url + CAUSE_LIST_PATH.replace("⁄", "%E2%81%84"),
+        "complexes": CAUSE_LIST_COMPLEXES,
+        "date_format": "%d/%m/%Y",
+    }]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8765)
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    server = serve(args, port=args.port)
+    print(f"Case status page: {server.base_url}{ECOURTS_PATH}")
+    print(f"Cause list page:  {sites_config(server.base_url)[0]['url']}")
+    print(f"CAPTCHA is always {MOCK_CAPTCHA}. Point the app at the mock with:")
+    print(f"  COURT_ECOURTS_URL={server.base_url}{ECOURTS_PATH} COURT_SITES_FILE=<file with {json.dumps(sites_config(server.base_url))}>")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,339 @@
+"""
+Chrome session setup and pooling for the scrapers.
+
+Sessions use the 'eager' page-load strategy (return once the DOM is ready
+instead of waiting for every image and font) and block heavy or third-party
+resources through the DevTools protocol. Blocking is pattern based
+(Network.setBlockedURLs), so the CAPTCHA endpoints of both court sites must
+never be matched: they are served from script URLs (securimage_show.php,
+?_siwp_captcha) rather than image file extensions, and any pattern that
+would match one of the sample CAPTCHA URLs is dropped before it is sent.
+"""
+import os
+import re
+import shutil
+import threading
+import time
+
+from selenium import webdriver
+
+IMAGE_PATTERNS = ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico", "*.bmp"]
+FONT_PATTERNS = ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot", "*fonts.googleapis.com*", "*fonts.gstatic.com*"]
+MEDIA_PATTERNS = ["*.mp4", "*.webm", "*.mp3", "*.pdf"]
+THIRD_PARTY_PATTERNS = [
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*facebook.net*", "*facebook.com/tr*", "*twitter.com/widgets*", "*platform.twitter.com*",
+    "*youtube.com/embed*", "*addthis.com*", "*sharethis.com*", "*hotjar.com*",
+]
+STYLESHEET_PATTERNS = ["*.css"]
+
+# Stylesheets are only dropped in 'strict': visibility checks (is_displayed,
+# modal detection) depend on them on the eCourts page.
+BLOCKING_PROFILES = {
+    "off": [],
+    "lean": IMAGE_PATTERNS + FONT_PATTERNS + MEDIA_PATTERNS + THIRD_PARTY_PATTERNS,
+    "strict": IMAGE_PATTERNS + FONT_PATTERNS + MEDIA_PATTERNS + THIRD_PARTY_PATTERNS + STYLESHEET_PATTERNS,
+}
+
+# URL fragments of the CAPTCHA images that must always load
+CAPTCHA_URL_MARKERS = ["securimage_show.php", "_siwp_captcha", "captcha"]
+# CAPTCHA image URLs as the court sites (and the mock court) request them;
+# a blocked pattern that matches any of these is dropped from every profile
+CAPTCHA_SAMPLE_URLS = [
+    "https://services.ecourts.gov.in/ecourtindia_v6/vendor/securimage/securimage_show.php",
+    "https://services.ecourts.gov.in/ecourtindia_v6/vendor/securimage/securimage_show.php?135",
+    "https://newdelhi.dcourts.gov.in/wp-content/plugins/si-captcha-for-wordpress/captcha/securimage_show.php?_siwp_captcha&id=5f3a",
+    "https://newdelhi.dcourts.gov.in/?_siwp_captcha&id=5f3a",
+    "http://127.0.0.1:8000/securimage_show.php",
+    "http://127.0.0.1:8000/securimage_show.php?_siwp_captcha",
+]
+
+DEFAULT_PROFILE = os.environ.get("COURT_BLOCKING_PROFILE", "lean")
+# Unattended runs (load tests against the mock court) set COURT_HEADLESS=1
+DEFAULT_HEADLESS = os.environ.get("COURT_HEADLESS") == "1"
+
+
+def pattern_matches(pattern, url):
+    """Whether a Network.setBlockedURLs pattern blocks url: the whole URL is
+    matched, '*' standing for any run of characters and '?' for one"""
+    regex = re.escape(pattern.lower()).replace(r"\*", ".*").replace(r"\?", ".")
+    return re.fullmatch(regex, url.lower(), re.DOTALL) is not None
+
+
+def blocks_captcha(pattern):
+    if any(marker in pattern.lower() for marker in CAPTCHA_URL_MARKERS):
+        return True
+    return any(pattern_matches(pattern, url) for url in CAPTCHA_SAMPLE_URLS)
+
+
+def blocked_patterns(profile):
+    if profile not in BLOCKING_PROFILES:
+        raise ValueError(f"Unknown blocking profile '{profile}'. Expected one of: {', '.join(BLOCKING_PROFILES)}")
+    # Never ship a pattern that could match a CAPTCHA URL
+    return [p for p in BLOCKING_PROFILES[profile] if not blocks_captcha(p)]
+
+
+def chrome_options(page_load_strategy="eager", headless=False, extra_arguments=()):
+    options = webdriver.ChromeOptions()
+    options.page_load_strategy = page_load_strategy
+    if headless:
+        options.add_argument("--headless=new")
+    for argument in extra_arguments:
+        options.add_argument(argument)
+    return options
+
+
+def apply_blocking(driver, profile):
+    patterns = blocked_patterns(profile)
+    if patterns:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+    return patterns
+
+
+def new_driver(profile=None, page_load_strategy="eager", headless=None, extra_arguments=()):
+    """Start Chrome with the given blocking profile applied before the first navigation"""
+    if headless is None:
+        headless = DEFAULT_HEADLESS
+    driver = webdriver.Chrome(options=chrome_options(page_load_strategy, headless, extra_arguments))
+    try:
+        apply_blocking(driver, profile or DEFAULT_PROFILE)
+    except Exception:
+        driver.quit()
+        raise
+    return driver
+
+
+PROFILE_ROOT = os.environ.get("COURT_BROWSER_PROFILES", os.path.join(os.getcwd(), ".browser_profiles"))
+PROFILE_SIZE_CAP_MB = int(os.environ.get("COURT_PROFILE_SIZE_CAP_MB", "300"))
+DISK_CACHE_MB = 200
+MAX_BROWSERS = 4
+IDLE_SESSION_SECONDS = 600
+# How often kept-alive sessions are checked for expiry and profile size
+REAP_INTERVAL_SECONDS = 60
+
+# Profile sub-directories that only hold caches and can be dropped at any time
+CACHE_DIRS = [
+    os.path.join("Default", "Cache"),
+    os.path.join("Default", "Code Cache"),
+    os.path.join("Default", "Service Worker", "CacheStorage"),
+    os.path.join("Default", "Service Worker", "ScriptCache"),
+    "GrShaderCache",
+    "ShaderCache",
+    os.path.join("Default", "GPUCache"),
+]
+
+
+def directory_size(path):
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+def enforce_profile_cap(profile_dir, cap_mb=None):
+    """Drop the cache directories of a profile that has grown past its cap; returns bytes freed"""
+    cap_bytes = (cap_mb or PROFILE_SIZE_CAP_MB) * 1024 * 1024
+    size = directory_size(profile_dir)
+    if size <= cap_bytes:
+        return 0
+    for cache_dir in CACHE_DIRS:
+        shutil.rmtree(os.path.join(profile_dir, cache_dir), ignore_errors=True)
+    return size - directory_size(profile_dir)
+
+
+class PooledBrowser:
+    """A Chrome session bound to one on-disk profile slot"""
+
+    def __init__(self, slot, profile_dir, driver):
+        self.slot = slot
+        self.profile_dir = profile_dir
+        self.driver = driver
+        self.affinity_key = None
+        # What the page is currently set up for, e.g. the selected court
+        self.context = {}
+        self.last_used = time.monotonic()
+        self.reused = False
+
+    def is_alive(self):
+        try:
+            self.driver.current_url
+            return True
+        except Exception:
+            return False
+
+
+class BrowserPool:
+    """
+    Hands out Chrome sessions that each own a persistent profile directory
+    (cookies and HTTP disk cache survive between fetches). With an affinity
+    key, a released session stays open and is handed back to the same user
+    on their next fetch, still logged into the court they last selected.
+    """
+
+    def __init__(self, root=None, max_browsers=MAX_BROWSERS, idle_seconds=IDLE_SESSION_SECONDS):
+        self.root = root or PROFILE_ROOT
+        self.max_browsers = max_browsers
+        self.idle_seconds = idle_seconds
+        self._busy = set()
+        self._idle = {}
+        self._cond = threading.Condition()
+        self._reaper = None
+
+    def _profile_dir(self, slot):
+        return os.path.join(self.root, f"profile-{slot}")
+
+    def _free_slot(self):
+        taken = self._busy | {browser.slot for browser in self._idle.values()}
+        for slot in range(self.max_browsers):
+            if slot not in taken:
+                return slot
+        return None
+
+    def _close(self, pooled):
+        try:
+            pooled.driver.quit()
+        except Exception:
+            pass
+        enforce_profile_cap(pooled.profile_dir)
+
+    def _retire(self, pooled):
+        """Close a session whose slot is marked busy, then free the slot.
+        The slot stays taken until Chrome has exited so that no new session
+        starts on a profile directory that is still locked."""
+        try:
+            self._close(pooled)
+        finally:
+            with self._cond:
+                self._busy.discard(pooled.slot)
+                self._cond.notify_all()
+
+    def _take_idle(self, key):
+        """Remove a kept-alive session and mark its slot busy (caller holds the lock)"""
+        pooled = self._idle.pop(key)
+        self._busy.add(pooled.slot)
+        return pooled
+
+    def cleanup_idle(self):
+        """Close kept-alive sessions that have not been used recently or whose
+        profile has grown past its cap (closing a session trims its profile)"""
+        now = time.monotonic()
+        cap_bytes = PROFILE_SIZE_CAP_MB * 1024 * 1024
+        with self._cond:
+            idle = list(self._idle.items())
+        # Profile sizes are read without the lock; a session taken meanwhile is left alone
+        expired = [(key, pooled) for key, pooled in idle
+                   if now - pooled.last_used > self.idle_seconds or directory_size(pooled.profile_dir) > cap_bytes]
+        with self._cond:
+            closing = [self._take_idle(key) for key, pooled in expired if self._idle.get(key) is pooled]
+        for pooled in closing:
+            self._retire(pooled)
+
+    def _reap(self):
+        while True:
+            time.sleep(min(REAP_INTERVAL_SECONDS, self.idle_seconds))
+            try:
+                self.cleanup_idle()
+            except Exception:
+                pass
+
+    def _start_reaper(self):
+        """Expire kept-alive sessions in the background, so a window left open
+        is closed even when no further fetch comes (caller holds the lock)"""
+        if self._reaper is None:
+            self._reaper = threading.Thread(target=self._reap, name="browser-pool-reaper", daemon=True)
+            self._reaper.start()
+
+    def acquire(self, affinity_key=None, profile=None, headless=None, extra_arguments=()):
+        with self._cond:
+            if affinity_key is not None and affinity_key in self._idle:
+                pooled = self._take_idle(affinity_key)
+                slot = pooled.slot
+            else:
+                pooled = None
+                while True:
+                    slot = self._free_slot()
+                    if slot is not None:
+                        self._busy.add(slot)
+                        break
+                    if self._idle:
+                        # Evict the least recently used kept-alive session
+                        oldest = min(self._idle, key=lambda key: self._idle[key].last_used)
+                        evicted = self._take_idle(oldest)
+                        self._cond.release()
+                        try:
+                            self._retire(evicted)
+                        finally:
+                            self._cond.acquire()
+                        continue
+                    self._cond.wait()
+
+        if pooled and pooled.is_alive():
+            pooled.reused = True
+            return pooled
+        if pooled:
+            # The kept-alive window was closed by the user; start over in the same slot
+            self._close(pooled)
+
+        profile_dir = self._profile_dir(slot)
+        os.makedirs(profile_dir, exist_ok=True)
+        arguments = [
+            f"--user-data-dir={profile_dir}",
+            f"--disk-cache-size={DISK_CACHE_MB * 1024 * 1024}",
+        ] + list(extra_arguments)
+        try:
+            driver = new_driver(profile=profile, headless=headless, extra_arguments=arguments)
+        except Exception:
+            with self._cond:
+                self._busy.discard(slot)
+                self._cond.notify_all()
+            raise
+        pooled = PooledBrowser(slot, profile_dir, driver)
+        pooled.affinity_key = affinity_key
+        return pooled
+
+    def release(self, pooled, keep_alive=False):
+        """Return a session; keep it open for its affinity key or close it"""
+        pooled.last_used = time.monotonic()
+        pooled.reused = False
+        if not (keep_alive and pooled.affinity_key is not None and pooled.is_alive()):
+            pooled.context = {}
+            self._retire(pooled)
+            return
+
+        with self._cond:
+            previous = self._take_idle(pooled.affinity_key) if pooled.affinity_key in self._idle else None
+            self._idle[pooled.affinity_key] = pooled
+            self._busy.discard(pooled.slot)
+            self._start_reaper()
+            self._cond.notify_all()
+        if previous:
+            self._retire(previous)
+
+    def close(self, affinity_key):
+        """Close the session kept open for an affinity key, if there is one"""
+        with self._cond:
+            pooled = self._take_idle(affinity_key) if affinity_key in self._idle else None
+        if pooled:
+            self._retire(pooled)
+
+    def stats(self):
+        with self._cond:
+            return {"busy": len(self._busy), "kept_alive": len(self._idle), "max_browsers": self.max_browsers}
+
+    def close_all(self):
+        with self._cond:
+            idle = [self._take_idle(key) for key in list(self._idle)]
+        for pooled in idle:
+            self._retire(pooled)
+
+
+_pool = BrowserPool()
+
+
+def get_pool():
+    return _pool
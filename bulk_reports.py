@@ -0,0 +1,172 @@
+"""
+Bulk PDF reports of stored cause lists, rendered across worker processes.
+
+Picks cause lists from the database (by default the latest fetch of each
+court complex, list type and date that was fetched today), renders one PDF
+per list in a ProcessPoolExecutor and writes them to a directory or streams
+them into a ZIP file on disk as they finish:
+
+    python bulk_reports.py --out reports/                       # today's lists, one PDF each
+    python bulk_reports.py --zip reports/2025-01-15.zip --fetched-on 2025-01-15
+    python bulk_reports.py --ids 12 13 14 --out reports/ --workers 4
+
+Workers read the lists from SQLite themselves, so only cause list ids go to
+them and only finished PDFs come back; at most two PDFs per worker are held
+in memory at a time. The app starts this module as a separate process
+(start_background) so rendering never blocks the Streamlit process.
+"""
+import argparse
+import datetime
+import os
+import sqlite3
+import subprocess
+import sys
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import pdf_reports
+
+def select_cause_lists(conn, fetched_on=None, court_complex=None, list_type=None):
+    """Ids of the latest cause list per complex, list type and date fetched on a day (default today).
+    The day is a UTC date, like the stored timestamps."""
+    query = "SELECT MAX(id) FROM cause_lists WHERE date(timestamp) = ?"
+    params = [fetched_on or datetime.datetime.now(datetime.timezone.utc).date().isoformat()]
+    if court_complex:
+        query += " AND court_complex = ?"
+        params.append(court_complex)
+    if list_type:
+        query += " AND list_type = ?"
+        params.append(list_type)
+    query += " GROUP BY court_complex, list_type, list_date ORDER BY court_complex, list_type, list_date"
+    return [row[0] for row in conn.execute(query, params)]
+
+
+def render_cause_list(db_file, cause_list_id):
+    """Worker: (cause_list_id, file_name, pdf bytes, pages, error)"""
+    try:
+        conn = sqlite3.connect(db_file)
+        try:
+            stored = pdf_reports.stored_cause_list(conn, cause_list_id)
+        finally:
+            conn.close()
+        if not stored:
+            return cause_list_id, None, None, 0, "no stored rows"
+        df, court_complex, list_date, list_type = stored
+        # One renderer per worker process, so its page counter is this worker's alone
+        renderer = pdf_reports.get_renderer()
+        pages_before = renderer.pages
+        pdf = renderer.cause_list_pdf(df, court_complex, list_date, list_type)
+        file_name = pdf_reports.cause_list_file_name(cause_list_id, court_complex, list_date, list_type)
+        return cause_list_id, file_name, pdf, renderer.pages - pages_before, None
+    except Exception as e:
+        return cause_list_id, None, None, 0, str(e)
+
+
+class DirectoryWriter:
+    def __init__(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+
+    def write(self, file_name, data):
+        with open(os.path.join(self.directory, file_name), "wb") as f:
+            f.write(data)
+
+    def close(self):
+        pass
+
+
+class ZipWriter:
+    """Appends each PDF to a ZIP on disk as soon as it is rendered"""
+
+    def __init__(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # PDFs are already compressed; deflating them again costs time for a few percent
+        self.archive = zipfile.ZipFile(path, "w", zipfile.ZIP_STORED)
+
+    def write(self, file_name, data):
+        self.archive.writestr(file_name, data)
+
+    def close(self):
+        self.archive.close()
+
+
+def run(db_file, cause_list_ids, writer, workers=None, progress=print):
+    """Render every cause list into writer; returns (documents written, failed, pages, seconds)"""
+    started = time.perf_counter()
+    written = failed = pages = 0
+    workers = workers or os.cpu_count() or 1
+    pending = deque(cause_list_ids)
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            in_flight = deque()
+            while pending or in_flight:
+                # Bound the finished-but-unwritten PDFs held in memory
+                while pending and len(in_flight) < 2 * workers:
+                    in_flight.append(executor.submit(render_cause_list, db_file, pending.popleft()))
+                cause_list_id, file_name, data, doc_pages, error = in_flight.popleft().result()
+                if error:
+                    failed += 1
+                    print(f"cause list {cause_list_id}: {error}", file=sys.stderr)
+                    continue
+                writer.write(file_name, data)
+                written += 1
+                pages += doc_pages
+                elapsed = time.perf_counter() - started
+                progress(f"{written + failed}/{len(cause_list_ids)} cause lists, {pages} pages, "
+                         f"{pages / elapsed if elapsed else 0:.1f} pages/sec")
+    finally:
+        writer.close()
+    return written, failed, pages, time.perf_counter() - started
+
+
+def start_background(db_file, cause_list_ids, out=None, zip_path=None, workers=None, log_path=None):
+    """Run the bulk export in its own process; returns the Popen (output goes to log_path if given)"""
+    command = [sys.executable, "-u", os.path.abspath(__file__), "--db", db_file, "--ids"] + [str(i) for i in cause_list_ids]
+    command += ["--zip", zip_path] if zip_path else ["--out", out or "reports"]
+    if workers:
+        command += ["--workers", str(workers)]
+    log = open(log_path, "w") if log_path else subprocess.DEVNULL
+    try:
+        return subprocess.Popen(command, stdout=log, stderr=subprocess.STDOUT)
+    finally:
+        if log_path:
+            log.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", default="case_data.db")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--out", help="Directory to write one PDF per cause list into (default: reports/)")
+    target.add_argument("--zip", help="ZIP file to stream the PDFs into")
+    parser.add_argument("--ids", type=int, nargs="+", help="Cause list ids to render instead of the day's latest lists")
+    parser.add_argument("--fetched-on", help="Day the lists were fetched, YYYY-MM-DD in UTC (default: today)")
+    parser.add_argument("--complex", help="Only this court complex")
+    parser.add_argument("--list-type", help="Only this list type (Civil/Criminal)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--quiet", action="store_true", help="Only print the final summary")
+    args = parser.parse_args(argv)
+
+    if args.ids:
+        cause_list_ids = args.ids
+    else:
+        conn = sqlite3.connect(args.db)
+        cause_list_ids = select_cause_lists(conn, args.fetched_on, args.complex, args.list_type)
+        conn.close()
+    if not cause_list_ids:
+        print("No cause lists to render.")
+        return
+
+    writer = ZipWriter(args.zip) if args.zip else DirectoryWriter(args.out or "reports")
+    written, failed, pages, elapsed = run(args.db, cause_list_ids, writer, args.workers,
+                                          progress=(lambda message: None) if args.quiet else print)
+    rate = pages / elapsed if elapsed else 0
+    print(f"Done: {written} PDFs ({pages} pages), {failed} failed in {elapsed:.1f}s ({rate:.1f} pages/sec) -> {args.zip or args.out or 'reports'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,442 @@
+"""
+CAPTCHA providers for the case status and cause list forms.
+
+A provider looks at the CAPTCHA image and returns an answer with a
+confidence, or no answer to leave the CAPTCHA to the person at the browser:
+
+    manual   the default; nothing is typed, the user solves it as before
+    ocr      an offline glyph classifier (nearest neighbours over segmented
+             characters, numpy + Pillow) trained on captured CAPTCHA images
+
+start() runs the selected provider on the form in the browser. An answer is
+typed and submitted only if its confidence reaches MIN_CONFIDENCE; no answer,
+a low confidence, an error or a rejection by the site all fall back to manual
+input in the same fetch. Every attempt is recorded in captcha_attempts
+(provider, answer, confidence, solve time, outcome), so accuracy and latency
+can be compared per provider.
+
+Images are kept in captcha_samples with the answer the site accepted, and
+are the training data. An OCR answer is known before it is submitted; for a
+CAPTCHA solved by hand, observe() is called while the fetch waits for the
+user and pairs what is typed in the answer field with a screenshot of the
+image at that moment, before the submit clears or replaces either
+(COURT_CAPTCHA_SAMPLES=0 turns this off):
+
+    python captcha.py train --db case_data.db       # fit captcha_model.npz on the labelled samples
+    python captcha.py evaluate --db case_data.db    # leave-one-out accuracy over the samples
+    python captcha.py stats --db case_data.db       # accuracy and latency per provider
+
+The model file is reloaded when it changes, so retraining needs no restart.
+"""
+import argparse
+import io
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+from PIL import Image
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+
+MODEL_FILE = os.environ.get("COURT_CAPTCHA_MODEL", "captcha_model.npz")
+DEFAULT_PROVIDER = os.environ.get("COURT_CAPTCHA_PROVIDER", "manual")
+# Keep the CAPTCHAs users solve by hand as training samples
+COLLECT_SAMPLES = os.environ.get("COURT_CAPTCHA_SAMPLES", "1") != "0"
+MIN_CONFIDENCE = 0.35
+GLYPH_SIZE = (12, 16)  # width, height every character is scaled to
+MIN_COLUMN_INK = 2  # Columns with fewer dark pixels are gaps (noise lines are thin)
+
+IMAGE_SELECTOR = '#captcha_image, #siwp_captcha_image, img[src*="securimage"], img[src*="captcha"]'
+INPUT_SELECTOR = '#case_captcha_code, #siwp_captcha_value, input[name*="captcha"]'
+
+IMAGE_LOADED_JS = """
+var img = document.querySelector(arguments[0]);
+return !!(img && img.complete && img.naturalWidth > 0);
+"""
+
+# Clicks the Go/Submit/Search button nearest to the CAPTCHA input
+SUBMIT_JS = """
+var input = document.querySelector(arguments[0]);
+for (var node = input && input.parentElement; node; node = node.parentElement) {
+    var buttons = node.querySelectorAll('button, input[type=submit], input[type=button]');
+    for (var i = 0; i < buttons.length; i++) {
+        var label = (buttons[i].innerText || buttons[i].value || '').trim().toLowerCase();
+        if (label === 'go' || label === 'submit' || label === 'search') {
+            buttons[i].click();
+            return true;
+        }
+    }
+}
+return false;
+"""
+
+REFRESH_JS = """
+var img = document.querySelector(arguments[0]);
+if (typeof refreshCaptcha === 'function') {
+    refreshCaptcha();
+} else if (img) {
+    var src = img.src.replace(/[?&]_=\\d+$/, '');
+    img.src = src + (src.indexOf('?') >= 0 ? '&' : '?') + '_=' + Date.now();
+}
+var input = document.querySelector(arguments[1]);
+if (input) input.value = '';
+"""
+
+
+def setup_captcha_tables(conn):
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS captcha_attempts (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+        form TEXT NOT NULL,
+        provider TEXT NOT NULL,
+        answer TEXT,
+        confidence REAL,
+        solve_ms REAL,
+        outcome TEXT NOT NULL
+    )
+    """)
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS captcha_samples (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+        form TEXT NOT NULL,
+        image BLOB NOT NULL,
+        label TEXT NOT NULL,
+        source TEXT NOT NULL
+    )
+    """)
+
+
+def binarize(png):
+    """Boolean ink mask of a CAPTCHA image: pixels darker than the midpoint of its range"""
+    pixels = np.asarray(Image.open(io.BytesIO(png)).convert("L"), dtype=np.float32)
+    return pixels < (pixels.min() + pixels.max()) / 2
+
+
+def glyph_vector(ink):
+    """One character's ink, trimmed to its rows and scaled to GLYPH_SIZE"""
+    rows = np.flatnonzero(ink.any(axis=1))
+    ink = ink[rows[0]:rows[-1] + 1]
+    image = Image.fromarray(ink.astype(np.uint8) * 255).resize(GLYPH_SIZE, Image.BILINEAR)
+    return np.asarray(image, dtype=np.float32).ravel() / 255
+
+
+def segment(png):
+    """Character vectors from left to right, split on empty columns"""
+    ink = binarize(png)
+    columns = ink.sum(axis=0) >= MIN_COLUMN_INK
+    runs = []
+    start = None
+    for x, has_ink in enumerate(np.append(columns, False)):
+        if has_ink and start is None:
+            start = x
+        elif not has_ink and start is not None:
+            if x - start >= 2:  # Specks are not characters
+                runs.append((start, x))
+            start = None
+    if not runs:
+        return []
+    # Touching characters make one wide run; cut it into as many median-width pieces
+    median = float(np.median([end - begin for begin, end in runs]))
+    pieces = []
+    for begin, end in runs:
+        parts = max(1, int(round((end - begin) / median)))
+        step = (end - begin) / parts
+        pieces += [(int(begin + i * step), int(begin + (i + 1) * step)) for i in range(parts)]
+    return [glyph_vector(ink[:, begin:end]) for begin, end in pieces if ink[:, begin:end].any()]
+
+
+class GlyphModel:
+    """Nearest-neighbour classifier over character vectors"""
+
+    def __init__(self, vectors, labels):
+        self.vectors = np.asarray(vectors, dtype=np.float32)
+        self.labels = np.asarray(labels)
+
+    @classmethod
+    def train(cls, samples):
+        """Fit on (png, label) pairs; returns (model or None, samples used, samples skipped).
+        A sample is skipped when it does not split into one piece per character."""
+        vectors, labels = [], []
+        used = skipped = 0
+        for png, label in samples:
+            glyphs = segment(png)
+            if len(glyphs) != len(label):
+                skipped += 1
+                continue
+            vectors += glyphs
+            labels += list(label)
+            used += 1
+        return (cls(vectors, labels) if vectors else None), used, skipped
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls(data["vectors"], data["labels"])
+
+    def save(self, path):
+        np.savez_compressed(path, vectors=self.vectors, labels=self.labels)
+
+    def classify(self, vector):
+        """(character, confidence); confidence compares the best match with the best different character"""
+        distances = ((self.vectors - vector) ** 2).sum(axis=1)
+        best = int(np.argmin(distances))
+        label = self.labels[best]
+        others = distances[self.labels != label]
+        if not len(others) or not others.min():
+            return str(label), 1.0
+        return str(label), float(1 - distances[best] / others.min())
+
+    def read(self, png):
+        """(answer, confidence of its least certain character); (None, 0.0) if nothing was found"""
+        glyphs = segment(png)
+        if not glyphs:
+            return None, 0.0
+        characters = [self.classify(glyph) for glyph in glyphs]
+        return "".join(char for char, _ in characters), min(confidence for _, confidence in characters)
+
+
+class ManualProvider:
+    name = "manual"
+
+    def solve(self, png):
+        return None, 0.0
+
+
+class OcrProvider:
+    name = "ocr"
+
+    def __init__(self, model_file=MODEL_FILE):
+        self.model_file = model_file
+        self._model = None
+        self._mtime = None
+        self._lock = threading.Lock()
+
+    def model(self):
+        """The trained model, reloaded when the file changes; None until one is trained"""
+        try:
+            mtime = os.path.getmtime(self.model_file)
+        except OSError:
+            return None
+        with self._lock:
+            if mtime != self._mtime:
+                self._model = GlyphModel.load(self.model_file)
+                self._mtime = mtime
+            return self._model
+
+    def solve(self, png):
+        model = self.model()
+        if model is None:
+            raise RuntimeError(f"no OCR model at {self.model_file}; run python captcha.py train")
+        return model.read(png)
+
+
+PROVIDERS = {provider.name: provider for provider in (ManualProvider(), OcrProvider())}
+
+
+def get_provider(name=None):
+    return PROVIDERS.get(name or DEFAULT_PROVIDER, PROVIDERS["manual"])
+
+
+def read_image(driver, timeout=5):
+    """PNG of the CAPTCHA as shown on the page (re-downloading it would get a new CAPTCHA)"""
+    WebDriverWait(driver, timeout).until(lambda d: d.execute_script(IMAGE_LOADED_JS, IMAGE_SELECTOR))
+    return driver.find_element(By.CSS_SELECTOR, IMAGE_SELECTOR).screenshot_as_png
+
+
+def typed_answer(driver):
+    try:
+        return (driver.find_element(By.CSS_SELECTOR, INPUT_SELECTOR).get_attribute("value") or "").strip()
+    except Exception:
+        return ""
+
+
+def refresh(driver):
+    """Ask the page for a new CAPTCHA and clear the answer field"""
+    driver.execute_script(REFRESH_JS, IMAGE_SELECTOR, INPUT_SELECTOR)
+
+
+class CaptchaAttempt:
+    """One CAPTCHA on a form, solved by a provider or by the user, waiting for the site's verdict"""
+
+    def __init__(self, db_file, form, provider, image, answer=None, confidence=None, solve_ms=None, automatic=False):
+        self.db_file = db_file
+        self.form = form
+        self.provider = provider
+        self.image = image
+        self.answer = answer
+        self.confidence = confidence
+        self.solve_ms = solve_ms
+        self.automatic = automatic
+        self.started = time.perf_counter()
+        self.finished = False
+
+    def observe(self, driver):
+        """Called while waiting for the user: keep the latest typed answer with the image it was typed for"""
+        if self.automatic or self.finished or not COLLECT_SAMPLES:
+            return
+        typed = typed_answer(driver)
+        if not typed or typed == self.answer:
+            return
+        try:
+            image = read_image(driver, timeout=0)
+        except Exception:
+            return  # Try again on the next call
+        self.answer, self.image = typed, image
+
+    def finish(self, outcome):
+        """Record the verdict once; an accepted answer labels the image (the last observed one, if manual)"""
+        if self.finished:
+            return
+        self.finished = True
+        if not self.automatic:
+            # The user's time at the browser is the manual provider's latency
+            self.solve_ms = (time.perf_counter() - self.started) * 1000
+        try:
+            conn = sqlite3.connect(self.db_file)
+            conn.execute(
+                """INSERT INTO captcha_attempts (form, provider, answer, confidence, solve_ms, outcome)
+                   VALUES (?, ?, ?, ?, ?, ?)""",
+                (self.form, self.provider, self.answer, self.confidence, self.solve_ms, outcome)
+            )
+            if outcome == "accepted" and self.answer and self.image:
+                conn.execute(
+                    "INSERT INTO captcha_samples (form, image, label, source) VALUES (?, ?, ?, ?)",
+                    (self.form, self.image, self.answer, self.provider)
+                )
+            conn.commit()
+            conn.close()
+        except sqlite3.Error:
+            pass  # Statistics must never fail a fetch
+
+    def accepted(self):
+        self.finish("accepted")
+
+    def rejected(self):
+        self.finish("rejected")
+
+
+def start(driver, form, db_file, provider_name=None, report=None):
+    """
+    Run the provider on the CAPTCHA on the page. With a confident answer it is
+    typed and the form submitted (attempt.automatic is True); otherwise the
+    returned attempt stands for the user solving it in the browser.
+    report(level, message) receives what happened, as in court_sites.
+    """
+    report = report or (lambda level, message: None)
+    provider = get_provider(provider_name)
+    if provider.name == "manual":
+        # The image is captured by observe() together with the user's answer
+        return CaptchaAttempt(db_file, form, "manual", None)
+
+    started = time.perf_counter()
+    image = None
+    try:
+        image = read_image(driver)
+        answer, confidence = provider.solve(image)
+    except Exception as e:
+        CaptchaAttempt(db_file, form, provider.name, image, automatic=True,
+                       solve_ms=(time.perf_counter() - started) * 1000).finish("error")
+        report("warning", f"🤖 CAPTCHA {provider.name} failed ({e}). Please solve the CAPTCHA in the browser.")
+        return CaptchaAttempt(db_file, form, "manual", None)
+    solve_ms = (time.perf_counter() - started) * 1000
+
+    attempt = CaptchaAttempt(db_file, form, provider.name, image, answer, confidence, solve_ms, automatic=True)
+    if not answer or confidence < MIN_CONFIDENCE:
+        attempt.finish("no_answer")
+        report("warning", f"🤖 CAPTCHA {provider.name} is not confident enough ({confidence:.0%}). Please solve the CAPTCHA in the browser.")
+        return CaptchaAttempt(db_file, form, "manual", None)
+
+    try:
+        answer_input = driver.find_element(By.CSS_SELECTOR, INPUT_SELECTOR)
+        answer_input.clear()
+        answer_input.send_keys(answer)
+        submitted = driver.execute_script(SUBMIT_JS, INPUT_SELECTOR)
+    except Exception:
+        submitted = False
+    if not submitted:
+        attempt.finish("error")
+        report("warning", f"🤖 Typed '{answer}' but could not find the submit button. Please check the CAPTCHA and submit in the browser.")
+        return CaptchaAttempt(db_file, form, "manual", None)
+    report("info", f"🤖 CAPTCHA answered by {provider.name} in {solve_ms:.0f} ms ({confidence:.0%} confident) and submitted")
+    return attempt
+
+
+def attempt_stats(db_file):
+    """Per provider: attempts, accepted, rejected, unanswered, accuracy of submitted answers and solve latency"""
+    conn = sqlite3.connect(db_file)
+    df = pd.read_sql_query("SELECT provider, outcome, solve_ms FROM captcha_attempts", conn)
+    conn.close()
+    stats = []
+    for provider, group in df.groupby("provider"):
+        accepted = int((group["outcome"] == "accepted").sum())
+        rejected = int((group["outcome"] == "rejected").sum())
+        stats.append({
+            "provider": provider,
+            "attempts": len(group),
+            "accepted": accepted,
+            "rejected": rejected,
+            "unanswered": int(group["outcome"].isin(["no_answer", "error"]).sum()),
+            "accuracy": round(accepted / (accepted + rejected), 3) if accepted + rejected else None,
+            "median_ms": round(float(group["solve_ms"].median()), 1) if group["solve_ms"].notna().any() else None,
+            "p95_ms": round(float(group["solve_ms"].quantile(0.95)), 1) if group["solve_ms"].notna().any() else None,
+        })
+    return pd.DataFrame(stats)
+
+
+def load_samples(db_file):
+    conn = sqlite3.connect(db_file)
+    samples = conn.execute("SELECT image, label FROM captcha_samples ORDER BY id").fetchall()
+    conn.close()
+    return samples
+
+
+def evaluate(samples):
+    """Leave-one-out: (correct, tried) reading each sample with a model trained on all the others"""
+    correct = tried = 0
+    for i, (png, label) in enumerate(samples):
+        model, _, _ = GlyphModel.train(samples[:i] + samples[i + 1:])
+        if model is None:
+            continue
+        answer, _ = model.read(png)
+        tried += 1
+        correct += answer == label
+    return correct, tried
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["train", "evaluate", "stats"])
+    parser.add_argument("--db", default="case_data.db")
+    parser.add_argument("--model", default=MODEL_FILE, help=f"Model file to write (default: {MODEL_FILE}, or COURT_CAPTCHA_MODEL)")
+    args = parser.parse_args(argv)
+
+    conn = sqlite3.connect(args.db)
+    setup_captcha_tables(conn)
+    conn.close()
+
+    if args.command == "stats":
+        stats = attempt_stats(args.db)
+        print(stats.to_string(index=False) if not stats.empty else "No CAPTCHA attempts recorded yet.")
+        return
+    samples = load_samples(args.db)
+    if args.command == "evaluate":
+        correct, tried = evaluate(samples)
+        print(f"Leave-one-out accuracy: {correct}/{tried}" + (f" ({correct / tried:.0%})" if tried else ""))
+        return
+    started = time.perf_counter()
+    model, used, skipped = GlyphModel.train(samples)
+    if model is None:
+        print(f"No usable samples ({skipped} of {len(samples)} did not segment into one piece per character).")
+        return
+    model.save(args.model)
+    print(f"Trained on {used} samples ({len(model.labels)} characters, {skipped} skipped) "
+          f"in {time.perf_counter() - started:.1f}s -> {args.model}")
+
+
+if __name__ == "__main__":
+    main()
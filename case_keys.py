@@ -0,0 +1,86 @@
+"""
+Canonical case-number keys.
+
+Cause lists print cases as one combined string ("T P (CRL)/19/2025") while
+case-status lookups keep the dropdown label ("CS (COMM) - CIVIL SUIT
+(COMMERCIAL)"), number and year separately. Both are reduced to the same
+(type_code, number, year) key so the two can be joined on indexed columns.
+"""
+import re
+
+_COMBINED_CASE = re.compile(
+    r"^\s*(?P<type>.*?)[\s/\-:.]*(?P<number>\d+)\s*[/\-]\s*(?P<year>\d{4})\s*$"
+)
+_TYPE_NOISE = re.compile(r"[\s.]+")
+# "MACT No. 45/2023": the trailing "No." belongs to the number, not the type
+_NUMBER_WORD = re.compile(r"[\s.]*\b(?:no|number)\b[\s.]*$", re.IGNORECASE)
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def type_code(case_type):
+    """Short type code from a case type or dropdown label, e.g. 'CS(COMM)'"""
+    if not case_type:
+        return ""
+    label = _NUMBER_WORD.sub("", str(case_type).split(" - ")[0])
+    return _TYPE_NOISE.sub("", label).upper()
+
+
+def _number(value):
+    value = str(value).strip()
+    return str(int(value)) if value.isdigit() else value.upper()
+
+
+def case_status_key(case_type, case_number, case_year):
+    """Key for a case-status lookup stored as separate fields"""
+    try:
+        year = int(case_year)
+    except (TypeError, ValueError):
+        return None
+    code = type_code(case_type)
+    if not code or not str(case_number).strip():
+        return None
+    return code, _number(case_number), year
+
+
+def parse_case_number(text):
+    """Key for a combined cause-list string like 'T P (CRL)/19/2025'"""
+    if not text:
+        return None
+    match = _COMBINED_CASE.match(str(text))
+    if not match:
+        return None
+    code = type_code(match.group("type"))
+    if not code:
+        return None
+    return code, _number(match.group("number")), int(match.group("year"))
+
+
+def format_key(key):
+    return f"{key[0]}/{key[1]}/{key[2]}" if key else ""
+
+
+def compact_key(text):
+    """Canonical key string for free text, falling back to alphanumerics only"""
+    key = parse_case_number(text)
+    if key:
+        return format_key(key)
+    return _NON_ALNUM.sub("", str(text).lower())
+
+
+def cause_list_columns(headers):
+    """Locate the section, case, party and advocate columns of a parsed cause list"""
+    keywords = {
+        "section": ["section"],
+        "case": ["case"],
+        "party": ["party", "petitioner"],
+        "advocate": ["advocate", "lawyer"],
+    }
+    columns = {}
+    for field, field_keywords in keywords.items():
+        columns[field] = None
+        for i, header in enumerate(headers or []):
+            header_lower = str(header).lower()
+            if any(keyword in header_lower for keyword in field_keywords):
+                columns[field] = i
+                break
+    return columns
@@ -0,0 +1,307 @@
+"""
+Structured extraction of eCourts case status pages.
+
+parse_case_page() turns a case_no_res result page into a CaseRecord: the
+summary fields, acts/sections, hearing history and orders. Records are
+stored normalized (case_details, case_hearings, case_orders keyed by the
+queries row), so the raw HTML never has to be re-parsed to answer
+questions about hearings. Existing rows are re-parsed from
+queries.raw_response_html by reprocess.py.
+"""
+import re
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import List, Optional
+
+from bs4 import BeautifulSoup
+
+NOT_FOUND = "Not Found"
+
+# Page label (lowercase, without the trailing colon) -> CaseRecord field
+LABELS = {
+    "case type": "case_type_text",
+    "filing number": "filing_number",
+    "filing date": "filing_date",
+    "registration number": "registration_number",
+    "registration no": "registration_number",
+    "registration date": "registration_date",
+    "cnr number": "cnr_number",
+    "first hearing date": "first_hearing_date",
+    "next hearing date": "next_hearing_date",
+    "decision date": "decision_date",
+    "case status": "status",
+    "case stage": "case_stage",
+    "stage of case": "case_stage",
+    "nature of disposal": "nature_of_disposal",
+    "court number and judge": "court_and_judge",
+    "court no and judge": "court_and_judge",
+}
+
+DATE_FIELDS = ("filing_date", "registration_date", "first_hearing_date", "next_hearing_date", "decision_date")
+
+_ORDINAL = re.compile(r"(\d{1,2})(st|nd|rd|th)\b", re.IGNORECASE)
+_SPACES = re.compile(r"\s+")
+_DATE_FORMATS = ("%d-%m-%Y", "%d/%m/%Y", "%d.%m.%Y", "%Y-%m-%d", "%d %B %Y", "%d %b %Y", "%d-%b-%Y", "%B %d %Y")
+
+
+@dataclass
+class Hearing:
+    judge: str = ""
+    business_on_date: Optional[str] = None
+    hearing_date: Optional[str] = None
+    purpose: str = ""
+
+
+@dataclass
+class Order:
+    order_number: str = ""
+    order_date: Optional[str] = None
+    order_details: str = ""
+    order_link: str = ""
+
+
+@dataclass
+class CaseRecord:
+    parties: str = NOT_FOUND
+    filing_date: str = NOT_FOUND
+    status: str = NOT_FOUND
+    case_type_text: Optional[str] = None
+    filing_number: Optional[str] = None
+    registration_number: Optional[str] = None
+    registration_date: Optional[str] = None
+    cnr_number: Optional[str] = None
+    first_hearing_date: Optional[str] = None
+    next_hearing_date: Optional[str] = None
+    decision_date: Optional[str] = None
+    case_stage: Optional[str] = None
+    nature_of_disposal: Optional[str] = None
+    court_and_judge: Optional[str] = None
+    petitioner: Optional[str] = None
+    respondent: Optional[str] = None
+    acts: List[str] = field(default_factory=list)
+    hearings: List[Hearing] = field(default_factory=list)
+    orders: List[Order] = field(default_factory=list)
+
+    def to_dict(self):
+        return asdict(self)
+
+
+def clean_text(text):
+    return _SPACES.sub(" ", text or "").strip()
+
+
+def normalize_date(text):
+    """ISO date for the formats the court sites use; the original text if none match"""
+    text = clean_text(text)
+    if not text:
+        return None
+    candidate = _ORDINAL.sub(r"\1", text).replace(",", "")
+    for date_format in _DATE_FORMATS:
+        try:
+            return datetime.strptime(candidate, date_format).strftime("%Y-%m-%d")
+        except ValueError:
+            continue
+    return text
+
+
+def _table_rows(table):
+    rows = table.find_all("tr")
+    if not rows:
+        return [], []
+    headers = [clean_text(cell.get_text(" ")).lower() for cell in rows[0].find_all(["th", "td"])]
+    body = [row.find_all(["td", "th"]) for row in rows[1:]]
+    return headers, [cells for cells in body if cells]
+
+
+def _find_table(soup, class_keywords, header_keywords):
+    """First table whose class mentions a keyword or whose header row has all header keywords"""
+    for table in soup.find_all("table"):
+        classes = " ".join(table.get("class", [])).lower()
+        if any(keyword in classes for keyword in class_keywords):
+            return table
+    for table in soup.find_all("table"):
+        headers, _ = _table_rows(table)
+        header_text = " ".join(headers)
+        if all(keyword in header_text for keyword in header_keywords):
+            return table
+    return None
+
+
+def _column(headers, *keywords):
+    for i, header in enumerate(headers):
+        if any(keyword in header for keyword in keywords):
+            return i
+    return None
+
+
+def _cell(cells, index):
+    return clean_text(cells[index].get_text(" ")) if index is not None and index < len(cells) else ""
+
+
+def _party_block(soup, keyword):
+    element = soup.find(class_=lambda classes: classes and keyword in classes.lower())
+    return clean_text(element.get_text(" ")) if element else None
+
+
+def parse_case_page(raw_html):
+    """Parse a case status result page into a CaseRecord"""
+    soup = BeautifulSoup(raw_html, "html.parser")
+    record = CaseRecord()
+
+    # Label/value cells: <td>Filing Date:</td><td>12-01-2024</td>
+    for cell in soup.find_all(["td", "th"]):
+        label = clean_text(cell.get_text(" ")).rstrip(":").strip().lower()
+        field_name = LABELS.get(label)
+        if not field_name:
+            continue
+        value_cell = cell.find_next_sibling(["td", "th"])
+        if value_cell is None:
+            continue
+        value = clean_text(value_cell.get_text(" "))
+        if value and getattr(record, field_name) in (None, NOT_FOUND):
+            setattr(record, field_name, value)
+
+    for date_field in DATE_FIELDS:
+        value = getattr(record, date_field)
+        if value not in (None, NOT_FOUND):
+            setattr(record, date_field, normalize_date(value))
+
+    parties_element = soup.select_one(".petitioner_advocate_tr td:nth-of-type(2)")
+    record.petitioner = _party_block(soup, "petitioner")
+    record.respondent = _party_block(soup, "respondent")
+    if parties_element:
+        record.parties = clean_text(parties_element.get_text(" "))
+    elif record.petitioner:
+        record.parties = record.petitioner + (f" Vs {record.respondent}" if record.respondent else "")
+
+    acts_table = _find_table(soup, ["acts_table", "acts"], ["act", "section"])
+    if acts_table:
+        headers, rows = _table_rows(acts_table)
+        act_col = _column(headers, "act")
+        section_col = _column(headers, "section")
+        for cells in rows:
+            act = _cell(cells, act_col)
+            section = _cell(cells, section_col)
+            if act or section:
+                record.acts.append(" - ".join(part for part in (act, section) if part))
+
+    history_table = _find_table(soup, ["history_table", "history"], ["hearing date", "purpose"])
+    if history_table:
+        headers, rows = _table_rows(history_table)
+        judge_col = _column(headers, "judge")
+        business_col = _column(headers, "business")
+        hearing_col = _column(headers, "hearing date")
+        purpose_col = _column(headers, "purpose")
+        for cells in rows:
+            hearing = Hearing(
+                judge=_cell(cells, judge_col),
+                business_on_date=normalize_date(_cell(cells, business_col)),
+                hearing_date=normalize_date(_cell(cells, hearing_col)),
+                purpose=_cell(cells, purpose_col),
+            )
+            if hearing.hearing_date or hearing.business_on_date:
+                record.hearings.append(hearing)
+
+    order_table = _find_table(soup, ["order_table", "orders"], ["order", "date"])
+    if order_table and order_table is not history_table:
+        headers, rows = _table_rows(order_table)
+        number_col = _column(headers, "order number", "order no", "sr")
+        date_col = _column(headers, "order date", "order on", "date")
+        details_col = _column(headers, "details", "order details")
+        for cells in rows:
+            link = cells[details_col].find("a") if details_col is not None and details_col < len(cells) else None
+            order = Order(
+                order_number=_cell(cells, number_col),
+                order_date=normalize_date(_cell(cells, date_col)),
+                order_details=_cell(cells, details_col),
+                order_link=(link.get("href") or link.get("onclick") or "") if link else "",
+            )
+            if order.order_date or order.order_details:
+                record.orders.append(order)
+
+    # The tree is full of parent/sibling cycles; breaking them frees it now instead of at the next GC pass.
+    # Decomposing the soup object itself stops at once (it has no next_element), so go through its children.
+    for element in list(soup.contents):
+        element.decompose()
+    return record
+
+
+def setup_case_detail_tables(conn):
+    cursor = conn.cursor()
+
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS case_details (
+        query_id INTEGER PRIMARY KEY,
+        case_type_text TEXT,
+        filing_number TEXT,
+        filing_date TEXT,
+        registration_number TEXT,
+        registration_date TEXT,
+        cnr_number TEXT,
+        first_hearing_date TEXT,
+        next_hearing_date TEXT,
+        decision_date TEXT,
+        case_status TEXT,
+        case_stage TEXT,
+        nature_of_disposal TEXT,
+        court_and_judge TEXT,
+        petitioner TEXT,
+        respondent TEXT,
+        acts TEXT,
+        parsed_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    )
+    """)
+
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS case_hearings (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        query_id INTEGER NOT NULL,
+        judge TEXT,
+        business_on_date TEXT,
+        hearing_date TEXT,
+        purpose TEXT
+    )
+    """)
+
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS case_orders (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        query_id INTEGER NOT NULL,
+        order_number TEXT,
+        order_date TEXT,
+        order_details TEXT,
+        order_link TEXT
+    )
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_case_details_next_hearing ON case_details (next_hearing_date)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_case_details_cnr ON case_details (cnr_number)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_case_hearings_query ON case_hearings (query_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_case_orders_query ON case_orders (query_id)")
+
+
+def store_case_record(cursor, query_id, record):
+    """Write (or replace) the normalized rows for one queries row; record is a CaseRecord or its to_dict()"""
+    data = record.to_dict() if isinstance(record, CaseRecord) else record
+    cursor.execute("DELETE FROM case_hearings WHERE query_id = ?", (query_id,))
+    cursor.execute("DELETE FROM case_orders WHERE query_id = ?", (query_id,))
+    cursor.execute(
+        """INSERT OR REPLACE INTO case_details
+           (query_id, case_type_text, filing_number, filing_date, registration_number, registration_date,
+            cnr_number, first_hearing_date, next_hearing_date, decision_date, case_status, case_stage,
+            nature_of_disposal, court_and_judge, petitioner, respondent, acts)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+        (query_id, data.get("case_type_text"), data.get("filing_number"), data.get("filing_date"),
+         data.get("registration_number"), data.get("registration_date"), data.get("cnr_number"),
+         data.get("first_hearing_date"), data.get("next_hearing_date"), data.get("decision_date"),
+         data.get("status"), data.get("case_stage"), data.get("nature_of_disposal"),
+         data.get("court_and_judge"), data.get("petitioner"), data.get("respondent"),
+         "; ".join(data.get("acts") or []))
+    )
+    cursor.executemany(
+        "INSERT INTO case_hearings (query_id, judge, business_on_date, hearing_date, purpose) VALUES (?, ?, ?, ?, ?)",
+        [(query_id, h["judge"], h["business_on_date"], h["hearing_date"], h["purpose"]) for h in data.get("hearings") or []]
+    )
+    cursor.executemany(
+        "INSERT INTO case_orders (query_id, order_number, order_date, order_details, order_link) VALUES (?, ?, ?, ?, ?)",
+        [(query_id, o["order_number"], o["order_date"], o["order_details"], o["order_link"]) for o in data.get("orders") or []]
+    )
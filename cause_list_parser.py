@@ -0,0 +1,190 @@
+"""
+Table extraction for district court cause list pages (dcourts.gov.in template).
+
+parse_cause_list_page() holds the heuristics that pick the cause list tables
+out of a fetched page (calendar detection, header keyword checks, row
+filtering). It works on raw HTML only, so a stored snapshot can be parsed
+again offline when the heuristics change (see reprocess.py).
+
+The parse tree is released as soon as the rows are extracted, rows are
+padded in place, and to_frame() turns them into Arrow-backed string
+columns, so a fetched list is held once, compactly, rather than as a tree,
+padded copies and a frame of Python objects at the same time.
+"""
+import json
+
+import pandas as pd
+from bs4 import BeautifulSoup
+
+from case_keys import cause_list_columns, parse_case_number
+
+# Common headers of dcourts.gov.in cause lists
+STANDARD_HEADERS = ['Serial Number', 'Case Type/Case Number/Case Year', 'Party Name', 'Advocate']
+MONTHS = ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec']
+HEADER_KEYWORDS = ['serial', 'case', 'party', 'advocate', 'petitioner', 'respondent']
+CASE_TEXT_MARKERS = ['/', '(', ')', 'Vs', 'vs', 'V/s', 'v/s']
+# Cells are stored in Arrow string buffers instead of one Python object each
+STRING_DTYPE = pd.StringDtype("pyarrow")
+
+
+def is_calendar_table(rows):
+    first_row_text = rows[0].get_text(strip=True).lower()
+    if any(month in first_row_text for month in MONTHS):
+        return True
+    # If most cells of the first data row are day numbers 1-31, it's likely a calendar
+    cells = rows[1].find_all('td')
+    if cells:
+        cell_texts = [cell.get_text(strip=True) for cell in cells]
+        numeric_cells = sum(1 for text in cell_texts if text.isdigit() and 1 <= int(text) <= 31)
+        if numeric_cells > len(cells) * 0.7:
+            return True
+    return False
+
+
+def is_cause_list_table(rows, table_headers):
+    if table_headers:
+        header_text = ' '.join(table_headers).lower()
+        if any(keyword in header_text for keyword in HEADER_KEYWORDS):
+            return True
+    # Otherwise check if data rows look like case data (e.g. T P (CRL)/19/2025)
+    sample_text = ' '.join(cell.get_text() for cell in rows[1].find_all('td'))
+    return any(marker in sample_text for marker in CASE_TEXT_MARKERS)
+
+
+def section_name_for(table):
+    prev_element = table.find_previous(['h1', 'h2', 'h3', 'h4', 'strong', 'b', 'p'])
+    if prev_element:
+        section_text = prev_element.get_text(strip=True)
+        if section_text and len(section_text) < 100:  # Reasonable section name length
+            return section_text
+    return "Cases"
+
+
+def parse_cause_list_page(raw_html):
+    """
+    Extract cause list rows from a page. Returns (rows, headers, notes) where
+    each row starts with its section name and notes describe the tables that
+    were processed or skipped; rows and headers are None if nothing was found.
+    """
+    soup = BeautifulSoup(raw_html, 'html.parser')
+    try:
+        return _extract_tables(soup)
+    finally:
+        # The tree is full of parent/sibling cycles; breaking them frees it now instead of at the next GC pass.
+        # Decomposing the soup object itself stops at once (it has no next_element), so go through its children.
+        for element in list(soup.contents):
+            element.decompose()
+
+
+def _extract_tables(soup):
+    tables = soup.find_all('table')
+    if not tables:
+        return None, None, ["No tables found on the page"]
+
+    notes = [f"Found {len(tables)} table(s) on the page"]
+    all_sections_data = []
+    for table in tables:
+        rows = table.find_all('tr')
+        if len(rows) < 2:  # Skip tables with no data rows
+            continue
+
+        if is_calendar_table(rows):
+            notes.append("⏭️ Skipping calendar table")
+            continue
+
+        header_cells = rows[0].find_all(['th', 'td'])
+        table_headers = [cell.text.strip() for cell in header_cells] if header_cells else []
+        if not is_cause_list_table(rows, table_headers):
+            notes.append("⏭️ Skipping non-cause-list table")
+            continue
+
+        section_name = section_name_for(table)
+        notes.append(f"✅ Processing valid cause list table: {section_name}")
+
+        for row in rows[1:]:
+            cols = row.find_all('td')
+            if not cols or len(cols) < 3:  # Valid data rows have at least 3 columns
+                continue
+            row_data = [col.text.strip() for col in cols]
+
+            # Skip rows that are mostly empty
+            if len([cell for cell in row_data if cell]) < 2:
+                continue
+            # Skip rows where all cells are just single/double digit numbers (calendar dates)
+            if all(cell.isdigit() and len(cell) <= 2 for cell in row_data if cell):
+                continue
+
+            all_sections_data.append([section_name] + row_data)
+
+    if not all_sections_data:
+        notes.append("No valid cause list data found in tables")
+        return None, None, notes
+    return all_sections_data, ['Section'] + STANDARD_HEADERS, notes
+
+
+def normalize_table(rows, headers):
+    """
+    Pad or trim headers and rows to the widest row so they fit one DataFrame.
+    Rows are padded in place rather than copied.
+    Returns (rows, headers, warning); warning is None when nothing was changed.
+    """
+    max_cols = max(len(row) for row in rows)
+    warning = None
+    if len(headers) != max_cols:
+        warning = f"Headers count ({len(headers)}) doesn't match data columns ({max_cols}). Using generic column names."
+        if len(headers) < max_cols:
+            headers = headers + [f"Column_{i+1}" for i in range(len(headers), max_cols)]
+        else:
+            headers = headers[:max_cols]
+    for row in rows:
+        if len(row) < max_cols:
+            row.extend([''] * (max_cols - len(row)))
+    return rows, headers, warning
+
+
+def to_frame(rows, headers):
+    """DataFrame of normalized rows with Arrow-backed string columns, built one column at a time"""
+    df = pd.DataFrame({
+        col: pd.array([None if row[col] is None else str(row[col]) for row in rows], dtype=STRING_DTYPE)
+        for col in range(len(headers))
+    })
+    df.columns = headers
+    return df
+
+
+def row_records(cause_list_id, headers, rows):
+    """cause_list_rows tuples for a parsed list, in column order of the INSERT below, generated one row at a time"""
+    columns = cause_list_columns(headers)
+
+    def cell(row, field):
+        col = columns[field]
+        return str(row[col]) if col is not None and col < len(row) and row[col] is not None else None
+
+    for row_index, row in enumerate(rows):
+        case_text = cell(row, "case")
+        key = parse_case_number(case_text) or (None, None, None)
+        yield ((cause_list_id, row_index, cell(row, "section"), case_text,
+                cell(row, "party"), cell(row, "advocate")) + key
+               + (json.dumps([str(value) for value in row]),))
+
+
+def store_rows(cursor, cause_list_id, headers, rows):
+    cursor.executemany(
+        """INSERT INTO cause_list_rows
+           (cause_list_id, row_index, section, case_text, party_text, advocate_text,
+            key_type, key_number, key_year, cells)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+        row_records(cause_list_id, headers, rows)
+    )
+
+
+def load_rows(conn, cause_list_id):
+    """The stored rows and headers of an earlier parse; (None, None) if it has none"""
+    header_row = conn.execute("SELECT headers FROM cause_lists WHERE id = ?", (cause_list_id,)).fetchone()
+    rows = [json.loads(cells) for (cells,) in conn.execute(
+        "SELECT cells FROM cause_list_rows WHERE cause_list_id = ? AND cells IS NOT NULL ORDER BY row_index",
+        (cause_list_id,)
+    )]
+    if not header_row or not header_row[0] or not rows:
+        return None, None
+    return rows, json.loads(header_row[0])
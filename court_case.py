@@ -1,24 +1,73 @@
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 import sqlite3
 import pandas as pd
-from selenium import webdriver
+import pyarrow as pa
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.support.ui import Select
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from bs4 import BeautifulSoup
+from selenium.common.exceptions import TimeoutException
 import time
 import os
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from io import BytesIO
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.lib import colors
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
-from reportlab.lib.enums import TA_CENTER, TA_LEFT
+import watchlist
+import history_search
+import resilience
+import scheduler
+import form_driver
+import browser
+import case_parser
+import cause_list_parser
+import court_sites
+import snapshots
+import pdf_reports
+import bulk_reports
+import analytics
+import archive
+import captcha
+import tracking
+import db_writer
+from case_keys import case_status_key
 
 DB_FILE = "case_data.db"
+# Data migrations applied so far are counted in PRAGMA user_version
+SCHEMA_VERSION = 2
+ECOURTS_URL = os.environ.get("COURT_ECOURTS_URL", "https://services.ecourts.gov.in/ecourtindia_v6/")
+
+def add_missing_columns(cursor, table, columns):
+    """Add columns introduced after a table was first created"""
+    existing = {row[1] for row in cursor.execute(f"PRAGMA table_info({table})")}
+    for name, definition in columns:
+        if name not in existing:
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN {name} {definition}")
+
+def backfill_query_keys(cursor):
+    """Fill the canonical keys of lookups stored before they existed"""
+    missing_keys = cursor.execute(
+        "SELECT id, case_type, case_number, case_year FROM queries WHERE key_type IS NULL"
+    ).fetchall()
+    for query_id, q_type, q_number, q_year in missing_keys:
+        key = case_status_key(q_type, q_number, q_year)
+        if key:
+            cursor.execute(
+                "UPDATE queries SET key_type = ?, key_number = ?, key_year = ? WHERE id = ?",
+                key + (query_id,)
+            )
+
+def normalize_query_dates(cursor):
+    """Rewrite filing dates stored as the site shows them (dd-mm-yyyy) in the
+    ISO form case_parser now stores"""
+    stored_dates = cursor.execute(
+        "SELECT id, filing_date FROM queries WHERE filing_date IS NOT NULL"
+    ).fetchall()
+    for query_id, filing_date in stored_dates:
+        iso_date = case_parser.normalize_date(filing_date)
+        if iso_date != filing_date:
+            cursor.execute("UPDATE queries SET filing_date = ? WHERE id = ?", (iso_date, query_id))
 
 def setup_database():
     conn = sqlite3.connect(DB_FILE)
@@ -52,315 +101,251 @@ def setup_database():
     )
     """)
     
+    # Individual rows of each fetched cause list
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS cause_list_rows (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        cause_list_id INTEGER NOT NULL,
+        row_index INTEGER NOT NULL,
+        section TEXT,
+        case_text TEXT,
+        party_text TEXT,
+        advocate_text TEXT,
+        key_type TEXT,
+        key_number TEXT,
+        key_year INTEGER
+    )
+    """)
+    
+    # Canonical (type_code, number, year) keys so listings can be joined to case status lookups
+    add_missing_columns(cursor, "queries", [
+        ("key_type", "TEXT"),
+        ("key_number", "TEXT"),
+        ("key_year", "INTEGER"),
+    ])
+    # One-off data migrations; setup_database runs on every rerun, these only once per database
+    version = cursor.execute("PRAGMA user_version").fetchone()[0]
+    if version < 1:
+        backfill_query_keys(cursor)
+    if version < 2:
+        normalize_query_dates(cursor)
+    if version < SCHEMA_VERSION:
+        cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    # Raw page snapshots behind each cause list, and what is needed to show a list again without re-parsing
+    snapshots.setup_snapshot_tables(conn)
+    add_missing_columns(cursor, "cause_lists", [
+        ("snapshot_id", "INTEGER"),
+        ("headers", "TEXT"),
+        # Key of the court site adapter the list was fetched with
+        ("site", f"TEXT DEFAULT '{court_sites.DEFAULT_SITE}'"),
+    ])
+    add_missing_columns(cursor, "cause_list_rows", [
+        ("cells", "TEXT"),
+    ])
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_cause_lists_snapshot ON cause_lists (snapshot_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_queries_case_key ON queries (key_type, key_number, key_year, timestamp)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_cause_list_rows_list ON cause_list_rows (cause_list_id, row_index)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_cause_list_rows_case_key ON cause_list_rows (key_type, key_number, key_year)")
+    
+    # Watchlist entries and their matches against fetched cause lists
+    watchlist.setup_watchlist_tables(conn)
+    
+    # Structured case status records (summary, hearing history, orders)
+    case_parser.setup_case_detail_tables(conn)
+    
+    # Full-text search over party and advocate names
+    history_search.setup_search_index(conn)
+    
+    # Summary tables behind the analytics tab
+    analytics.setup_analytics_tables(conn)
+    analytics.backfill_if_empty(conn)
+    
+    # CAPTCHA attempts per provider and the captured images the OCR is trained on
+    captcha.setup_captcha_tables(conn)
+    
+    # Tracked cases re-checked on a schedule and the changes found
+    tracking.setup_tracking_tables(conn)
+    
     conn.commit()
     conn.close()
 
-def store_query_result(case_type, number, year, parsed_data, raw_html):
-    conn = sqlite3.connect(DB_FILE)
-    cursor = conn.cursor()
+def write_query_result(cursor, case_type, number, year, parsed_data, raw_html):
+    key = case_status_key(case_type, number, year) or (None, None, None)
     cursor.execute(
         """INSERT INTO queries 
-           (case_type, case_number, case_year, parties, filing_date, case_status, raw_response_html) 
-           VALUES (?, ?, ?, ?, ?, ?, ?)""",
+           (case_type, case_number, case_year, parties, filing_date, case_status, raw_response_html,
+            key_type, key_number, key_year) 
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
         (case_type, number, year, 
          parsed_data.get('parties'), parsed_data.get('filing_date'), parsed_data.get('status'), 
-         raw_html)
+         raw_html) + key
     )
-    conn.commit()
-    conn.close()
+    query_id = cursor.lastrowid
+    if 'hearings' in parsed_data:
+        case_parser.store_case_record(cursor, query_id, parsed_data)
+    return query_id
 
-def store_cause_list_result(court_complex, court_number, list_date, list_type, total_cases):
-    conn = sqlite3.connect(DB_FILE)
-    cursor = conn.cursor()
+def store_query_result(case_type, number, year, parsed_data, raw_html):
+    """Queue a case status lookup on the background writer; returns a Future of its queries id"""
+    return db_writer.get_writer(DB_FILE).submit(write_query_result, case_type, number, year, parsed_data, raw_html)
+
+def write_cause_list(cursor, court_complex, court_number, list_date, list_type, headers, rows, snapshot_id, site, matches):
     cursor.execute(
         """INSERT INTO cause_lists 
-           (court_complex, court_number, list_date, list_type, total_cases) 
-           VALUES (?, ?, ?, ?, ?)""",
-        (court_complex, court_number, list_date, list_type, total_cases)
+           (court_complex, court_number, list_date, list_type, total_cases, snapshot_id, headers, site) 
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+        (court_complex, court_number, list_date, list_type, len(rows), snapshot_id,
+         json.dumps(headers) if headers else None, site or court_sites.DEFAULT_SITE)
     )
-    conn.commit()
+    cause_list_id = cursor.lastrowid
+    cause_list_parser.store_rows(cursor, cause_list_id, headers, rows)
+    analytics.record_cause_list(cursor, cause_list_id)
+    if matches:
+        watchlist.insert_matches(cursor, cause_list_id, court_complex, list_date, list_type, matches)
+    return cause_list_id
+
+def store_cause_list_result(court_complex, court_number, list_date, list_type, headers, rows, snapshot_id=None, site=None, matches=None):
+    """
+    Queue a parsed cause list with its rows, summary counts and watchlist
+    matches as one write on the background writer; returns a Future of its id
+    """
+    return db_writer.get_writer(DB_FILE).submit(write_cause_list, court_complex, court_number, list_date, list_type,
+                                                headers, rows, snapshot_id, site, matches)
+
+def wait_for_pending_writes():
+    """Block until the results queued on the background writer are committed, so a read sees them"""
+    db_writer.get_writer(DB_FILE).flush()
+
+def find_parsed_cause_list(snapshot_id):
+    """The latest cause list already parsed from this snapshot: (cause_list_id, rows, headers) or None"""
+    # A parse of the same page may still be queued for writing
+    wait_for_pending_writes()
+    conn = sqlite3.connect(DB_FILE)
+    found = None
+    for (cause_list_id,) in conn.execute(
+        "SELECT id FROM cause_lists WHERE snapshot_id = ? ORDER BY id DESC", (snapshot_id,)
+    ):
+        rows, headers = cause_list_parser.load_rows(conn, cause_list_id)
+        if rows:
+            found = (cause_list_id, rows, headers)
+            break
     conn.close()
+    return found
 
-def generate_case_details_pdf(case_data, case_type, case_number, case_year):
-    """Generate PDF for case details"""
-    buffer = BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=letter, rightMargin=72, leftMargin=72,
-                           topMargin=72, bottomMargin=18)
-    
-    # Container for the 'Flowable' objects
-    elements = []
-    
-    # Define styles
-    styles = getSampleStyleSheet()
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=24,
-        textColor=colors.HexColor('#1f77b4'),
-        spaceAfter=30,
-        alignment=TA_CENTER
-    )
+def process_cause_list_page(site_key, raw_html, court_complex, court_number, list_date, list_type, page=st):
+    """
+    Keep the page snapshot, parse it with the site's adapter (or reuse an
+    identical earlier parse) and store the list, its rows and its watchlist matches.
+    Messages go to page. Returns ({"df", "matches", "watch_entries"}, None) or (None, reason).
+    """
+    # Keep the page itself so the table heuristics can be re-run on it later
+    snapshot_id, seen_before = snapshots.store_snapshot(DB_FILE, "cause_list", raw_html)
+    previous = find_parsed_cause_list(snapshot_id) if seen_before else None
+    site = court_sites.get_site(site_key)
+    if previous:
+        cause_list_id, cause_list_data, headers = previous
+        page.info("♻️ The cause list has not changed since it was last fetched. Showing the stored copy.")
+    else:
+        cause_list_data, headers, notes = site.parse(raw_html)
+        for note in notes:
+            page.info(note)
+        if not cause_list_data:
+            return None, notes[-1]
+    # The page held a cause list, so the site answered properly
+    resilience.get_breaker(site.url).record_success()
     
-    heading_style = ParagraphStyle(
-        'CustomHeading',
-        parent=styles['Heading2'],
-        fontSize=14,
-        textColor=colors.HexColor('#2c3e50'),
-        spaceAfter=12,
-        spaceBefore=12
-    )
+    # Make headers and rows the same width
+    cause_list_data, headers, width_warning = cause_list_parser.normalize_table(cause_list_data, headers)
+    if width_warning:
+        page.warning(width_warning)
     
-    # Add title
-    title = Paragraph(f"<b>Case Details Report</b>", title_style)
-    elements.append(title)
-    elements.append(Spacer(1, 12))
-    
-    # Add case information
-    case_info_data = [
-        ['Case Type:', case_type],
-        ['Case Number:', case_number],
-        ['Case Year:', str(case_year)],
-        ['Generated On:', pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')]
-    ]
-    
-    case_info_table = Table(case_info_data, colWidths=[2*inch, 4*inch])
-    case_info_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#ecf0f1')),
-        ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-        ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-        ('TOPPADDING', (0, 0), (-1, -1), 12),
-        ('GRID', (0, 0), (-1, -1), 1, colors.grey)
-    ]))
-    
-    elements.append(case_info_table)
-    elements.append(Spacer(1, 20))
-    
-    # Add fetched data
-    heading = Paragraph("<b>Fetched Information</b>", heading_style)
-    elements.append(heading)
-    
-    fetched_data = []
-    for key, value in case_data.items():
-        fetched_data.append([key.replace('_', ' ').title() + ':', str(value)])
-    
-    fetched_table = Table(fetched_data, colWidths=[2*inch, 4*inch])
-    fetched_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#e8f4f8')),
-        ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-        ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-        ('TOPPADDING', (0, 0), (-1, -1), 12),
-        ('GRID', (0, 0), (-1, -1), 1, colors.grey),
-        ('VALIGN', (0, 0), (-1, -1), 'TOP')
-    ]))
-    
-    elements.append(fetched_table)
-    
-    # Build PDF
-    doc.build(elements)
-    buffer.seek(0)
-    return buffer
+    # Check the list against the watchlist
+    watch_index = watchlist.load_watch_index(DB_FILE)
+    matches = []
+    if len(watch_index):
+        matches = watchlist.match_rows(watch_index, headers, cause_list_data)
+    
+    if not previous:
+        # Written by the background writer; the page does not wait for the commit
+        store_cause_list_result(
+            court_complex,
+            court_number if court_number else "All Courts",
+            list_date,
+            list_type,
+            headers,
+            cause_list_data,
+            snapshot_id=snapshot_id,
+            site=site_key,
+            matches=matches
+        )
+    # Only the compact frame outlives this call; the row lists go with the pending write
+    df = cause_list_parser.to_frame(cause_list_data, headers)
+    return {"df": df, "matches": matches, "watch_entries": len(watch_index)}, None
+
+def cause_list_display(df, matches, watch_entries, date_label, list_type_label):
+    """Everything the result view needs, computed once so reruns only render"""
+    # Section grouping is computed once here, not on every rerun; only row positions are kept, not per-section copies
+    sections = []
+    section_counts = None
+    if 'Section' in df.columns:
+        section_counts = df['Section'].value_counts().reset_index()
+        section_counts.columns = ['Section', 'Count']
+        sections = list(df.groupby('Section', sort=False).indices.items())
+    return {
+        "df": df,
+        "matches": pd.DataFrame(matches).drop(['watch_id', 'row_index'], axis=1) if matches else None,
+        "watch_entries": watch_entries,
+        "section_counts": section_counts,
+        "sections": sections,
+        # Kept as bytes: the download button would otherwise encode a new copy of a str on every rerun
+        "csv": df.to_csv(index=False).encode("utf-8"),
+        "search_text": row_search_text(df),
+        "payload_bytes": arrow_payload_bytes(df),
+        "date_label": date_label,
+        "list_type_label": list_type_label,
+    }
+
+def view_cause_list_with_case_status(cause_list_id):
+    """Join each listing to the latest case status lookup with the same canonical key"""
+    conn = sqlite3.connect(DB_FILE)
+    df = pd.read_sql_query(
+        """SELECT r.row_index, r.section, r.case_text, r.party_text, r.advocate_text,
+                  q.case_status, q.filing_date, q.timestamp AS status_checked_at
+           FROM cause_list_rows r
+           LEFT JOIN queries q ON q.id = (
+               SELECT q2.id FROM queries q2
+               WHERE q2.key_type = r.key_type AND q2.key_number = r.key_number AND q2.key_year = r.key_year
+               ORDER BY q2.timestamp DESC, q2.id DESC LIMIT 1
+           )
+           WHERE r.cause_list_id = ?
+           ORDER BY r.row_index""",
+        conn,
+        params=(cause_list_id,)
+    )
+    conn.close()
+    return df
+
+def generate_case_details_pdf(case_data, case_type, case_number, case_year):
+    """Generate PDF for case details"""
+    return BytesIO(pdf_reports.get_renderer().case_details_pdf(case_data, case_type, case_number, case_year))
 
 def generate_cause_list_pdf(df, court_complex, date, list_type):
     """Generate PDF for cause list with proper text wrapping"""
-    buffer = BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=20, leftMargin=20,
-                           topMargin=30, bottomMargin=18)
-    
-    elements = []
-    styles = getSampleStyleSheet()
-    
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=16,
-        textColor=colors.HexColor('#1f77b4'),
-        spaceAfter=15,
-        alignment=TA_CENTER
-    )
-    
-    # Cell text style for wrapping
-    cell_style = ParagraphStyle(
-        'CellStyle',
-        parent=styles['Normal'],
-        fontSize=7,
-        leading=9,
-        alignment=TA_LEFT,
-        wordWrap='CJK'
-    )
-    
-    header_cell_style = ParagraphStyle(
-        'HeaderCellStyle',
-        parent=styles['Normal'],
-        fontSize=8,
-        leading=10,
-        alignment=TA_CENTER,
-        textColor=colors.whitesmoke,
-        fontName='Helvetica-Bold',
-        wordWrap='CJK'
-    )
-    
-    # Add title
-    title = Paragraph(f"<b>{list_type} Cause List Report</b>", title_style)
-    elements.append(title)
-    
-    # Add header info
-    header_data = [
-        ['Court Complex:', court_complex],
-        ['Date:', date],
-        ['List Type:', list_type],
-        ['Total Cases:', str(len(df))],
-        ['Generated On:', pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')]
-    ]
-    
-    header_table = Table(header_data, colWidths=[1.5*inch, 4.5*inch])
-    header_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#ecf0f1')),
-        ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 8),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-        ('TOPPADDING', (0, 0), (-1, -1), 6),
-        ('GRID', (0, 0), (-1, -1), 1, colors.grey)
-    ]))
-    
-    elements.append(header_table)
-    elements.append(Spacer(1, 15))
-    
-    # Define custom column widths based on typical cause list structure
-    # Assuming columns: Serial Number, Case Type/Number/Year, Party Name, Advocate
-    def get_column_widths(columns):
-        """Smart column width allocation based on column names"""
-        total_width = 7.5 * inch  # Total available width on A4
-        widths = []
-        
-        for col in columns:
-            col_lower = str(col).lower()
-            if 'serial' in col_lower or 'sr' in col_lower or 'no' in col_lower:
-                widths.append(0.5 * inch)  # Serial number - narrow
-            elif 'case' in col_lower or 'type' in col_lower or 'number' in col_lower:
-                widths.append(1.5 * inch)  # Case details - medium
-            elif 'party' in col_lower or 'name' in col_lower:
-                widths.append(3.0 * inch)  # Party names - widest
-            elif 'advocate' in col_lower or 'lawyer' in col_lower:
-                widths.append(1.5 * inch)  # Advocate - medium
-            else:
-                widths.append(1.0 * inch)  # Default
-        
-        # Normalize to fit total width
-        current_total = sum(widths)
-        if current_total > total_width:
-            scale_factor = total_width / current_total
-            widths = [w * scale_factor for w in widths]
-        
-        return widths
-    
-    # Group by section if available
-    if 'Section' in df.columns:
-        for section in df['Section'].unique():
-            section_df = df[df['Section'] == section].copy()
-            
-            # Section heading
-            section_heading = Paragraph(f"<b>{section} ({len(section_df)} cases)</b>", 
-                                       styles['Heading3'])
-            elements.append(section_heading)
-            elements.append(Spacer(1, 8))
-            
-            # Prepare table data with Paragraphs for text wrapping
-            display_df = section_df.drop('Section', axis=1)
-            
-            # Create header row with Paragraphs
-            header_row = [Paragraph(f"<b>{col}</b>", header_cell_style) for col in display_df.columns]
-            table_data = [header_row]
-            
-            # Create data rows with Paragraphs
-            for _, row in display_df.iterrows():
-                row_data = []
-                for val in row:
-                    # Convert to string and wrap in Paragraph for automatic text wrapping
-                    text = str(val) if pd.notna(val) else ''
-                    row_data.append(Paragraph(text, cell_style))
-                table_data.append(row_data)
-            
-            # Get smart column widths
-            col_widths = get_column_widths(display_df.columns)
-            
-            # Create table with proper wrapping
-            cause_table = Table(table_data, colWidths=col_widths, repeatRows=1)
-            cause_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#3498db')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (0, -1), 'CENTER'),  # Serial number centered
-                ('ALIGN', (1, 1), (-1, -1), 'LEFT'),   # Rest left-aligned
-                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 8),
-                ('FONTSIZE', (0, 1), (-1, -1), 7),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-                ('TOPPADDING', (0, 0), (-1, -1), 8),
-                ('LEFTPADDING', (0, 0), (-1, -1), 5),
-                ('RIGHTPADDING', (0, 0), (-1, -1), 5),
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f8f9fa')])
-            ]))
-            
-            elements.append(cause_table)
-            elements.append(Spacer(1, 12))
-            
-            # Add page break between sections (except last)
-            if section != df['Section'].unique()[-1]:
-                elements.append(PageBreak())
-    else:
-        # No sections, just display all data
-        # Create header row with Paragraphs
-        header_row = [Paragraph(f"<b>{col}</b>", header_cell_style) for col in df.columns]
-        table_data = [header_row]
-        
-        # Create data rows with Paragraphs
-        for _, row in df.iterrows():
-            row_data = []
-            for val in row:
-                text = str(val) if pd.notna(val) else ''
-                row_data.append(Paragraph(text, cell_style))
-            table_data.append(row_data)
-        
-        # Get smart column widths
-        col_widths = get_column_widths(df.columns)
-        
-        cause_table = Table(table_data, colWidths=col_widths, repeatRows=1)
-        cause_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#3498db')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (0, -1), 'CENTER'),
-            ('ALIGN', (1, 1), (-1, -1), 'LEFT'),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 8),
-            ('FONTSIZE', (0, 1), (-1, -1), 7),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-            ('TOPPADDING', (0, 0), (-1, -1), 8),
-            ('LEFTPADDING', (0, 0), (-1, -1), 5),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 5),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f8f9fa')])
-        ]))
-        
-        elements.append(cause_table)
-    
-    # Build PDF
-    doc.build(elements)
-    buffer.seek(0)
-    return buffer
+    return BytesIO(pdf_reports.get_renderer().cause_list_pdf(df, court_complex, date, list_type))
+
+def load_stored_cause_lists(cause_list_ids):
+    """Stored cause lists that have rows, as (cause_list_id, df, court_complex, list_date, list_type)"""
+    conn = sqlite3.connect(DB_FILE)
+    loaded = []
+    for cause_list_id in cause_list_ids:
+        stored = pdf_reports.stored_cause_list(conn, cause_list_id)
+        if stored:
+            loaded.append((cause_list_id,) + stored)
+    conn.close()
+    return loaded
 
 def view_all_data():
+    wait_for_pending_writes()
     conn = sqlite3.connect(DB_FILE)
     
     # Get case status queries
@@ -381,675 +366,731 @@ def view_all_data():
     
     return case_df, cause_list_df
 
-def fetch_case_data(case_type, case_number, year, state_name, district_name, court_complex_name):
-    options = webdriver.ChromeOptions()
-    options.add_argument("--start-maximized")
+# Clears the previous result, brings the case number tab back to front and
+# asks the page for a fresh CAPTCHA, all in one call. Returns false when the
+# form is gone (page navigated away or session expired).
+RETURN_TO_CASE_FORM_JS = """
+if (!document.getElementById('search_case_no')) return false;
+var result = document.getElementById('case_no_res');
+if (result) result.innerHTML = '';
+var tab = document.getElementById('casenumber-tabMenu');
+if (tab && !document.getElementById('search_case_no').offsetParent) tab.click();
+var captcha = document.querySelector('#captcha_image, img[src*="securimage"]');
+if (typeof refreshCaptcha === 'function') {
+    refreshCaptcha();
+} else if (captcha) {
+    captcha.src = captcha.src.split('?')[0] + '?' + Date.now();
+}
+var captchaInput = document.querySelector('#case_captcha_code, input[name*="captcha"]');
+if (captchaInput) captchaInput.value = '';
+return true;
+"""
+
+def session_id():
+    """Identifier of the current Streamlit browser session, used for browser affinity"""
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx else None
+
+MAX_REMEMBERED_RESULTS = 10
+
+def remember_result(store_name, key, result):
+    """Keep a fetched result in session state so widget reruns can show it again without a new fetch"""
+    results = st.session_state.setdefault(store_name, {})
+    results.pop(key, None)
+    results[key] = result
+    while len(results) > MAX_REMEMBERED_RESULTS:
+        results.pop(next(iter(results)))
+
+def remembered_result(store_name, key):
+    return st.session_state.get(store_name, {}).get(key)
+
+TABLE_PAGE_SIZES = [50, 100, 250, 500]
+
+def arrow_payload_bytes(df):
+    """Approximate size of what st.dataframe sends to the browser (it serializes tables with Arrow)"""
+    return pa.Table.from_pandas(df, preserve_index=False).nbytes
+
+def row_search_text(df):
+    """One lowercase string per row, built once so filtering on reruns is a single vectorized scan.
+    Held as Arrow strings, like the cause list frame itself."""
+    def column_text(position):
+        return df.iloc[:, position].astype(cause_list_parser.STRING_DTYPE).fillna('')
+    text = column_text(0)
+    for position in range(1, len(df.columns)):
+        text = text + ' ' + column_text(position)
+    return text.str.lower()
+
+def render_paginated_table(df, key, search_text=None, full_payload_bytes=None):
+    """Send only one page of rows to the browser, after an optional server-side text filter"""
+    filter_col, size_col, page_col = st.columns([3, 1, 1])
+    with filter_col:
+        query = st.text_input("Filter rows", key=f"{key}_query", placeholder="Case number, party or advocate") if search_text is not None else ""
+    with size_col:
+        page_size = st.selectbox("Rows per page", TABLE_PAGE_SIZES, key=f"{key}_page_size")
     
-    try:
-        driver = webdriver.Chrome(options=options)
-    except Exception as e:
-        return None, f"WebDriver Error: {e}. Ensure chromedriver is in your PATH."
+    filtered = df
+    if query:
+        filtered = df[search_text.loc[df.index].str.contains(query.strip().lower(), regex=False)]
+    
+    pages = max(1, -(-len(filtered) // page_size))
+    with page_col:
+        # Keyed on the filter and page size so the page number starts over when either changes
+        page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1, step=1,
+                               key=f"{key}_page_{query}_{page_size}")
+    
+    start = (page - 1) * page_size
+    page_df = filtered.iloc[start:start + page_size]
+    st.dataframe(page_df, use_container_width=True)
+    
+    caption = f"Rows {start + 1 if len(filtered) else 0}–{start + len(page_df)} of {len(filtered)}"
+    if len(filtered) != len(df):
+        caption += f" (filtered from {len(df)})"
+    caption += f" · {arrow_payload_bytes(page_df) / 1024:.1f} KB sent"
+    if full_payload_bytes:
+        caption += f" instead of {full_payload_bytes / 1024:.1f} KB for the whole table"
+    st.caption(caption)
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def case_details_pdf_bytes(case_data, case_type, case_number, case_year):
+    return generate_case_details_pdf(case_data, case_type, case_number, case_year).getvalue()
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def cause_list_pdf_bytes(df, court_complex, date, list_type):
+    return generate_cause_list_pdf(df, court_complex, date, list_type).getvalue()
 
+def court_already_selected(driver, state_name, district_name, court_complex_name):
+    """Whether the case status page still holds this court selection (kept-open or restored session)"""
+    selects = {sel["id"]: sel for sel in form_driver.collect_form(driver)["selects"]}
+    for element_id, wanted in [("sess_state_code", state_name), ("sess_dist_code", district_name), ("court_complex_code", court_complex_name)]:
+        select = selects.get(element_id)
+        if not select or not select["value"]:
+            return False
+        selected = [option for option in select["options"] if option["selected"]]
+        if not selected or form_driver.match_option(selected, wanted) is None:
+            return False
+    return True
+
+def select_court_complex(driver, state_name, district_name, court_complex_name, page=st):
+    """Select state, district and court complex on the case status page; returns an error message or None"""
+    state_element = driver.find_element(By.ID, "sess_state_code")
+    state_options = form_driver.read_options(driver, state_element)
+    
+    # Debug: Print available states
+    available_states = [option["text"] for option in state_options]
+    page.info(f"Available states: {', '.join(available_states[:5])}...")
+    
+    # Try to select state (exact text first, then partial match)
+    state_option = form_driver.match_option(state_options, state_name)
+    state_selected = bool(state_option) and form_driver.set_select_value(driver, state_element, state_option["value"])
+    
+    if not state_selected:
+        return f"Could not find state '{state_name}'. Available states: {', '.join(available_states)}"
+    
+    # Wait for district dropdown to load
+    time.sleep(2)
+    resilience.retry_step(lambda: WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.ID, "sess_dist_code"))))
+    district_element = driver.find_element(By.ID, "sess_dist_code")
+    district_options = form_driver.read_options(driver, district_element)
+    
+    # Debug: Print available districts
+    available_districts = [option["text"] for option in district_options if option["text"]]
+    page.info(f"Available districts: {', '.join(available_districts)}")
+    
+    # Try to select district (exact text first, then partial match)
+    district_option = form_driver.match_option(district_options, district_name)
+    district_selected = bool(district_option) and form_driver.set_select_value(driver, district_element, district_option["value"])
+
+    if not district_selected:
+        return f"Could not find district '{district_name}'. Available districts: {', '.join(available_districts)}"
+
+    # Wait for court complex dropdown to load
+    time.sleep(2)
+    resilience.retry_step(lambda: WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.ID, "court_complex_code"))))
+    court_complex_element = driver.find_element(By.ID, "court_complex_code")
+    court_complex_options = form_driver.read_options(driver, court_complex_element)
+    
+    # Debug: Print available court complexes
+    available_courts = [option["text"] for option in court_complex_options if option["text"]]
+    page.info(f"Available court complexes: {', '.join(available_courts)}")
+    
+    # Try to select court complex (exact text first, then partial match)
+    court_option = form_driver.match_option(court_complex_options, court_complex_name)
+    court_selected = bool(court_option) and form_driver.set_select_value(driver, court_complex_element, court_option["value"])
+    
+    if not court_selected:
+        return f"Could not find court complex '{court_complex_name}'. Available courts: {', '.join(available_courts)}"
+    
+    # Wait a moment for any validation
+    time.sleep(1)
+    
+    # Check for and dismiss any modal dialogs
     try:
-        driver.get("https://services.ecourts.gov.in/ecourtindia_v6/")
-        
-        WebDriverWait(driver, 10).until(EC.element_to_be_clickable((By.ID, "leftPaneMenuCS"))).click()
+        # Look for validation error modal
+        modal = driver.find_element(By.ID, "validateError")
+        if modal.is_displayed():
+            page.warning("Validation error modal detected. Attempting to close...")
+            # Try to find and click close button
+            try:
+                close_button = driver.find_element(By.CSS_SELECTOR, "#validateError .btn-close, #validateError button.close, #validateError .modal-footer button")
+                close_button.click()
+                time.sleep(1)
+            except:
+                # If can't find close button, try pressing ESC
+                driver.find_element(By.TAG_NAME, 'body').send_keys(Keys.ESCAPE)
+                time.sleep(1)
+    except:
+        # No modal found, continue
+        pass
+    return None
 
-        # Wait for state dropdown to be present
-        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.ID, "sess_state_code")))
-        state_dropdown = Select(driver.find_element(By.ID, "sess_state_code"))
-        
-        # Debug: Print available states
-        available_states = [option.text for option in state_dropdown.options]
-        st.info(f"Available states: {', '.join(available_states[:5])}...")
-        
-        # Try to select state (with error handling)
-        state_selected = False
-        try:
-            state_dropdown.select_by_visible_text(state_name)
-            state_selected = True
-        except:
-            # Try partial match
-            for option in state_dropdown.options:
-                if state_name.lower() in option.text.lower():
-                    option.click()
-                    state_selected = True
-                    break
-        
-        if not state_selected:
-            return None, f"Could not find state '{state_name}'. Available states: {', '.join(available_states)}"
-        
-        # Wait for district dropdown to load
-        time.sleep(2)
-        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.ID, "sess_dist_code")))
-        district_dropdown = Select(driver.find_element(By.ID, "sess_dist_code"))
-        
-        # Debug: Print available districts
-        available_districts = [option.text for option in district_dropdown.options if option.text.strip()]
-        st.info(f"Available districts: {', '.join(available_districts)}")
-        
-        # Try to select district (with error handling)
-        district_selected = False
-        try:
-            district_dropdown.select_by_visible_text(district_name)
-            district_selected = True
-        except:
-            # Try partial match
-            for option in district_dropdown.options:
-                if district_name.lower() in option.text.lower():
-                    option.click()
-                    district_selected = True
-                    break
-
-        if not district_selected:
-            return None, f"Could not find district '{district_name}'. Available districts: {', '.join(available_districts)}"
-
-        # Wait for court complex dropdown to load
-        time.sleep(2)
-        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.ID, "court_complex_code")))
-        court_complex_dropdown = Select(driver.find_element(By.ID, "court_complex_code"))
-        
-        # Debug: Print available court complexes
-        available_courts = [option.text for option in court_complex_dropdown.options if option.text.strip()]
-        st.info(f"Available court complexes: {', '.join(available_courts)}")
-        
-        # Try to select court complex (with error handling)
-        court_selected = False
-        try:
-            court_complex_dropdown.select_by_visible_text(court_complex_name)
-            court_selected = True
-        except:
-            # Try partial match
-            for option in court_complex_dropdown.options:
-                if court_complex_name.lower() in option.text.lower():
-                    option.click()
-                    court_selected = True
-                    break
+def fill_case_form(driver, case_type, case_number, year, page=st):
+    """Fill case type, number and year on the case number form; returns an error message or None"""
+    # Get case type dropdown and show available options
+    case_type_element = resilience.retry_step(lambda: WebDriverWait(driver, 10).until(
+        EC.presence_of_element_located((By.ID, "case_type"))
+    ))
+    case_type_options = form_driver.read_options(driver, case_type_element)
+    available_case_types = [option["text"] for option in case_type_options if option["text"]]
+    page.info(f"Available case types: {', '.join(available_case_types[:10])}... ({len(available_case_types)} total)")
+    
+    # Try to select case type (with error handling)
+    case_type_selected = False
+    exact_option = next((option for option in case_type_options if option["text"] == case_type.strip()), None)
+    if exact_option:
+        # First try exact match
+        case_type_selected = form_driver.set_select_value(driver, case_type_element, exact_option["value"])
+        page.success(f"Selected case type: {case_type}")
+    else:
+        # Try partial match - match the beginning part before any dash or description
+        case_type_clean = case_type.split(' - ')[0].strip() if ' - ' in case_type else case_type.strip()
         
-        if not court_selected:
-            return None, f"Could not find court complex '{court_complex_name}'. Available courts: {', '.join(available_courts)}"
+        for option in case_type_options:
+            option_text = option["text"]
+            option_clean = option_text.split(' - ')[0].strip() if ' - ' in option_text else option_text
+            
+            # Try to match the main part (before the dash)
+            if option_text and (option_text.lower() == case_type.lower() or 
+                option_clean.lower() == case_type_clean.lower() or
+                case_type.lower() in option_text.lower() or
+                option_text.lower().startswith(case_type.lower())):
+                case_type_selected = form_driver.set_select_value(driver, case_type_element, option["value"])
+                page.success(f"Matched case type: {option_text}")
+                break
+    
+    if not case_type_selected:
+        return f"Could not find case type '{case_type}'. Available case types: {', '.join(available_case_types)}"
+    
+    # Wait a moment for the form to update after case type selection
+    time.sleep(1)
+    
+    # Enter case number
+    try:
+        case_no_input = resilience.retry_step(lambda: WebDriverWait(driver, 10).until(
+            EC.presence_of_element_located((By.ID, "search_case_no"))
+        ))
+        case_no_input.clear()
+        case_no_input.send_keys(case_number)
+        page.success(f"Entered case number: {case_number}")
+    except Exception as e:
+        return f"Could not find case number field: {e}"
+    
+    # Wait for year dropdown to be present and get available options
+    try:
+        year_element = WebDriverWait(driver, 10).until(
+            EC.presence_of_element_located((By.ID, "search_case_year"))
+        )
+        year_options = form_driver.read_options(driver, year_element)
+        available_years = [option["text"] for option in year_options if option["text"]]
+        page.info(f"Available years: {', '.join(available_years[:20])}...")
         
-        # Wait a moment for any validation
-        time.sleep(1)
+        # Try to select year
+        year_option = next((option for option in year_options if option["text"] == str(year)), None)
+        if year_option:
+            form_driver.set_select_value(driver, year_element, year_option["value"])
+            page.success(f"Selected year: {year}")
+        else:
+            return f"Could not find year '{year}'. Available years: {', '.join(available_years)}"
+    except Exception as e:
+        # Year dropdown might not exist for this case type, try alternative selectors
+        page.warning(f"Standard year dropdown not found. Trying to locate year field...")
         
-        # Check for and dismiss any modal dialogs
+        # Debug: Show all select and input elements on the page
         try:
-            # Look for validation error modal
-            modal = driver.find_element(By.ID, "validateError")
-            if modal.is_displayed():
-                st.warning("Validation error modal detected. Attempting to close...")
-                # Try to find and click close button
-                try:
-                    close_button = driver.find_element(By.CSS_SELECTOR, "#validateError .btn-close, #validateError button.close, #validateError .modal-footer button")
-                    close_button.click()
-                    time.sleep(1)
-                except:
-                    # If can't find close button, try pressing ESC
-                    driver.find_element(By.TAG_NAME, 'body').send_keys(Keys.ESCAPE)
-                    time.sleep(1)
+            form = form_driver.collect_form(driver)
+            select_info = [sel["id"] or sel["name"] or 'unnamed' for sel in form["selects"] if sel["visible"]]
+            page.info(f"Found {len(select_info)} visible select elements: {', '.join(select_info[:10])}")
+            
+            input_info = [inp["id"] or inp["name"] or inp["type"] for inp in form["inputs"] if inp["visible"]]
+            page.info(f"Found {len(input_info)} visible input elements: {', '.join(input_info[:10])}")
         except:
-            # No modal found, continue
             pass
         
-        # Use JavaScript click to avoid interception
-        case_number_tab = driver.find_element(By.ID, "casenumber-tabMenu")
-        driver.execute_script("arguments[0].click();", case_number_tab)
-        
-        time.sleep(2)  # Increased wait time for tab content to load
-        
-        # Get case type dropdown and show available options
-        case_type_element = WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.ID, "case_type"))
-        )
-        case_type_dropdown = Select(case_type_element)
-        available_case_types = [option.text for option in case_type_dropdown.options if option.text.strip()]
-        st.info(f"Available case types: {', '.join(available_case_types[:10])}... ({len(available_case_types)} total)")
-        
-        # Try to select case type (with error handling)
-        case_type_selected = False
-        try:
-            # First try exact match
-            case_type_dropdown.select_by_visible_text(case_type)
-            case_type_selected = True
-            st.success(f"Selected case type: {case_type}")
-        except:
-            # Try partial match - match the beginning part before any dash or description
-            case_type_clean = case_type.split(' - ')[0].strip() if ' - ' in case_type else case_type.strip()
-            
-            for option in case_type_dropdown.options:
-                option_text = option.text.strip()
-                option_clean = option_text.split(' - ')[0].strip() if ' - ' in option_text else option_text
-                
-                # Try to match the main part (before the dash)
-                if (option_text.lower() == case_type.lower() or 
-                    option_clean.lower() == case_type_clean.lower() or
-                    case_type.lower() in option_text.lower() or
-                    option_text.lower().startswith(case_type.lower())):
-                    option.click()
-                    case_type_selected = True
-                    st.success(f"Matched case type: {option_text}")
-                    break
-        
-        if not case_type_selected:
-            return None, f"Could not find case type '{case_type}'. Available case types: {', '.join(available_case_types)}"
-        
-        # Wait a moment for the form to update after case type selection
-        time.sleep(1)
-        
-        # Enter case number
+        # Try to find any year-related input field
+        year_set = False
         try:
-            case_no_input = WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.ID, "search_case_no"))
-            )
-            case_no_input.clear()
-            case_no_input.send_keys(case_number)
-            st.success(f"Entered case number: {case_number}")
-        except Exception as e:
-            return None, f"Could not find case number field: {e}"
-        
-        # Wait for year dropdown to be present and get available options
-        try:
-            year_element = WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.ID, "search_case_year"))
-            )
-            year_dropdown = Select(year_element)
-            available_years = [option.text for option in year_dropdown.options if option.text.strip()]
-            st.info(f"Available years: {', '.join(available_years[:20])}...")
-            
-            # Try to select year
-            try:
-                year_dropdown.select_by_visible_text(str(year))
-                st.success(f"Selected year: {year}")
-            except:
-                return None, f"Could not find year '{year}'. Available years: {', '.join(available_years)}"
-        except Exception as e:
-            # Year dropdown might not exist for this case type, try alternative selectors
-            st.warning(f"Standard year dropdown not found. Trying to locate year field...")
-            
-            # Debug: Show all select and input elements on the page
-            try:
-                all_selects = driver.find_elements(By.TAG_NAME, "select")
-                select_info = [f"{sel.get_attribute('id') or sel.get_attribute('name') or 'unnamed'}" for sel in all_selects if sel.is_displayed()]
-                st.info(f"Found {len(select_info)} visible select elements: {', '.join(select_info[:10])}")
-                
-                all_inputs = driver.find_elements(By.TAG_NAME, "input")
-                input_info = [f"{inp.get_attribute('id') or inp.get_attribute('name') or inp.get_attribute('type')}" for inp in all_inputs if inp.is_displayed()]
-                st.info(f"Found {len(input_info)} visible input elements: {', '.join(input_info[:10])}")
-            except:
-                pass
+            # Try multiple possible year field IDs/names
+            possible_year_fields = ['rgyear', 'search_case_year', 'case_year', 'year']
             
-            # Try to find any year-related input field
-            year_set = False
-            try:
-                # Try multiple possible year field IDs/names
-                possible_year_fields = ['rgyear', 'search_case_year', 'case_year', 'year']
-                
-                for field_id in possible_year_fields:
+            for field_id in possible_year_fields:
+                try:
+                    year_input = driver.find_element(By.ID, field_id)
+                    page.info(f"Found year field with ID: {field_id}")
+                    
+                    # Try multiple methods to set the value
                     try:
-                        year_input = driver.find_element(By.ID, field_id)
-                        st.info(f"Found year field with ID: {field_id}")
-                        
-                        # Try multiple methods to set the value
-                        try:
-                            # Method 1: Regular send_keys
-                            if year_input.is_displayed() and year_input.is_enabled():
-                                year_input.clear()
-                                year_input.send_keys(str(year))
-                                year_set = True
-                                st.success(f"Entered year using send_keys: {year}")
-                                break
-                        except:
-                            pass
-                        
-                        try:
-                            # Method 2: JavaScript
-                            driver.execute_script(f"arguments[0].value = '{year}';", year_input)
-                            # Trigger change event
-                            driver.execute_script("arguments[0].dispatchEvent(new Event('change', { bubbles: true }));", year_input)
+                        # Method 1: Regular send_keys
+                        if year_input.is_displayed() and year_input.is_enabled():
+                            year_input.clear()
+                            year_input.send_keys(str(year))
                             year_set = True
-                            st.success(f"Entered year using JavaScript: {year}")
+                            page.success(f"Entered year using send_keys: {year}")
                             break
-                        except:
-                            pass
                     except:
-                        continue
-                
-                if not year_set:
-                    st.warning(f"⚠️ Could not automatically set year value. Please enter **{year}** manually in the 'Registration Year' field in the browser.")
-            except Exception as ex:
-                st.warning(f"Year field handling issue: {ex}. Continuing anyway...")
-
-        st.info("🌐 Browser is open. Please complete the following steps:")
-        st.markdown("""
-        1. **Check all fields** are filled correctly (especially the year if there was a warning above)
-        2. **Solve the CAPTCHA** 
-        3. **Click the 'Go' button**
-        4. Wait for the script to automatically parse the results
-        """)
-        st.warning("⏳ After you click 'Go', the script will take over and parse the results.")
-        
-        WebDriverWait(driver, 120).until(
-            EC.presence_of_element_located((By.ID, "case_no_res"))
-        )
-
-        raw_html = driver.page_source
-        soup = BeautifulSoup(raw_html, 'html.parser')
-        
-        parties_element = soup.select_one(".petitioner_advocate_tr td:nth-of-type(2)")
-        
-        filing_date_label = soup.find("td", string="Filing Date:")
-        filing_date_element = filing_date_label.find_next_sibling("td") if filing_date_label else None
+                        pass
+                    
+                    try:
+                        # Method 2: JavaScript
+                        driver.execute_script(f"arguments[0].value = '{year}';", year_input)
+                        # Trigger change event
+                        driver.execute_script("arguments[0].dispatchEvent(new Event('change', { bubbles: true }));", year_input)
+                        year_set = True
+                        page.success(f"Entered year using JavaScript: {year}")
+                        break
+                    except:
+                        pass
+                except:
+                    continue
+            
+            if not year_set:
+                page.warning(f"⚠️ Could not automatically set year value. Please enter **{year}** manually in the 'Registration Year' field in the browser.")
+        except Exception as ex:
+            page.warning(f"Year field handling issue: {ex}. Continuing anyway...")
+    return None
 
-        status_label = soup.find("td", string="Case Status:")
-        status_element = status_label.find_next_sibling("td") if status_label else None
+def parse_case_status(raw_html):
+    """Extract the full structured case record from a case_no_res result page"""
+    return case_parser.parse_case_page(raw_html).to_dict()
 
-        parties = parties_element.text.strip() if parties_element else "Not Found"
-        filing_date = filing_date_element.text.strip() if filing_date_element else "Not Found"
-        status = status_element.text.strip() if status_element else "Not Found"
+CAPTCHA_AUTO_WAIT = 20  # Seconds to wait for the verdict on an automatically submitted CAPTCHA
 
-        parsed_data = {"parties": parties, "filing_date": filing_date, "status": status}
-        return parsed_data, raw_html
+def wait_for_case_result(driver, result_replaced, timeout, watch=None):
+    """
+    Wait for case_no_res to be filled; raises FetchFailure if the site
+    rejected the CAPTCHA. watch(driver) is called on every poll.
+    """
+    def result_shown(d):
+        if watch:
+            watch(d)
+        if result_replaced:
+            # The old result container was emptied; wait for it to be filled again
+            return d.execute_script("var el = document.getElementById('case_no_res'); return !!(el && el.innerText.trim());")
+        return EC.presence_of_element_located((By.ID, "case_no_res"))(d)
 
-    except Exception as e:
-        return None, f"An error occurred during scraping: {e}"
-    finally:
-        driver.quit()
+    WebDriverWait(driver, timeout).until(result_shown)
+    # A rejected CAPTCHA is reported inside the result container
+    resilience.check_failure_text(driver.find_element(By.ID, "case_no_res").text)
 
-def fetch_cause_list_delhi(court_complex, court_number, cause_list_date, list_type):
+def fetch_case_data(case_type, case_number, year, state_name, district_name, court_complex_name, session_key=None,
+                    captcha_provider=None, page=st, interactive=True):
     """
-    Fetch cause list from Delhi District Courts website
-    court_complex: Name of the court complex
-    court_number: Specific court/judge
-    cause_list_date: Date in YYYY-MM-DD format
-    list_type: 'Civil' or 'Criminal'
+    Fetch case status from eCourts.
+    session_key: when given, the browser stays open after the lookup and is
+    reused for the next lookup with the same key (same user), keeping the
+    court session and skipping re-selection of an unchanged court.
+    captcha_provider: name of the captcha provider to try before asking the
+    user (default: captcha.DEFAULT_PROVIDER)
+    page: Streamlit container the progress messages are written to
+    interactive: False when nobody is at the browser (background refresh); a
+    CAPTCHA that is not answered automatically then fails the fetch at once
+    instead of waiting for manual input
     """
+    breaker = resilience.get_breaker(ECOURTS_URL)
+    if not breaker.allow():
+        return None, f"{breaker.host} has been failing repeatedly. Skipping the fetch; try again in {breaker.retry_after()} seconds."
+    
+    pool = browser.get_pool()
     try:
-        options = webdriver.ChromeOptions()
-        driver = webdriver.Chrome(options=options)
-        driver.maximize_window()
-        
-        # Go directly to Delhi courts cause list page
-        driver.get("https://newdelhi.dcourts.gov.in/cause-list-%E2%81%84-daily-board/")
-        
-        st.info("🌐 Delhi Courts Cause List page opened")
-        
-        time.sleep(3)
-        
-        # Step 1: Select "Court Complex" radio button
-        try:
-            radio_buttons = driver.find_elements(By.CSS_SELECTOR, "input[type='radio']")
-            for radio in radio_buttons:
-                label_text = ""
-                try:
-                    # Try to find associated label
-                    radio_id = radio.get_attribute("id")
-                    if radio_id:
-                        label = driver.find_element(By.CSS_SELECTOR, f"label[for='{radio_id}']")
-                        label_text = label.text.strip()
-                except:
-                    pass
-                
-                # Look for "Court Complex" radio button
-                if "court complex" in label_text.lower() or radio.get_attribute("value") == "court_complex":
-                    driver.execute_script("arguments[0].click();", radio)
-                    st.success("✅ Selected 'Court Complex' radio button")
-                    time.sleep(1)
-                    break
-        except Exception as e:
-            st.warning(f"Could not find Court Complex radio button: {e}")
+        pooled = pool.acquire(affinity_key=("ecourts", session_key) if session_key else None,
+                              extra_arguments=["--start-maximized"])
+        driver = pooled.driver
+    except Exception as e:
+        breaker.record_failure(resilience.UNKNOWN)
+        return None, f"WebDriver Error: {e}. Ensure chromedriver is in your PATH."
+
+    site_failed = False
+    result_parsed = False
+    court = (state_name, district_name, court_complex_name)
+    # A kept-open browser that finished a lookup in this court is still on the case number form
+    on_case_form = pooled.reused and pooled.context.get("court") == court and pooled.context.get("on_case_form")
+    pooled.context["on_case_form"] = False
+    try:
+        if on_case_form:
+            on_case_form = driver.execute_script(RETURN_TO_CASE_FORM_JS)
         
-        # Step 2: Select Court Complex from dropdown
-        try:
-            # Wait for court complex dropdown to appear
-            time.sleep(2)
-            court_complex_select = WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "select[name*='complex'], select[id*='complex'], select"))
-            )
+        if on_case_form:
+            page.success(f"♻️ Case number form for {court_complex_name} is still open. Only the case details will change.")
+            time.sleep(1)  # Let the tab and the new CAPTCHA render
+        else:
+            def open_case_status_page():
+                driver.get(ECOURTS_URL)
+                resilience.check_page_for_failure(driver.page_source)
+                WebDriverWait(driver, 10).until(EC.element_to_be_clickable((By.ID, "leftPaneMenuCS"))).click()
             
-            court_dropdown = Select(court_complex_select)
-            available_courts = [option.text for option in court_dropdown.options if option.text.strip()]
-            st.info(f"Available court complexes: {', '.join(available_courts)}")
+            resilience.retry_step(open_case_status_page)
+
+            # Wait for state dropdown to be present
+            resilience.retry_step(lambda: WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.ID, "sess_state_code"))))
+            if pooled.reused and court_already_selected(driver, *court):
+                page.success(f"♻️ Reusing the open session for {court_complex_name}")
+            else:
+                court_error = select_court_complex(driver, *court, page=page)
+                if court_error:
+                    return None, court_error
+            pooled.context["court"] = court
             
-            # Try to select the court complex
-            court_selected = False
-            try:
-                court_dropdown.select_by_visible_text(court_complex)
-                court_selected = True
-                st.success(f"✅ Selected: {court_complex}")
-            except:
-                # Try partial match
-                for option in court_dropdown.options:
-                    if court_complex.lower() in option.text.lower():
-                        option.click()
-                        court_selected = True
-                        st.success(f"✅ Matched: {option.text}")
-                        break
+            # Use JavaScript click to avoid interception
+            case_number_tab = driver.find_element(By.ID, "casenumber-tabMenu")
+            driver.execute_script("arguments[0].click();", case_number_tab)
             
-            if not court_selected:
-                st.warning(f"⚠️ Could not auto-select '{court_complex}'. Please select manually.")
-        except Exception as e:
-            st.warning(f"Court complex selection issue: {e}")
+            time.sleep(2)  # Increased wait time for tab content to load
         
-        time.sleep(2)
+        form_error = fill_case_form(driver, case_type, case_number, year, page=page)
+        if form_error:
+            return None, form_error
+
+        attempt = captcha.start(driver, "case_status", DB_FILE, captcha_provider, page_reporter(page))
+        if attempt.automatic:
+            try:
+                wait_for_case_result(driver, on_case_form, CAPTCHA_AUTO_WAIT)
+            except (TimeoutException, resilience.FetchFailure) as e:
+                if isinstance(e, resilience.FetchFailure) and e.kind != resilience.CAPTCHA_WRONG:
+                    raise
+                attempt.rejected()
+                page.warning("🤖 The automatic CAPTCHA answer was not accepted. Falling back to manual input.")
+                # Clears the rejection and loads a new CAPTCHA for the user
+                on_case_form = driver.execute_script(RETURN_TO_CASE_FORM_JS)
+                attempt = captcha.start(driver, "case_status", DB_FILE, "manual")
         
-        # Step 3: Select Court Number from dropdown
-        try:
-            time.sleep(2)  # Wait for court dropdown to populate
-            
-            # Try multiple selectors for court dropdown
-            court_num_dropdown = None
-            for selector in ["select[id*='court']", "select[name*='court']", "select.form-control", "select"]:
-                try:
-                    selects = driver.find_elements(By.CSS_SELECTOR, selector)
-                    for select_elem in selects:
-                        # Check if this select has court-related options
-                        select_obj = Select(select_elem)
-                        options = [opt.text for opt in select_obj.options if opt.text.strip()]
-                        # Look for judge names or court numbers in options
-                        if any(any(keyword in opt.lower() for keyword in ['judge', 'court', 'ms.', 'mr.', 'sh.', 'smt.']) for opt in options):
-                            court_num_dropdown = select_obj
-                            st.info(f"Found court dropdown with {len(options)} courts")
-                            st.info(f"Available courts: {', '.join(options[:3])}...")
-                            break
-                    if court_num_dropdown:
-                        break
-                except:
-                    continue
-            
-            if court_num_dropdown:
-                # Try to select court number
-                if court_number:
-                    selected = False
-                    try:
-                        court_num_dropdown.select_by_visible_text(court_number)
-                        st.success(f"✅ Selected court: {court_number}")
-                        selected = True
-                    except:
-                        # Try partial match
-                        for option in court_num_dropdown.options:
-                            option_text = option.text.strip()
-                            if option_text and court_number.lower() in option_text.lower():
-                                driver.execute_script("arguments[0].selected = true;", option)
-                                driver.execute_script("arguments[0].dispatchEvent(new Event('change', { bubbles: true }));", option.parent)
-                                st.success(f"✅ Matched court: {option_text}")
-                                selected = True
-                                break
-                    
-                    if not selected:
-                        st.warning(f"⚠️ Could not auto-select court '{court_number}'. Please select manually.")
-                else:
-                    st.info("ℹ️ No court specified. Please select court manually from dropdown.")
-            else:
-                st.warning("⚠️ Could not find court dropdown. Please select court manually.")
-        except Exception as e:
-            st.warning(f"Court number selection issue: {e}. Please select manually.")
+        if not attempt.automatic and not interactive:
+            raise resilience.FetchFailure(resilience.CAPTCHA_WRONG, "The CAPTCHA was not solved automatically and nobody is at the browser to solve it")
         
-        # Step 4: Set the date
-        try:
-            time.sleep(1)
-            
-            # Try multiple methods to set date
-            date_set = False
+        if not attempt.automatic:
+            page.info("🌐 Browser is open. Please complete the following steps:")
+            page.markdown("""
+            1. **Check all fields** are filled correctly (especially the year if there was a warning above)
+            2. **Solve the CAPTCHA** 
+            3. **Click the 'Go' button**
+            4. Wait for the script to automatically parse the results
+            """)
+            page.warning("⏳ After you click 'Go', the script will take over and parse the results.")
             
-            # Method 1: Find date input by common attributes
             try:
-                # Try multiple selectors
-                date_selectors = [
-                    "input[type='date']",
-                    "input[id*='date']",
-                    "input[name*='date']",
-                    "input[placeholder*='date']",
-                    "input.form-control[type='date']"
-                ]
-                
-                for selector in date_selectors:
-                    date_inputs = driver.find_elements(By.CSS_SELECTOR, selector)
-                    for date_input in date_inputs:
-                        if date_input.is_displayed() and date_input.is_enabled():
-                            try:
-                                # Click the input first
-                                driver.execute_script("arguments[0].focus();", date_input)
-                                time.sleep(0.5)
-                                
-                                # Try different date formats
-                                date_formats_to_try = [
-                                    cause_list_date,  # DD/MM/YYYY (primary format)
-                                    cause_list_date.replace('/', '-'),  # DD-MM-YYYY
-                                ]
-                                
-                                for date_format in date_formats_to_try:
-                                    try:
-                                        # Clear and set value using JavaScript
-                                        driver.execute_script("arguments[0].value = '';", date_input)
-                                        driver.execute_script(f"arguments[0].value = '{date_format}';", date_input)
-                                        
-                                        # Trigger all possible events
-                                        driver.execute_script("arguments[0].dispatchEvent(new Event('input', { bubbles: true }));", date_input)
-                                        driver.execute_script("arguments[0].dispatchEvent(new Event('change', { bubbles: true }));", date_input)
-                                        driver.execute_script("arguments[0].dispatchEvent(new Event('blur', { bubbles: true }));", date_input)
-                                        
-                                        time.sleep(0.3)
-                                        
-                                        # Verify the value was set
-                                        current_value = date_input.get_attribute('value')
-                                        if current_value and len(current_value) >= 8:  # Date was set
-                                            st.success(f"✅ Set date to: {date_format}")
-                                            date_set = True
-                                            break
-                                    except:
-                                        continue
-                                
-                                if date_set:
-                                    break
-                            except:
-                                continue
-                    if date_set:
-                        break
-            except:
-                pass
-            
-            if not date_set:
-                st.warning(f"⚠️ Could not automatically set date to {cause_list_date}. Please select date manually from calendar.")
-        except Exception as e:
-            st.warning(f"Date setting issue: {e}. Please set date manually.")
+                wait_for_case_result(driver, on_case_form, 120, watch=attempt.observe)
+            except TimeoutException:
+                # Waiting on the user here, not on the site
+                resilience.check_page_for_failure(driver.page_source)
+                attempt.finish("timeout")
+                raise resilience.FetchFailure(resilience.CAPTCHA_WRONG, "No result appeared within 120 seconds. The CAPTCHA may not have been submitted or was rejected.")
+            except resilience.FetchFailure as e:
+                if e.kind == resilience.CAPTCHA_WRONG:
+                    attempt.rejected()
+                raise
+
+        attempt.accepted()
+        raw_html = driver.page_source
+        parsed_data = parse_case_status(raw_html)
+        pooled.context["on_case_form"] = True
+        result_parsed = True
+        return parsed_data, raw_html
+
+    except Exception as e:
+        kind = resilience.classify_exception(e)
+        breaker.record_failure(kind)
+        site_failed = True
+        if isinstance(e, resilience.FetchFailure):
+            return None, f"An error occurred during scraping: {e}"
+        return None, f"An error occurred during scraping ({resilience.FAILURE_LABELS[kind]}): {e}"
+    finally:
+        # Only a parsed result shows the site is healthy; stopping on the form or the user's input shows nothing
+        if result_parsed:
+            breaker.record_success()
+        elif not site_failed:
+            breaker.release()
+        pool.release(pooled, keep_alive=bool(session_key) and not site_failed)
+
+def refresh_tracked_case(tracked, captcha_provider=None, page=None):
+    """
+    Re-fetch one tracked case at batch priority and store the lookup
+    (the refresh_case callback of tracking.run_once).
+    page: Streamlit container when a user is watching ("Refresh Due Cases
+    Now"); without one the fetch is unattended, its messages are dropped and
+    a CAPTCHA the provider cannot answer fails the case, to be retried later
+    Returns (query_id, parsed_data, error)
+    """
+    court = (tracked["state_name"], tracked["district_name"], tracked["court_complex"])
+    case = (tracked["case_type"], tracked["case_number"], str(tracked["case_year"]))
+    # Fetch and store as one unit, so a lookup sharing this fetch does not store it again
+    def fetch_and_store_case():
+        parsed_data, response_text = fetch_case_data(*case, *court, captcha_provider=captcha_provider,
+                                                     page=page or QuietPage(), interactive=page is not None)
+        if not parsed_data:
+            return None, None, response_text
+        return store_query_result(*case, parsed_data, response_text).result(), parsed_data, None
+    
+    return scheduler.get_scheduler().run(
+        ECOURTS_URL,
+        ("case",) + court + case,
+        fetch_and_store_case,
+        priority=scheduler.BATCH
+    )
+
+def describe_changes(changes):
+    return "; ".join(f"{tracking.CHANGE_FIELDS[field]}: {old or '-'} → {new}" for field, old, new in changes)
+
+def page_reporter(page):
+    """report(level, message) callback for site adapters that writes to a Streamlit container"""
+    return lambda level, message: getattr(page, level)(message)
+
+class QuietPage:
+    """Stands in for a Streamlit container where nobody is watching (background refreshes); drops every message"""
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+def fetch_cause_list(site_key, court_complex, court_number, cause_list_date, list_type, page=st, session_key=None,
+                     captcha_provider=None):
+    """
+    Fetch a cause list through the site adapter registered under site_key
+    court_complex: Name of the court complex
+    court_number: Specific court/judge
+    cause_list_date: Date already formatted for the site's form
+    list_type: 'Civil' or 'Criminal'
+    page: Streamlit container the progress messages are written to
+    session_key: when given, the browser stays open afterwards and the next
+    fetch with the same key reuses it without selecting the complex again
+    captcha_provider: name of the captcha provider to try before asking the user
+    Returns (raw_html, None) on success or (None, error message)
+    """
+    site = court_sites.get_site(site_key)
+    breaker = resilience.get_breaker(site.url)
+    if not breaker.allow():
+        return None, f"{breaker.host} has been failing repeatedly. Skipping the fetch; try again in {breaker.retry_after()} seconds."
+    
+    pool = browser.get_pool()
+    pooled = None
+    site_failed = False
+    try:
+        pooled = pool.acquire(affinity_key=("cause_list", site_key, session_key) if session_key else None)
+        driver = pooled.driver
         
-        time.sleep(1)
+        # A kept-open browser that finished a fetch for this complex still has the form filled in up to the complex
+        complex_selected = pooled.reused and pooled.context.get("complex") == (site_key, court_complex)
+        if complex_selected:
+            page.success(f"♻️ {site.name} form for {court_complex} is still open. Only the date and list type will change.")
+        else:
+            driver.maximize_window()
+            site.navigate(driver)
+            page.info(f"🌐 {site.name} cause list page opened")
+            time.sleep(3)
         
-        # Step 5: Select Civil/Criminal radio button
-        try:
-            radio_selected = False
-            
-            # Try multiple methods to find and click radio button
-            # Method 1: By value attribute
-            radio_buttons = driver.find_elements(By.CSS_SELECTOR, "input[type='radio']")
-            for radio in radio_buttons:
-                try:
-                    radio_value = radio.get_attribute("value")
-                    radio_id = radio.get_attribute("id")
-                    
-                    # Check if this is the Civil/Criminal radio button
-                    if radio_value and list_type.lower() in radio_value.lower():
-                        # Try JavaScript click
-                        driver.execute_script("arguments[0].checked = true;", radio)
-                        driver.execute_script("arguments[0].click();", radio)
-                        driver.execute_script("arguments[0].dispatchEvent(new Event('change', { bubbles: true }));", radio)
-                        
-                        # Verify it's checked
-                        if radio.is_selected():
-                            st.success(f"✅ Selected '{list_type}' list type")
-                            radio_selected = True
-                            break
-                except:
-                    continue
-            
-            # Method 2: Try finding by label text
-            if not radio_selected:
-                try:
-                    labels = driver.find_elements(By.TAG_NAME, "label")
-                    for label in labels:
-                        label_text = label.text.strip().lower()
-                        if list_type.lower() in label_text:
-                            # Try to click the label
-                            driver.execute_script("arguments[0].click();", label)
-                            st.success(f"✅ Selected '{list_type}' list type (via label)")
-                            radio_selected = True
-                            break
-                except:
-                    pass
-            
-            if not radio_selected:
-                st.warning(f"⚠️ Could not auto-select '{list_type}'. Please select manually.")
-        except Exception as e:
-            st.warning(f"List type selection issue: {e}")
+        site.fill_form(driver, court_complex, court_number, cause_list_date, list_type, page_reporter(page),
+                       complex_selected=complex_selected)
+        pooled.context["complex"] = (site_key, court_complex)
         
-        # Step 6: Wait for user to complete form and CAPTCHA
-        st.info("🔐 Please complete the following in the browser:")
-        st.markdown("""
-        ### Manual Steps Required:
-        1. **Check Court Complex** - Verify it's selected correctly
-        2. **Select Court/Judge** - Choose from the dropdown (if not auto-selected)
-        3. **Select Date** - Click calendar and pick the date (if not auto-set)
-        4. **Select Civil/Criminal** - Verify the correct radio button is selected
-        5. **Enter CAPTCHA** - Type the code shown in the image
-        6. **Click Submit** - Click the submit button
-        7. **Wait** - The script will automatically capture the results
-        """)
+        def show_manual_steps():
+            # Wait for user to complete form and CAPTCHA
+            page.info("🔐 Please complete the following in the browser:")
+            page.markdown("""
+            ### Manual Steps Required:
+            1. **Check Court Complex** - Verify it's selected correctly
+            2. **Select Court/Judge** - Choose from the dropdown (if not auto-selected)
+            3. **Select Date** - Click calendar and pick the date (if not auto-set)
+            4. **Select Civil/Criminal** - Verify the correct radio button is selected
+            5. **Enter CAPTCHA** - Type the code shown in the image
+            6. **Click Submit** - Click the submit button
+            7. **Wait** - The script will automatically capture the results
+            """)
+            page.warning("⏳ You have 45 seconds to complete the form and submit...")
         
-        st.warning("⏳ You have 45 seconds to complete the form and submit...")
+        attempt = captcha.start(driver, "cause_list", DB_FILE, captcha_provider, page_reporter(page))
+        if not attempt.automatic:
+            show_manual_steps()
         
-        # Countdown with progress bar
-        progress_bar = st.progress(0)
-        status_text = st.empty()
+        # Countdown with progress bar; stops as soon as a new cause list is on the page
+        progress_bar = page.progress(0)
+        status_text = page.empty()
+        previous_result = pooled.context.get("result_hash")
+        # After an automatic answer is rejected, the rejection stays on the page until the user submits again
+        tolerate_rejection = False
         
         wait_time = 45
+        found = False
+        last_checked_html = None
         for i in range(wait_time):
             progress_bar.progress((i + 1) / wait_time)
             status_text.text(f"⏰ Time remaining: {wait_time - i} seconds")
             time.sleep(1)
+            attempt.observe(driver)
+            # An automatic answer gets its verdict within seconds, so check every second for it
+            if attempt.automatic or i % 3 == 2:
+                current_html = driver.page_source
+                # Only a page that changed since the last check is handed to the adapter
+                if current_html != last_checked_html:
+                    last_checked_html = current_html
+                    try:
+                        found = site.detect_results(current_html) and snapshots.content_hash(current_html) != previous_result
+                    except resilience.FetchFailure as e:
+                        if e.kind != resilience.CAPTCHA_WRONG:
+                            raise
+                        if attempt.automatic:
+                            attempt.rejected()
+                            page.warning("🤖 The automatic CAPTCHA answer was not accepted. Falling back to manual input.")
+                            captcha.refresh(driver)
+                            attempt = captcha.start(driver, "cause_list", DB_FILE, "manual")
+                            show_manual_steps()
+                            tolerate_rejection = True
+                        elif not tolerate_rejection:
+                            attempt.rejected()
+                            raise
+                    if found:
+                        break
+            if attempt.automatic and i + 1 >= CAPTCHA_AUTO_WAIT:
+                attempt.rejected()
+                page.warning("🤖 No result after the automatic CAPTCHA answer. Falling back to manual input.")
+                captcha.refresh(driver)
+                attempt = captcha.start(driver, "cause_list", DB_FILE, "manual")
+                show_manual_steps()
         
         progress_bar.empty()
         status_text.empty()
+        attempt.finish("accepted" if found else "timeout")
         
-        # Get the page source
+        # Get the page source; tables are extracted by the caller so the snapshot can be parsed again offline
         raw_html = driver.page_source
-        soup = BeautifulSoup(raw_html, 'html.parser')
-        
-        # Parse cause list tables with sections
-        all_sections_data = []
-        
-        # Find all tables
-        tables = soup.find_all('table')
-        
-        if len(tables) > 0:
-            st.info(f"Found {len(tables)} table(s) on the page")
-            
-            # Common headers for Delhi court cause lists
-            standard_headers = ['Serial Number', 'Case Type/Case Number/Case Year', 'Party Name', 'Advocate']
-            
-            for table in tables:
-                rows = table.find_all('tr')
-                
-                if len(rows) < 2:  # Skip tables with no data rows
-                    continue
-                
-                # Check if this is a calendar table (skip it)
-                first_row_text = rows[0].get_text(strip=True).lower()
-                is_calendar = False
-                
-                # Look for calendar indicators
-                if any(month in first_row_text for month in ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec']):
-                    is_calendar = True
-                
-                # Check if first data row contains mostly numbers (likely a calendar)
-                if not is_calendar and len(rows) > 1:
-                    first_data_row = rows[1]
-                    cells = first_data_row.find_all('td')
-                    if cells:
-                        cell_texts = [cell.get_text(strip=True) for cell in cells]
-                        # If most cells are just numbers 1-31, it's likely a calendar
-                        numeric_cells = sum(1 for text in cell_texts if text.isdigit() and 1 <= int(text) <= 31)
-                        if numeric_cells > len(cells) * 0.7:  # More than 70% are date numbers
-                            is_calendar = True
-                
-                if is_calendar:
-                    st.info("⏭️ Skipping calendar table")
-                    continue
-                
-                # Try to find the section name by looking at previous siblings or parent elements
-                section_name = "Cases"
-                
-                # Look for heading before the table
-                prev_element = table.find_previous(['h1', 'h2', 'h3', 'h4', 'strong', 'b', 'p'])
-                if prev_element:
-                    section_text = prev_element.get_text(strip=True)
-                    if section_text and len(section_text) < 100:  # Reasonable section name length
-                        section_name = section_text
-                
-                # Extract headers from the table
-                header_row = rows[0]
-                header_cells = header_row.find_all(['th', 'td'])
-                table_headers = [cell.text.strip() for cell in header_cells] if header_cells else []
-                
-                # Check if this looks like a valid cause list table
-                # Valid tables should have headers like "Serial Number", "Case", "Party", etc.
-                is_valid_table = False
-                if table_headers:
-                    header_text = ' '.join(table_headers).lower()
-                    if any(keyword in header_text for keyword in ['serial', 'case', 'party', 'advocate', 'petitioner', 'respondent']):
-                        is_valid_table = True
-                
-                if not is_valid_table:
-                    # Check if data rows look like case data (contains case numbers like T P (CRL)/19/2025)
-                    if len(rows) > 1:
-                        sample_text = ' '.join([cell.get_text() for cell in rows[1].find_all('td')])
-                        if any(pattern in sample_text for pattern in ['/', '(', ')', 'Vs', 'vs', 'V/s', 'v/s']):
-                            is_valid_table = True
-                
-                if not is_valid_table:
-                    st.info(f"⏭️ Skipping non-cause-list table")
-                    continue
-                
-                st.success(f"✅ Processing valid cause list table: {section_name}")
-                
-                # Extract data rows
-                for row in rows[1:]:
-                    cols = row.find_all('td')
-                    if cols and len(cols) >= 3:  # Valid data row (at least 3 columns)
-                        row_data = [col.text.strip() for col in cols]
-                        
-                        # Skip rows that are mostly empty or contain only numbers
-                        non_empty_cells = [cell for cell in row_data if cell]
-                        if len(non_empty_cells) < 2:
-                            continue
-                        
-                        # Skip rows where all cells are just single/double digit numbers (calendar dates)
-                        all_numbers = all(cell.isdigit() and len(cell) <= 2 for cell in row_data if cell)
-                        if all_numbers:
-                            continue
-                        
-                        # Add section name as the first column
-                        row_with_section = [section_name] + row_data
-                        all_sections_data.append(row_with_section)
-            
-            if all_sections_data:
-                # Add "Section" as the first header
-                final_headers = ['Section'] + standard_headers
-                return all_sections_data, final_headers, raw_html
-            else:
-                return None, None, "No valid cause list data found in tables"
-        else:
-            return None, None, "No tables found on the page"
+        resilience.check_page_for_failure(raw_html)
+        pooled.context["result_hash"] = snapshots.content_hash(raw_html)
+        return raw_html, None
 
     except Exception as e:
-        return None, None, f"An error occurred during cause list fetch: {e}"
+        kind = resilience.classify_exception(e)
+        breaker.record_failure(kind)
+        site_failed = True
+        if isinstance(e, resilience.FetchFailure):
+            return None, f"An error occurred during cause list fetch: {e}"
+        return None, f"An error occurred during cause list fetch ({resilience.FAILURE_LABELS[kind]}): {e}"
     finally:
-        time.sleep(5)  # Give time to see results
-        driver.quit()
+        # Success is recorded by process_cause_list_page once the page is found to hold a cause list
+        if not site_failed:
+            breaker.release()
+        if pooled:
+            keep_alive = bool(session_key) and not site_failed
+            if not keep_alive:
+                time.sleep(5)  # Give time to see results
+            pool.release(pooled, keep_alive=keep_alive)
+
+RANGE_WORKERS = 2
+MAX_RANGE_DAYS = 14
+
+def fetch_cause_list_range(site_key, court_complex, court_number, dates, list_types, captcha_provider=None):
+    """
+    Fetch and store one cause list per (date, list type) on a bounded pool of
+    worker threads. Each worker keeps its browser open between its jobs so
+    later dates reuse the selected complex. Returns [(date, list_type, result, error)]
+    with result as returned by process_cause_list_page.
+    """
+    site = court_sites.get_site(site_key)
+    jobs = [(list_date, list_type) for list_date in dates for list_type in list_types]
+    workers = min(len(jobs), RANGE_WORKERS, browser.MAX_BROWSERS)
+    ctx = get_script_run_ctx()
+    base_key = session_id() or "range"
+    worker_keys = set()
+    # One container per job, created up front so the output stays in job order
+    containers = {job: st.container() for job in jobs}
+    
+    def attach_context():
+        # Lets the worker threads write to the page
+        add_script_run_ctx(threading.current_thread(), ctx)
+    
+    def run_job(job):
+        list_date, list_type = job
+        formatted = site.format_date(list_date)
+        page = containers[job]
+        page.subheader(f"📅 {list_date.isoformat()} · {list_type}")
+        worker_key = (base_key, threading.current_thread().name)
+        worker_keys.add(worker_key)
+        
+        # Fetch and store as one unit, like a single date
+        def fetch_and_store():
+            raw_html, error = fetch_cause_list(site_key, court_complex, court_number, formatted, list_type,
+                                               page=page, session_key=worker_key, captcha_provider=captcha_provider)
+            if not raw_html:
+                return None, error
+            return process_cause_list_page(site_key, raw_html, court_complex, court_number, formatted, list_type, page=page)
+        
+        return scheduler.get_scheduler().run(
+            site.url,
+            ("cause_list", site_key, court_complex, court_number, formatted, list_type),
+            fetch_and_store
+        )
+    
+    try:
+        with ThreadPoolExecutor(max_workers=workers, initializer=attach_context) as executor:
+            results = list(executor.map(run_job, jobs))
+    finally:
+        for worker_key in worker_keys:
+            browser.get_pool().close(("cause_list", site_key, worker_key))
+    return [(list_date, list_type, result, error) for (list_date, list_type), (result, error) in zip(jobs, results)]
 
 st.set_page_config(page_title="Court Data Fetcher", layout="wide")
 st.title("⚖️ Indian Courts Case Data Fetcher & Automation Tool")
 setup_database()
-tab1, tab2, tab3 = st.tabs(["🔎 Fetch New Case Data", "📋 Fetch Cause List", "🗂️ View History"])
+
+with st.sidebar:
+    st.subheader("🌐 Court Website Status")
+    site_status = resilience.breaker_status()
+    if site_status:
+        for site in site_status:
+            if site["state"] == "closed":
+                st.success(f"✅ {site['host']}: healthy")
+            elif site["state"] == "half_open":
+                st.warning(f"🟡 {site['host']}: recovering, next fetch is a trial")
+            else:
+                st.error(f"⛔ {site['host']}: failing ({site['last_failure']}), retry in {site['retry_after_seconds']}s")
+    else:
+        st.info("No fetches yet in this session.")
+    
+    pool_stats = browser.get_pool().stats()
+    st.caption(f"Browsers: {pool_stats['busy']} in use, {pool_stats['kept_alive']} kept open (max {pool_stats['max_browsers']})")
+    
+    scheduler_stats = scheduler.get_scheduler().stats()
+    for host_stats in scheduler_stats["hosts"]:
+        st.caption(f"{host_stats['host']}: {host_stats['running']} running, {host_stats['waiting']} queued")
+    if scheduler_stats["coalesced"]:
+        st.caption(f"{scheduler_stats['coalesced']} duplicate requests shared an in-flight fetch")
+    
+    writer_stats = db_writer.get_writer(DB_FILE).stats()
+    if writer_stats["batches"]:
+        st.caption(f"Database writes: {writer_stats['pending']} pending, queue peak {writer_stats['max_depth']} of {writer_stats['queue_capacity']}, "
+                   f"{writer_stats['jobs_committed']} results in {writer_stats['batches']} commits, "
+                   f"commit p50 {writer_stats['commit_ms_p50']} ms, p95 {writer_stats['commit_ms_p95']} ms")
+    if writer_stats["retries"]:
+        st.caption(f"{writer_stats['retries']} write batches were retried while the database was locked")
+    if writer_stats["jobs_failed"]:
+        st.warning(f"⚠️ {writer_stats['jobs_failed']} results could not be saved: {writer_stats['last_error']}")
+    
+    st.subheader("🤖 CAPTCHA Solving")
+    provider_names = list(captcha.PROVIDERS)
+    captcha_provider = st.selectbox(
+        "Provider", provider_names, index=provider_names.index(captcha.get_provider().name), key="captcha_provider",
+        help="Automatic providers fill in the CAPTCHA and fall back to manual input when the answer is rejected."
+    )
+    if captcha_provider == "ocr" and captcha.PROVIDERS["ocr"].model() is None:
+        st.caption("No OCR model yet. Solve some CAPTCHAs manually, then run `python captcha.py train`.")
+    for provider_stats in captcha.attempt_stats(DB_FILE).itertuples():
+        if provider_stats.provider != "manual" and pd.notna(provider_stats.accuracy):
+            st.caption(f"{provider_stats.provider}: {provider_stats.accuracy:.0%} accepted over {provider_stats.attempts} attempts, "
+                       f"median {provider_stats.median_ms:.0f} ms")
+tab1, tab2, tab3, tab4, tab5 = st.tabs(["🔎 Fetch New Case Data", "📋 Fetch Cause List", "🗂️ View History", "🔔 Watchlist", "📈 Analytics"])
 
 with tab1:
     st.header("1. Select Court")
@@ -1097,75 +1138,156 @@ with tab1:
             current_year = pd.Timestamp.now().year
             case_year = st.selectbox("Year", list(range(current_year, 1989, -1)))
         
+        keep_session = st.checkbox(
+            "Keep the browser open for my next lookup",
+            help="The court session stays open for a few minutes. The next lookup in the same court reuses the open case number form, so only the case details and CAPTCHA are entered again."
+        )
+        
         submitted = st.form_submit_button("🚀 Fetch Case Details")
 
+    case_request = (state_name, district_name, court_complex_name, case_type, case_number, case_year)
     if submitted:
         if not all([case_type, case_number, case_year, state_name, district_name, court_complex_name]):
             st.error("Please fill in all the fields before submitting.")
         else:
             with st.spinner(f"Processing... A browser window will open."):
-                parsed_data, response_text = fetch_case_data(case_type, case_number, case_year, state_name, district_name, court_complex_name)
+                # Fetch and store as one unit, so a request sharing an in-flight fetch does not store the lookup again
+                def fetch_and_store_case():
+                    parsed_data, response_text = fetch_case_data(case_type, case_number, case_year, state_name, district_name, court_complex_name,
+                                                                 session_key=session_id() if keep_session else None,
+                                                                 captcha_provider=captcha_provider)
+                    if not parsed_data:
+                        return parsed_data, response_text, None, []
+                    stored_query = store_query_result(case_type, case_number, case_year, parsed_data, response_text)
+                    # A manual lookup of a tracked case counts as its re-check
+                    changes = []
+                    tracked_id = tracking.find_tracked(DB_FILE, *case_request)
+                    if tracked_id:
+                        changes = tracking.record_check(DB_FILE, tracked_id, stored_query.result(), parsed_data)
+                        if changes:
+                            tracking.deliver_pending(DB_FILE)
+                    return parsed_data, response_text, stored_query, changes
+                
+                parsed_data, response_text, stored_query, changes = scheduler.get_scheduler().run(
+                    ECOURTS_URL,
+                    ("case",) + case_request,
+                    fetch_and_store_case
+                )
                 if parsed_data:
                     st.success("Data Fetched Successfully!")
-                    store_query_result(case_type, case_number, case_year, parsed_data, response_text)
-                    st.subheader("Fetched Case Details")
-                    st.json(parsed_data)
-                    
-                    # Download options
-                    col1, col2 = st.columns(2)
-                    
-                    with col1:
-                        # CSV Download
-                        df_case = pd.DataFrame([parsed_data])
-                        csv = df_case.to_csv(index=False)
-                        st.download_button(
-                            label="📥 Download as CSV",
-                            data=csv,
-                            file_name=f"case_{case_type}_{case_number}_{case_year}.csv",
-                            mime="text/csv"
-                        )
-                    
-                    with col2:
-                        # PDF Download
-                        pdf_buffer = generate_case_details_pdf(parsed_data, case_type, case_number, case_year)
-                        st.download_button(
-                            label="📄 Download as PDF",
-                            data=pdf_buffer,
-                            file_name=f"case_{case_type}_{case_number}_{case_year}.pdf",
-                            mime="application/pdf"
-                        )
+                    if changes:
+                        st.info(f"📌 Changed since the last check: {describe_changes(changes)}")
+                    # Only the id is kept for later reruns, once the writer has committed the lookup
+                    try:
+                        query_id = stored_query.result()
+                    except Exception as e:
+                        query_id = None
+                        st.error(f"The lookup could not be saved to the history: {e}")
+                    remember_result("case_results", case_request, {
+                        "query_id": query_id,
+                        "parsed_data": parsed_data,
+                        "case_summary": {key: value for key, value in parsed_data.items() if not isinstance(value, list)},
+                    })
                 else:
                     st.error(f"Failed to fetch data. Reason: {response_text}")
+    
+    # Shown on every rerun (downloads, expanders) from the copy kept in session state
+    case_result = remembered_result("case_results", case_request)
+    if case_result:
+        parsed_data = case_result["parsed_data"]
+        case_summary = case_result["case_summary"]
+        st.subheader("Fetched Case Details")
+        st.json(case_summary)
+        
+        if tracking.find_tracked(DB_FILE, *case_request):
+            st.caption("📌 This case is tracked. The Watchlist tab shows when it is checked next.")
+        elif st.button("📌 Track This Case", help="Re-check it on a schedule and get notified when its status or next hearing changes"):
+            tracking.track_case(DB_FILE, *case_request, query_id=case_result["query_id"], record=parsed_data)
+            st.rerun()
+        
+        if parsed_data.get('acts'):
+            st.markdown("**Acts / Sections:** " + "; ".join(parsed_data['acts']))
+        if parsed_data.get('hearings'):
+            st.subheader(f"📅 Case History ({len(parsed_data['hearings'])} hearings)")
+            st.dataframe(pd.DataFrame(parsed_data['hearings']), use_container_width=True)
+        if parsed_data.get('orders'):
+            st.subheader(f"📜 Orders ({len(parsed_data['orders'])})")
+            st.dataframe(pd.DataFrame(parsed_data['orders']), use_container_width=True)
+        
+        # Download options
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            # CSV Download
+            df_case = pd.DataFrame([case_summary])
+            csv = df_case.to_csv(index=False)
+            st.download_button(
+                label="📥 Download as CSV",
+                data=csv,
+                file_name=f"case_{case_type}_{case_number}_{case_year}.csv",
+                mime="text/csv"
+            )
+        
+        with col2:
+            # PDF Download
+            pdf_bytes = case_details_pdf_bytes(parsed_data, case_type, case_number, case_year)
+            st.download_button(
+                label="📄 Download as PDF",
+                data=pdf_bytes,
+                file_name=f"case_{case_type}_{case_number}_{case_year}.pdf",
+                mime="application/pdf"
+            )
 
 with tab2:
     st.header("📋 Fetch Daily Cause List")
     st.info("💡 Fetch the daily cause list from court website.")
     
+    # Outside the form so the complex list follows the chosen site straight away
+    cl_site_key = st.selectbox(
+        "District Court Website",
+        list(court_sites.SITES),
+        format_func=lambda key: court_sites.SITES[key].name,
+        help="District court sites on the dcourts.gov.in template"
+    )
+    cl_site = court_sites.get_site(cl_site_key)
+    cl_range_mode = st.radio(
+        "Fetch",
+        ["Single date", "Date range"],
+        horizontal=True,
+        help="A date range fetches one cause list per date in parallel browsers"
+    ) == "Date range"
+    
     with st.form("cause_list_form"):
         form_col1, form_col2 = st.columns(2)
         
         with form_col1:
-            cl_court_complex = st.selectbox(
-                "Court Complex",
-                [
-                    "Patiala House Court Complex",
-                    "Tis Hazari Courts Complex",
-                    "Karkardooma Courts Complex",
-                    "Rohini Courts Complex",
-                    "Dwarka Courts Complex",
-                    "Saket Courts Complex",
-                    "Rouse Avenue Courts Complex"
-                ],
-                help="Select the Delhi court complex"
-            )
+            if cl_site.complexes:
+                cl_court_complex = st.selectbox(
+                    "Court Complex",
+                    cl_site.complexes,
+                    help=f"Select the court complex ({cl_site.name})"
+                )
+            else:
+                cl_court_complex = st.text_input(
+                    "Court Complex",
+                    help=f"Type the court complex as it appears on the {cl_site.name} website"
+                )
         
         with form_col2:
-            cl_list_type = st.radio(
-                "List Type",
-                ["Civil", "Criminal"],
-                horizontal=True,
-                help="Select Civil or Criminal cause list"
-            )
+            if cl_range_mode:
+                cl_list_types = st.multiselect(
+                    "List Types",
+                    ["Civil", "Criminal"],
+                    default=["Civil"],
+                    help="One cause list is fetched per date and list type"
+                )
+            else:
+                cl_list_type = st.radio(
+                    "List Type",
+                    ["Civil", "Criminal"],
+                    horizontal=True,
+                    help="Select Civil or Criminal cause list"
+                )
         
         cl_court_number = st.text_input(
             "Court Number / Judge Name (Optional)",
@@ -1173,125 +1295,177 @@ with tab2:
             help="Enter the court number and judge name. Leave blank to see all available options."
         )
         
-        cl_date = st.date_input(
-            "Cause List Date",
-            help="Select the date for which you want to fetch the cause list"
-        )
-        # Format date as MM/DD/YYYY for Delhi courts website
-        formatted_date = cl_date.strftime("%m/%d/%Y")
+        if cl_range_mode:
+            today = pd.Timestamp.now().date()
+            cl_dates = st.date_input(
+                "Cause List Dates",
+                value=(today, today + pd.Timedelta(days=4)),
+                help=f"First and last date of the range (at most {MAX_RANGE_DAYS} days)"
+            )
+            cl_skip_weekends = st.checkbox("Skip Saturdays and Sundays", value=True)
+        else:
+            cl_date = st.date_input(
+                "Cause List Date",
+                help="Select the date for which you want to fetch the cause list"
+            )
+            # Format the date the way the site's form expects it
+            formatted_date = cl_site.format_date(cl_date)
         
         cl_submitted = st.form_submit_button("🚀 Fetch Cause List")
     
-    if cl_submitted:
-        with st.spinner(f"Processing... A browser window will open."):
-            cause_list_data, headers, response = fetch_cause_list_delhi(
-                cl_court_complex,
-                cl_court_number,
-                formatted_date,
-                cl_list_type
-            )
+    if cl_range_mode:
+        # The date input returns a single date until the end of the range is picked
+        range_start, range_end = (tuple(cl_dates) * 2)[:2] if isinstance(cl_dates, (tuple, list)) else (cl_dates, cl_dates)
+        range_dates = [
+            day.date() for day in pd.date_range(range_start, range_end)
+            if not (cl_skip_weekends and day.dayofweek >= 5)
+        ]
+        cause_list_request = (cl_site_key, cl_court_complex, cl_court_number, "range",
+                              tuple(range_dates), tuple(cl_list_types))
+    else:
+        cause_list_request = (cl_site_key, cl_court_complex, cl_court_number, formatted_date, cl_list_type)
+    
+    if cl_submitted and cl_range_mode:
+        if not range_dates or not cl_list_types:
+            st.error("Pick at least one date and one list type.")
+        elif len(range_dates) > MAX_RANGE_DAYS:
+            st.error(f"The range has {len(range_dates)} dates. Fetch at most {MAX_RANGE_DAYS} at a time.")
+        else:
+            st.info(f"🗓️ Fetching {len(range_dates) * len(cl_list_types)} cause lists with up to {RANGE_WORKERS} browsers at a time. "
+                    f"Each browser stays on {cl_court_complex} between its dates, so only the date, list type and CAPTCHA change.")
+            fetched = fetch_cause_list_range(cl_site_key, cl_court_complex, cl_court_number, range_dates, cl_list_types,
+                                             captcha_provider=captcha_provider)
             
-            if cause_list_data:
-                st.success(f"✅ Cause List Fetched Successfully for {formatted_date}!")
-                
-                # Store in database
-                store_cause_list_result(
+            frames = []
+            all_matches = []
+            watch_entries = 0
+            for list_date, list_type, result, error in fetched:
+                if not result:
+                    st.warning(f"⚠️ {list_date.isoformat()} {list_type}: {error}")
+                    continue
+                # Tag every row with the list it came from
+                frames.append(result["df"].assign(**{"Date": list_date.isoformat(), "List Type": list_type}))
+                all_matches += [dict(match, date=list_date.isoformat(), list_type=list_type) for match in result["matches"]]
+                watch_entries = result["watch_entries"]
+            
+            if frames:
+                combined = pd.concat(frames, ignore_index=True).fillna('')
+                combined = combined[["Date", "List Type"] + [c for c in combined.columns if c not in ("Date", "List Type")]]
+                st.success(f"✅ {len(frames)} of {len(fetched)} cause lists fetched, {len(combined)} cases in total.")
+                remember_result("cause_list_results", cause_list_request, cause_list_display(
+                    combined, all_matches, watch_entries,
+                    f"{range_dates[0].isoformat()} to {range_dates[-1].isoformat()}", ", ".join(cl_list_types)
+                ))
+            else:
+                st.error("None of the cause lists in the range could be fetched.")
+    
+    elif cl_submitted:
+        with st.spinner(f"Processing... A browser window will open."):
+            # Fetch and store as one unit, so a request sharing an in-flight fetch does not store the list again
+            def fetch_and_store_cause_list():
+                raw_html, response = fetch_cause_list(
+                    cl_site_key,
                     cl_court_complex,
-                    cl_court_number if cl_court_number else "All Courts",
+                    cl_court_number,
                     formatted_date,
                     cl_list_type,
-                    len(cause_list_data)
+                    captcha_provider=captcha_provider
                 )
-                
-                # Display header information
-                st.markdown(f"""
-                ### 📋 {cl_list_type} Cause List
-                **Court Complex:** {cl_court_complex}  
-                **Date:** {formatted_date}  
-                **Total Cases:** {len(cause_list_data)}
-                """)
-                
-                # Display as dataframe
-                if cause_list_data:
-                    # Check if headers match data columns
-                    if headers and len(cause_list_data) > 0:
-                        # Find the maximum number of columns in the data
-                        max_cols = max(len(row) for row in cause_list_data)
-                        
-                        # If headers don't match, create generic headers or pad existing ones
-                        if len(headers) != max_cols:
-                            st.warning(f"Headers count ({len(headers)}) doesn't match data columns ({max_cols}). Using generic column names.")
-                            # Use existing headers and add generic ones for missing columns
-                            if len(headers) < max_cols:
-                                headers = headers + [f"Column_{i+1}" for i in range(len(headers), max_cols)]
-                            else:
-                                headers = headers[:max_cols]
-                        
-                        # Ensure all rows have the same number of columns
-                        normalized_data = []
-                        for row in cause_list_data:
-                            if len(row) < max_cols:
-                                # Pad short rows with empty strings
-                                row = row + [''] * (max_cols - len(row))
-                            elif len(row) > max_cols:
-                                # Truncate long rows
-                                row = row[:max_cols]
-                            normalized_data.append(row)
-                        
-                        df = pd.DataFrame(normalized_data, columns=headers)
-                    else:
-                        # No headers, just use the data as-is
-                        df = pd.DataFrame(cause_list_data)
-                    
-                    # Display full table
-                    st.dataframe(df, use_container_width=True)
-                    
-                    # Show section-wise breakdown if 'Section' column exists
-                    if 'Section' in df.columns:
-                        st.markdown("---")
-                        st.subheader("📊 Section-wise Breakdown")
-                        section_counts = df['Section'].value_counts()
-                        
-                        col1, col2 = st.columns([2, 3])
-                        with col1:
-                            st.dataframe(section_counts.reset_index().rename(columns={'index': 'Section', 'Section': 'Count'}), use_container_width=True)
-                        
-                        with col2:
-                            # Show expandable sections
-                            for section in df['Section'].unique():
-                                section_df = df[df['Section'] == section]
-                                with st.expander(f"📂 {section} ({len(section_df)} cases)"):
-                                    st.dataframe(section_df.drop('Section', axis=1), use_container_width=True)
-                    
-                    st.markdown("---")
-                    
-                    # Download options
-                    st.subheader("📥 Download Options")
-                    col1, col2 = st.columns(2)
-                    
-                    with col1:
-                        # CSV Download
-                        csv = df.to_csv(index=False)
-                        st.download_button(
-                            label="📥 Download as CSV",
-                            data=csv,
-                            file_name=f"cause_list_{cl_court_complex.replace(' ', '_')}_{formatted_date}_{cl_list_type}.csv",
-                            mime="text/csv"
-                        )
-                    
-                    with col2:
-                        # PDF Download
-                        pdf_buffer = generate_cause_list_pdf(df, cl_court_complex, formatted_date, cl_list_type)
-                        st.download_button(
-                            label="📄 Download as PDF",
-                            data=pdf_buffer,
-                            file_name=f"cause_list_{cl_court_complex.replace(' ', '_')}_{formatted_date}_{cl_list_type}.pdf",
-                            mime="application/pdf"
-                        )
-                else:
-                    st.warning("No cases found in the cause list.")
+                if not raw_html:
+                    return None, response
+                return process_cause_list_page(cl_site_key, raw_html, cl_court_complex, cl_court_number, formatted_date, cl_list_type)
+            
+            result, response = scheduler.get_scheduler().run(
+                cl_site.url,
+                ("cause_list",) + cause_list_request,
+                fetch_and_store_cause_list
+            )
+            
+            if result:
+                st.success(f"✅ Cause List Fetched Successfully for {formatted_date}!")
+                remember_result("cause_list_results", cause_list_request, cause_list_display(
+                    result["df"], result["matches"], result["watch_entries"], formatted_date, cl_list_type
+                ))
             else:
                 st.error(f"Failed to fetch cause list. Reason: {response}")
+    
+    # Shown on every rerun (expanders, downloads) from the copy kept in session state
+    cause_list_result = remembered_result("cause_list_results", cause_list_request)
+    if cause_list_result:
+        df = cause_list_result["df"]
+        date_label = cause_list_result["date_label"]
+        list_type_label = cause_list_result["list_type_label"]
+        file_stem = f"cause_list_{cl_court_complex.replace(' ', '_')}_{date_label.replace(' ', '_')}_{list_type_label.replace(', ', '_')}"
+        
+        # Display header information
+        st.markdown(f"""
+        ### 📋 {list_type_label} Cause List
+        **Court Complex:** {cl_court_complex}  
+        **Date:** {date_label}  
+        **Total Cases:** {len(df)}
+        """)
+        
+        # Only the visible page of rows goes to the browser
+        render_paginated_table(df, "cause_list_table", cause_list_result["search_text"], cause_list_result["payload_bytes"])
+        
+        if cause_list_result["watch_entries"]:
+            if cause_list_result["matches"] is not None:
+                st.markdown("---")
+                st.subheader(f"🔔 Watchlist Matches ({len(cause_list_result['matches'])})")
+                st.dataframe(cause_list_result["matches"], use_container_width=True)
+            else:
+                st.info(f"ℹ️ None of the {cause_list_result['watch_entries']} watchlist entries appear in this cause list.")
+        
+        # Show section-wise breakdown if 'Section' column exists
+        if cause_list_result["section_counts"] is not None:
+            st.markdown("---")
+            st.subheader("📊 Section-wise Breakdown")
+            
+            col1, col2 = st.columns([2, 3])
+            with col1:
+                st.dataframe(cause_list_result["section_counts"], use_container_width=True)
+            
+            with col2:
+                # A section's rows are only rendered while its toggle is on
+                open_sections = [
+                    (i, section, positions)
+                    for i, (section, positions) in enumerate(cause_list_result["sections"])
+                    if st.toggle(f"📂 {section} ({len(positions)} cases)", key=f"cause_list_section_{i}")
+                ]
+            
+            for i, section, positions in open_sections:
+                st.markdown(f"**📂 {section}**")
+                render_paginated_table(df.iloc[positions].drop('Section', axis=1), f"cause_list_section_{i}",
+                                       cause_list_result["search_text"])
+        
+        st.markdown("---")
+        
+        # Download options
+        st.subheader("📥 Download Options")
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            # CSV Download
+            st.download_button(
+                label="📥 Download as CSV",
+                data=cause_list_result["csv"],
+                file_name=f"{file_stem}.csv",
+                mime="text/csv"
+            )
+        
+        with col2:
+            # PDF Download; built on request since it is by far the slowest part for a long list
+            if cause_list_result.get("pdf") is None and st.button("📄 Prepare PDF", key="cause_list_prepare_pdf"):
+                with st.spinner(f"Building PDF for {len(df)} cases..."):
+                    cause_list_result["pdf"] = cause_list_pdf_bytes(df, cl_court_complex, date_label, list_type_label)
+            pdf_bytes = cause_list_result.get("pdf")
+            if pdf_bytes is not None:
+                st.download_button(
+                    label="📄 Download as PDF",
+                    data=pdf_bytes,
+                    file_name=f"{file_stem}.pdf",
+                    mime="application/pdf"
+                )
 
 with tab3:
     st.header("📊 Query History")
@@ -1299,6 +1473,19 @@ with tab3:
     if st.button("🔄 Refresh History"):
         st.rerun()
     
+    search_text = st.text_input("🔍 Search Parties & Advocates", placeholder="e.g., Ram Kumar or Sharma")
+    if search_text:
+        try:
+            wait_for_pending_writes()
+            results_df = history_search.search_history(DB_FILE, search_text)
+            if not results_df.empty:
+                st.info(f"Top {len(results_df)} matches (best of each source first)")
+                st.dataframe(results_df.drop('rank', axis=1), use_container_width=True)
+            else:
+                st.info("No matches found.")
+        except Exception as e:
+            st.error(f"Search is unavailable: {e}")
+    
     case_df, cause_list_df = view_all_data()
     
     # Create sub-tabs for different history types
@@ -1327,5 +1514,260 @@ with tab3:
                 'total_cases': 'Total Cases'
             })
             st.dataframe(display_df, use_container_width=True)
+            
+            with st.expander("🔗 Listings with latest known case status"):
+                join_id = st.selectbox("Cause List ID", cause_list_df['id'].tolist())
+                joined_df = view_cause_list_with_case_status(join_id)
+                if not joined_df.empty:
+                    st.info(f"{joined_df['case_status'].notna().sum()} of {len(joined_df)} listings have a stored case status lookup")
+                    st.dataframe(joined_df, use_container_width=True)
+                else:
+                    st.info("No rows stored for this cause list.")
+
+            with st.expander("📄 Export stored cause lists as PDF"):
+                export_ids = st.multiselect("Cause List IDs", cause_list_df['id'].tolist(),
+                                            default=cause_list_df['id'].tolist()[:10])
+                export_format = st.radio("Export As", ["One combined PDF", "ZIP of PDFs"], horizontal=True)
+                stored_lists = None
+                if st.button("📄 Prepare Export", disabled=not export_ids):
+                    stored_lists = load_stored_cause_lists(export_ids)
+                    if not stored_lists:
+                        st.warning("None of the selected cause lists have stored rows to export.")
+                if stored_lists:
+                    with st.spinner(f"Rendering {len(stored_lists)} cause lists..."):
+                        renderer = pdf_reports.get_renderer()
+                        before = renderer.stats()
+                        started = time.perf_counter()
+                        if export_format == "ZIP of PDFs":
+                            data = renderer.cause_lists_zip(
+                                (pdf_reports.cause_list_file_name(cause_list_id, court, list_date, list_type), df, court, list_date, list_type)
+                                for cause_list_id, df, court, list_date, list_type in stored_lists
+                            )
+                            file_name, mime = "cause_lists.zip", "application/zip"
+                        else:
+                            data = renderer.combined_cause_lists_pdf(entry[1:] for entry in stored_lists)
+                            file_name, mime = "cause_lists.pdf", "application/pdf"
+                        elapsed = time.perf_counter() - started
+                        pages = renderer.stats()["pages"] - before["pages"]
+                    st.session_state["cause_list_export"] = {
+                        "data": data, "file_name": file_name, "mime": mime,
+                        "summary": f"{len(stored_lists)} of {len(export_ids)} cause lists had stored rows · "
+                                   f"{pages} pages in {elapsed:.1f}s ({pages / elapsed if elapsed else 0:.1f} pages/sec)",
+                    }
+                export = st.session_state.get("cause_list_export")
+                if export:
+                    st.success(export["summary"])
+                    st.download_button("📥 Download Export", data=export["data"], file_name=export["file_name"], mime=export["mime"])
+
+                st.caption("For many lists, render them in worker processes outside the app and write the PDFs to a folder:")
+                export_dir = st.text_input("Output Folder", value="reports")
+                if st.button("🗂️ Render in Background", disabled=not export_ids):
+                    os.makedirs(export_dir, exist_ok=True)
+                    log_path = os.path.join(export_dir, "bulk_reports.log")
+                    process = bulk_reports.start_background(DB_FILE, export_ids, out=export_dir, log_path=log_path)
+                    st.session_state["bulk_report_job"] = {"process": process, "log": log_path, "count": len(export_ids)}
+                job = st.session_state.get("bulk_report_job")
+                if job:
+                    with open(job["log"], encoding="utf-8", errors="replace") as f:
+                        log_lines = f.read().splitlines()
+                    if job["process"].poll() is None:
+                        st.info(f"⏳ Rendering {job['count']} cause lists in the background: {log_lines[-1] if log_lines else 'starting...'}")
+                    elif job["process"].returncode == 0:
+                        st.success(f"✅ {log_lines[-1] if log_lines else 'Done'}")
+                    else:
+                        st.error(f"Background export failed: {log_lines[-1] if log_lines else job['process'].returncode}")
+        else:
+            st.info("No cause list queries found.")
+
+    with st.expander("🗄️ Archived History"):
+        archived = archive.archive_summary()
+        if not archived:
+            st.info("Nothing archived yet. Run `python archive.py --older-than-days 180` to move old history out of the database.")
         else:
-            st.info("No cause list queries found.")
\ No newline at end of file
+            st.caption(" · ".join(f"{name}: {files} files, {size / 1024 / 1024:.1f} MB" for name, (files, size) in archived.items()))
+            if not archive.duckdb_available():
+                st.info("💡 Install DuckDB to search the archive: pip install duckdb")
+            else:
+                archive_scope = st.radio("Search In", ["Cause list rows", "Case status lookups"], horizontal=True)
+                archive_text = st.text_input("Party, Advocate or Case Number", key="archive_search_text")
+                archive_days = ()
+                if archive_scope == "Cause list rows":
+                    archive_days = st.date_input("Listing Dates", value=(), key="archive_search_days")
+                if archive_text or archive_days:
+                    started = time.perf_counter()
+                    try:
+                        if archive_scope == "Cause list rows":
+                            start_day = archive_days[0].isoformat() if len(archive_days) > 0 else None
+                            end_day = archive_days[-1].isoformat() if len(archive_days) > 1 else None
+                            archived_df = archive.search_cause_list_rows(archive_text, start_day, end_day)
+                        else:
+                            archived_df = archive.search_queries(archive_text) if archive_text else pd.DataFrame()
+                    except Exception as e:
+                        st.error(f"Archive search failed: {e}")
+                        archived_df = None
+                    if archived_df is not None:
+                        if not archived_df.empty:
+                            st.info(f"{len(archived_df)} archived matches in {(time.perf_counter() - started) * 1000:.0f} ms (newest first)")
+                            st.dataframe(archived_df, use_container_width=True)
+                        else:
+                            st.info("No archived matches.")
+
+with tab4:
+    st.header("🔔 Watchlist")
+    st.info("💡 Every fetched cause list is checked against these entries. Party and advocate entries match on whole words anywhere in the name.")
+    
+    with st.form("watchlist_form", clear_on_submit=True):
+        wl_col1, wl_col2, wl_col3 = st.columns([1, 2, 2])
+        with wl_col1:
+            wl_kind = st.selectbox(
+                "Match On",
+                list(watchlist.WATCH_KINDS),
+                format_func=lambda kind: {"case": "Case Number", "party": "Party Name", "advocate": "Advocate"}[kind]
+            )
+        with wl_col2:
+            wl_value = st.text_input("Value", placeholder="e.g., T P (CRL)/19/2025 or Ram Kumar")
+        with wl_col3:
+            wl_label = st.text_input("Label (Optional)", placeholder="e.g., Client file reference")
+        
+        wl_submitted = st.form_submit_button("➕ Add to Watchlist")
+    
+    if wl_submitted:
+        if not wl_value.strip():
+            st.error("Please enter a value to watch for.")
+        else:
+            watchlist.add_watch_entry(DB_FILE, wl_kind, wl_value, wl_label or None)
+            st.success(f"✅ Added '{wl_value.strip()}' to the watchlist")
+    
+    # Matches are written with their cause list by the background writer
+    wait_for_pending_writes()
+    entries_df, matches_df = watchlist.view_watchlist(DB_FILE)
+    
+    st.subheader("Tracked Entries")
+    if not entries_df.empty:
+        st.dataframe(entries_df, use_container_width=True)
+        remove_id = st.selectbox("Remove Entry", entries_df['id'].tolist(),
+                                 format_func=lambda watch_id: f"{watch_id}: {entries_df.loc[entries_df['id'] == watch_id, 'value'].iloc[0]}")
+        if st.button("🗑️ Remove Selected Entry"):
+            watchlist.remove_watch_entry(DB_FILE, remove_id)
+            st.rerun()
+    else:
+        st.info("No watchlist entries yet.")
+    
+    st.subheader("Recent Matches")
+    if not matches_df.empty:
+        st.dataframe(matches_df, use_container_width=True)
+    else:
+        st.info("No matches found yet.")
+    
+    st.subheader("📌 Tracked Cases")
+    st.caption(f"Checked daily from {tracking.NEAR_HEARING.days} days before the next hearing until the new date is posted, "
+               f"otherwise every {tracking.STALE_AFTER.days} days. Changes go to "
+               f"{', '.join(map(str, tracking.configured_notifiers())) or 'no notifiers'}. Track a case from its result in the first tab.")
+    tracked_df = tracking.view_tracked(DB_FILE)
+    if not tracked_df.empty:
+        st.dataframe(tracked_df, use_container_width=True)
+        
+        tr_col1, tr_col2 = st.columns(2)
+        with tr_col1:
+            refresh_budget = st.number_input("Cases per Refresh", min_value=1, max_value=50, value=tracking.DEFAULT_BUDGET,
+                                             help="At most this many due cases are fetched per run, most overdue first")
+            if st.button("🔄 Refresh Due Cases Now"):
+                with st.spinner("Re-checking due cases..."):
+                    summary = tracking.run_once(DB_FILE, lambda tracked: refresh_tracked_case(tracked, captcha_provider, page=st),
+                                                refresh_budget, progress=st.write)
+                st.success(f"Checked {summary['checked']} cases: {summary['changed']} changed, {summary['failed']} failed, "
+                           f"{summary['delivered']} notifications sent")
+        with tr_col2:
+            refresher = tracking.get_refresher(DB_FILE)
+            auto_refresh = st.toggle(
+                "Refresh in the background", value=refresher.running, disabled=captcha_provider == "manual",
+                help="Needs an automatic CAPTCHA provider (sidebar), since nobody is there to type the CAPTCHA"
+            )
+            refresh_hours = st.selectbox("Every", [1, 3, 6, 12, 24], index=2, format_func=lambda hours: f"{hours} h")
+            if auto_refresh and captcha_provider != "manual":
+                refresher.start(lambda tracked: refresh_tracked_case(tracked, captcha_provider), refresh_hours * 3600, refresh_budget)
+            elif refresher.running:
+                refresher.stop()
+            refresher_stats = refresher.stats()
+            if refresher_stats["last_run"]:
+                last_summary = refresher_stats["last_summary"] or {}
+                st.caption(f"Last background run {refresher_stats['last_run']} UTC: {last_summary.get('checked', 0)} checked, "
+                           f"{last_summary.get('changed', 0)} changed, {last_summary.get('failed', 0)} failed"
+                           + (f" ({refresher_stats['last_error']})" if refresher_stats["last_error"] else ""))
+        
+        untrack_id = st.selectbox("Stop Tracking", tracked_df['id'].tolist(),
+                                  format_func=lambda tracked_id: f"{tracked_id}: {tracked_df.loc[tracked_df['id'] == tracked_id, 'case'].iloc[0]}")
+        if st.button("🗑️ Stop Tracking Selected Case"):
+            tracking.untrack_case(DB_FILE, untrack_id)
+            st.rerun()
+    else:
+        st.info("No tracked cases yet.")
+    
+    changes_df = tracking.recent_changes(DB_FILE)
+    if not changes_df.empty:
+        st.subheader("Recent Case Changes")
+        st.dataframe(changes_df, use_container_width=True)
+
+with tab5:
+    st.header("📈 Analytics")
+    st.info("💡 Counts come from summary tables updated as cause lists are stored. Only the latest fetch of each list is counted.")
+    
+    # The summary tables are updated in the same writes as the lists
+    wait_for_pending_writes()
+    first_day, last_day = analytics.day_range(DB_FILE)
+    if not first_day:
+        st.info("No cause lists stored yet.")
+    else:
+        an_col1, an_col2 = st.columns([1, 2])
+        with an_col1:
+            try:
+                default_range = (pd.Timestamp(first_day).date(), pd.Timestamp(last_day).date())
+            except ValueError:
+                default_range = ()
+            an_range = st.date_input("Listing Dates", value=default_range)
+        with an_col2:
+            all_counts = analytics.listing_counts(DB_FILE)
+            an_complexes = st.multiselect("Court Complexes", sorted(all_counts['court_complex'].unique()))
+        
+        start_day = end_day = None
+        if isinstance(an_range, (list, tuple)) and len(an_range) == 2:
+            start_day, end_day = an_range[0].isoformat(), an_range[1].isoformat()
+        counts = analytics.listing_counts(DB_FILE, start_day, end_day, an_complexes)
+        
+        if counts.empty:
+            st.info("No listings in the selected range.")
+        else:
+            metric_col1, metric_col2, metric_col3 = st.columns(3)
+            metric_col1.metric("Listings", int(counts['cases'].sum()))
+            metric_col2.metric("Listing Days", counts['list_day'].nunique())
+            metric_col3.metric("Court Complexes", counts['court_complex'].nunique())
+            
+            st.subheader("Cases per Day by Court Complex")
+            st.bar_chart(counts.pivot_table(index='list_day', columns='court_complex', values='cases', aggfunc='sum', fill_value=0))
+            
+            st.subheader("Section-wise Listings")
+            top_sections = counts.groupby('section')['cases'].sum().nlargest(8).index
+            section_trend = counts[counts['section'].isin(top_sections)].pivot_table(
+                index='list_day', columns='section', values='cases', aggfunc='sum', fill_value=0
+            )
+            st.line_chart(section_trend)
+            
+            st.subheader("Civil vs Criminal")
+            st.bar_chart(counts.pivot_table(index='court_complex', columns='list_type', values='cases', aggfunc='sum', fill_value=0))
+        
+        st.subheader("Most Listed Advocates")
+        advocates_df = analytics.top_advocates(DB_FILE, start_day, end_day, an_complexes)
+        if not advocates_df.empty:
+            st.bar_chart(advocates_df.set_index('advocate')['listings'])
+            st.dataframe(advocates_df.rename(columns={
+                'advocate': 'Advocate', 'listings': 'Listings', 'days_listed': 'Days Listed'
+            }), use_container_width=True)
+        else:
+            st.info("No advocates listed in the selected range.")
+    
+    if st.button("🔄 Rebuild Summary Tables"):
+        conn = sqlite3.connect(DB_FILE)
+        rebuilt = analytics.rebuild(conn)
+        conn.commit()
+        conn.close()
+        st.success(f"✅ Recounted {rebuilt} cause lists")
@@ -0,0 +1,256 @@
+"""
+Site adapters for district court cause list pages.
+
+Most district courts publish their daily cause lists on the shared
+dcourts.gov.in template, so one adapter drives all of them and adding a
+court is mostly configuration: its cause list URL, the date format its form
+expects and the court complexes it lists. A court with different markup
+gets a subclass of DcourtsCauseListAdapter that overrides the step that
+differs: navigate(), fill_form(), detect_results() or parse().
+
+Adapters never talk to Streamlit; progress messages go through a
+report(level, message) callback with level 'info', 'success' or 'warning'.
+Pooling, rate limiting and the circuit breaker are applied by the caller
+per site URL, so every site shares them.
+
+Extra sites can be registered without code from a JSON file named by the
+COURT_SITES_FILE environment variable:
+
+    [{"key": "...", "name": "...", "url": "https://<district>.dcourts.gov.in/cause-list-%E2%81%84-daily-board/",
+      "complexes": ["..."], "date_format": "%d/%m/%Y"}]
+"""
+import json
+import os
+import time
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+import cause_list_parser
+import form_driver
+import resilience
+
+DEFAULT_COURT_OPTION_KEYWORDS = ['judge', 'court', 'ms.', 'mr.', 'sh.', 'smt.']
+
+
+class DcourtsCauseListAdapter:
+    """Cause list form of a dcourts.gov.in district court site"""
+
+    def __init__(self, key, name, url, complexes=(), date_format="%d/%m/%Y",
+                 court_option_keywords=None, complex_radio_label="court complex"):
+        self.key = key
+        self.name = name
+        self.url = url
+        self.complexes = list(complexes)
+        self.date_format = date_format
+        self.court_option_keywords = court_option_keywords or DEFAULT_COURT_OPTION_KEYWORDS
+        self.complex_radio_label = complex_radio_label
+
+    def format_date(self, date):
+        return date.strftime(self.date_format)
+
+    def navigate(self, driver):
+        def open_cause_list_page():
+            driver.get(self.url)
+            resilience.check_page_for_failure(driver.page_source)
+
+        resilience.retry_step(open_cause_list_page)
+
+    def select_complex(self, driver, court_complex, report):
+        # Step 1: Select "Court Complex" radio button
+        try:
+            form = form_driver.collect_form(driver)
+            for radio in form["radios"]:
+                if self.complex_radio_label in radio["label"].lower() or radio["value"] == "court_complex":
+                    form_driver.apply_form(driver, [{"kind": "click_radio", "index": radio["index"]}])
+                    report("success", "✅ Selected 'Court Complex' radio button")
+                    time.sleep(1)
+                    break
+        except Exception as e:
+            report("warning", f"Could not find Court Complex radio button: {e}")
+
+        # Step 2: Select Court Complex from dropdown
+        try:
+            # Wait for court complex dropdown to appear
+            time.sleep(2)
+            resilience.retry_step(lambda: WebDriverWait(driver, 10).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, "select[name*='complex'], select[id*='complex'], select"))
+            ))
+
+            form = form_driver.collect_form(driver)
+            complex_selects = [sel for sel in form["selects"] if "complex" in (sel["name"] + sel["id"]).lower()]
+            court_dropdown = complex_selects[0] if complex_selects else form["selects"][0]
+            available_courts = [option["text"] for option in court_dropdown["options"] if option["text"]]
+            report("info", f"Available court complexes: {', '.join(available_courts)}")
+
+            option = form_driver.match_option(court_dropdown["options"], court_complex)
+            if option:
+                form_driver.apply_form(driver, [{"kind": "select", "index": court_dropdown["index"], "value": option["value"]}])
+                report("success", f"✅ Selected: {option['text']}")
+            else:
+                report("warning", f"⚠️ Could not auto-select '{court_complex}'. Please select manually.")
+        except Exception as e:
+            report("warning", f"Court complex selection issue: {e}")
+
+    def fill_form(self, driver, court_complex, court_number, list_date, list_type, report, complex_selected=False):
+        """
+        Fill everything except the CAPTCHA; anything that cannot be set is
+        reported for the user to do. complex_selected skips steps 1-2 on a
+        page that still has the complex chosen from the previous fetch.
+        """
+        if not complex_selected:
+            self.select_complex(driver, court_complex, report)
+            time.sleep(4)  # Wait for court dropdown to populate
+
+        # Steps 3-5: Court number, date and Civil/Criminal are read in one snapshot and applied in one call
+        try:
+            form = form_driver.collect_form(driver)
+        except Exception as e:
+            report("warning", f"Could not read the cause list form: {e}. Please complete it manually.")
+            return
+
+        actions = []
+        messages = []
+
+        # Step 3: Select Court Number from dropdown
+        court_num_dropdown = None
+        for select in form["selects"]:
+            options = [opt["text"] for opt in select["options"] if opt["text"]]
+            # Look for judge names or court numbers in options
+            if any(any(keyword in opt.lower() for keyword in self.court_option_keywords) for opt in options):
+                court_num_dropdown = select
+                report("info", f"Found court dropdown with {len(options)} courts")
+                report("info", f"Available courts: {', '.join(options[:3])}...")
+                break
+
+        if court_num_dropdown:
+            if court_number:
+                option = form_driver.match_option(court_num_dropdown["options"], court_number)
+                if option:
+                    actions.append({"kind": "select", "index": court_num_dropdown["index"], "value": option["value"]})
+                    messages.append(f"✅ Selected court: {option['text']}")
+                else:
+                    report("warning", f"⚠️ Could not auto-select court '{court_number}'. Please select manually.")
+            else:
+                report("info", "ℹ️ No court specified. Please select court manually from dropdown.")
+        else:
+            report("warning", "⚠️ Could not find court dropdown. Please select court manually.")
+
+        # Step 4: Set the date
+        date_inputs = []
+        date_selectors = [
+            lambda inp: inp["type"] == "date",
+            lambda inp: "date" in inp["id"].lower(),
+            lambda inp: "date" in inp["name"].lower(),
+            lambda inp: "date" in inp["placeholder"].lower(),
+        ]
+        for matches_selector in date_selectors:
+            for date_input in form["inputs"]:
+                if matches_selector(date_input) and date_input["visible"] and date_input["enabled"] and date_input not in date_inputs:
+                    date_inputs.append(date_input)
+        if date_inputs:
+            actions.append({
+                "kind": "input",
+                "index": date_inputs[0]["index"],
+                # The site's own format first, then the same with dashes
+                "values": [list_date, list_date.replace('/', '-')],
+                "min_length": 8,
+            })
+            messages.append("✅ Set date to: {value}")
+
+        # Step 5: Select Civil/Criminal radio button
+        list_type_radio = next((radio for radio in form["radios"] if radio["value"] and list_type.lower() in radio["value"].lower()), None)
+        list_type_label = next((label for label in form["labels"] if list_type.lower() in label["text"].lower()), None)
+        if list_type_radio:
+            actions.append({"kind": "radio", "index": list_type_radio["index"]})
+            messages.append(f"✅ Selected '{list_type}' list type")
+        elif list_type_label:
+            actions.append({"kind": "label", "index": list_type_label["index"]})
+            messages.append(f"✅ Selected '{list_type}' list type (via label)")
+        else:
+            report("warning", f"⚠️ Could not auto-select '{list_type}'. Please select manually.")
+
+        try:
+            results = form_driver.apply_form(driver, actions)
+            for action, result, success_message in zip(actions, results, messages):
+                if result.get("ok"):
+                    report("success", success_message.replace("{value}", str(result.get("value"))))
+                elif action["kind"] == "select":
+                    report("warning", f"⚠️ Could not auto-select court '{court_number}'. Please select manually.")
+                elif action["kind"] == "input":
+                    # Fall back to the other date-like inputs, one call each
+                    date_set = False
+                    for date_input in date_inputs[1:]:
+                        retry = form_driver.apply_form(driver, [dict(action, index=date_input["index"])])[0]
+                        if retry.get("ok"):
+                            report("success", f"✅ Set date to: {retry['value']}")
+                            date_set = True
+                            break
+                    if not date_set:
+                        report("warning", f"⚠️ Could not automatically set date to {list_date}. Please select date manually from calendar.")
+                elif action["kind"] == "radio" and list_type_label:
+                    form_driver.apply_form(driver, [{"kind": "label", "index": list_type_label["index"]}])
+                    report("success", f"✅ Selected '{list_type}' list type (via label)")
+                else:
+                    report("warning", f"⚠️ Could not auto-select '{list_type}'. Please select manually.")
+            if not date_inputs:
+                report("warning", f"⚠️ Could not automatically set date to {list_date}. Please select date manually from calendar.")
+        except Exception as e:
+            report("warning", f"Form filling issue: {e}. Please complete the form manually.")
+
+    def detect_results(self, raw_html):
+        """True once the page holds a cause list; raises FetchFailure for error pages"""
+        resilience.check_page_for_failure(raw_html)
+        if "<table" not in raw_html.lower():
+            return False
+        rows, _, _ = self.parse(raw_html)
+        return rows is not None
+
+    def parse(self, raw_html):
+        """(rows, headers, notes) as returned by cause_list_parser.parse_cause_list_page"""
+        return cause_list_parser.parse_cause_list_page(raw_html)
+
+
+DEFAULT_SITE = "newdelhi"
+
+SITES = {}
+
+
+def register_site(adapter):
+    SITES[adapter.key] = adapter
+    return adapter
+
+
+def get_site(key=None):
+    return SITES[key or DEFAULT_SITE]
+
+
+def load_sites_file(path):
+    """Register the template sites described in a JSON file; returns how many were added"""
+    with open(path, encoding="utf-8") as f:
+        entries = json.load(f)
+    for entry in entries:
+        register_site(DcourtsCauseListAdapter(**entry))
+    return len(entries)
+
+
+register_site(DcourtsCauseListAdapter(
+    key="newdelhi",
+    name="Delhi District Courts",
+    url="https://newdelhi.dcourts.gov.in/cause-list-%E2%81%84-daily-board/",
+    complexes=[
+        "Patiala House Court Complex",
+        "Tis Hazari Courts Complex",
+        "Karkardooma Courts Complex",
+        "Rohini Courts Complex",
+        "Dwarka Courts Complex",
+        "Saket Courts Complex",
+        "Rouse Avenue Courts Complex",
+    ],
+    # The Delhi form takes MM/DD/YYYY
+    date_format="%m/%d/%Y",
+))
+
+if os.environ.get("COURT_SITES_FILE"):
+    load_sites_file(os.environ["COURT_SITES_FILE"])
@@ -0,0 +1,245 @@
+"""
+Background writer that batches the app's result inserts into few transactions.
+
+Fetch results are handed to a single writer thread per database file instead
+of being committed on the UI thread one transaction each. submit() puts a
+job (a function taking a cursor) on a bounded queue and returns a Future; the
+writer takes the jobs off the queue and runs as many as arrive within
+FLUSH_INTERVAL (at most BATCH_SIZE) in one transaction, each inside its own
+savepoint so a failing job is rolled back without losing the rest of the
+batch. A job's Future is resolved only after its transaction is committed,
+so a caller that needs the new row id (or needs the row to be readable)
+waits on it; everyone else moves on.
+
+If BEGIN IMMEDIATE or COMMIT fails because another process holds the
+database (sqlite3.OperationalError), the transaction is rolled back and the
+whole batch is run again after a growing pause, up to COMMIT_ATTEMPTS times;
+only then do all of its jobs fail. Jobs must therefore be safe to run again.
+
+When the queue is full, submit() blocks until the writer catches up, which
+bounds the memory held by pending results. close() (registered with atexit)
+stops accepting jobs and commits everything still queued before the process
+exits. stats() reports the queue depth and commit latency.
+"""
+import atexit
+import queue
+import sqlite3
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+MAX_QUEUE = 256
+BATCH_SIZE = 64
+FLUSH_INTERVAL = 0.25  # Seconds a batch stays open for more jobs after its first one
+LATENCY_WINDOW = 500  # Recent commits the latency percentiles are taken over
+BUSY_TIMEOUT = 30  # Seconds sqlite waits for a lock before raising
+COMMIT_ATTEMPTS = 5
+RETRY_DELAY = 0.1  # Seconds before the first retry of a batch, doubled for each next one
+MAX_RETRY_DELAY = 2.0
+
+_STOP = object()
+
+
+def _flush_marker(cursor):
+    return None
+
+
+class WriterClosed(RuntimeError):
+    pass
+
+
+class DBWriter:
+    def __init__(self, db_file, max_queue=MAX_QUEUE, batch_size=BATCH_SIZE, flush_interval=FLUSH_INTERVAL,
+                 busy_timeout=BUSY_TIMEOUT):
+        self.db_file = db_file
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.busy_timeout = busy_timeout
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._closed = False
+        self._lock = threading.Lock()
+        self._commit_ms = deque(maxlen=LATENCY_WINDOW)
+        self.max_depth = 0
+        self.jobs_committed = 0
+        self.jobs_failed = 0
+        self.batches = 0
+        self.blocked_submits = 0
+        self.retries = 0
+        self.last_error = None
+        self._pending = 0
+        self._thread = threading.Thread(target=self._run, name="db-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, job, *args):
+        """Queue job(cursor, *args); the Future resolves to its return value once committed"""
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise WriterClosed(f"the writer for {self.db_file} is closed")
+            self._pending += 1
+        try:
+            self._queue.put_nowait((job, args, future))
+        except queue.Full:
+            with self._lock:
+                self.blocked_submits += 1
+            self._queue.put((job, args, future))
+        with self._lock:
+            self.max_depth = max(self.max_depth, self._queue.qsize())
+        return future
+
+    def flush(self, timeout=None):
+        """Wait until everything submitted before this call is committed; returns at once if nothing is pending"""
+        with self._lock:
+            if not self._pending:
+                return
+        # The marker also closes the open batch instead of waiting out FLUSH_INTERVAL
+        self.submit(_flush_marker).result(timeout)
+
+    def close(self, timeout=30):
+        """Stop accepting jobs, commit the queued ones and stop the thread"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        # A submit() that raced with close() is failed instead of left waiting
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP:
+                item[2].set_exception(WriterClosed(f"the writer for {self.db_file} closed before this job ran"))
+
+    def _next_batch(self):
+        first = self._queue.get()
+        if first is _STOP:
+            return [], True
+        batch = [first]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+            if item[0] is _flush_marker:
+                break
+        return batch, False
+
+    def _run_batch(self, conn, batch):
+        """One transaction over the batch; a job's own error only rolls back its savepoint"""
+        results = []
+        conn.execute("BEGIN IMMEDIATE")
+        cursor = conn.cursor()
+        for job, args, _ in batch:
+            cursor.execute("SAVEPOINT job")
+            try:
+                results.append((job(cursor, *args), None))
+                cursor.execute("RELEASE job")
+            except Exception as e:
+                cursor.execute("ROLLBACK TO job")
+                cursor.execute("RELEASE job")
+                results.append((None, e))
+        conn.execute("COMMIT")
+        return results
+
+    def _write(self, conn, batch):
+        started = time.perf_counter()
+        for attempt in range(1, COMMIT_ATTEMPTS + 1):
+            try:
+                results = self._run_batch(conn, batch)
+                break
+            except Exception as e:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                # Locked by another process: run the whole batch again once it had time to finish
+                if isinstance(e, sqlite3.OperationalError) and attempt < COMMIT_ATTEMPTS:
+                    with self._lock:
+                        self.retries += 1
+                    time.sleep(min(MAX_RETRY_DELAY, RETRY_DELAY * 2 ** (attempt - 1)))
+                    continue
+                results = [(None, e)] * len(batch)
+                break
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        failed = [error for _, error in results if error is not None]
+        markers = sum(1 for job, _, _ in batch if job is _flush_marker)
+        with self._lock:
+            self._commit_ms.append(elapsed_ms)
+            self.batches += 1
+            self.jobs_committed += len(batch) - len(failed) - markers
+            self.jobs_failed += len(failed)
+            self._pending -= len(batch)
+            if failed:
+                self.last_error = f"{type(failed[-1]).__name__}: {failed[-1]}"
+        for (_, _, future), (result, error) in zip(batch, results):
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
+
+    def _run(self):
+        # Autocommit mode: transactions and savepoints are opened explicitly
+        conn = sqlite3.connect(self.db_file, timeout=self.busy_timeout, isolation_level=None)
+        try:
+            stopping = False
+            while not stopping:
+                batch, stopping = self._next_batch()
+                if stopping:
+                    # Take whatever was queued before close() too
+                    while True:
+                        try:
+                            item = self._queue.get_nowait()
+                        except queue.Empty:
+                            break
+                        if item is not _STOP:
+                            batch.append(item)
+                if batch:
+                    self._write(conn, batch)
+        finally:
+            conn.close()
+
+    def stats(self):
+        with self._lock:
+            latencies = sorted(self._commit_ms)
+            return {
+                "queue_depth": self._queue.qsize(),
+                "pending": self._pending,  # Queued or in the batch being written
+                "max_depth": self.max_depth,
+                "queue_capacity": self._queue.maxsize,
+                "batches": self.batches,
+                "jobs_committed": self.jobs_committed,
+                "jobs_failed": self.jobs_failed,
+                "avg_batch": round(self.jobs_committed / self.batches, 1) if self.batches else 0,
+                "blocked_submits": self.blocked_submits,
+                "retries": self.retries,  # Batches run again after the database was locked
+                "commit_ms_last": round(self._commit_ms[-1], 1) if latencies else None,
+                "commit_ms_p50": round(latencies[len(latencies) // 2], 1) if latencies else None,
+                "commit_ms_p95": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 1) if latencies else None,
+                "last_error": self.last_error,
+            }
+
+
+_writers = {}
+_writers_lock = threading.Lock()
+
+
+def get_writer(db_file):
+    with _writers_lock:
+        writer = _writers.get(db_file)
+        if writer is None or writer._closed:
+            writer = _writers[db_file] = DBWriter(db_file)
+        return writer
+
+
+@atexit.register
+def close_all():
+    with _writers_lock:
+        writers = list(_writers.values())
+    for writer in writers:
+        writer.close()
@@ -0,0 +1,153 @@
+"""
+Batched form filling over WebDriver.
+
+Every WebDriver call (find_element, get_attribute, .text, execute_script,
+is_selected) is an HTTP round-trip to chromedriver. Instead of walking the
+form element by element, collect_form() reads all selects, radios, inputs
+and their options in one execute_script call, the caller decides what to
+change in Python, and apply_form() performs every change (plus the input /
+change / blur events the page listens for) in one more call.
+"""
+
+COLLECT_FORM_JS = """
+function visible(el) {
+    return !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+}
+function labelFor(el) {
+    if (el.id) {
+        var label = document.querySelector('label[for="' + CSS.escape(el.id) + '"]');
+        if (label) return label.innerText.trim();
+    }
+    var parent = el.closest('label');
+    return parent ? parent.innerText.trim() : '';
+}
+var form = {selects: [], radios: [], inputs: [], labels: []};
+document.querySelectorAll('select').forEach(function (el, i) {
+    form.selects.push({
+        index: i, id: el.id || '', name: el.name || '', visible: visible(el),
+        value: el.value,
+        options: Array.prototype.map.call(el.options, function (opt) {
+            return {value: opt.value, text: (opt.text || '').trim(), selected: opt.selected};
+        })
+    });
+});
+document.querySelectorAll('input[type="radio"]').forEach(function (el, i) {
+    form.radios.push({
+        index: i, id: el.id || '', name: el.name || '', value: el.value || '',
+        label: labelFor(el), checked: el.checked
+    });
+});
+document.querySelectorAll('input:not([type="radio"]):not([type="checkbox"]):not([type="hidden"])').forEach(function (el, i) {
+    form.inputs.push({
+        index: i, id: el.id || '', name: el.name || '', type: (el.type || '').toLowerCase(),
+        placeholder: el.placeholder || '', className: el.className || '',
+        visible: visible(el), enabled: !el.disabled && !el.readOnly, value: el.value
+    });
+});
+document.querySelectorAll('label').forEach(function (el, i) {
+    form.labels.push({index: i, text: el.innerText.trim()});
+});
+return form;
+"""
+
+APPLY_FORM_JS = """
+var actions = arguments[0];
+var selects = document.querySelectorAll('select');
+var radios = document.querySelectorAll('input[type="radio"]');
+var inputs = document.querySelectorAll('input:not([type="radio"]):not([type="checkbox"]):not([type="hidden"])');
+var labels = document.querySelectorAll('label');
+function fire(el, names) {
+    names.forEach(function (name) {
+        el.dispatchEvent(new Event(name, {bubbles: true}));
+    });
+}
+return actions.map(function (action) {
+    try {
+        if (action.kind === 'select') {
+            var select = selects[action.index];
+            select.value = action.value;
+            fire(select, ['change']);
+            return {ok: select.value === action.value, value: select.value};
+        }
+        if (action.kind === 'radio') {
+            var radio = radios[action.index];
+            radio.checked = true;
+            radio.click();
+            fire(radio, ['change']);
+            return {ok: radio.checked, value: radio.value};
+        }
+        if (action.kind === 'click_radio') {
+            radios[action.index].click();
+            return {ok: true, value: radios[action.index].value};
+        }
+        if (action.kind === 'label') {
+            labels[action.index].click();
+            return {ok: true, value: labels[action.index].innerText.trim()};
+        }
+        if (action.kind === 'input') {
+            var input = inputs[action.index];
+            var candidates = action.values || [action.value];
+            for (var i = 0; i < candidates.length; i++) {
+                input.focus();
+                input.value = '';
+                input.value = candidates[i];
+                fire(input, ['input', 'change', 'blur']);
+                if (input.value && input.value.length >= (action.min_length || 1)) {
+                    return {ok: true, value: candidates[i]};
+                }
+            }
+            return {ok: false, value: input.value};
+        }
+        return {ok: false, error: 'unknown action ' + action.kind};
+    } catch (e) {
+        return {ok: false, error: String(e)};
+    }
+});
+"""
+
+READ_SELECT_JS = """
+var el = arguments[0];
+return Array.prototype.map.call(el.options, function (opt) {
+    return {value: opt.value, text: (opt.text || '').trim(), selected: opt.selected};
+});
+"""
+
+SET_SELECT_JS = """
+var el = arguments[0];
+el.value = arguments[1];
+el.dispatchEvent(new Event('change', {bubbles: true}));
+return el.value === arguments[1];
+"""
+
+
+def collect_form(driver):
+    """Snapshot of every select, radio, text-like input and label on the page"""
+    return driver.execute_script(COLLECT_FORM_JS)
+
+
+def apply_form(driver, actions):
+    """Apply a list of actions in one round-trip; returns one {ok, value} per action"""
+    if not actions:
+        return []
+    return driver.execute_script(APPLY_FORM_JS, actions)
+
+
+def read_options(driver, select_element):
+    """All options of one <select> in a single call instead of one per option"""
+    return driver.execute_script(READ_SELECT_JS, select_element)
+
+
+def set_select_value(driver, select_element, value):
+    return driver.execute_script(SET_SELECT_JS, select_element, value)
+
+
+def match_option(options, wanted):
+    """Exact visible-text match first, then case-insensitive containment"""
+    wanted_lower = wanted.strip().lower()
+    for option in options:
+        if option["text"] == wanted.strip():
+            return option
+    for option in options:
+        if option["text"] and wanted_lower in option["text"].lower():
+            return option
+    return None
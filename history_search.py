@@ -0,0 +1,130 @@
+"""
+Full-text search over stored party and advocate names.
+
+Two external-content FTS5 tables index cause_list_rows and the parties
+column of queries. Triggers keep them in sync with the base tables, so the
+index never needs a separate refresh and holds no second copy of the text.
+"""
+import re
+import sqlite3
+
+import pandas as pd
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+_FTS_TABLES = [
+    # (fts table, base table, indexed columns)
+    ("cause_list_rows_fts", "cause_list_rows", ["case_text", "party_text", "advocate_text"]),
+    ("queries_fts", "queries", ["parties"]),
+]
+
+
+def fts5_available(conn):
+    try:
+        conn.execute("CREATE VIRTUAL TABLE IF NOT EXISTS temp.fts5_probe USING fts5(x)")
+        conn.execute("DROP TABLE temp.fts5_probe")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+def setup_search_index(conn):
+    """Create the FTS5 tables and sync triggers; returns False if FTS5 is unavailable"""
+    if not fts5_available(conn):
+        return False
+
+    cursor = conn.cursor()
+    for fts_table, base_table, columns in _FTS_TABLES:
+        exists = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (fts_table,)
+        ).fetchone()
+
+        column_list = ", ".join(columns)
+        new_values = ", ".join(f"new.{col}" for col in columns)
+        old_values = ", ".join(f"old.{col}" for col in columns)
+
+        cursor.execute(f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS {fts_table} USING fts5(
+            {column_list},
+            content='{base_table}',
+            content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2'
+        )
+        """)
+        cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {fts_table}_ai AFTER INSERT ON {base_table} BEGIN
+            INSERT INTO {fts_table} (rowid, {column_list}) VALUES (new.id, {new_values});
+        END
+        """)
+        cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {fts_table}_ad AFTER DELETE ON {base_table} BEGIN
+            INSERT INTO {fts_table} ({fts_table}, rowid, {column_list}) VALUES ('delete', old.id, {old_values});
+        END
+        """)
+        cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {fts_table}_au AFTER UPDATE OF {column_list} ON {base_table} BEGIN
+            INSERT INTO {fts_table} ({fts_table}, rowid, {column_list}) VALUES ('delete', old.id, {old_values});
+            INSERT INTO {fts_table} (rowid, {column_list}) VALUES (new.id, {new_values});
+        END
+        """)
+
+        # Index rows stored before the search table existed
+        if not exists:
+            cursor.execute(f"INSERT INTO {fts_table} ({fts_table}) VALUES ('rebuild')")
+    return True
+
+
+def build_match_query(text):
+    """Turn free text into an FTS5 query: every word must appear, the last one as a prefix"""
+    tokens = _TOKEN.findall(text or "")
+    if not tokens:
+        return None
+    terms = [f'"{token}"' for token in tokens]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+# One ranked query per FTS table
+_SOURCE_QUERIES = [
+    """SELECT 'Cause List' AS source, c.list_date AS date, c.court_complex AS detail,
+              r.case_text AS case_ref,
+              snippet(cause_list_rows_fts, -1, '[', ']', ' … ', 12) AS snippet
+       FROM cause_list_rows_fts
+       JOIN cause_list_rows r ON r.id = cause_list_rows_fts.rowid
+       JOIN cause_lists c ON c.id = r.cause_list_id
+       WHERE cause_list_rows_fts MATCH ?
+       ORDER BY bm25(cause_list_rows_fts, 1.0, 2.0, 2.0) LIMIT ?""",
+    """SELECT 'Case Status' AS source, q.timestamp AS date, q.case_status AS detail,
+              q.case_type || ' ' || q.case_number || '/' || q.case_year AS case_ref,
+              snippet(queries_fts, -1, '[', ']', ' … ', 12) AS snippet
+       FROM queries_fts
+       JOIN queries q ON q.id = queries_fts.rowid
+       WHERE queries_fts MATCH ?
+       ORDER BY bm25(queries_fts) LIMIT ?""",
+]
+
+
+def search_history(db_file, text, limit=50):
+    """
+    Return cause list and case status matches with highlighted snippets.
+    bm25 scores of the two FTS tables are not comparable (different columns,
+    weights and document statistics), so each source is ranked on its own
+    and the two rankings are interleaved; rank is the position within the
+    match's own source.
+    """
+    match_query = build_match_query(text)
+    if not match_query:
+        return pd.DataFrame()
+
+    conn = sqlite3.connect(db_file)
+    try:
+        frames = []
+        for query in _SOURCE_QUERIES:
+            df = pd.read_sql_query(query, conn, params=(match_query, limit))
+            df["rank"] = range(1, len(df) + 1)
+            frames.append(df)
+    finally:
+        conn.close()
+    df = pd.concat(frames, ignore_index=True)
+    # Stable sort on the per-source position: best cause list match, best case status match, second of each, ...
+    return df.sort_values("rank", kind="stable").head(limit).reset_index(drop=True)
@@ -0,0 +1,329 @@
+"""
+PDF reports for case details and cause lists.
+
+A PdfRenderer builds its paragraph styles and table styles once and keeps
+the column layout of every header schema it has seen, so rendering many
+documents only costs the table cells themselves. Cause lists can be written
+one PDF each, all into one combined PDF, or as a ZIP of PDFs in one pass;
+the renderer counts pages and render time so batch exports can report
+pages/sec.
+
+Cells that fit on one line are drawn as plain strings in the cell style's
+font; only longer cells become wrapping Paragraphs, which cost far more
+memory and time per cell.
+
+The renderer holds no per-document state and is shared between threads
+(get_renderer()); only its counters are guarded by a lock.
+"""
+import threading
+import time
+import zipfile
+from io import BytesIO
+
+import pandas as pd
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER, TA_LEFT
+from reportlab.lib.pagesizes import A4, letter
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.lib.units import inch
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.platypus import PageBreak, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+import cause_list_parser
+
+CAUSE_LIST_TABLE_WIDTH = 7.5 * inch  # Total available width on A4
+CAUSE_CELL_PADDING = 10  # LEFTPADDING + RIGHTPADDING of cause_table_style
+
+CASE_HISTORY_SECTIONS = [
+    ("Case History", 'hearings', [('judge', 'Judge'), ('business_on_date', 'Business On Date'), ('hearing_date', 'Hearing Date'), ('purpose', 'Purpose')]),
+    ("Orders", 'orders', [('order_number', 'Order Number'), ('order_date', 'Order Date'), ('order_details', 'Order Details')]),
+]
+
+
+def column_width(column):
+    """Width for one cause list column, from its name"""
+    col_lower = str(column).lower()
+    if 'serial' in col_lower or 'sr' in col_lower or 'no' in col_lower:
+        return 0.5 * inch  # Serial number - narrow
+    if 'case' in col_lower or 'type' in col_lower or 'number' in col_lower:
+        return 1.5 * inch  # Case details - medium
+    if 'party' in col_lower or 'name' in col_lower:
+        return 3.0 * inch  # Party names - widest
+    if 'advocate' in col_lower or 'lawyer' in col_lower:
+        return 1.5 * inch  # Advocate - medium
+    return 1.0 * inch  # Default
+
+
+class PdfRenderer:
+    def __init__(self):
+        styles = getSampleStyleSheet()
+        self.styles = styles
+
+        # Case details report
+        self.case_title_style = ParagraphStyle('CustomTitle', parent=styles['Heading1'], fontSize=24,
+                                               textColor=colors.HexColor('#1f77b4'), spaceAfter=30, alignment=TA_CENTER)
+        self.case_heading_style = ParagraphStyle('CustomHeading', parent=styles['Heading2'], fontSize=14,
+                                                 textColor=colors.HexColor('#2c3e50'), spaceAfter=12, spaceBefore=12)
+        self.case_cell_style = ParagraphStyle('CaseCellStyle', parent=styles['Normal'], fontSize=8, leading=10)
+        self.case_info_table_style = TableStyle([
+            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#ecf0f1')),
+            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+            ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+            ('TOPPADDING', (0, 0), (-1, -1), 12),
+            ('GRID', (0, 0), (-1, -1), 1, colors.grey)
+        ])
+        self.fetched_table_style = TableStyle([
+            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#e8f4f8')),
+            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+            ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+            ('TOPPADDING', (0, 0), (-1, -1), 12),
+            ('GRID', (0, 0), (-1, -1), 1, colors.grey),
+            ('VALIGN', (0, 0), (-1, -1), 'TOP')
+        ])
+        self.history_table_style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#e8f4f8')),
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey)
+        ])
+
+        # Cause list report
+        self.list_title_style = ParagraphStyle('CustomTitle', parent=styles['Heading1'], fontSize=16,
+                                               textColor=colors.HexColor('#1f77b4'), spaceAfter=15, alignment=TA_CENTER)
+        # Cell text style for wrapping
+        self.cell_style = ParagraphStyle('CellStyle', parent=styles['Normal'], fontSize=7, leading=9,
+                                         alignment=TA_LEFT, wordWrap='CJK')
+        self.header_cell_style = ParagraphStyle('HeaderCellStyle', parent=styles['Normal'], fontSize=8, leading=10,
+                                                alignment=TA_CENTER, textColor=colors.whitesmoke,
+                                                fontName='Helvetica-Bold', wordWrap='CJK')
+        self.list_header_table_style = TableStyle([
+            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#ecf0f1')),
+            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), 8),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+            ('TOPPADDING', (0, 0), (-1, -1), 6),
+            ('GRID', (0, 0), (-1, -1), 1, colors.grey)
+        ])
+        self.cause_table_style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#3498db')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (0, -1), 'CENTER'),  # Serial number centered
+            ('ALIGN', (1, 1), (-1, -1), 'LEFT'),   # Rest left-aligned
+            ('ALIGN', (0, 1), (0, -1), 'LEFT'),    # Plain-string cells align like the cell_style paragraphs
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 8),
+            ('FONTNAME', (0, 1), (-1, -1), self.cell_style.fontName),
+            ('FONTSIZE', (0, 1), (-1, -1), self.cell_style.fontSize),
+            ('LEADING', (0, 1), (-1, -1), self.cell_style.leading),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+            ('TOPPADDING', (0, 0), (-1, -1), 8),
+            ('LEFTPADDING', (0, 0), (-1, -1), 5),
+            ('RIGHTPADDING', (0, 0), (-1, -1), 5),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f8f9fa')])
+        ])
+
+        # Header schema -> (column widths, header cell markup)
+        self._layouts = {}
+        self._lock = threading.Lock()
+        self.documents = 0
+        self.pages = 0
+        self.seconds = 0.0
+
+    def cause_list_layout(self, columns):
+        """Column widths and header cell markup for a header schema, built once per schema.
+        Paragraphs themselves are not cached: reportlab keeps layout state on
+        them while wrapping, so they cannot be shared between threads."""
+        key = tuple(str(col) for col in columns)
+        layout = self._layouts.get(key)
+        if layout is None:
+            widths = [column_width(col) for col in key]
+            # Normalize to fit total width
+            current_total = sum(widths)
+            if current_total > CAUSE_LIST_TABLE_WIDTH:
+                scale_factor = CAUSE_LIST_TABLE_WIDTH / current_total
+                widths = [w * scale_factor for w in widths]
+            header_markup = [f"<b>{col}</b>" for col in key]
+            layout = self._layouts.setdefault(key, (widths, header_markup))
+        return layout
+
+    def cause_table(self, columns, rows):
+        widths, header_markup = self.cause_list_layout(columns)
+        cell_style = self.cell_style
+        font_name, font_size = cell_style.fontName, cell_style.fontSize
+        text_widths = [width - CAUSE_CELL_PADDING for width in widths]
+        table_data = [[Paragraph(markup, self.header_cell_style) for markup in header_markup]]
+        for row in rows:
+            cells = []
+            for val, text_width in zip(row, text_widths):
+                text = str(val) if pd.notna(val) else ''
+                # Only text that needs wrapping pays for a Paragraph
+                if '\n' in text or stringWidth(text, font_name, font_size) > text_width:
+                    cells.append(Paragraph(text, cell_style))
+                else:
+                    cells.append(text)
+            table_data.append(cells)
+        cause_table = Table(table_data, colWidths=widths, repeatRows=1)
+        cause_table.setStyle(self.cause_table_style)
+        return cause_table
+
+    def case_details_flowables(self, case_data, case_type, case_number, case_year):
+        elements = [Paragraph("<b>Case Details Report</b>", self.case_title_style), Spacer(1, 12)]
+
+        case_info_data = [
+            ['Case Type:', case_type],
+            ['Case Number:', case_number],
+            ['Case Year:', str(case_year)],
+            ['Generated On:', pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')]
+        ]
+        case_info_table = Table(case_info_data, colWidths=[2*inch, 4*inch])
+        case_info_table.setStyle(self.case_info_table_style)
+        elements += [case_info_table, Spacer(1, 20)]
+
+        elements.append(Paragraph("<b>Fetched Information</b>", self.case_heading_style))
+        fetched_data = []
+        for key, value in case_data.items():
+            if isinstance(value, list):
+                # Acts, hearings and orders get their own sections below
+                continue
+            fetched_data.append([key.replace('_', ' ').title() + ':', str(value) if value is not None else ''])
+        fetched_table = Table(fetched_data, colWidths=[2*inch, 4*inch])
+        fetched_table.setStyle(self.fetched_table_style)
+        elements.append(fetched_table)
+
+        if case_data.get('acts'):
+            elements.append(Paragraph("<b>Acts / Sections</b>", self.case_heading_style))
+            for act in case_data['acts']:
+                elements.append(Paragraph(act, self.styles['Normal']))
+
+        # Hearing history and orders as wrapped tables
+        for title, key, columns in CASE_HISTORY_SECTIONS:
+            rows = case_data.get(key) or []
+            if not rows:
+                continue
+            elements.append(Paragraph(f"<b>{title}</b>", self.case_heading_style))
+            table_data = [[Paragraph(f"<b>{label}</b>", self.case_cell_style) for _, label in columns]]
+            for row in rows:
+                table_data.append([Paragraph(str(row.get(field) or ''), self.case_cell_style) for field, _ in columns])
+            history_table = Table(table_data, colWidths=[6*inch / len(columns)] * len(columns), repeatRows=1)
+            history_table.setStyle(self.history_table_style)
+            elements.append(history_table)
+        return elements
+
+    def cause_list_flowables(self, df, court_complex, date, list_type):
+        elements = [Paragraph(f"<b>{list_type} Cause List Report</b>", self.list_title_style)]
+
+        header_data = [
+            ['Court Complex:', court_complex],
+            ['Date:', date],
+            ['List Type:', list_type],
+            ['Total Cases:', str(len(df))],
+            ['Generated On:', pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')]
+        ]
+        header_table = Table(header_data, colWidths=[1.5*inch, 4.5*inch])
+        header_table.setStyle(self.list_header_table_style)
+        elements += [header_table, Spacer(1, 15)]
+
+        if 'Section' not in df.columns:
+            elements.append(self.cause_table(df.columns, df.itertuples(index=False, name=None)))
+            return elements
+
+        # Group rows by section, in order of first appearance, without copying the frame per section
+        section_col = df.columns.get_loc('Section')
+        columns = [col for col in df.columns if col != 'Section']
+        sections = {}
+        for row in df.itertuples(index=False, name=None):
+            sections.setdefault(row[section_col], []).append(row[:section_col] + row[section_col + 1:])
+        for position, (section, rows) in enumerate(sections.items()):
+            elements.append(Paragraph(f"<b>{section} ({len(rows)} cases)</b>", self.styles['Heading3']))
+            elements.append(Spacer(1, 8))
+            elements.append(self.cause_table(columns, rows))
+            elements.append(Spacer(1, 12))
+            # Add page break between sections (except last)
+            if position < len(sections) - 1:
+                elements.append(PageBreak())
+        return elements
+
+    def build(self, elements, **page):
+        """Render flowables into PDF bytes and count the pages"""
+        start = time.perf_counter()
+        buffer = BytesIO()
+        doc = SimpleDocTemplate(buffer, **page)
+        doc.build(elements)
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self.documents += 1
+            self.pages += doc.page
+            self.seconds += elapsed
+        return buffer.getvalue()
+
+    def case_details_pdf(self, case_data, case_type, case_number, case_year):
+        return self.build(self.case_details_flowables(case_data, case_type, case_number, case_year),
+                          pagesize=letter, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=18)
+
+    def cause_list_pdf(self, df, court_complex, date, list_type):
+        return self.build(self.cause_list_flowables(df, court_complex, date, list_type),
+                          pagesize=A4, rightMargin=20, leftMargin=20, topMargin=30, bottomMargin=18)
+
+    def combined_cause_lists_pdf(self, cause_lists):
+        """One PDF with every (df, court_complex, date, list_type), each starting on a new page"""
+        elements = []
+        for df, court_complex, date, list_type in cause_lists:
+            if elements:
+                elements.append(PageBreak())
+            elements += self.cause_list_flowables(df, court_complex, date, list_type)
+        return self.build(elements, pagesize=A4, rightMargin=20, leftMargin=20, topMargin=30, bottomMargin=18)
+
+    def cause_lists_zip(self, cause_lists):
+        """ZIP of one PDF per (file_name, df, court_complex, date, list_type)"""
+        buffer = BytesIO()
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+            for file_name, df, court_complex, date, list_type in cause_lists:
+                archive.writestr(file_name, self.cause_list_pdf(df, court_complex, date, list_type))
+        return buffer.getvalue()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "documents": self.documents,
+                "pages": self.pages,
+                "seconds": round(self.seconds, 3),
+                "pages_per_second": round(self.pages / self.seconds, 1) if self.seconds else 0.0,
+            }
+
+
+def stored_cause_list(conn, cause_list_id):
+    """A stored cause list as (df, court_complex, list_date, list_type), or None if it has no rows"""
+    info = conn.execute(
+        "SELECT court_complex, list_date, list_type FROM cause_lists WHERE id = ?", (cause_list_id,)
+    ).fetchone()
+    if not info:
+        return None
+    rows, headers = cause_list_parser.load_rows(conn, cause_list_id)
+    if not rows:
+        return None
+    rows, headers, _ = cause_list_parser.normalize_table(rows, headers)
+    return (cause_list_parser.to_frame(rows, headers),) + tuple(str(value or '') for value in info)
+
+
+def cause_list_file_name(cause_list_id, court_complex, list_date, list_type):
+    stem = "_".join(str(part) for part in (court_complex, list_date, list_type) if part)
+    safe = "".join(ch if ch.isalnum() or ch in "-_" else "_" for ch in stem.replace(" ", "_"))
+    return f"cause_list_{cause_list_id}_{safe}.pdf"
+
+
+_renderer = PdfRenderer()
+
+
+def get_renderer():
+    return _renderer
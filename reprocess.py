@@ -0,0 +1,198 @@
+"""
+Resumable, parallel re-parsing of stored raw HTML.
+
+When a parser improves, the pages already stored in the database can be
+re-parsed instead of fetched again:
+
+    python reprocess.py case_status --db case_data.db --workers 4
+    python reprocess.py case_status --restart      # ignore the checkpoint
+    python reprocess.py cause_list                 # re-run the cause list table heuristics
+
+Rows are streamed from SQLite in id order (keyset pagination, one chunk at a
+time), parsed in a ProcessPoolExecutor, and written back one transaction per
+chunk together with the job's checkpoint, so an interrupted run resumes after
+the last committed chunk.
+"""
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import analytics
+import case_parser
+import cause_list_parser
+import court_sites
+import snapshots
+
+
+def parse_case_status_chunk(rows):
+    results = []
+    for query_id, raw_html in rows:
+        try:
+            results.append((query_id, case_parser.parse_case_page(raw_html or "").to_dict(), None))
+        except Exception as e:
+            results.append((query_id, None, str(e)))
+    return results
+
+
+def parse_cause_list_chunk(rows):
+    results = []
+    for cause_list_id, html_zlib, site_key in rows:
+        try:
+            data, headers, notes = court_sites.get_site(site_key).parse(snapshots.decompress(html_zlib))
+            if not data:
+                raise ValueError(notes[-1])
+            data, headers, _ = cause_list_parser.normalize_table(data, headers)
+            results.append((cause_list_id, {"rows": data, "headers": headers}, None))
+        except Exception as e:
+            results.append((cause_list_id, None, str(e)))
+    return results
+
+
+def setup_cause_list_job(conn):
+    snapshots.setup_snapshot_tables(conn)
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(cause_lists)")}
+    if "site" not in columns:
+        raise SystemExit("cause_lists has no snapshot_id/site columns yet; start the app once to upgrade the database")
+    analytics.setup_analytics_tables(conn)
+    analytics.backfill_if_empty(conn)
+
+
+def write_cause_list(cursor, cause_list_id, data):
+    analytics.forget_cause_list_rows(cursor, cause_list_id)
+    cursor.execute("DELETE FROM cause_list_rows WHERE cause_list_id = ?", (cause_list_id,))
+    cause_list_parser.store_rows(cursor, cause_list_id, data["headers"], data["rows"])
+    analytics.record_cause_list(cursor, cause_list_id)
+    cursor.execute(
+        "UPDATE cause_lists SET total_cases = ?, headers = ? WHERE id = ?",
+        (len(data["rows"]), json.dumps(data["headers"]), cause_list_id)
+    )
+
+
+def write_case_status(cursor, query_id, data):
+    case_parser.store_case_record(cursor, query_id, data)
+    cursor.execute(
+        "UPDATE queries SET parties = ?, filing_date = ?, case_status = ? WHERE id = ?",
+        (data["parties"], data["filing_date"], data["status"], query_id)
+    )
+
+
+# job name -> (setup(conn), chunk query taking (last_id, limit), parse(rows) in a worker, write(cursor, id, result))
+JOBS = {
+    "case_status": (
+        case_parser.setup_case_detail_tables,
+        "SELECT id, raw_response_html FROM queries WHERE id > ? ORDER BY id LIMIT ?",
+        parse_case_status_chunk,
+        write_case_status,
+    ),
+    "cause_list": (
+        setup_cause_list_job,
+        """SELECT c.id, s.html_zlib, c.site FROM cause_lists c JOIN page_snapshots s ON s.id = c.snapshot_id
+           WHERE c.id > ? ORDER BY c.id LIMIT ?""",
+        parse_cause_list_chunk,
+        write_cause_list,
+    ),
+}
+
+
+def setup_checkpoints(conn):
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS reprocess_checkpoints (
+        job TEXT PRIMARY KEY,
+        last_id INTEGER NOT NULL,
+        rows_done INTEGER NOT NULL,
+        updated DATETIME DEFAULT CURRENT_TIMESTAMP
+    )
+    """)
+
+
+def load_checkpoint(conn, job):
+    row = conn.execute("SELECT last_id, rows_done FROM reprocess_checkpoints WHERE job = ?", (job,)).fetchone()
+    return row if row else (0, 0)
+
+
+def save_checkpoint(cursor, job, last_id, rows_done):
+    cursor.execute(
+        """INSERT INTO reprocess_checkpoints (job, last_id, rows_done, updated)
+           VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+           ON CONFLICT(job) DO UPDATE SET last_id = excluded.last_id, rows_done = excluded.rows_done,
+                                          updated = excluded.updated""",
+        (job, last_id, rows_done)
+    )
+
+
+def run(job, db_file, workers=None, chunk_size=500, restart=False, progress=print):
+    """Re-parse every row after the job's checkpoint; returns (rows parsed, rows failed, seconds)"""
+    setup, chunk_query, parse, write = JOBS[job]
+    conn = sqlite3.connect(db_file)
+    setup(conn)
+    setup_checkpoints(conn)
+    if restart:
+        conn.execute("DELETE FROM reprocess_checkpoints WHERE job = ?", (job,))
+    conn.commit()
+
+    last_id, rows_done = load_checkpoint(conn, job)
+    started = time.perf_counter()
+    parsed = failed = 0
+
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        max_in_flight = 2 * workers
+        in_flight = deque()
+        exhausted = False
+        while in_flight or not exhausted:
+            # Keep the pool busy without reading the whole table into memory
+            while not exhausted and len(in_flight) < max_in_flight:
+                rows = conn.execute(chunk_query, (last_id, chunk_size)).fetchall()
+                if not rows:
+                    exhausted = True
+                    break
+                last_id = rows[-1][0]
+                in_flight.append((last_id, executor.submit(parse, rows)))
+
+            if not in_flight:
+                break
+
+            # Chunks are written in submission order so the checkpoint only moves forward
+            chunk_last_id, future = in_flight.popleft()
+            cursor = conn.cursor()
+            for row_id, result, error in future.result():
+                if error:
+                    failed += 1
+                    print(f"{job} row {row_id}: {error}", file=sys.stderr)
+                    continue
+                write(cursor, row_id, result)
+                parsed += 1
+            rows_done_total = rows_done + parsed + failed
+            save_checkpoint(cursor, job, chunk_last_id, rows_done_total)
+            conn.commit()
+
+            elapsed = time.perf_counter() - started
+            progress(f"{job}: {rows_done_total} rows (last id {chunk_last_id}), {parsed / elapsed if elapsed else 0:.0f} rows/sec")
+
+    conn.close()
+    return parsed, failed, time.perf_counter() - started
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("job", choices=sorted(JOBS))
+    parser.add_argument("--db", default="case_data.db")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=500, help="Rows per chunk and per transaction")
+    parser.add_argument("--restart", action="store_true", help="Ignore the saved checkpoint and start from the first row")
+    parser.add_argument("--quiet", action="store_true", help="Only print the final summary")
+    args = parser.parse_args(argv)
+
+    parsed, failed, elapsed = run(args.job, args.db, args.workers, args.chunk_size, args.restart,
+                                  progress=(lambda message: None) if args.quiet else print)
+    rate = parsed / elapsed if elapsed else 0
+    print(f"Done: {parsed} rows parsed, {failed} failed in {elapsed:.1f}s ({rate:.0f} rows/sec)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+"""
+Retries and circuit breaking around the court websites.
+
+Failures are classified so that only the ones worth retrying are retried
+(with jittered exponential backoff, reusing the same browser), and a
+per-host circuit breaker stops new fetches from launching a browser while
+a site keeps failing.
+"""
+import random
+import threading
+import time
+from urllib.parse import urlparse
+
+from bs4 import BeautifulSoup
+
+from selenium.common.exceptions import (
+    NoSuchElementException,
+    StaleElementReferenceException,
+    TimeoutException,
+    WebDriverException,
+)
+
+SITE_DOWN = "site_down"
+ELEMENT_MISSING = "element_missing"
+CAPTCHA_WRONG = "captcha_wrong"
+TIMEOUT = "timeout"
+UNKNOWN = "unknown"
+
+FAILURE_LABELS = {
+    SITE_DOWN: "Court website is unreachable",
+    ELEMENT_MISSING: "Expected page element not found",
+    CAPTCHA_WRONG: "CAPTCHA was rejected",
+    TIMEOUT: "Court website took too long to respond",
+    UNKNOWN: "Unexpected error",
+}
+
+# Failures that say something about the health of the site itself
+BREAKER_FAILURES = (SITE_DOWN, TIMEOUT)
+
+_SITE_DOWN_MARKERS = (
+    "err_name_not_resolved", "err_connection", "err_internet_disconnected",
+    "err_timed_out", "err_address_unreachable", "err_ssl", "502 bad gateway",
+    "503 service", "504 gateway",
+)
+_CAPTCHA_MARKERS = ("invalid captcha", "captcha code is invalid", "wrong captcha")
+# id/class fragments of the elements sites and browsers show errors in
+_ERROR_ELEMENT_KEYWORDS = ("alert", "error", "invalid", "warning", "toast")
+
+
+class FetchFailure(Exception):
+    """A classified scraping failure"""
+
+    def __init__(self, kind, message):
+        super().__init__(message)
+        self.kind = kind
+
+    def __str__(self):
+        return f"{FAILURE_LABELS.get(self.kind, self.kind)}: {self.args[0]}"
+
+
+def classify_exception(exc):
+    if isinstance(exc, FetchFailure):
+        return exc.kind
+    if isinstance(exc, TimeoutException):
+        return TIMEOUT
+    if isinstance(exc, (NoSuchElementException, StaleElementReferenceException)):
+        return ELEMENT_MISSING
+    if isinstance(exc, WebDriverException):
+        message = str(exc).lower()
+        if any(marker in message for marker in _SITE_DOWN_MARKERS):
+            return SITE_DOWN
+    return UNKNOWN
+
+
+def check_failure_text(text):
+    """Raise FetchFailure if text taken from an error or message element reports a rejection or outage"""
+    text = text.lower()
+    if any(marker in text for marker in _CAPTCHA_MARKERS):
+        raise FetchFailure(CAPTCHA_WRONG, "The court website rejected the CAPTCHA")
+    if any(marker in text for marker in _SITE_DOWN_MARKERS):
+        raise FetchFailure(SITE_DOWN, "The court website returned an error page")
+
+
+def _hidden(element):
+    for node in [element] + list(element.parents):
+        if node.name in ("script", "style", "template", "noscript"):
+            return True
+        attrs = getattr(node, "attrs", None) or {}
+        style = attrs.get("style", "").replace(" ", "").lower()
+        classes = attrs.get("class") or []
+        if "hidden" in attrs or "display:none" in style or "visibility:hidden" in style or {"hidden", "d-none"} & set(classes):
+            return True
+    return False
+
+
+def failure_text(page_source):
+    """
+    Text of the parts of a page that report errors: the title and headings
+    (server and browser error pages) and visible alert/error elements.
+    Listing text, such as party names and remarks, is left out.
+    """
+    soup = BeautifulSoup(page_source, "html.parser")
+    elements = soup.find_all(["title", "h1", "h2"])
+    for element in soup.find_all(True):
+        if element.get("role") in ("alert", "alertdialog"):
+            elements.append(element)
+            continue
+        names = " ".join([element.get("id") or ""] + list(element.get("class") or [])).lower()
+        if any(keyword in names for keyword in _ERROR_ELEMENT_KEYWORDS):
+            elements.append(element)
+    return "\n".join(element.get_text(" ") for element in elements if not _hidden(element))
+
+
+def check_page_for_failure(page_source):
+    """Raise FetchFailure if the page is an error page or shows a CAPTCHA rejection in its alert/error elements"""
+    text = page_source.lower()
+    # Nearly every page has no marker anywhere; only then is the page parsed to find where the marker is
+    if not any(marker in text for marker in _CAPTCHA_MARKERS + _SITE_DOWN_MARKERS):
+        return
+    check_failure_text(failure_text(page_source))
+
+
+def retry_step(step, attempts=3, base_delay=1.0, max_delay=8.0, retry_on=(TIMEOUT, ELEMENT_MISSING, SITE_DOWN)):
+    """
+    Run one scraping step, retrying classified transient failures with
+    full-jitter exponential backoff. The step is a closure over the open
+    driver, so retries reuse the same browser session.
+    """
+    for attempt in range(1, attempts + 1):
+        try:
+            return step()
+        except Exception as e:
+            kind = classify_exception(e)
+            if kind not in retry_on or attempt == attempts:
+                if isinstance(e, FetchFailure):
+                    raise
+                raise FetchFailure(kind, str(e).splitlines()[0] if str(e) else type(e).__name__) from e
+            time.sleep(random.uniform(0, min(max_delay, base_delay * 2 ** (attempt - 1))))
+
+
+class CircuitBreaker:
+    """Closed -> open after repeated site failures -> half-open trial after a cool-down"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, host, failure_threshold=3, reset_timeout=120):
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.last_failure = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """Whether a new fetch may start against this host"""
+        with self._lock:
+            if self.state == self.OPEN:
+                if time.monotonic() - self.opened_at < self.reset_timeout:
+                    return False
+                self.state = self.HALF_OPEN
+                self._trial_in_flight = False
+            if self.state == self.HALF_OPEN:
+                if self._trial_in_flight:
+                    return False
+                self._trial_in_flight = True
+            return True
+
+    def retry_after(self):
+        with self._lock:
+            if self.state != self.OPEN:
+                return 0
+            return max(0, int(self.reset_timeout - (time.monotonic() - self.opened_at)))
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.consecutive_failures = 0
+            self.opened_at = None
+            self._trial_in_flight = False
+
+    def release(self):
+        """End a fetch that says nothing about the site's health (it stopped on
+        the user's input or on the form); frees a half-open trial"""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self, kind):
+        with self._lock:
+            self.last_failure = kind
+            if kind not in BREAKER_FAILURES:
+                # The site answered; release a half-open trial without judging health
+                self._trial_in_flight = False
+                return
+            self.consecutive_failures += 1
+            if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+                self._trial_in_flight = False
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(url_or_host):
+    host = urlparse(url_or_host).netloc or url_or_host
+    with _breakers_lock:
+        if host not in _breakers:
+            _breakers[host] = CircuitBreaker(host)
+        return _breakers[host]
+
+
+def breaker_status():
+    """Snapshot of every known host for display"""
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return [
+        {
+            "host": breaker.host,
+            "state": breaker.state,
+            "consecutive_failures": breaker.consecutive_failures,
+            "last_failure": breaker.last_failure,
+            "retry_after_seconds": breaker.retry_after(),
+        }
+        for breaker in breakers
+    ]
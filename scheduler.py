@@ -0,0 +1,170 @@
+"""
+Central request scheduler for the court websites.
+
+Every fetch goes through FetchScheduler.run(). Per host it enforces a
+concurrency cap and a token-bucket rate limit, admits waiting fetches in
+priority order (interactive before background batches), and coalesces
+identical in-flight requests so that concurrent callers asking for the same
+cause list or case share one fetch.
+
+The fetch itself runs on the caller's thread once admitted, so Streamlit
+messages emitted by the scrapers still reach the right session.
+"""
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import Future
+from urllib.parse import urlparse
+
+INTERACTIVE = 0
+BATCH = 10
+
+# host -> (max concurrent fetches, fetches per minute, burst size)
+DEFAULT_LIMITS = (2, 6, 2)
+HOST_LIMITS = {
+    "services.ecourts.gov.in": (2, 6, 2),
+    "newdelhi.dcourts.gov.in": (2, 6, 2),
+}
+
+
+class HostLimiter:
+    """Priority admission with a concurrency cap and a token bucket for one host"""
+
+    def __init__(self, host, max_concurrent, per_minute, burst):
+        self.host = host
+        self.max_concurrent = max_concurrent
+        self.refill_per_second = per_minute / 60.0
+        self.burst = burst
+        self.tokens = float(burst)
+        self.last_refill = time.monotonic()
+        self.running = 0
+        self.waiting = []
+        self.admitted = 0
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.last_refill) * self.refill_per_second)
+        self.last_refill = now
+
+    def acquire(self, priority=INTERACTIVE):
+        ticket = (priority, next(self._seq))
+        with self._cond:
+            heapq.heappush(self.waiting, ticket)
+            try:
+                while True:
+                    if self.waiting[0] == ticket and self.running < self.max_concurrent:
+                        self._refill()
+                        if self.tokens >= 1:
+                            self.tokens -= 1
+                            break
+                        self._cond.wait((1 - self.tokens) / self.refill_per_second)
+                    else:
+                        self._cond.wait()
+            except BaseException:
+                self.waiting.remove(ticket)
+                heapq.heapify(self.waiting)
+                self._cond.notify_all()
+                raise
+            heapq.heappop(self.waiting)
+            self.running += 1
+            self.admitted += 1
+            self._cond.notify_all()
+
+    def release(self):
+        with self._cond:
+            self.running -= 1
+            self._cond.notify_all()
+
+    def stats(self):
+        with self._cond:
+            self._refill()
+            return {
+                "host": self.host,
+                "running": self.running,
+                "waiting": len(self.waiting),
+                "tokens": round(self.tokens, 2),
+                "admitted": self.admitted,
+            }
+
+
+class _LeaderInterrupted(Exception):
+    """Set on a shared fetch whose caller was interrupted; the waiting calls retry"""
+
+
+class FetchScheduler:
+    def __init__(self, host_limits=None):
+        self.host_limits = dict(HOST_LIMITS if host_limits is None else host_limits)
+        self._limiters = {}
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self.coalesced = 0
+
+    def limiter(self, url_or_host):
+        host = urlparse(url_or_host).netloc or url_or_host
+        with self._lock:
+            if host not in self._limiters:
+                limits = self.host_limits.get(host, DEFAULT_LIMITS)
+                self._limiters[host] = HostLimiter(host, *limits)
+            return self._limiters[host]
+
+    def run(self, url_or_host, key, fn, priority=INTERACTIVE):
+        """
+        Run fn() once admitted for the host. A call whose key matches a fetch
+        already in flight waits for that fetch and returns its result instead.
+        If that fetch was interrupted (KeyboardInterrupt, a stopped script) the
+        waiting calls are not interrupted with it; one of them fetches instead.
+        """
+        counted = False
+        while True:
+            with self._lock:
+                future = self._inflight.get(key)
+                leader = future is None
+                if leader:
+                    future = Future()
+                    self._inflight[key] = future
+                elif not counted:
+                    self.coalesced += 1
+                    counted = True
+            if leader:
+                break
+            try:
+                return future.result()
+            except _LeaderInterrupted:
+                continue
+
+        limiter = self.limiter(url_or_host)
+        try:
+            limiter.acquire(priority)
+            try:
+                result = fn()
+            finally:
+                limiter.release()
+        except BaseException as e:
+            with self._lock:
+                self._inflight.pop(key, None)
+            future.set_exception(e if isinstance(e, Exception) else _LeaderInterrupted())
+            raise
+        with self._lock:
+            self._inflight.pop(key, None)
+        future.set_result(result)
+        return result
+
+    def stats(self):
+        with self._lock:
+            limiters = list(self._limiters.values())
+            in_flight = len(self._inflight)
+        return {
+            "in_flight": in_flight,
+            "coalesced": self.coalesced,
+            "hosts": [limiter.stats() for limiter in limiters],
+        }
+
+
+_scheduler = FetchScheduler()
+
+
+def get_scheduler():
+    return _scheduler
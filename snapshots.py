@@ -0,0 +1,97 @@
+"""
+Compressed, content-addressed storage of fetched pages.
+
+Each distinct page is stored once, zlib-compressed, under the SHA-256 of its
+normalized content. Re-fetching a page whose content has not changed only
+bumps its fetch count and last-seen time, and tells the caller that the
+earlier parse can be reused.
+
+The hash ignores markup that changes on every request without changing the
+listing: <script>/<style> blocks and the values of hidden form fields (the
+WordPress nonces and CAPTCHA tokens on the court sites).
+"""
+import hashlib
+import re
+import sqlite3
+import zlib
+
+COMPRESSION_LEVEL = 6
+
+_VOLATILE = [
+    re.compile(r"<script\b.*?</script>", re.IGNORECASE | re.DOTALL),
+    re.compile(r"<style\b.*?</style>", re.IGNORECASE | re.DOTALL),
+]
+_HIDDEN_INPUT = re.compile(r"<input\b[^>]*type=[\"']?hidden[^>]*>", re.IGNORECASE)
+_SPACES = re.compile(r"\s+")
+
+
+def setup_snapshot_tables(conn):
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS page_snapshots (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        content_hash TEXT NOT NULL UNIQUE,
+        kind TEXT NOT NULL,
+        html_zlib BLOB NOT NULL,
+        raw_size INTEGER NOT NULL,
+        stored_size INTEGER NOT NULL,
+        fetch_count INTEGER NOT NULL DEFAULT 1,
+        first_seen DATETIME DEFAULT CURRENT_TIMESTAMP,
+        last_seen DATETIME DEFAULT CURRENT_TIMESTAMP
+    )
+    """)
+
+
+def content_hash(raw_html):
+    text = raw_html
+    for pattern in _VOLATILE:
+        text = pattern.sub("", text)
+    text = _HIDDEN_INPUT.sub("", text)
+    text = _SPACES.sub(" ", text).strip()
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def compress(raw_html):
+    return zlib.compress(raw_html.encode("utf-8"), COMPRESSION_LEVEL)
+
+
+def decompress(blob):
+    return zlib.decompress(blob).decode("utf-8")
+
+
+def store_snapshot(db_file, kind, raw_html):
+    """Store a page unless identical content is already stored; returns (snapshot_id, seen_before)"""
+    digest = content_hash(raw_html)
+    conn = sqlite3.connect(db_file)
+    cursor = conn.cursor()
+    row = cursor.execute("SELECT id FROM page_snapshots WHERE content_hash = ?", (digest,)).fetchone()
+    if row:
+        cursor.execute(
+            "UPDATE page_snapshots SET fetch_count = fetch_count + 1, last_seen = CURRENT_TIMESTAMP WHERE id = ?",
+            (row[0],)
+        )
+        snapshot_id, seen_before = row[0], True
+    else:
+        blob = compress(raw_html)
+        cursor.execute(
+            """INSERT INTO page_snapshots (content_hash, kind, html_zlib, raw_size, stored_size)
+               VALUES (?, ?, ?, ?, ?)""",
+            (digest, kind, blob, len(raw_html.encode("utf-8")), len(blob))
+        )
+        snapshot_id, seen_before = cursor.lastrowid, False
+    conn.commit()
+    conn.close()
+    return snapshot_id, seen_before
+
+
+def load_snapshot(conn, snapshot_id):
+    row = conn.execute("SELECT html_zlib FROM page_snapshots WHERE id = ?", (snapshot_id,)).fetchone()
+    return decompress(row[0]) if row else None
+
+
+def snapshot_stats(db_file):
+    conn = sqlite3.connect(db_file)
+    row = conn.execute(
+        "SELECT COUNT(*), COALESCE(SUM(raw_size), 0), COALESCE(SUM(stored_size), 0), COALESCE(SUM(fetch_count), 0) FROM page_snapshots"
+    ).fetchone()
+    conn.close()
+    return {"snapshots": row[0], "raw_bytes": row[1], "stored_bytes": row[2], "fetches": row[3]}
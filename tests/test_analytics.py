@@ -0,0 +1,131 @@
+import sqlite3
+
+import pytest
+
+import analytics
+import cause_list_parser
+
+HEADERS = ["Section"] + cause_list_parser.STANDARD_HEADERS
+
+
+def rows(*cases):
+    return [[section, str(i + 1), f"CS/{i + 1}/2024", "A Vs B", advocate] for i, (section, advocate) in enumerate(cases)]
+
+
+@pytest.fixture
+def db_file(tmp_path):
+    path = str(tmp_path / "cases.db")
+    conn = sqlite3.connect(path)
+    conn.execute("""CREATE TABLE cause_lists (id INTEGER PRIMARY KEY, court_complex TEXT, court_number TEXT,
+                    list_date TEXT, list_type TEXT, site TEXT)""")
+    conn.execute("""CREATE TABLE cause_list_rows (cause_list_id INTEGER, row_index INTEGER, section TEXT,
+                    case_text TEXT, party_text TEXT, advocate_text TEXT, key_type TEXT, key_number TEXT,
+                    key_year INTEGER, cells TEXT)""")
+    analytics.setup_analytics_tables(conn)
+    conn.commit()
+    conn.close()
+    return path
+
+
+def store_list(db_file, cause_list_id, list_rows, list_date="03/09/2026", court_complex="Saket Courts Complex",
+               list_type="Civil", record=True):
+    conn = sqlite3.connect(db_file)
+    cursor = conn.cursor()
+    cursor.execute("INSERT INTO cause_lists VALUES (?, ?, 'All Courts', ?, ?, 'newdelhi')",
+                   (cause_list_id, court_complex, list_date, list_type))
+    cause_list_parser.store_rows(cursor, cause_list_id, HEADERS, list_rows)
+    if record:
+        analytics.record_cause_list(cursor, cause_list_id)
+    conn.commit()
+    conn.close()
+
+
+def counts(db_file):
+    conn = sqlite3.connect(db_file)
+    listing = conn.execute("SELECT list_day, section, cases FROM agg_listing_counts ORDER BY section").fetchall()
+    advocates = dict(conn.execute("SELECT advocate, listings FROM agg_advocate_counts").fetchall())
+    conn.close()
+    return listing, advocates
+
+
+def test_list_day_uses_the_site_date_format():
+    assert analytics.list_day("03/09/2026", "newdelhi") == "2026-03-09"
+    assert analytics.list_day("03-09-2026", "newdelhi") == "2026-03-09"
+    assert analytics.list_day("09/03/2026", "unknown-site") == "2026-03-09"
+    assert analytics.list_day("next week", "newdelhi") == "next week"
+
+
+def test_advocate_names_are_split_and_normalized():
+    assert analytics.advocate_names("a. sharma, B  Singh;\nC. Rao.") == ["A. SHARMA", "B SINGH", "C. RAO"]
+    assert analytics.advocate_names(None) == []
+
+
+def test_a_stored_list_is_counted(db_file):
+    store_list(db_file, 1, rows(("Fresh", "A. Sharma"), ("Fresh", "A. Sharma, B. Singh"), ("Arguments", "")))
+    assert counts(db_file) == (
+        [("2026-03-09", "Arguments", 1), ("2026-03-09", "Fresh", 2)],
+        {"A. SHARMA": 2, "B. SINGH": 1},
+    )
+
+
+def test_a_refetch_replaces_the_counts_instead_of_adding_to_them(db_file):
+    store_list(db_file, 1, rows(("Fresh", "A. Sharma"), ("Fresh", "B. Singh")))
+    store_list(db_file, 2, rows(("Fresh", "A. Sharma"), ("Arguments", "A. Sharma"), ("Arguments", "C. Rao")))
+    assert counts(db_file) == (
+        [("2026-03-09", "Arguments", 2), ("2026-03-09", "Fresh", 1)],
+        {"A. SHARMA": 2, "C. RAO": 1},
+    )
+    conn = sqlite3.connect(db_file)
+    assert conn.execute("SELECT cause_list_id FROM agg_current_lists").fetchall() == [(2,)]
+    conn.close()
+
+
+def test_recording_an_older_fetch_after_a_newer_one_changes_nothing(db_file):
+    store_list(db_file, 2, rows(("Fresh", "A. Sharma")))
+    store_list(db_file, 1, rows(("Fresh", "B. Singh"), ("Fresh", "B. Singh")))
+    assert counts(db_file) == ([("2026-03-09", "Fresh", 1)], {"A. SHARMA": 1})
+
+
+def test_other_lists_are_counted_separately(db_file):
+    store_list(db_file, 1, rows(("Fresh", "A. Sharma")))
+    store_list(db_file, 2, rows(("Fresh", "A. Sharma")), list_type="Criminal")
+    store_list(db_file, 3, rows(("Fresh", "A. Sharma")), list_date="03/10/2026")
+    conn = sqlite3.connect(db_file)
+    assert conn.execute("SELECT COUNT(*) FROM agg_current_lists").fetchone() == (3,)
+    conn.close()
+    df = analytics.top_advocates(db_file)
+    assert df.to_dict("records") == [{"advocate": "A. SHARMA", "listings": 3, "days_listed": 2}]
+    assert analytics.day_range(db_file) == ("2026-03-09", "2026-03-10")
+    assert analytics.listing_counts(db_file, start_day="2026-03-10")["cases"].tolist() == [1]
+
+
+def test_reparsed_rows_replace_their_own_counts(db_file):
+    store_list(db_file, 1, rows(("Fresh", "A. Sharma"), ("Fresh", "A. Sharma")))
+    conn = sqlite3.connect(db_file)
+    cursor = conn.cursor()
+    analytics.forget_cause_list_rows(cursor, 1)
+    cursor.execute("DELETE FROM cause_list_rows WHERE cause_list_id = 1")
+    cause_list_parser.store_rows(cursor, 1, HEADERS, rows(("Arguments", "B. Singh")))
+    analytics.record_cause_list(cursor, 1)
+    conn.commit()
+    conn.close()
+    assert counts(db_file) == ([("2026-03-09", "Arguments", 1)], {"B. SINGH": 1})
+
+
+def test_rebuild_and_backfill_match_the_incremental_counts(db_file):
+    store_list(db_file, 1, rows(("Fresh", "A. Sharma"), ("Fresh", "B. Singh")))
+    store_list(db_file, 2, rows(("Fresh", "A. Sharma"), ("Arguments", "C. Rao")))
+    store_list(db_file, 3, rows(("Fresh", "A. Sharma")), list_type="Criminal")
+    incremental = counts(db_file)
+
+    conn = sqlite3.connect(db_file)
+    assert analytics.rebuild(conn) == 2
+    conn.commit()
+    assert counts(db_file) == incremental
+
+    for table in ("agg_current_lists", "agg_listing_counts", "agg_advocate_counts"):
+        conn.execute(f"DELETE FROM {table}")
+    analytics.backfill_if_empty(conn)
+    conn.commit()
+    conn.close()
+    assert counts(db_file) == incremental
@@ -0,0 +1,76 @@
+import json
+import sqlite3
+
+import pytest
+
+import analytics
+import archive
+import cause_list_parser
+import snapshots
+import watchlist
+from benchmarks import mock_court
+
+LIST = ("Mock Courts Complex", "", "01/15/2025", "Civil")
+
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = sqlite3.connect(tmp_path / "case_data.db")
+    # The cause list tables as court_case.setup_database creates them
+    conn.execute("""CREATE TABLE cause_lists (id INTEGER PRIMARY KEY AUTOINCREMENT, court_complex TEXT NOT NULL,
+                    court_number TEXT, list_date TEXT NOT NULL, list_type TEXT NOT NULL, total_cases INTEGER,
+                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP, snapshot_id INTEGER, headers TEXT, site TEXT DEFAULT 'newdelhi')""")
+    conn.execute("""CREATE TABLE cause_list_rows (id INTEGER PRIMARY KEY AUTOINCREMENT, cause_list_id INTEGER NOT NULL,
+                    row_index INTEGER NOT NULL, section TEXT, case_text TEXT, party_text TEXT, advocate_text TEXT,
+                    key_type TEXT, key_number TEXT, key_year INTEGER, cells TEXT)""")
+    snapshots.setup_snapshot_tables(conn)
+    watchlist.setup_watchlist_tables(conn)
+    analytics.setup_analytics_tables(conn)
+    archive.setup_archive_tables(conn)
+    yield conn
+    conn.close()
+
+
+def store_list(conn, timestamp=None):
+    """What court_case.write_cause_list stores for one fetch of LIST"""
+    raw_html = "<html><body>" + mock_court.cause_list_fragment(LIST[0], LIST[2], LIST[3], 30) + "</body></html>"
+    rows, headers, _ = cause_list_parser.parse_cause_list_page(raw_html)
+    cursor = conn.cursor()
+    cursor.execute(
+        """INSERT INTO cause_lists (court_complex, court_number, list_date, list_type, total_cases, headers, timestamp)
+           VALUES (?, ?, ?, ?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP))""",
+        LIST + (len(rows), json.dumps(headers), timestamp)
+    )
+    cause_list_id = cursor.lastrowid
+    cause_list_parser.store_rows(cursor, cause_list_id, headers, rows)
+    analytics.record_cause_list(cursor, cause_list_id)
+    watchlist.insert_matches(cursor, cause_list_id, LIST[0], LIST[2], LIST[3], [{
+        "watch_id": 1, "row_index": 0, "matched_field": "party", "section": None,
+        "case_text": "CS/1/2024", "party_text": "A vs B", "advocate_text": "C",
+    }])
+    conn.commit()
+    return cause_list_id
+
+
+def aggregates(conn):
+    return (
+        conn.execute("SELECT list_day, court_complex, list_type, section, cases FROM agg_listing_counts ORDER BY 1, 2, 3, 4").fetchall(),
+        conn.execute("SELECT advocate, list_day, court_complex, listings FROM agg_advocate_counts ORDER BY 1, 2, 3").fetchall(),
+    )
+
+
+def test_refetch_after_archive_keeps_aggregate_counts(conn, tmp_path):
+    store_list(conn, timestamp="2020-01-01 00:00:00")
+    counted = aggregates(conn)
+    assert counted[0]
+
+    archive_dir = tmp_path / "archive"
+    lists_moved, rows_moved, _ = archive.run(str(tmp_path / "case_data.db"), str(archive_dir), older_than_days=30,
+                                             progress=lambda message: None)
+    assert (lists_moved, rows_moved) == (1, 30)
+    assert conn.execute("SELECT COUNT(*) FROM agg_current_lists").fetchone()[0] == 0
+    assert conn.execute("SELECT COUNT(*) FROM watchlist_matches").fetchone()[0] == 0
+    assert "watchlist_matches" in archive.archive_summary(str(archive_dir))
+
+    store_list(conn)
+    assert aggregates(conn) == counted
@@ -0,0 +1,103 @@
+import os
+import time
+
+import pytest
+
+import browser
+
+
+@pytest.mark.parametrize("profile", ["lean", "strict"])
+@pytest.mark.parametrize("url", browser.CAPTCHA_SAMPLE_URLS)
+def test_profiles_never_block_captcha(profile, url):
+    assert not any(browser.pattern_matches(p, url) for p in browser.blocked_patterns(profile))
+
+
+def test_pattern_matching_an_image_captcha_is_dropped(monkeypatch):
+    monkeypatch.setitem(browser.BLOCKING_PROFILES, "lean", browser.BLOCKING_PROFILES["lean"] + ["*securimage*", "*.php*"])
+    patterns = browser.blocked_patterns("lean")
+    assert "*securimage*" not in patterns
+    assert "*.php*" not in patterns
+    assert "*.png" in patterns
+
+
+@pytest.mark.parametrize("url", [
+    "https://newdelhi.dcourts.gov.in/wp-content/uploads/logo.png",
+    "https://fonts.gstatic.com/s/roboto/v30/font.woff2",
+    "https://www.google-analytics.com/analytics.js",
+])
+def test_lean_still_blocks_heavy_resources(url):
+    assert any(browser.pattern_matches(p, url) for p in browser.blocked_patterns("lean"))
+
+
+def test_pattern_matches_whole_url():
+    assert browser.pattern_matches("*.png", "https://example.com/a.png")
+    assert not browser.pattern_matches("*.png", "https://example.com/a.png.php")
+    assert browser.pattern_matches("*.p?f", "https://example.com/a.pdf")
+
+
+class FakeDriver:
+    def __init__(self):
+        self.closed = False
+
+    @property
+    def current_url(self):
+        if self.closed:
+            raise RuntimeError("window closed")
+        return "about:blank"
+
+    def quit(self):
+        self.closed = True
+
+
+@pytest.fixture
+def pool(tmp_path, monkeypatch):
+    monkeypatch.setattr(browser, "new_driver", lambda **kwargs: FakeDriver())
+    return browser.BrowserPool(root=str(tmp_path), max_browsers=2, idle_seconds=60)
+
+
+def test_kept_alive_session_is_handed_back_to_its_owner(pool):
+    pooled = pool.acquire(affinity_key="user-1")
+    pool.release(pooled, keep_alive=True)
+    assert pool.stats() == {"busy": 0, "kept_alive": 1, "max_browsers": 2}
+    again = pool.acquire(affinity_key="user-1")
+    assert again is pooled and again.reused
+    other = pool.acquire(affinity_key="user-2")
+    assert other.slot != pooled.slot
+    pool.release(other)
+    assert other.driver.closed
+
+
+def test_cleanup_closes_sessions_past_the_idle_window(pool):
+    pooled = pool.acquire(affinity_key="user-1")
+    pool.release(pooled, keep_alive=True)
+    pool.cleanup_idle()
+    assert not pooled.driver.closed
+    pooled.last_used -= 61
+    pool.cleanup_idle()
+    assert pooled.driver.closed
+    assert pool.stats()["kept_alive"] == 0
+
+
+def test_cleanup_closes_and_trims_a_profile_past_its_cap(pool, monkeypatch):
+    monkeypatch.setattr(browser, "PROFILE_SIZE_CAP_MB", 1)
+    pooled = pool.acquire(affinity_key="user-1")
+    cache = os.path.join(pooled.profile_dir, "Default", "Cache")
+    os.makedirs(cache)
+    with open(os.path.join(cache, "data_1"), "wb") as f:
+        f.write(b"\0" * (2 * 1024 * 1024))
+    pool.release(pooled, keep_alive=True)
+    pool.cleanup_idle()
+    assert pooled.driver.closed
+    assert not os.path.exists(cache)
+
+
+def test_idle_sessions_expire_without_another_fetch(pool, monkeypatch):
+    monkeypatch.setattr(browser, "REAP_INTERVAL_SECONDS", 0.01)
+    pool.idle_seconds = 0.01
+    pooled = pool.acquire(affinity_key="user-1")
+    pool.release(pooled, keep_alive=True)
+    deadline = time.monotonic() + 2
+    while not pooled.driver.closed:
+        assert time.monotonic() < deadline, "kept-alive session was never closed"
+        time.sleep(0.01)
+    assert pool.stats()["kept_alive"] == 0
@@ -0,0 +1,77 @@
+import json
+import os
+import sqlite3
+import zipfile
+
+import pytest
+
+import bulk_reports
+import cause_list_parser
+
+HEADERS = ["Section"] + cause_list_parser.STANDARD_HEADERS
+ROWS = [["Cases", "1", "CS/1/2024", "Ram Kumar Vs State", "A. Sharma"]]
+
+
+@pytest.fixture
+def db_file(tmp_path):
+    path = str(tmp_path / "cases.db")
+    conn = sqlite3.connect(path)
+    conn.execute("""CREATE TABLE cause_lists (id INTEGER PRIMARY KEY, court_complex TEXT, list_date TEXT,
+                    list_type TEXT, headers TEXT, timestamp DATETIME)""")
+    conn.execute("""CREATE TABLE cause_list_rows (cause_list_id INTEGER, row_index INTEGER, section TEXT,
+                    case_text TEXT, party_text TEXT, advocate_text TEXT, key_type TEXT, key_number TEXT,
+                    key_year INTEGER, cells TEXT)""")
+    lists = [
+        (1, "Saket Courts Complex", "03/09/2026", "Civil", "2026-03-09 08:00:00"),
+        # Fetched again later the same day: replaces list 1
+        (2, "Saket Courts Complex", "03/09/2026", "Civil", "2026-03-09 11:00:00"),
+        (3, "Saket Courts Complex", "03/09/2026", "Criminal", "2026-03-09 09:00:00"),
+        (4, "Rohini Courts Complex", "03/09/2026", "Civil", "2026-03-09 10:00:00"),
+        (5, "Rohini Courts Complex", "03/08/2026", "Civil", "2026-03-08 10:00:00"),
+    ]
+    for cause_list_id, court_complex, list_date, list_type, timestamp in lists:
+        conn.execute("INSERT INTO cause_lists VALUES (?, ?, ?, ?, ?, ?)",
+                     (cause_list_id, court_complex, list_date, list_type, json.dumps(HEADERS), timestamp))
+        if cause_list_id != 3:
+            cause_list_parser.store_rows(conn.cursor(), cause_list_id, HEADERS, ROWS)
+    conn.commit()
+    conn.close()
+    return path
+
+
+def test_latest_list_of_each_complex_type_and_date(db_file):
+    conn = sqlite3.connect(db_file)
+    assert bulk_reports.select_cause_lists(conn, "2026-03-09") == [4, 2, 3]
+    assert bulk_reports.select_cause_lists(conn, "2026-03-09", court_complex="Saket Courts Complex", list_type="Civil") == [2]
+    assert bulk_reports.select_cause_lists(conn, "2026-03-01") == []
+    conn.close()
+
+
+def test_render_to_a_directory(db_file, tmp_path):
+    out = tmp_path / "reports"
+    written, failed, pages, _ = bulk_reports.run(db_file, [2, 4], bulk_reports.DirectoryWriter(str(out)),
+                                                 workers=1, progress=lambda message: None)
+    assert (written, failed, pages) == (2, 0, 2)
+    assert sorted(os.listdir(out)) == [
+        "cause_list_2_Saket_Courts_Complex_03_09_2026_Civil.pdf",
+        "cause_list_4_Rohini_Courts_Complex_03_09_2026_Civil.pdf",
+    ]
+
+
+def test_lists_without_rows_fail_without_stopping_the_run(db_file, tmp_path):
+    zip_path = str(tmp_path / "out" / "reports.zip")
+    messages = []
+    written, failed, _, _ = bulk_reports.run(db_file, [3, 2, 99], bulk_reports.ZipWriter(zip_path),
+                                             workers=2, progress=messages.append)
+    assert (written, failed) == (1, 2)
+    with zipfile.ZipFile(zip_path) as archive:
+        assert archive.namelist() == ["cause_list_2_Saket_Courts_Complex_03_09_2026_Civil.pdf"]
+        assert archive.read(archive.namelist()[0]).startswith(b"%PDF")
+    assert len(messages) == 1 and messages[0].startswith("2/3 cause lists, 1 pages")
+
+
+def test_main_with_ids(db_file, tmp_path, capsys):
+    bulk_reports.main(["--db", db_file, "--ids", "5", "--out", str(tmp_path / "reports"), "--workers", "1", "--quiet"])
+    assert capsys.readouterr().out.startswith("Done: 1 PDFs (1 pages), 0 failed")
+    bulk_reports.main(["--db", db_file, "--fetched-on", "2026-03-01"])
+    assert capsys.readouterr().out == "No cause lists to render.\n"
@@ -0,0 +1,107 @@
+import sqlite3
+
+import pytest
+from selenium.webdriver.common.by import By
+
+import captcha
+
+
+class Element:
+    def __init__(self, page, selector):
+        self.page = page
+        self.selector = selector
+
+    def get_attribute(self, name):
+        return self.page.typed
+
+    @property
+    def screenshot_as_png(self):
+        return self.page.image
+
+
+class FakePage:
+    """The CAPTCHA image and answer field of a form, as far as captcha.py looks at them"""
+
+    def __init__(self, image=b"png-1"):
+        self.image = image
+        self.typed = ""
+        self.calls = 0
+
+    def find_element(self, by, selector):
+        self.calls += 1
+        assert by == By.CSS_SELECTOR
+        return Element(self, selector)
+
+    def execute_script(self, script, *args):
+        self.calls += 1
+        return script == captcha.IMAGE_LOADED_JS
+
+
+class UntouchablePage:
+    def __getattr__(self, name):
+        raise AssertionError(f"the page was used ({name})")
+
+
+@pytest.fixture
+def db_file(tmp_path):
+    db_file = str(tmp_path / "case_data.db")
+    conn = sqlite3.connect(db_file)
+    captcha.setup_captcha_tables(conn)
+    conn.close()
+    return db_file
+
+
+def samples(db_file):
+    conn = sqlite3.connect(db_file)
+    rows = conn.execute("SELECT image, label, source FROM captcha_samples").fetchall()
+    conn.close()
+    return rows
+
+
+def test_manual_start_does_not_wait_for_the_image(db_file):
+    attempt = captcha.start(UntouchablePage(), "case_status", db_file, "manual")
+    assert not attempt.automatic
+    assert attempt.image is None
+
+
+def test_manual_sample_is_labelled_with_the_answer_typed_before_submit(db_file):
+    page = FakePage()
+    attempt = captcha.start(page, "case_status", db_file, "manual")
+    attempt.observe(page)
+    page.typed = "7K3"
+    attempt.observe(page)
+    page.typed = "7K3QX"
+    attempt.observe(page)
+    # Submitting clears the field and loads a new CAPTCHA
+    page.typed, page.image = "", b"png-2"
+    attempt.observe(page)
+    attempt.accepted()
+    assert samples(db_file) == [(b"png-1", "7K3QX", "manual")]
+
+
+def test_manual_answer_typed_for_a_new_captcha_takes_the_new_image(db_file):
+    page = FakePage()
+    attempt = captcha.start(page, "cause_list", db_file, "manual")
+    page.typed = "AAAAA"
+    attempt.observe(page)
+    page.typed, page.image = "BBBBB", b"png-2"
+    attempt.observe(page)
+    attempt.accepted()
+    assert samples(db_file) == [(b"png-2", "BBBBB", "manual")]
+
+
+def test_manual_attempt_without_an_observed_answer_keeps_no_sample(db_file):
+    attempt = captcha.start(FakePage(), "case_status", db_file, "manual")
+    attempt.accepted()
+    assert samples(db_file) == []
+
+
+def test_samples_can_be_turned_off(db_file, monkeypatch):
+    monkeypatch.setattr(captcha, "COLLECT_SAMPLES", False)
+    page = FakePage()
+    attempt = captcha.start(page, "case_status", db_file, "manual")
+    page.typed = "7K3QX"
+    attempt.observe(page)
+    attempt.accepted()
+    assert page.calls == 0
+    assert samples(db_file) == []
@@ -0,0 +1,51 @@
+import pytest
+
+import watchlist
+from case_keys import case_status_key, cause_list_columns, compact_key, format_key, parse_case_number
+
+
+@pytest.mark.parametrize("listing, case_type, number, year", [
+    ("T P (CRL)/19/2025", "T P (CRL) - TRANSFER PETITION (CRIMINAL)", "19", "2025"),
+    ("CS (COMM) 12/2024", "CS (COMM) - CIVIL SUIT (COMMERCIAL)", "012", "2024"),
+    ("MACT No. 45/2023", "MACT", "45", "2023"),
+    ("Crl. Rev. No 3/2022", "CRL.REV. - CRIMINAL REVISION", "3", 2022),
+    ("CS/0101/2024", "CS - CIVIL SUIT", "101", "2024"),
+])
+def test_listing_and_lookup_reduce_to_the_same_key(listing, case_type, number, year):
+    assert parse_case_number(listing) == case_status_key(case_type, number, year)
+
+
+def test_key_round_trips_through_its_text_form():
+    key = parse_case_number("MACT No. 45/2023")
+    assert key == ("MACT", "45", 2023)
+    assert parse_case_number(format_key(key)) == key
+    assert compact_key("mact no.45/2023") == "MACT/45/2023"
+
+
+def test_number_word_is_only_stripped_as_a_whole_word():
+    assert parse_case_number("ANO 5/2020") == ("ANO", "5", 2020)
+
+
+@pytest.mark.parametrize("text", ["", None, "Adjourned", "CS/12", "12/2024"])
+def test_text_without_a_case_number_has_no_key(text):
+    assert parse_case_number(text) is None
+
+
+def test_lookup_without_a_usable_year_or_number_has_no_key():
+    assert case_status_key("CS", "12", "twenty") is None
+    assert case_status_key("CS", " ", "2024") is None
+    assert case_status_key("", "12", "2024") is None
+
+
+def test_compact_key_falls_back_to_alphanumerics():
+    assert compact_key("Bail Matters (Urgent)") == "bailmattersurgent"
+
+
+def test_cause_list_columns():
+    columns = cause_list_columns(["Sr. No.", "Section", "Case Number", "Petitioner vs Respondent", "Advocate"])
+    assert columns == {"section": 1, "case": 2, "party": 3, "advocate": 4}
+
+
+def test_watchlist_case_entry_matches_a_differently_written_listing():
+    index = watchlist.WatchlistIndex([(1, "case", "MACT 45/2023")])
+    assert index.match_fields("MACT No. 45/2023", "", "") == [(1, "case")]
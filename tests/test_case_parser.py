@@ -0,0 +1,109 @@
+import sqlite3
+
+import pytest
+
+import case_parser
+
+CASE_PAGE = """<html><body><div id="case_no_res">
+<table class="case_details_table">
+  <tr><td>Case Type</td><td>CS - CIVIL SUIT</td></tr>
+  <tr><td>Filing Number:</td><td>1234/2023</td><td>Filing Date:</td><td>05-01-2023</td></tr>
+  <tr><td>Registration Number:</td><td>45/2023</td><td>Registration Date:</td><td>07/01/2023</td></tr>
+  <tr><td>CNR Number</td><td>DLCT010012342023</td></tr>
+</table>
+<table class="case_status_table">
+  <tr><td>First Hearing Date</td><td>12th February 2023</td></tr>
+  <tr><td>Next Hearing Date</td><td>3rd March 2025</td></tr>
+  <tr><td>Case Stage</td><td>Evidence</td></tr>
+  <tr><td>Case Status:</td><td>Pending</td></tr>
+  <tr><td>Court Number and Judge</td><td>5 - Civil Judge</td></tr>
+</table>
+<span class="Petitioner_Advocate_table">1) Ram Kumar</span>
+<span class="Respondent_Advocate_table">1) Shyam Lal</span>
+<table class="acts_table">
+  <tr><th>Under Act(s)</th><th>Under Section(s)</th></tr>
+  <tr><td>Code of Civil Procedure</td><td>9</td></tr>
+  <tr><td>Specific Relief Act</td><td>38</td></tr>
+</table>
+<table class="history_table">
+  <tr><th>Judge</th><th>Business on Date</th><th>Hearing Date</th><th>Purpose of Hearing</th></tr>
+  <tr><td>Civil Judge</td><td>12-02-2023</td><td>10-04-2023</td><td>Appearance</td></tr>
+  <tr><td>Civil Judge</td><td>10-04-2023</td><td>03-03-2025</td><td>Evidence</td></tr>
+</table>
+<table class="order_table">
+  <tr><th>Order Number</th><th>Order Date</th><th>Order Details</th></tr>
+  <tr><td>1</td><td>12-02-2023</td><td><a href="/orders/1.pdf">Copy of order</a></td></tr>
+</table>
+</div></body></html>"""
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("05-01-2023", "2023-01-05"),
+    ("07/01/2023", "2023-01-07"),
+    ("12th February 2023", "2023-02-12"),
+    ("March 3rd, 2025", "2025-03-03"),
+    ("2024-11-30", "2024-11-30"),
+    ("  ", None),
+    ("Not yet listed", "Not yet listed"),
+])
+def test_normalize_date(text, expected):
+    assert case_parser.normalize_date(text) == expected
+
+
+def test_summary_fields():
+    record = case_parser.parse_case_page(CASE_PAGE)
+    assert record.case_type_text == "CS - CIVIL SUIT"
+    assert record.filing_number == "1234/2023"
+    assert record.filing_date == "2023-01-05"
+    assert record.registration_number == "45/2023"
+    assert record.registration_date == "2023-01-07"
+    assert record.cnr_number == "DLCT010012342023"
+    assert record.first_hearing_date == "2023-02-12"
+    assert record.next_hearing_date == "2025-03-03"
+    assert record.case_stage == "Evidence"
+    assert record.status == "Pending"
+    assert record.court_and_judge == "5 - Civil Judge"
+
+
+def test_parties_and_acts():
+    record = case_parser.parse_case_page(CASE_PAGE)
+    assert record.parties == "1) Ram Kumar Vs 1) Shyam Lal"
+    assert record.petitioner == "1) Ram Kumar"
+    assert record.respondent == "1) Shyam Lal"
+    assert record.acts == ["Code of Civil Procedure - 9", "Specific Relief Act - 38"]
+
+
+def test_hearings_and_orders():
+    record = case_parser.parse_case_page(CASE_PAGE)
+    assert [(h.business_on_date, h.hearing_date, h.purpose) for h in record.hearings] == [
+        ("2023-02-12", "2023-04-10", "Appearance"),
+        ("2023-04-10", "2025-03-03", "Evidence"),
+    ]
+    assert [(o.order_number, o.order_date, o.order_link) for o in record.orders] == [
+        ("1", "2023-02-12", "/orders/1.pdf"),
+    ]
+
+
+def test_parties_from_the_petitioner_advocate_row():
+    page = '<table><tr class="petitioner_advocate_tr"><td>1)</td><td>Ram Kumar\n Advocate - A. Sharma</td></tr></table>'
+    assert case_parser.parse_case_page(page).parties == "Ram Kumar Advocate - A. Sharma"
+
+
+def test_page_without_a_result():
+    record = case_parser.parse_case_page("<html><body><div id='case_no_res'></div></body></html>")
+    assert (record.parties, record.filing_date, record.status) == (case_parser.NOT_FOUND,) * 3
+    assert record.hearings == [] and record.orders == [] and record.acts == []
+
+
+def test_stored_record_replaces_the_previous_one():
+    conn = sqlite3.connect(":memory:")
+    case_parser.setup_case_detail_tables(conn)
+    record = case_parser.parse_case_page(CASE_PAGE)
+    case_parser.store_case_record(conn.cursor(), 7, record)
+    case_parser.store_case_record(conn.cursor(), 7, record.to_dict())
+    assert conn.execute("SELECT filing_date, case_status, acts FROM case_details WHERE query_id = 7").fetchall() == [
+        ("2023-01-05", "Pending", "Code of Civil Procedure - 9; Specific Relief Act - 38")
+    ]
+    assert conn.execute("SELECT COUNT(*) FROM case_hearings WHERE query_id = 7").fetchone() == (2,)
+    assert conn.execute("SELECT COUNT(*) FROM case_orders WHERE query_id = 7").fetchone() == (1,)
+
@@ -0,0 +1,72 @@
+import json
+import sqlite3
+
+import cause_list_parser
+
+LIST_PAGE = """<html><body>
+<table><tr><th>October 2026</th></tr><tr><td>1</td><td>2</td><td>3</td><td>4</td></tr></table>
+<table><tr><td>Court No.</td><td>Judge</td></tr><tr><td>5</td><td>Civil Judge</td></tr></table>
+<h3>Fresh Matters</h3>
+<table>
+  <tr><th>Serial Number</th><th>Case Type/Case Number/Case Year</th><th>Party Name</th><th>Advocate</th></tr>
+  <tr><td>1</td><td>CS (COMM)/12/2024</td><td>Ram Kumar Vs Shyam Lal</td><td>A. Sharma</td></tr>
+  <tr><td>2</td><td></td><td></td><td></td></tr>
+  <tr><td>3</td><td>T P (CRL)/19/2025</td><td>State Vs Mohan</td></tr>
+</table>
+<h3>Arguments</h3>
+<table>
+  <tr><td>4</td><td>MACT/45/2023</td><td>Sita Devi Vs United Insurance</td><td>B. Singh</td></tr>
+  <tr><td>5</td><td>ARBTN/7/2022</td><td>Alpha Ltd Vs Beta Ltd</td><td></td></tr>
+</table>
+</body></html>"""
+
+
+def test_cause_list_tables_are_kept_with_their_sections():
+    rows, headers, notes = cause_list_parser.parse_cause_list_page(LIST_PAGE)
+    assert headers == ["Section"] + cause_list_parser.STANDARD_HEADERS
+    assert [row[:3] for row in rows] == [
+        ["Fresh Matters", "1", "CS (COMM)/12/2024"],
+        ["Fresh Matters", "3", "T P (CRL)/19/2025"],
+        ["Arguments", "5", "ARBTN/7/2022"],
+    ]
+    assert "⏭️ Skipping calendar table" in notes
+    assert "⏭️ Skipping non-cause-list table" in notes
+
+
+def test_page_without_a_cause_list():
+    assert cause_list_parser.parse_cause_list_page("<p>No list published</p>") == (None, None, ["No tables found on the page"])
+    rows, headers, notes = cause_list_parser.parse_cause_list_page(
+        "<table><tr><th>Notice</th></tr><tr><td>Court closed</td><td>today</td></tr></table>"
+    )
+    assert (rows, headers) == (None, None)
+    assert notes[-1] == "No valid cause list data found in tables"
+
+
+def test_normalize_table_pads_headers_and_rows():
+    rows, headers, warning = cause_list_parser.normalize_table([["a", "b", "c"], ["d"]], ["One", "Two"])
+    assert headers == ["One", "Two", "Column_3"]
+    assert rows == [["a", "b", "c"], ["d", "", ""]]
+    assert warning.startswith("Headers count (2)")
+
+
+def test_normalize_table_leaves_matching_tables_alone():
+    assert cause_list_parser.normalize_table([["a", "b"]], ["One", "Two"]) == ([["a", "b"]], ["One", "Two"], None)
+    assert cause_list_parser.normalize_table([["a"]], ["One", "Two"])[1] == ["One"]
+
+
+def test_stored_rows_load_back_for_reuse():
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE cause_lists (id INTEGER PRIMARY KEY, headers TEXT)")
+    conn.execute("""CREATE TABLE cause_list_rows (cause_list_id INTEGER, row_index INTEGER, section TEXT,
+                    case_text TEXT, party_text TEXT, advocate_text TEXT, key_type TEXT, key_number TEXT,
+                    key_year INTEGER, cells TEXT)""")
+    rows, headers, _ = cause_list_parser.parse_cause_list_page(LIST_PAGE)
+    rows, headers, _ = cause_list_parser.normalize_table(rows, headers)
+    conn.execute("INSERT INTO cause_lists (id, headers) VALUES (1, ?)", (json.dumps(headers),))
+    cause_list_parser.store_rows(conn.cursor(), 1, headers, rows)
+
+    assert cause_list_parser.load_rows(conn, 1) == (rows, headers)
+    assert cause_list_parser.load_rows(conn, 2) == (None, None)
+    assert conn.execute("SELECT key_type, key_number, key_year FROM cause_list_rows ORDER BY row_index").fetchall() == [
+        ("CS(COMM)", "12", 2024), ("TP(CRL)", "19", 2025), ("ARBTN", "7", 2022),
+    ]
@@ -0,0 +1,74 @@
+import datetime
+import json
+
+import pytest
+
+import court_sites
+import resilience
+
+FORM_PAGE = """<html><body><form id="cause_list_form"><select id="court_complex"></select></form>
+<table><tr><th>October 2026</th></tr><tr><td>1</td><td>2</td><td>3</td><td>4</td></tr></table>
+</body></html>"""
+
+LIST_PAGE = """<html><body><h3>Fresh Matters</h3>
+<table>
+  <tr><th>Serial Number</th><th>Case Type/Case Number/Case Year</th><th>Party Name</th><th>Advocate</th></tr>
+  <tr><td>1</td><td>CS (COMM)/12/2024</td><td>Ram Kumar Vs Shyam Lal</td><td>A. Sharma</td></tr>
+</table></body></html>"""
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    monkeypatch.setattr(court_sites, "SITES", dict(court_sites.SITES))
+    return court_sites.SITES
+
+
+def test_default_site_is_delhi():
+    site = court_sites.get_site()
+    assert site.key == court_sites.DEFAULT_SITE == "newdelhi"
+    assert site.format_date(datetime.date(2026, 3, 9)) == "03/09/2026"
+
+
+def test_sites_file_registers_template_sites(registry, tmp_path):
+    path = tmp_path / "sites.json"
+    path.write_text(json.dumps([{"key": "saket", "name": "Saket", "url": "https://south.dcourts.gov.in/cause-list/",
+                                 "complexes": ["Saket Courts Complex"]}]))
+    assert court_sites.load_sites_file(str(path)) == 1
+    site = court_sites.get_site("saket")
+    assert site.complexes == ["Saket Courts Complex"]
+    assert site.format_date(datetime.date(2026, 3, 9)) == "09/03/2026"
+    assert site.court_option_keywords == court_sites.DEFAULT_COURT_OPTION_KEYWORDS
+
+
+def test_unknown_site_raises(registry):
+    with pytest.raises(KeyError):
+        court_sites.get_site("nowhere")
+
+
+def test_detect_results_waits_for_a_cause_list_table():
+    site = court_sites.get_site()
+    assert not site.detect_results("<html><body><form></form></body></html>")
+    # The form page's calendar table is not a result
+    assert not site.detect_results(FORM_PAGE)
+    assert site.detect_results(LIST_PAGE)
+
+
+def test_detect_results_skips_the_parse_without_a_table(monkeypatch):
+    site = court_sites.get_site()
+    monkeypatch.setattr(site, "parse", lambda raw_html: pytest.fail("parsed a page without tables"))
+    assert not site.detect_results("<html><body><form></form></body></html>")
+
+
+def test_detect_results_raises_on_error_pages():
+    site = court_sites.get_site()
+    with pytest.raises(resilience.FetchFailure):
+        site.detect_results('<div class="alert-danger">Invalid Captcha</div>')
+
+
+def test_subclass_overrides_one_step(registry):
+    class PlainListAdapter(court_sites.DcourtsCauseListAdapter):
+        def parse(self, raw_html):
+            return [["Cases", "1", "CS/1/2024", "A Vs B", ""]], ["Section", "Serial", "Case", "Party", "Advocate"], []
+
+    court_sites.register_site(PlainListAdapter("plain", "Plain", "https://plain.example/"))
+    assert court_sites.get_site("plain").detect_results("<table></table>")
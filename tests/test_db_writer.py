@@ -0,0 +1,202 @@
+import os
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+import db_writer
+
+SLOW = 5  # A flush interval no test waits out
+
+
+def wait_until(condition, timeout=2):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+def insert(cursor, value):
+    cursor.execute("INSERT INTO items (value) VALUES (?)", (value,))
+    return cursor.lastrowid
+
+
+def insert_and_fail(cursor, value):
+    insert(cursor, value)
+    raise ValueError(f"bad value {value}")
+
+
+def stored(db_file):
+    conn = sqlite3.connect(db_file)
+    values = [value for (value,) in conn.execute("SELECT value FROM items ORDER BY id")]
+    conn.close()
+    return values
+
+
+@pytest.fixture
+def db_file(tmp_path):
+    path = str(tmp_path / "cases.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, value TEXT)")
+    conn.close()
+    return path
+
+
+@pytest.fixture
+def writers():
+    started = []
+
+    def start(db_file, **options):
+        writer = db_writer.DBWriter(db_file, **options)
+        started.append(writer)
+        return writer
+
+    yield start
+    for writer in started:
+        writer.close()
+
+
+def test_a_full_batch_is_committed_without_waiting_for_the_interval(db_file, writers):
+    writer = writers(db_file, batch_size=3, flush_interval=SLOW)
+    futures = [writer.submit(insert, str(i)) for i in range(3)]
+    assert [future.result(2) for future in futures] == [1, 2, 3]
+    assert stored(db_file) == ["0", "1", "2"]
+    assert writer.stats()["batches"] == 1
+
+
+def test_a_partial_batch_is_committed_after_the_interval(db_file, writers):
+    writer = writers(db_file, flush_interval=0.2)
+    started = time.monotonic()
+    futures = [writer.submit(insert, str(i)) for i in range(5)]
+    for future in futures:
+        future.result(2)
+    assert time.monotonic() - started >= 0.15
+    stats = writer.stats()
+    assert (stats["batches"], stats["jobs_committed"], stats["avg_batch"]) == (1, 5, 5.0)
+
+
+def test_a_failing_job_is_rolled_back_alone(db_file, writers):
+    writer = writers(db_file, flush_interval=SLOW)
+    ok_before = writer.submit(insert, "a")
+    failing = writer.submit(insert_and_fail, "b")
+    ok_after = writer.submit(insert, "c")
+    writer.flush(2)
+
+    # The rolled back row took no id
+    assert (ok_before.result(), ok_after.result()) == (1, 2)
+    with pytest.raises(ValueError):
+        failing.result()
+    assert stored(db_file) == ["a", "c"]
+    stats = writer.stats()
+    assert (stats["batches"], stats["jobs_committed"], stats["jobs_failed"]) == (1, 2, 1)
+    assert stats["last_error"] == "ValueError: bad value b"
+
+
+def test_flush_returns_once_earlier_jobs_are_committed(db_file, writers):
+    writer = writers(db_file, flush_interval=SLOW)
+    futures = [writer.submit(insert, str(i)) for i in range(10)]
+    started = time.monotonic()
+    writer.flush(2)
+    # The flush closes the open batch instead of waiting out the interval
+    assert time.monotonic() - started < 1
+    assert all(future.done() for future in futures)
+    assert stored(db_file) == [str(i) for i in range(10)]
+    stats = writer.stats()
+    assert (stats["pending"], stats["jobs_committed"]) == (0, 10)
+
+    # Nothing pending: no marker is queued
+    writer.flush(2)
+    assert writer.stats()["batches"] == stats["batches"]
+
+
+def test_close_commits_the_queued_jobs_and_refuses_new_ones(db_file):
+    writer = db_writer.DBWriter(db_file, flush_interval=SLOW)
+    futures = [writer.submit(insert, str(i)) for i in range(3)]
+    writer.close()
+    assert [future.result(0) for future in futures] == [1, 2, 3]
+    with pytest.raises(db_writer.WriterClosed):
+        writer.submit(insert, "late")
+    assert stored(db_file) == ["0", "1", "2"]
+
+
+def test_get_writer_replaces_a_closed_writer(db_file, monkeypatch):
+    monkeypatch.setattr(db_writer, "_writers", {})
+    writer = db_writer.get_writer(db_file)
+    assert db_writer.get_writer(db_file) is writer
+    db_writer.close_all()
+    assert db_writer.get_writer(db_file) is not writer
+    db_writer.close_all()
+
+
+def test_queued_jobs_are_committed_at_exit(db_file):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    script = (
+        "import db_writer\n"
+        "writer = db_writer.get_writer(%r)\n"
+        "writer.flush_interval = 60\n"
+        "for i in range(3):\n"
+        "    writer.submit(lambda cursor, value: cursor.execute('INSERT INTO items (value) VALUES (?)', (value,)), str(i))\n"
+    ) % db_file
+    subprocess.run([sys.executable, "-c", script], cwd=root, check=True, timeout=30)
+    assert stored(db_file) == ["0", "1", "2"]
+
+
+def test_a_full_queue_blocks_submit_until_the_writer_catches_up(db_file, writers):
+    writer = writers(db_file, max_queue=1, flush_interval=0)
+    running, release = threading.Event(), threading.Event()
+
+    def held(cursor):
+        running.set()
+        release.wait(2)
+        return insert(cursor, "held")
+
+    writer.submit(held)
+    assert running.wait(2)
+    writer.submit(insert, "queued")
+    blocked = threading.Thread(target=writer.submit, args=(insert, "blocked"), daemon=True)
+    blocked.start()
+    wait_until(lambda: writer.stats()["blocked_submits"] == 1)
+    assert blocked.is_alive()
+
+    release.set()
+    blocked.join(2)
+    writer.flush(2)
+    assert stored(db_file) == ["held", "queued", "blocked"]
+    stats = writer.stats()
+    assert (stats["max_depth"], stats["queue_capacity"], stats["jobs_committed"]) == (1, 1, 3)
+    assert stats["commit_ms_p50"] is not None and stats["commit_ms_p95"] >= stats["commit_ms_p50"]
+
+
+def test_a_batch_is_retried_while_another_process_holds_the_database(db_file, writers, monkeypatch):
+    monkeypatch.setattr(db_writer, "RETRY_DELAY", 0.05)
+    writer = writers(db_file, flush_interval=0, busy_timeout=0.01)
+    other = sqlite3.connect(db_file, isolation_level=None)
+    other.execute("BEGIN IMMEDIATE")
+    future = writer.submit(insert, "a")
+    wait_until(lambda: writer.stats()["retries"] >= 1)
+    other.execute("COMMIT")
+    other.close()
+
+    assert future.result(5) == 1
+    assert stored(db_file) == ["a"]
+    assert writer.stats()["jobs_failed"] == 0
+
+
+def test_a_batch_fails_after_the_last_attempt(db_file, writers, monkeypatch):
+    monkeypatch.setattr(db_writer, "RETRY_DELAY", 0.01)
+    monkeypatch.setattr(db_writer, "COMMIT_ATTEMPTS", 3)
+    writer = writers(db_file, flush_interval=0, busy_timeout=0.01)
+    other = sqlite3.connect(db_file, isolation_level=None)
+    other.execute("BEGIN IMMEDIATE")
+    future = writer.submit(insert, "a")
+    with pytest.raises(sqlite3.OperationalError):
+        future.result(5)
+    other.execute("ROLLBACK")
+    other.close()
+
+    stats = writer.stats()
+    assert (stats["retries"], stats["jobs_failed"]) == (2, 1)
+    assert stored(db_file) == []
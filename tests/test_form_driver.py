@@ -0,0 +1,68 @@
+import form_driver
+
+
+class RecordingDriver:
+    """Stands in for WebDriver: records every execute_script round-trip"""
+
+    def __init__(self, reply=None):
+        self.calls = []
+        self.reply = reply
+
+    def execute_script(self, script, *args):
+        self.calls.append((script, args))
+        return self.reply
+
+
+OPTIONS = [
+    {"value": "0", "text": "Select Court Complex", "selected": True},
+    {"value": "1@2", "text": "Karkardooma Court Complex", "selected": False},
+    {"value": "3@4", "text": "Karkardooma Court Complex, Family Courts", "selected": False},
+    {"value": "", "text": "", "selected": False},
+]
+
+
+def test_match_option_prefers_the_exact_text():
+    assert form_driver.match_option(OPTIONS, "Karkardooma Court Complex")["value"] == "1@2"
+    assert form_driver.match_option(OPTIONS, "  Karkardooma Court Complex ")["value"] == "1@2"
+
+
+def test_match_option_falls_back_to_case_insensitive_containment():
+    assert form_driver.match_option(OPTIONS, "family courts")["value"] == "3@4"
+    assert form_driver.match_option(OPTIONS, "karkardooma")["value"] == "1@2"
+
+
+def test_match_option_without_a_match():
+    assert form_driver.match_option(OPTIONS, "Tis Hazari") is None
+    assert form_driver.match_option([], "Tis Hazari") is None
+
+
+def test_collect_form_reads_the_whole_form_in_one_call():
+    form = {"selects": [], "radios": [], "inputs": [], "labels": []}
+    driver = RecordingDriver(form)
+    assert form_driver.collect_form(driver) is form
+    assert driver.calls == [(form_driver.COLLECT_FORM_JS, ())]
+
+
+def test_apply_form_sends_every_action_in_one_call():
+    actions = [
+        {"kind": "select", "index": 0, "value": "1@2"},
+        {"kind": "input", "index": 2, "values": ["19/10/2026", "2026-10-19"], "min_length": 8},
+        {"kind": "label", "index": 1},
+    ]
+    driver = RecordingDriver([{"ok": True}] * len(actions))
+    assert form_driver.apply_form(driver, actions) == [{"ok": True}] * 3
+    assert driver.calls == [(form_driver.APPLY_FORM_JS, (actions,))]
+
+
+def test_apply_form_without_actions_skips_the_round_trip():
+    driver = RecordingDriver()
+    assert form_driver.apply_form(driver, []) == []
+    assert driver.calls == []
+
+
+def test_select_helpers_pass_the_element_through():
+    element = object()
+    driver = RecordingDriver(True)
+    assert form_driver.set_select_value(driver, element, "1@2") is True
+    form_driver.read_options(driver, element)
+    assert driver.calls == [(form_driver.SET_SELECT_JS, (element, "1@2")), (form_driver.READ_SELECT_JS, (element,))]
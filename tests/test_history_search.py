@@ -0,0 +1,109 @@
+import sqlite3
+
+import pytest
+
+import history_search
+
+
+@pytest.fixture
+def db_file(tmp_path):
+    db_file = str(tmp_path / "case_data.db")
+    conn = sqlite3.connect(db_file)
+    if not history_search.fts5_available(conn):
+        pytest.skip("SQLite was built without FTS5")
+    # The searched tables as court_case.setup_database creates them
+    conn.execute("""CREATE TABLE queries (id INTEGER PRIMARY KEY AUTOINCREMENT, case_type TEXT NOT NULL,
+                    case_number TEXT NOT NULL, case_year INTEGER NOT NULL, parties TEXT, filing_date TEXT,
+                    case_status TEXT, raw_response_html TEXT, timestamp DATETIME DEFAULT CURRENT_TIMESTAMP)""")
+    conn.execute("""CREATE TABLE cause_lists (id INTEGER PRIMARY KEY AUTOINCREMENT, court_complex TEXT NOT NULL,
+                    court_number TEXT, list_date TEXT NOT NULL, list_type TEXT NOT NULL, total_cases INTEGER,
+                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP)""")
+    conn.execute("""CREATE TABLE cause_list_rows (id INTEGER PRIMARY KEY AUTOINCREMENT, cause_list_id INTEGER NOT NULL,
+                    row_index INTEGER NOT NULL, section TEXT, case_text TEXT, party_text TEXT, advocate_text TEXT)""")
+    conn.execute("INSERT INTO cause_lists (court_complex, list_date, list_type) VALUES ('Saket Courts Complex', '15/01/2025', 'Civil')")
+    conn.commit()
+    conn.close()
+    return db_file
+
+
+def add_row(conn, party, advocate="", case_text="CS/1/2024"):
+    cursor = conn.execute(
+        "INSERT INTO cause_list_rows (cause_list_id, row_index, case_text, party_text, advocate_text) VALUES (1, 0, ?, ?, ?)",
+        (case_text, party, advocate)
+    )
+    return cursor.lastrowid
+
+
+def add_query(conn, parties):
+    cursor = conn.execute(
+        "INSERT INTO queries (case_type, case_number, case_year, parties, case_status) VALUES ('CS', '1', 2024, ?, 'Pending')",
+        (parties,)
+    )
+    return cursor.lastrowid
+
+
+def sources(db_file, text):
+    return list(history_search.search_history(db_file, text).get("source", []))
+
+
+def test_triggers_keep_the_index_in_sync(db_file):
+    conn = sqlite3.connect(db_file)
+    history_search.setup_search_index(conn)
+    row_id = add_row(conn, "Ramesh Kumar vs State")
+    conn.commit()
+    assert sources(db_file, "ramesh") == ["Cause List"]
+
+    conn.execute("UPDATE cause_list_rows SET party_text = 'Suresh Gupta vs State' WHERE id = ?", (row_id,))
+    conn.commit()
+    assert sources(db_file, "ramesh") == []
+    assert sources(db_file, "suresh") == ["Cause List"]
+
+    conn.execute("DELETE FROM cause_list_rows WHERE id = ?", (row_id,))
+    conn.commit()
+    conn.close()
+    assert sources(db_file, "suresh") == []
+
+
+def test_rows_stored_before_the_index_existed_are_indexed(db_file):
+    conn = sqlite3.connect(db_file)
+    add_row(conn, "Anita Sharma vs Union of India")
+    add_query(conn, "Anita Sharma Versus Delhi Development Authority")
+    conn.commit()
+    assert history_search.setup_search_index(conn)
+    conn.commit()
+    conn.close()
+    assert sorted(sources(db_file, "anita sharma")) == ["Case Status", "Cause List"]
+
+
+def test_last_word_matches_as_a_prefix_and_accents_are_ignored(db_file):
+    conn = sqlite3.connect(db_file)
+    history_search.setup_search_index(conn)
+    add_row(conn, "José Fernandes vs State", advocate="Adv. Mehta")
+    conn.commit()
+    conn.close()
+    assert sources(db_file, "jose fern") == ["Cause List"]
+    assert sources(db_file, "meh") == ["Cause List"]
+    assert sources(db_file, "fernandes jos") == ["Cause List"]
+    assert sources(db_file, "fern jose") == []
+    assert sources(db_file, "   ") == []
+
+
+def test_sources_are_ranked_separately_and_interleaved(db_file):
+    conn = sqlite3.connect(db_file)
+    history_search.setup_search_index(conn)
+    for i in range(3):
+        add_row(conn, f"Kapoor Traders {i} vs Kapoor", advocate="Kapoor")
+    add_query(conn, "Kapoor Traders vs Bank")
+    conn.commit()
+    conn.close()
+
+    df = history_search.search_history(db_file, "kapoor")
+    assert list(df["source"]) == ["Cause List", "Case Status", "Cause List", "Cause List"]
+    assert list(df["rank"]) == [1, 1, 2, 3]
+    assert len(history_search.search_history(db_file, "kapoor", limit=2)) == 2
+
+
+def test_build_match_query():
+    assert history_search.build_match_query("Ram  Kumar-Singh") == '"Ram" "Kumar" "Singh"*'
+    assert history_search.build_match_query('"; DROP') == '"DROP"*'
+    assert history_search.build_match_query("") is None
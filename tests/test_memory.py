@@ -0,0 +1,47 @@
+import os
+import sqlite3
+import sys
+import tracemalloc
+
+import pyarrow as pa
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+import bench_memory  # noqa: E402
+import watchlist  # noqa: E402
+
+ROWS = 2000
+# About 2.5x what a 2000-row fetch measures; a parse tree or row list kept alive blows well past both
+MAX_PEAK_MB = 25
+MAX_RETAINED_MB = 1.5
+
+
+def page(rows):
+    return "<html><body>" + bench_memory.mock_court.cause_list_fragment("Mock Courts Complex", "15/01/2025", "Civil", rows) + "</body></html>"
+
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(":memory:")
+    conn.execute("""CREATE TABLE cause_list_rows (cause_list_id, row_index, section, case_text, party_text, advocate_text,
+                                                  key_type, key_number, key_year, cells)""")
+    yield conn
+    conn.close()
+
+
+def test_cause_list_fetch_stays_within_memory_budget(conn):
+    watch_index = watchlist.WatchlistIndex(bench_memory.WATCH_ENTRIES)
+    raw_html = page(ROWS)
+    tracemalloc.start()
+    try:
+        bench_memory.cause_list_fetch(page(20), conn, watch_index, False)  # Warm-up
+        before = tracemalloc.get_traced_memory()[0] + pa.total_allocated_bytes()
+        meter, result = bench_memory.cause_list_fetch(raw_html, conn, watch_index, False)
+        retained = tracemalloc.get_traced_memory()[0] + pa.total_allocated_bytes() - before
+    finally:
+        tracemalloc.stop()
+
+    assert len(result["df"]) == ROWS
+    assert meter.fetch_peak / bench_memory.MB < MAX_PEAK_MB
+    assert retained / bench_memory.MB < MAX_RETAINED_MB
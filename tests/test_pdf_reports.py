@@ -0,0 +1,85 @@
+import json
+import sqlite3
+import zipfile
+from io import BytesIO
+
+import pandas as pd
+
+import cause_list_parser
+import pdf_reports
+from pdf_reports import PdfRenderer, inch
+
+HEADERS = ["Section"] + cause_list_parser.STANDARD_HEADERS
+
+
+def cause_list_df(sections=("Fresh Matters", "Arguments"), rows_per_section=3):
+    rows = [[section, str(i + 1), f"CS/{i + 1}/2024", f"Party {i + 1} Vs State", "A. Sharma"]
+            for section in sections for i in range(rows_per_section)]
+    return pd.DataFrame(rows, columns=HEADERS)
+
+
+def test_column_widths_fit_the_page_and_are_built_once_per_schema():
+    renderer = PdfRenderer()
+    widths, header_markup = renderer.cause_list_layout(cause_list_parser.STANDARD_HEADERS + ["Remarks"])
+    assert sum(widths) <= pdf_reports.CAUSE_LIST_TABLE_WIDTH + 1e-6
+    assert header_markup[0] == "<b>Serial Number</b>"
+    assert renderer.cause_list_layout(cause_list_parser.STANDARD_HEADERS + ["Remarks"]) is renderer.cause_list_layout(
+        tuple(cause_list_parser.STANDARD_HEADERS) + ("Remarks",))
+    assert pdf_reports.column_width("Party Name") == 3.0 * inch
+
+
+def test_each_section_starts_a_new_page():
+    renderer = PdfRenderer()
+    pdf = renderer.cause_list_pdf(cause_list_df(), "Saket Courts Complex", "09/03/2026", "Civil")
+    assert pdf.startswith(b"%PDF")
+    stats = renderer.stats()
+    assert (stats["documents"], stats["pages"]) == (1, 2)
+
+
+def test_combined_pdf_and_zip_hold_every_list():
+    renderer = PdfRenderer()
+    lists = [(cause_list_df(sections=("Cases",)), "Saket Courts Complex", f"0{day}/03/2026", "Civil") for day in (2, 3, 4)]
+    renderer.combined_cause_lists_pdf(lists)
+    assert renderer.stats()["pages"] == 3
+
+    archive = zipfile.ZipFile(BytesIO(renderer.cause_lists_zip([(f"list_{i}.pdf",) + entry for i, entry in enumerate(lists)])))
+    assert archive.namelist() == ["list_0.pdf", "list_1.pdf", "list_2.pdf"]
+    assert all(archive.read(name).startswith(b"%PDF") for name in archive.namelist())
+    # One combined document plus one per list in the ZIP
+    assert renderer.stats()["documents"] == 4
+
+
+def test_case_details_pdf_with_history():
+    case_data = {
+        "status": "Pending",
+        "filing_date": "2023-01-05",
+        "acts": ["Code of Civil Procedure - 9"],
+        "hearings": [{"judge": "Civil Judge", "business_on_date": "2023-02-12", "hearing_date": "2023-04-10", "purpose": "Appearance"}],
+        "orders": [{"order_number": "1", "order_date": "2023-02-12", "order_details": "Copy of order"}],
+    }
+    renderer = PdfRenderer()
+    assert renderer.case_details_pdf(case_data, "CS", "45", 2023).startswith(b"%PDF")
+    assert renderer.stats()["documents"] == 1
+
+
+def test_stored_cause_list_and_file_name():
+    conn = sqlite3.connect(":memory:")
+    conn.execute("""CREATE TABLE cause_lists (id INTEGER PRIMARY KEY, court_complex TEXT, list_date TEXT,
+                    list_type TEXT, headers TEXT)""")
+    conn.execute("""CREATE TABLE cause_list_rows (cause_list_id INTEGER, row_index INTEGER, section TEXT,
+                    case_text TEXT, party_text TEXT, advocate_text TEXT, key_type TEXT, key_number TEXT,
+                    key_year INTEGER, cells TEXT)""")
+    df = cause_list_df(rows_per_section=1)
+    conn.execute("INSERT INTO cause_lists VALUES (1, 'Saket Courts Complex', '03/09/2026', 'Civil', ?)", (json.dumps(HEADERS),))
+    conn.execute("INSERT INTO cause_lists VALUES (2, 'Saket Courts Complex', '03/10/2026', 'Civil', ?)", (json.dumps(HEADERS),))
+    cause_list_parser.store_rows(conn.cursor(), 1, HEADERS, df.values.tolist())
+
+    stored_df, court_complex, list_date, list_type = pdf_reports.stored_cause_list(conn, 1)
+    assert stored_df.values.tolist() == df.values.tolist()
+    assert list(stored_df.columns) == HEADERS
+    assert (stored_df.dtypes == cause_list_parser.STRING_DTYPE).all()
+    assert (court_complex, list_date, list_type) == ("Saket Courts Complex", "03/09/2026", "Civil")
+    assert pdf_reports.stored_cause_list(conn, 2) is None
+    assert pdf_reports.stored_cause_list(conn, 3) is None
+    assert pdf_reports.cause_list_file_name(1, court_complex, list_date, list_type) == \
+        "cause_list_1_Saket_Courts_Complex_03_09_2026_Civil.pdf"
@@ -0,0 +1,93 @@
+import sqlite3
+
+import pytest
+
+import reprocess
+
+
+def case_page(status):
+    return f"<table><tr><td>Case Status:</td><td>{status}</td></tr><tr><td>Filing Date:</td><td>05-01-2023</td></tr></table>"
+
+
+@pytest.fixture
+def db_file(tmp_path):
+    path = str(tmp_path / "cases.db")
+    conn = sqlite3.connect(path)
+    conn.execute("""CREATE TABLE queries (id INTEGER PRIMARY KEY, parties TEXT, filing_date TEXT,
+                    case_status TEXT, raw_response_html TEXT)""")
+    conn.executemany("INSERT INTO queries (id, raw_response_html) VALUES (?, ?)",
+                     [(i, case_page(f"Pending {i}")) for i in range(1, 6)])
+    conn.commit()
+    conn.close()
+    return path
+
+
+class Interrupted(Exception):
+    pass
+
+
+def interrupt_after(chunks):
+    messages = []
+
+    def progress(message):
+        messages.append(message)
+        if len(messages) == chunks:
+            raise Interrupted
+    return progress
+
+
+def statuses(db_file):
+    conn = sqlite3.connect(db_file)
+    rows = conn.execute("SELECT id, case_status FROM queries ORDER BY id").fetchall()
+    conn.close()
+    return rows
+
+
+def checkpoint(db_file):
+    conn = sqlite3.connect(db_file)
+    row = reprocess.load_checkpoint(conn, "case_status")
+    conn.close()
+    return row
+
+
+def test_full_run_parses_every_row(db_file):
+    parsed, failed, _ = reprocess.run("case_status", db_file, workers=1, chunk_size=2, progress=lambda message: None)
+    assert (parsed, failed) == (5, 0)
+    assert statuses(db_file) == [(i, f"Pending {i}") for i in range(1, 6)]
+    assert checkpoint(db_file) == (5, 5)
+
+
+def test_interrupted_run_resumes_after_the_last_committed_chunk(db_file):
+    with pytest.raises(Interrupted):
+        reprocess.run("case_status", db_file, workers=1, chunk_size=2, progress=interrupt_after(1))
+    assert checkpoint(db_file) == (2, 2)
+    assert [status for _, status in statuses(db_file)] == ["Pending 1", "Pending 2", None, None, None]
+
+    # Rows of the committed chunk are not parsed again
+    conn = sqlite3.connect(db_file)
+    conn.execute("UPDATE queries SET case_status = 'kept' WHERE id <= 2")
+    conn.commit()
+    conn.close()
+
+    parsed, failed, _ = reprocess.run("case_status", db_file, workers=1, chunk_size=2, progress=lambda message: None)
+    assert (parsed, failed) == (3, 0)
+    assert [status for _, status in statuses(db_file)] == ["kept", "kept", "Pending 3", "Pending 4", "Pending 5"]
+    assert checkpoint(db_file) == (5, 5)
+
+
+def test_restart_ignores_the_checkpoint(db_file):
+    reprocess.run("case_status", db_file, workers=1, chunk_size=2, progress=lambda message: None)
+    assert reprocess.run("case_status", db_file, workers=1, progress=lambda message: None)[:2] == (0, 0)
+    parsed, _, _ = reprocess.run("case_status", db_file, workers=1, restart=True, progress=lambda message: None)
+    assert parsed == 5
+
+
+def test_rows_added_after_a_run_are_picked_up(db_file):
+    reprocess.run("case_status", db_file, workers=1, progress=lambda message: None)
+    conn = sqlite3.connect(db_file)
+    conn.execute("INSERT INTO queries (id, raw_response_html) VALUES (6, ?)", (case_page("Disposed"),))
+    conn.commit()
+    conn.close()
+    assert reprocess.run("case_status", db_file, workers=1, progress=lambda message: None)[:2] == (1, 0)
+    assert statuses(db_file)[-1] == (6, "Disposed")
+    assert checkpoint(db_file) == (6, 6)
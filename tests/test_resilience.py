@@ -0,0 +1,91 @@
+import pytest
+
+import resilience
+
+ERROR_PAGE = "<html><body><h1>503 Service Unavailable</h1><p>The server is temporarily unable to service your request.</p></body></html>"
+INVALID_CAPTCHA = '<div class="alert alert-danger">Invalid Captcha</div>'
+
+
+def failure_kind(page):
+    try:
+        resilience.check_page_for_failure(page)
+    except resilience.FetchFailure as e:
+        return e.kind
+    return None
+
+
+def cause_list_page(extra_rows=""):
+    rows = "".join(
+        f"<tr><td>{i}</td><td>CS/{i}/2024</td><td>Party {i} vs Party {i + 1}</td><td>Adv {i}</td></tr>"
+        for i in range(1, 4)
+    )
+    return f"""<html><head><title>Cause List</title></head><body>
+    <div id="validateError" class="modal" style="display:none">Invalid Captcha</div>
+    <template><div class="alert alert-danger">Invalid Captcha</div></template>
+    <table><tr><th>Sr</th><th>Case</th><th>Party</th><th>Advocate</th></tr>{rows}{extra_rows}</table>
+    </body></html>"""
+
+
+def test_listing_text_with_marker_words_is_not_a_failure():
+    remarks = ("<tr><td>4</td><td>CS/4/2024</td><td>Invalid Captcha Pvt Ltd vs 503 Service Workers Union</td>"
+               "<td>Adv 4 (remark: wrong captcha entered at filing)</td></tr>")
+    assert failure_kind(cause_list_page(remarks)) is None
+
+
+def test_visible_alert_rejecting_the_captcha_is_reported():
+    page = cause_list_page().replace("<table>", INVALID_CAPTCHA + "<table>")
+    assert failure_kind(page) == resilience.CAPTCHA_WRONG
+
+
+def test_server_error_page_is_reported():
+    assert failure_kind(ERROR_PAGE) == resilience.SITE_DOWN
+    assert failure_kind("<html><head><title>502 Bad Gateway</title></head><body><center>nginx</center></body></html>") == resilience.SITE_DOWN
+
+
+def test_browser_error_page_is_reported():
+    page = '<html><body class="neterror"><div id="main-frame-error"><div class="error-code">ERR_CONNECTION_REFUSED</div></div></body></html>'
+    assert failure_kind(page) == resilience.SITE_DOWN
+
+
+@pytest.mark.parametrize("text, kind", [
+    ("Invalid Captcha", resilience.CAPTCHA_WRONG),
+    ("Case Status: Pending", None),
+])
+def test_result_container_text(text, kind):
+    try:
+        resilience.check_failure_text(text)
+    except resilience.FetchFailure as e:
+        assert e.kind == kind
+    else:
+        assert kind is None
+
+
+def test_breaker_opens_after_repeated_site_failures_and_recovers_on_success():
+    breaker = resilience.CircuitBreaker("court.example", failure_threshold=2, reset_timeout=0)
+    breaker.record_failure(resilience.SITE_DOWN)
+    assert breaker.state == breaker.CLOSED
+    breaker.record_failure(resilience.SITE_DOWN)
+    assert breaker.state == breaker.OPEN
+
+    assert breaker.allow()  # Half-open trial after the (zero) cool-down
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == breaker.CLOSED
+    assert breaker.allow() and breaker.allow()
+
+
+def test_rejected_captcha_does_not_count_against_the_site():
+    breaker = resilience.CircuitBreaker("court.example", failure_threshold=1)
+    breaker.record_failure(resilience.CAPTCHA_WRONG)
+    assert breaker.state == breaker.CLOSED
+
+
+def test_release_frees_a_half_open_trial_without_closing_the_breaker():
+    breaker = resilience.CircuitBreaker("court.example", failure_threshold=1, reset_timeout=0)
+    breaker.record_failure(resilience.SITE_DOWN)
+    assert breaker.allow()
+    breaker.release()
+    assert breaker.state == breaker.HALF_OPEN
+    assert breaker.allow()
+    breaker.record_failure(resilience.SITE_DOWN)
+    assert breaker.state == breaker.OPEN
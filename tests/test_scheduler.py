@@ -0,0 +1,154 @@
+import threading
+import time
+
+import pytest
+
+import scheduler
+
+FAST = {"court.example": (2, 6000, 10)}
+
+
+def wait_until(condition, timeout=2):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+def run_in_thread(fn):
+    outcome = {}
+
+    def target():
+        try:
+            outcome["result"] = fn()
+        except BaseException as e:
+            outcome["error"] = e
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    return thread, outcome
+
+
+def test_limits_apply_per_host():
+    fetches = scheduler.FetchScheduler({"court.example": (1, 600, 1)})
+    assert fetches.limiter("https://court.example/list").max_concurrent == 1
+    assert fetches.limiter("court.example") is fetches.limiter("https://court.example/other")
+    assert fetches.limiter("https://elsewhere.example/").max_concurrent == scheduler.DEFAULT_LIMITS[0]
+
+
+def test_waiting_fetches_are_admitted_in_priority_order():
+    limiter = scheduler.HostLimiter("court.example", 1, 6000, 10)
+    limiter.acquire()
+    order = []
+
+    def fetch(name, priority):
+        limiter.acquire(priority)
+        order.append(name)
+        limiter.release()
+
+    threads = []
+    for name, priority in [("batch", scheduler.BATCH), ("interactive", scheduler.INTERACTIVE)]:
+        thread = threading.Thread(target=fetch, args=(name, priority), daemon=True)
+        thread.start()
+        threads.append(thread)
+        wait_until(lambda: limiter.stats()["waiting"] == len(threads))
+    limiter.release()
+    for thread in threads:
+        thread.join(2)
+    assert order == ["interactive", "batch"]
+    assert limiter.stats()["admitted"] == 3
+
+
+def test_token_bucket_holds_fetches_beyond_the_burst():
+    limiter = scheduler.HostLimiter("court.example", 5, 60, 1)
+    limiter.acquire()
+    limiter.release()
+    thread, outcome = run_in_thread(limiter.acquire)
+    thread.join(0.2)
+    assert thread.is_alive()
+    assert limiter.stats()["waiting"] == 1
+    limiter.tokens = 1
+    limiter.last_refill = time.monotonic()
+    with limiter._cond:
+        limiter._cond.notify_all()
+    thread.join(2)
+    assert not thread.is_alive() and "error" not in outcome
+
+
+def test_identical_requests_share_one_fetch():
+    fetches = scheduler.FetchScheduler(FAST)
+    started, finish = threading.Event(), threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        started.set()
+        finish.wait(2)
+        return "listing"
+
+    leader, leader_outcome = run_in_thread(lambda: fetches.run("court.example", ("cause_list", 1), fetch))
+    started.wait(2)
+    follower, follower_outcome = run_in_thread(lambda: fetches.run("court.example", ("cause_list", 1), fetch))
+    wait_until(lambda: fetches.coalesced == 1)
+    finish.set()
+    leader.join(2)
+    follower.join(2)
+    assert calls == [1]
+    assert leader_outcome["result"] == follower_outcome["result"] == "listing"
+    assert fetches.stats()["in_flight"] == 0
+
+
+def test_shared_fetch_error_reaches_every_caller():
+    fetches = scheduler.FetchScheduler(FAST)
+    started, finish = threading.Event(), threading.Event()
+
+    def fetch():
+        started.set()
+        finish.wait(2)
+        raise ValueError("site down")
+
+    leader, leader_outcome = run_in_thread(lambda: fetches.run("court.example", "key", fetch))
+    started.wait(2)
+    follower, follower_outcome = run_in_thread(lambda: fetches.run("court.example", "key", fetch))
+    wait_until(lambda: fetches.coalesced == 1)
+    finish.set()
+    leader.join(2)
+    follower.join(2)
+    assert isinstance(leader_outcome["error"], ValueError)
+    assert follower_outcome["error"] is leader_outcome["error"]
+
+
+def test_interrupted_leader_hands_the_fetch_to_a_waiting_caller():
+    fetches = scheduler.FetchScheduler(FAST)
+    started, finish = threading.Event(), threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(threading.current_thread().name)
+        if len(calls) == 1:
+            started.set()
+            finish.wait(2)
+            raise KeyboardInterrupt
+        return "case"
+
+    leader, leader_outcome = run_in_thread(lambda: fetches.run("court.example", "key", fetch))
+    started.wait(2)
+    follower, follower_outcome = run_in_thread(lambda: fetches.run("court.example", "key", fetch))
+    wait_until(lambda: fetches.coalesced == 1)
+    finish.set()
+    leader.join(2)
+    follower.join(2)
+    assert isinstance(leader_outcome["error"], KeyboardInterrupt)
+    assert follower_outcome == {"result": "case"}
+    assert calls == [leader.name, follower.name]
+    assert fetches.coalesced == 1
+
+
+def test_finished_fetch_is_not_shared_with_later_requests():
+    fetches = scheduler.FetchScheduler(FAST)
+    assert fetches.run("court.example", "key", lambda: 1) == 1
+    assert fetches.run("court.example", "key", lambda: 2) == 2
+    with pytest.raises(ZeroDivisionError):
+        fetches.run("court.example", "key", lambda: 1 / 0)
+    assert fetches.stats()["in_flight"] == 0
+    assert fetches.limiter("court.example").stats()["running"] == 0
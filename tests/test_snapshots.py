@@ -0,0 +1,53 @@
+import sqlite3
+
+import pytest
+
+import snapshots
+
+PAGE = """<html><head><script>var nonce = "{nonce}";</script><style>.x {{ color: red }}</style></head>
+<body><form><input type="hidden" name="_wpnonce" value="{nonce}"><input type="text" name="date" value="19/10/2026"></form>
+<table><tr><th>Serial Number</th><th>Case</th></tr><tr><td>1</td><td>{case}</td></tr></table></body></html>"""
+
+
+def page(nonce="a1", case="CS/1/2024"):
+    return PAGE.format(nonce=nonce, case=case)
+
+
+@pytest.fixture
+def db_file(tmp_path):
+    path = str(tmp_path / "snapshots.db")
+    conn = sqlite3.connect(path)
+    snapshots.setup_snapshot_tables(conn)
+    conn.close()
+    return path
+
+
+def test_hash_ignores_scripts_styles_and_hidden_values():
+    assert snapshots.content_hash(page("a1")) == snapshots.content_hash(page("b2"))
+    assert snapshots.content_hash(page()) == snapshots.content_hash(page().replace("\n", "\n\n  "))
+
+
+def test_hash_changes_with_the_listing():
+    assert snapshots.content_hash(page(case="CS/1/2024")) != snapshots.content_hash(page(case="CS/2/2024"))
+    assert snapshots.content_hash(page()) != snapshots.content_hash(page().replace('value="19/10/2026"', 'value="20/10/2026"'))
+
+
+def test_identical_refetch_is_stored_once(db_file):
+    first_id, first_seen = snapshots.store_snapshot(db_file, "cause_list", page("a1"))
+    again_id, again_seen = snapshots.store_snapshot(db_file, "cause_list", page("b2"))
+    other_id, other_seen = snapshots.store_snapshot(db_file, "cause_list", page(case="CS/2/2024"))
+    assert (first_seen, again_seen, other_seen) == (False, True, False)
+    assert again_id == first_id != other_id
+    stats = snapshots.snapshot_stats(db_file)
+    assert stats["snapshots"] == 2
+    assert stats["fetches"] == 3
+
+
+def test_stored_page_round_trips(db_file):
+    snapshot_id, _ = snapshots.store_snapshot(db_file, "cause_list", page() * 50)
+    conn = sqlite3.connect(db_file)
+    assert snapshots.load_snapshot(conn, snapshot_id) == page() * 50
+    assert snapshots.load_snapshot(conn, snapshot_id + 1) is None
+    conn.close()
+    stats = snapshots.snapshot_stats(db_file)
+    assert stats["stored_bytes"] < stats["raw_bytes"]
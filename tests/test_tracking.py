@@ -0,0 +1,132 @@
+import datetime
+import sqlite3
+
+import pytest
+
+import case_parser
+import tracking
+
+NOW = datetime.datetime(2025, 3, 10, 12, 0, 0)
+COURT = ("Delhi", "New Delhi", "Patiala House Court Complex")
+
+
+class ListNotifier:
+    def __init__(self):
+        self.sent = []
+
+    def send(self, notification):
+        self.sent.append(notification)
+
+
+class StubSite:
+    """refresh_case for run_once: serves a fixed status per case number and stores the lookup like court_case"""
+
+    def __init__(self, db_file, statuses):
+        self.db_file = db_file
+        self.statuses = statuses
+        self.refreshed = []
+
+    def __call__(self, tracked):
+        self.refreshed.append(tracked["case_number"])
+        status = self.statuses[tracked["case_number"]]
+        if status is None:
+            return None, None, "The CAPTCHA was not solved automatically"
+        record = case_parser.CaseRecord(status=status, next_hearing_date="2025-06-01").to_dict()
+        conn = sqlite3.connect(self.db_file)
+        cursor = conn.cursor()
+        cursor.execute(
+            """INSERT INTO queries (case_type, case_number, case_year, case_status, key_type, key_number, key_year)
+               VALUES (?, ?, ?, ?, ?, ?, ?)""",
+            (tracked["case_type"], tracked["case_number"], tracked["case_year"], status,
+             tracked["key_type"], tracked["key_number"], tracked["key_year"])
+        )
+        query_id = cursor.lastrowid
+        case_parser.store_case_record(cursor, query_id, record)
+        conn.commit()
+        conn.close()
+        return query_id, record, None
+
+
+@pytest.fixture
+def db_file(tmp_path):
+    db_file = str(tmp_path / "case_data.db")
+    conn = sqlite3.connect(db_file)
+    # The queries table as court_case.setup_database creates it
+    conn.execute("""CREATE TABLE queries (id INTEGER PRIMARY KEY AUTOINCREMENT, case_type TEXT NOT NULL,
+                    case_number TEXT NOT NULL, case_year INTEGER NOT NULL, parties TEXT, filing_date TEXT,
+                    case_status TEXT, raw_response_html TEXT, timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    key_type TEXT, key_number TEXT, key_year INTEGER)""")
+    case_parser.setup_case_detail_tables(conn)
+    tracking.setup_tracking_tables(conn)
+    conn.close()
+    return db_file
+
+
+def track(db_file, number, last_checked=None):
+    tracked_id = tracking.track_case(db_file, *COURT, "CS", number, 2024)
+    if last_checked:
+        conn = sqlite3.connect(db_file)
+        conn.execute("UPDATE tracked_cases SET last_checked = ? WHERE id = ?",
+                     (last_checked.strftime("%Y-%m-%d %H:%M:%S"), tracked_id))
+        conn.commit()
+        conn.close()
+    return tracked_id
+
+
+def test_run_once_refreshes_most_overdue_first_within_budget(db_file):
+    track(db_file, "1", last_checked=NOW - datetime.timedelta(days=15))
+    track(db_file, "2", last_checked=NOW - datetime.timedelta(days=30))
+    track(db_file, "3", last_checked=NOW - datetime.timedelta(days=1))  # Not due
+    track(db_file, "4", last_checked=NOW - datetime.timedelta(days=20))
+    site = StubSite(db_file, {"1": "Pending", "2": "Pending", "3": "Pending", "4": "Pending"})
+
+    summary = tracking.run_once(db_file, site, budget=2, now=NOW, notifiers=[])
+    assert site.refreshed == ["2", "4"]
+    assert summary["checked"] == 2
+
+    tracking.run_once(db_file, site, budget=5, now=NOW, notifiers=[])
+    assert site.refreshed == ["2", "4", "1"]
+
+
+def test_run_once_notifies_only_on_change(db_file):
+    track(db_file, "1")
+    site = StubSite(db_file, {"1": "Pending"})
+    notifier = ListNotifier()
+
+    # The first lookup is the baseline
+    summary = tracking.run_once(db_file, site, now=NOW, notifiers=[notifier])
+    assert (summary["checked"], summary["changed"], notifier.sent) == (1, 0, [])
+
+    later = NOW + tracking.STALE_AFTER
+    summary = tracking.run_once(db_file, site, now=later, notifiers=[notifier])
+    assert (summary["checked"], summary["changed"], notifier.sent) == (1, 0, [])
+
+    site.statuses["1"] = "Disposed"
+    summary = tracking.run_once(db_file, site, now=later + tracking.STALE_AFTER, notifiers=[notifier])
+    assert (summary["changed"], summary["delivered"]) == (1, 1)
+    assert [(c["field"], c["old"], c["new"]) for c in notifier.sent[0]["changes"]] == [("status", "Pending", "Disposed")]
+
+
+def test_failed_refresh_is_retried_later(db_file):
+    track(db_file, "1")
+    site = StubSite(db_file, {"1": None})
+
+    summary = tracking.run_once(db_file, site, now=NOW, notifiers=[])
+    assert summary["failed"] == 1
+    assert tracking.due_cases(db_file, now=NOW + datetime.timedelta(minutes=5)) == []
+    assert [case["case_number"] for case in tracking.due_cases(db_file, now=NOW + tracking.RETRY_AFTER)] == ["1"]
+
+
+def test_a_shared_lookup_is_recorded_once(db_file):
+    tracked_id = track(db_file, "1")
+    site = StubSite(db_file, {"1": "Pending"})
+    tracking.run_once(db_file, site, now=NOW, notifiers=[])
+
+    # A manual lookup and a background refresh that shared one fetch both report its query
+    site.statuses["1"] = "Disposed"
+    query_id, record, _ = site(tracking.due_cases(db_file, now=NOW + tracking.STALE_AFTER)[0])
+    assert tracking.record_check(db_file, tracked_id, query_id, record) == [("status", "Pending", "Disposed")]
+    assert tracking.record_check(db_file, tracked_id, query_id, record) == []
+    conn = sqlite3.connect(db_file)
+    assert conn.execute("SELECT COUNT(*) FROM case_changes").fetchone() == (1,)
+    conn.close()
@@ -0,0 +1,63 @@
+import sqlite3
+
+import pytest
+
+import watchlist
+
+HEADERS = ["Sr. No.", "Case No.", "Party Name", "Advocate"]
+ROWS = [
+    ["1", "CS/101/2024", "Ram Kumar vs State", "Adv. Sharma"],
+    ["2", "T P (CRL)/19/2025", "Ramesh Kumar vs Union of India", "S. K. Sharma, R. Gupta"],
+    ["3", "CS/7/2023", "Kumari Devi vs Ram", "Guptaji & Co."],
+]
+
+
+def matched(entries, rows=ROWS):
+    index = watchlist.WatchlistIndex(entries)
+    return sorted((m["watch_id"], m["row_index"], m["matched_field"]) for m in watchlist.match_rows(index, HEADERS, rows))
+
+
+def test_party_names_match_on_word_boundaries():
+    # "Ram" must not match "Ramesh" or "Kumari"
+    assert matched([(1, "party", "Ram")]) == [(1, 0, "party"), (1, 2, "party")]
+    assert matched([(1, "party", "ram kumar")]) == [(1, 0, "party")]
+
+
+def test_matching_ignores_case_and_punctuation():
+    assert matched([(1, "advocate", "s k sharma")]) == [(1, 1, "advocate")]
+    assert matched([(1, "advocate", "GUPTA")]) == [(1, 1, "advocate")]
+
+
+def test_case_numbers_match_on_the_whole_normalized_number():
+    assert matched([(1, "case", "TP(CRL) 19/2025")]) == [(1, 1, "case")]
+    assert matched([(1, "case", "CS/10/2024")]) == []
+
+
+def test_one_row_can_match_several_entries():
+    assert matched([(1, "party", "Union of India"), (2, "advocate", "R. Gupta"), (3, "party", "Devi")]) == [
+        (1, 1, "party"), (2, 1, "advocate"), (3, 2, "party"),
+    ]
+
+
+def test_empty_watchlist_matches_nothing():
+    assert matched([]) == []
+
+
+def test_load_watch_index_is_rebuilt_when_the_watchlist_changes(tmp_path):
+    db_file = str(tmp_path / "case_data.db")
+    conn = sqlite3.connect(db_file)
+    watchlist.setup_watchlist_tables(conn)
+    conn.close()
+
+    watchlist.add_watch_entry(db_file, "party", "Ram Kumar")
+    index = watchlist.load_watch_index(db_file)
+    assert len(index) == 1
+    assert watchlist.load_watch_index(db_file) is index
+
+    watchlist.add_watch_entry(db_file, "advocate", "Sharma")
+    assert len(watchlist.load_watch_index(db_file)) == 2
+
+
+def test_unknown_watch_kind_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        watchlist.add_watch_entry(str(tmp_path / "case_data.db"), "judge", "Someone")
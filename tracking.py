@@ -0,0 +1,635 @@
+"""
+Tracked cases: scheduled re-checks of case status with change notifications.
+
+A tracked case is re-fetched only when it is due. While its next hearing is
+near (from NEAR_HEARING before the date until AFTER_HEARING after it, when
+the site posts the next date) it is checked every NEAR_INTERVAL; otherwise
+once its last check is STALE_AFTER old. Due cases are taken from a priority
+queue ordered by due time, at most a budget per run, so the fetch budget goes
+to the cases that can have changed.
+
+Each new result is diffed against the previous lookup of the case in
+`queries`. Only the differences (status, next hearing date, stage, decision,
+new orders) are stored in case_changes and sent to the configured notifiers:
+a JSON POST to a local webhook (COURT_NOTIFY_WEBHOOK) and an .eml file per
+notification in an outbox directory standing in for email
+(COURT_NOTIFY_OUTBOX, default outbox/). Undelivered changes are retried on
+the next run.
+
+    python tracking.py queue                 # tracked cases in due order
+    python tracking.py deliver               # retry undelivered notifications
+    python tracking.py listen --port 8766    # local webhook receiver that prints what it gets
+
+The fetch itself needs the browser and CAPTCHA flow of the app, so the app
+passes a refresh_case callback to run_once() or to the background Refresher.
+"""
+import argparse
+import datetime
+import heapq
+import json
+import os
+import sqlite3
+import threading
+import time
+import urllib.request
+from email.message import EmailMessage
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pandas as pd
+
+import case_parser
+from case_keys import case_status_key, format_key
+
+NEAR_HEARING = datetime.timedelta(days=3)
+AFTER_HEARING = datetime.timedelta(days=7)
+NEAR_INTERVAL = datetime.timedelta(days=1)
+STALE_AFTER = datetime.timedelta(days=14)
+RETRY_AFTER = datetime.timedelta(hours=1)  # After a failed re-check
+DEFAULT_BUDGET = 5
+
+WEBHOOK_URL = os.environ.get("COURT_NOTIFY_WEBHOOK")
+OUTBOX_DIR = os.environ.get("COURT_NOTIFY_OUTBOX", os.path.join(os.getcwd(), "outbox"))
+NOTIFY_EMAIL = os.environ.get("COURT_NOTIFY_EMAIL", "tracked-cases@localhost")
+
+# CaseRecord field -> label, in the order changes are reported
+CHANGE_FIELDS = {
+    "status": "Case status",
+    "next_hearing_date": "Next hearing date",
+    "case_stage": "Case stage",
+    "decision_date": "Decision date",
+    "nature_of_disposal": "Nature of disposal",
+    "court_and_judge": "Court and judge",
+    "orders": "New orders",
+}
+
+_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def setup_tracking_tables(conn):
+    cursor = conn.cursor()
+
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS tracked_cases (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        state_name TEXT NOT NULL,
+        district_name TEXT NOT NULL,
+        court_complex TEXT NOT NULL,
+        case_type TEXT NOT NULL,
+        case_number TEXT NOT NULL,
+        case_year INTEGER NOT NULL,
+        label TEXT,
+        key_type TEXT,
+        key_number TEXT,
+        key_year INTEGER,
+        last_query_id INTEGER,
+        last_checked DATETIME,
+        last_attempt DATETIME,
+        last_error TEXT,
+        case_status TEXT,
+        next_hearing_date TEXT,
+        added DATETIME DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE (state_name, district_name, court_complex, case_type, case_number, case_year)
+    )
+    """)
+
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS case_changes (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        tracked_id INTEGER NOT NULL,
+        query_id INTEGER NOT NULL,
+        previous_query_id INTEGER,
+        field TEXT NOT NULL,
+        old_value TEXT,
+        new_value TEXT,
+        detected DATETIME DEFAULT CURRENT_TIMESTAMP,
+        delivered DATETIME,
+        delivery_error TEXT
+    )
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_case_changes_tracked ON case_changes (tracked_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_case_changes_undelivered ON case_changes (delivered) WHERE delivered IS NULL")
+
+
+def utcnow():
+    """Naive UTC time, comparable with CURRENT_TIMESTAMP values"""
+    return datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+
+
+def _parse_time(value):
+    return datetime.datetime.strptime(value, _TIME_FORMAT) if value else None
+
+
+def _parse_day(value):
+    try:
+        return datetime.date.fromisoformat(value) if value else None
+    except ValueError:  # normalize_date keeps text it could not read
+        return None
+
+
+def due_at(tracked, now):
+    """When a tracked case (row as dict) should be checked next"""
+    last_checked = _parse_time(tracked["last_checked"])
+    if last_checked is None:
+        due = now
+    else:
+        due = last_checked + STALE_AFTER
+        hearing_day = _parse_day(tracked["next_hearing_date"])
+        if hearing_day:
+            hearing = datetime.datetime.combine(hearing_day, datetime.time())
+            if last_checked < hearing + AFTER_HEARING:
+                due = min(due, max(hearing - NEAR_HEARING, last_checked + NEAR_INTERVAL))
+    last_attempt = _parse_time(tracked["last_attempt"])
+    if tracked["last_error"] and last_attempt:
+        due = max(due, last_attempt + RETRY_AFTER)
+    return due
+
+
+def load_tracked(conn, tracked_id=None):
+    conn.row_factory = sqlite3.Row
+    if tracked_id is None:
+        rows = conn.execute("SELECT * FROM tracked_cases").fetchall()
+    else:
+        rows = conn.execute("SELECT * FROM tracked_cases WHERE id = ?", (tracked_id,)).fetchall()
+    conn.row_factory = None
+    return [dict(row) for row in rows]
+
+
+def refresh_queue(db_file, now=None):
+    """Heap of (due time, tracked id, tracked case) over every tracked case"""
+    now = now or utcnow()
+    conn = sqlite3.connect(db_file)
+    tracked = load_tracked(conn)
+    conn.close()
+    queue = [(due_at(case, now), case["id"], case) for case in tracked]
+    heapq.heapify(queue)
+    return queue
+
+
+def due_cases(db_file, budget=DEFAULT_BUDGET, now=None):
+    """Up to budget tracked cases that are due, most overdue first"""
+    now = now or utcnow()
+    queue = refresh_queue(db_file, now)
+    due = []
+    while queue and len(due) < budget and queue[0][0] <= now:
+        due.append(heapq.heappop(queue)[2])
+    return due
+
+
+def track_case(db_file, state_name, district_name, court_complex, case_type, case_number, case_year,
+               label=None, query_id=None, record=None):
+    """Start tracking a case, optionally with the lookup just made as its baseline; returns the tracked id"""
+    key = case_status_key(case_type, case_number, case_year) or (None, None, None)
+    conn = sqlite3.connect(db_file)
+    cursor = conn.cursor()
+    cursor.execute(
+        """INSERT OR IGNORE INTO tracked_cases
+           (state_name, district_name, court_complex, case_type, case_number, case_year, label,
+            key_type, key_number, key_year)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+        (state_name, district_name, court_complex, case_type, str(case_number), int(case_year), label) + key
+    )
+    tracked_id = cursor.execute(
+        """SELECT id FROM tracked_cases WHERE state_name = ? AND district_name = ? AND court_complex = ?
+           AND case_type = ? AND case_number = ? AND case_year = ?""",
+        (state_name, district_name, court_complex, case_type, str(case_number), int(case_year))
+    ).fetchone()[0]
+    if query_id is not None and record is not None:
+        _mark_checked(cursor, tracked_id, query_id, record)
+    conn.commit()
+    conn.close()
+    return tracked_id
+
+
+def find_tracked(db_file, state_name, district_name, court_complex, case_type, case_number, case_year):
+    conn = sqlite3.connect(db_file)
+    row = conn.execute(
+        """SELECT id FROM tracked_cases WHERE state_name = ? AND district_name = ? AND court_complex = ?
+           AND case_type = ? AND case_number = ? AND case_year = ?""",
+        (state_name, district_name, court_complex, case_type, str(case_number), int(case_year))
+    ).fetchone()
+    conn.close()
+    return row[0] if row else None
+
+
+def untrack_case(db_file, tracked_id):
+    conn = sqlite3.connect(db_file)
+    cursor = conn.cursor()
+    cursor.execute("DELETE FROM tracked_cases WHERE id = ?", (tracked_id,))
+    cursor.execute("DELETE FROM case_changes WHERE tracked_id = ?", (tracked_id,))
+    conn.commit()
+    conn.close()
+
+
+def load_record(conn, query_id):
+    """The comparable fields of a stored lookup, or None if the queries row is gone (e.g. archived)"""
+    row = conn.execute(
+        """SELECT q.case_status, d.case_status, d.next_hearing_date, d.case_stage, d.decision_date,
+                  d.nature_of_disposal, d.court_and_judge
+           FROM queries q LEFT JOIN case_details d ON d.query_id = q.id WHERE q.id = ?""",
+        (query_id,)
+    ).fetchone()
+    if row is None:
+        return None
+    record = dict(zip(("status", "next_hearing_date", "case_stage", "decision_date", "nature_of_disposal", "court_and_judge"),
+                      (row[1] or row[0],) + row[2:]))
+    record["orders"] = [
+        {"order_number": number, "order_date": order_date}
+        for number, order_date in conn.execute(
+            "SELECT order_number, order_date FROM case_orders WHERE query_id = ? ORDER BY id", (query_id,)
+        )
+    ]
+    return record
+
+
+def previous_query_id(conn, tracked, query_id):
+    """The lookup a new result is compared with: the last one the tracker saw, else the latest earlier one of the case"""
+    if tracked["last_query_id"] and tracked["last_query_id"] != query_id:
+        return tracked["last_query_id"]
+    if not tracked["key_type"]:
+        return None
+    row = conn.execute(
+        """SELECT MAX(id) FROM queries WHERE key_type = ? AND key_number = ? AND key_year = ? AND id < ?""",
+        (tracked["key_type"], tracked["key_number"], tracked["key_year"], query_id)
+    ).fetchone()
+    return row[0]
+
+
+def _value(value):
+    value = case_parser.clean_text(str(value)) if value is not None else ""
+    return "" if value == case_parser.NOT_FOUND else value
+
+
+def _order_text(order):
+    return " ".join(part for part in (_value(order.get("order_number")), _value(order.get("order_date"))) if part)
+
+
+def diff_records(previous, current):
+    """[(field, old, new)] for the fields that changed. A field the new page no longer shows
+    is not reported, since that is far more often a parse miss than a real change."""
+    changes = []
+    for field in CHANGE_FIELDS:
+        if field == "orders":
+            seen = {_order_text(order) for order in previous.get("orders") or []}
+            new_orders = [_order_text(order) for order in current.get("orders") or []]
+            new_orders = [text for text in new_orders if text and text not in seen]
+            if new_orders and previous.get("orders") is not None:
+                changes.append((field, str(len(seen)), "; ".join(new_orders)))
+            continue
+        old, new = _value(previous.get(field)), _value(current.get(field))
+        if new and old != new:
+            changes.append((field, old or None, new))
+    return changes
+
+
+def _mark_checked(cursor, tracked_id, query_id, record, checked_at=None):
+    checked_at = (checked_at or utcnow()).strftime(_TIME_FORMAT)
+    cursor.execute(
+        """UPDATE tracked_cases SET last_query_id = ?, last_checked = ?, last_attempt = ?, last_error = NULL,
+                  case_status = COALESCE(?, case_status), next_hearing_date = COALESCE(?, next_hearing_date)
+           WHERE id = ?""",
+        (query_id, checked_at, checked_at,
+         _value(record.get("status")) or None, _value(record.get("next_hearing_date")) or None, tracked_id)
+    )
+
+
+def record_check(db_file, tracked_id, query_id, record, checked_at=None):
+    """Store a new lookup of a tracked case: diff it with the previous one and keep only the changes.
+    record is the parsed case (CaseRecord.to_dict()); returns [(field, old, new)].
+    A lookup that was already recorded is not diffed again, so callers that
+    shared one fetch do not store its changes twice."""
+    conn = sqlite3.connect(db_file)
+    tracked = load_tracked(conn, tracked_id)
+    if not tracked or (tracked[0]["last_checked"] and tracked[0]["last_query_id"] == query_id):
+        conn.close()
+        return []
+    tracked = tracked[0]
+    previous_id = previous_query_id(conn, tracked, query_id)
+    previous = load_record(conn, previous_id) if previous_id else None
+    if previous is None and tracked["last_checked"]:
+        # The previous lookup was archived or deleted; compare with what the tracker kept of it
+        previous = {"status": tracked["case_status"], "next_hearing_date": tracked["next_hearing_date"]}
+    changes = diff_records(previous, record) if previous is not None else []
+    cursor = conn.cursor()
+    cursor.executemany(
+        """INSERT INTO case_changes (tracked_id, query_id, previous_query_id, field, old_value, new_value)
+           VALUES (?, ?, ?, ?, ?, ?)""",
+        [(tracked_id, query_id, previous_id, field, old, new) for field, old, new in changes]
+    )
+    _mark_checked(cursor, tracked_id, query_id, record, checked_at)
+    conn.commit()
+    conn.close()
+    return changes
+
+
+def record_failure(db_file, tracked_id, error, attempted_at=None):
+    conn = sqlite3.connect(db_file)
+    conn.execute(
+        "UPDATE tracked_cases SET last_attempt = ?, last_error = ? WHERE id = ?",
+        ((attempted_at or utcnow()).strftime(_TIME_FORMAT), str(error)[:500], tracked_id)
+    )
+    conn.commit()
+    conn.close()
+
+
+class WebhookNotifier:
+    """POSTs each notification as JSON"""
+
+    def __init__(self, url, timeout=10):
+        self.url = url
+        self.timeout = timeout
+
+    def send(self, notification):
+        request = urllib.request.Request(
+            self.url, data=json.dumps(notification).encode("utf-8"),
+            headers={"Content-Type": "application/json"}, method="POST"
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+
+    def __str__(self):
+        return f"webhook {self.url}"
+
+
+class OutboxNotifier:
+    """Writes each notification as an .eml file, in place of sending mail"""
+
+    def __init__(self, directory, to_address=NOTIFY_EMAIL):
+        self.directory = directory
+        self.to_address = to_address
+
+    def send(self, notification):
+        message = EmailMessage()
+        message["To"] = self.to_address
+        message["From"] = "court-tracker@localhost"
+        message["Subject"] = f"[{notification['case']}] {', '.join(change['label'] for change in notification['changes'])} changed"
+        lines = [f"{notification['case']} ({notification['court_complex']})"]
+        if notification.get("label"):
+            lines.append(notification["label"])
+        lines.append("")
+        for change in notification["changes"]:
+            lines.append(f"{change['label']}: {change['old'] or '-'} -> {change['new']}")
+        lines.append("")
+        lines.append(f"Checked at {notification['checked_at']} UTC (lookup {notification['query_id']})")
+        message.set_content("\n".join(lines))
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"case{notification['tracked_id']}-q{notification['query_id']}.eml")
+        with open(path + ".tmp", "wb") as f:
+            f.write(bytes(message))
+        os.replace(path + ".tmp", path)
+
+    def __str__(self):
+        return f"outbox {self.directory}"
+
+
+def configured_notifiers():
+    notifiers = []
+    if WEBHOOK_URL:
+        notifiers.append(WebhookNotifier(WEBHOOK_URL))
+    if OUTBOX_DIR:
+        notifiers.append(OutboxNotifier(OUTBOX_DIR))
+    return notifiers
+
+
+def pending_notifications(conn):
+    """Undelivered changes grouped into one notification per lookup"""
+    rows = conn.execute(
+        """SELECT c.id, c.tracked_id, c.query_id, c.field, c.old_value, c.new_value, c.detected,
+                  t.case_type, t.case_number, t.case_year, t.court_complex, t.label
+           FROM case_changes c JOIN tracked_cases t ON t.id = c.tracked_id
+           WHERE c.delivered IS NULL ORDER BY c.id"""
+    ).fetchall()
+    notifications = {}
+    for change_id, tracked_id, query_id, field, old, new, detected, case_type, number, year, court_complex, label in rows:
+        notification = notifications.setdefault((tracked_id, query_id), {
+            "tracked_id": tracked_id,
+            "query_id": query_id,
+            "case": format_key(case_status_key(case_type, number, year)) or f"{case_type} {number}/{year}",
+            "case_type": case_type,
+            "court_complex": court_complex,
+            "label": label,
+            "checked_at": detected,
+            "changes": [],
+            "change_ids": [],
+        })
+        notification["changes"].append({"field": field, "label": CHANGE_FIELDS.get(field, field), "old": old, "new": new})
+        notification["change_ids"].append(change_id)
+    return list(notifications.values())
+
+
+def deliver_pending(db_file, notifiers=None):
+    """Send undelivered changes to every notifier; returns (notifications delivered, failed).
+    A notification counts as delivered once every notifier took it."""
+    notifiers = configured_notifiers() if notifiers is None else notifiers
+    conn = sqlite3.connect(db_file)
+    delivered = failed = 0
+    for notification in pending_notifications(conn):
+        change_ids = notification.pop("change_ids")
+        errors = []
+        for notifier in notifiers:
+            try:
+                notifier.send(notification)
+            except Exception as e:
+                errors.append(f"{notifier}: {e}")
+        placeholders = ",".join("?" * len(change_ids))
+        if errors:
+            failed += 1
+            conn.execute(f"UPDATE case_changes SET delivery_error = ? WHERE id IN ({placeholders})",
+                         ["; ".join(errors)[:500]] + change_ids)
+        else:
+            delivered += 1
+            conn.execute(f"UPDATE case_changes SET delivered = CURRENT_TIMESTAMP, delivery_error = NULL WHERE id IN ({placeholders})",
+                         change_ids)
+        conn.commit()
+    conn.close()
+    return delivered, failed
+
+
+def run_once(db_file, refresh_case, budget=DEFAULT_BUDGET, now=None, progress=None, notifiers=None):
+    """
+    Re-check the due tracked cases, most overdue first, then deliver the changes
+    (to notifiers, default configured_notifiers()). refresh_case(tracked)
+    fetches and stores one case and returns (query_id, record, error).
+    Returns a summary dict.
+    """
+    progress = progress or (lambda message: None)
+    summary = {"checked": 0, "changed": 0, "failed": 0, "delivered": 0, "undelivered": 0}
+    for tracked in due_cases(db_file, budget, now):
+        case = f"{tracked['case_type']} {tracked['case_number']}/{tracked['case_year']}"
+        try:
+            query_id, record, error = refresh_case(tracked)
+        except Exception as e:
+            query_id, record, error = None, None, str(e)
+        if error or query_id is None:
+            summary["failed"] += 1
+            record_failure(db_file, tracked["id"], error or "no result", now)
+            progress(f"{case}: failed ({error})")
+            continue
+        changes = record_check(db_file, tracked["id"], query_id, record, now)
+        summary["checked"] += 1
+        if changes:
+            summary["changed"] += 1
+            progress(f"{case}: " + "; ".join(f"{CHANGE_FIELDS[field]} {old or '-'} -> {new}" for field, old, new in changes))
+        else:
+            progress(f"{case}: no change")
+    summary["delivered"], summary["undelivered"] = deliver_pending(db_file, notifiers)
+    return summary
+
+
+class Refresher:
+    """Background thread that runs run_once() every interval"""
+
+    def __init__(self, db_file):
+        self.db_file = db_file
+        self.interval = None
+        self.budget = DEFAULT_BUDGET
+        self.last_run = None
+        self.last_summary = None
+        self.last_error = None
+        self._refresh_case = None
+        self._thread = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, refresh_case, interval_seconds, budget=DEFAULT_BUDGET):
+        """Start, or update the callback, interval and budget of a running refresher"""
+        with self._lock:
+            self._refresh_case = refresh_case
+            self.interval = interval_seconds
+            self.budget = budget
+            if self.running:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="case-refresher", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        with self._lock:
+            self._stop.set()
+            thread, self._thread = self._thread, None
+        if thread:
+            thread.join(timeout=1)
+
+    def _loop(self):
+        while not self._stop.is_set():
+            with self._lock:
+                refresh_case, budget = self._refresh_case, self.budget
+            try:
+                self.last_summary = run_once(self.db_file, refresh_case, budget)
+                self.last_error = None
+            except Exception as e:
+                self.last_error = str(e)
+            self.last_run = utcnow()
+            self._stop.wait(self.interval)
+
+    def stats(self):
+        return {
+            "running": self.running,
+            "interval_seconds": self.interval,
+            "budget": self.budget,
+            "last_run": self.last_run.strftime(_TIME_FORMAT) if self.last_run else None,
+            "last_summary": self.last_summary,
+            "last_error": self.last_error,
+        }
+
+
+_refreshers = {}
+_refreshers_lock = threading.Lock()
+
+
+def get_refresher(db_file):
+    with _refreshers_lock:
+        if db_file not in _refreshers:
+            _refreshers[db_file] = Refresher(db_file)
+        return _refreshers[db_file]
+
+
+def view_tracked(db_file, now=None):
+    """Tracked cases in due order, with when each is due"""
+    now = now or utcnow()
+    queue = refresh_queue(db_file, now)
+    rows = []
+    while queue:
+        due, _, tracked = heapq.heappop(queue)
+        rows.append({
+            "id": tracked["id"],
+            "case": f"{tracked['case_type']} {tracked['case_number']}/{tracked['case_year']}",
+            "court_complex": tracked["court_complex"],
+            "label": tracked["label"],
+            "case_status": tracked["case_status"],
+            "next_hearing_date": tracked["next_hearing_date"],
+            "last_checked": tracked["last_checked"],
+            "due": "now" if due <= now else due.strftime("%Y-%m-%d %H:%M"),
+            "last_error": tracked["last_error"],
+        })
+    return pd.DataFrame(rows)
+
+
+def recent_changes(db_file, limit=200):
+    conn = sqlite3.connect(db_file)
+    df = pd.read_sql_query(
+        """SELECT c.detected, t.case_type, t.case_number, t.case_year, t.label, c.field, c.old_value, c.new_value,
+                  c.delivered, c.delivery_error
+           FROM case_changes c JOIN tracked_cases t ON t.id = c.tracked_id
+           ORDER BY c.id DESC LIMIT ?""",
+        conn,
+        params=(limit,)
+    )
+    conn.close()
+    df["field"] = df["field"].map(lambda field: CHANGE_FIELDS.get(field, field))
+    return df
+
+
+class _WebhookReceiver(BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        self.send_response(204)
+        self.end_headers()
+        try:
+            notification = json.loads(body)
+            print(f"{notification['case']} ({notification['court_complex']}): " + "; ".join(
+                f"{change['label']} {change['old'] or '-'} -> {change['new']}" for change in notification["changes"]), flush=True)
+        except (ValueError, KeyError, TypeError):
+            print(body.decode("utf-8", "replace"), flush=True)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["queue", "deliver", "listen"])
+    parser.add_argument("--db", default="case_data.db")
+    parser.add_argument("--port", type=int, default=8766, help="Port of the local webhook receiver (listen)")
+    args = parser.parse_args(argv)
+
+    if args.command == "listen":
+        server = HTTPServer(("127.0.0.1", args.port), _WebhookReceiver)
+        print(f"Listening on http://127.0.0.1:{args.port}/ (set COURT_NOTIFY_WEBHOOK to this URL)", flush=True)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        return
+
+    conn = sqlite3.connect(args.db)
+    setup_tracking_tables(conn)
+    conn.commit()
+    conn.close()
+
+    if args.command == "queue":
+        tracked = view_tracked(args.db)
+        print(tracked.to_string(index=False) if not tracked.empty else "No tracked cases.")
+        return
+    started = time.perf_counter()
+    notifiers = configured_notifiers()
+    delivered, failed = deliver_pending(args.db, notifiers)
+    print(f"Delivered {delivered} notifications, {failed} failed, to {', '.join(map(str, notifiers)) or 'no notifiers'} "
+          f"in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+"""
+Watchlist matching for fetched cause lists.
+
+Watch entries are case numbers, party name fragments or advocate names.
+They are compiled once into an index (a dictionary of normalized case keys
+plus one Aho-Corasick automaton per text field), so a cause list is matched
+in a single pass over its rows instead of comparing every row with every
+watch entry.
+"""
+import re
+import sqlite3
+from collections import deque
+
+import pandas as pd
+
+from case_keys import cause_list_columns, compact_key
+
+WATCH_KINDS = ("case", "party", "advocate")
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+_index_cache = {}
+
+
+def setup_watchlist_tables(conn):
+    cursor = conn.cursor()
+
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS watchlist (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        kind TEXT NOT NULL,
+        value TEXT NOT NULL,
+        label TEXT,
+        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+    )
+    """)
+
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS watchlist_matches (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        watch_id INTEGER NOT NULL,
+        cause_list_id INTEGER,
+        row_index INTEGER NOT NULL,
+        matched_field TEXT NOT NULL,
+        list_date TEXT,
+        court_complex TEXT,
+        list_type TEXT,
+        section TEXT,
+        case_text TEXT,
+        party_text TEXT,
+        advocate_text TEXT,
+        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+    )
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_watchlist_matches_watch ON watchlist_matches (watch_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_watchlist_matches_list ON watchlist_matches (cause_list_id)")
+
+
+def normalize_text(text):
+    """Lowercase, collapse punctuation to single spaces and pad with spaces so
+    that patterns only match on word boundaries."""
+    cleaned = _NON_ALNUM.sub(" ", str(text).lower()).strip()
+    return f" {cleaned} " if cleaned else ""
+
+
+class AhoCorasick:
+    """Multi-pattern substring matcher over normalized text"""
+
+    def __init__(self):
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+        self.built = False
+
+    def add(self, pattern, value):
+        node = 0
+        for char in pattern:
+            next_node = self.goto[node].get(char)
+            if next_node is None:
+                next_node = len(self.goto)
+                self.goto[node][char] = next_node
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append([])
+            node = next_node
+        self.output[node].append(value)
+        self.built = False
+
+    def build(self):
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self.goto[node].items():
+                queue.append(child)
+                fallback = self.fail[node]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(char, 0)
+                self.output[child] = self.output[child] + self.output[self.fail[child]]
+        self.built = True
+
+    def search(self, text):
+        """Return the set of values whose patterns occur in text"""
+        if not self.built:
+            self.build()
+        found = set()
+        node = 0
+        for char in text:
+            while node and char not in self.goto[node]:
+                node = self.fail[node]
+            node = self.goto[node].get(char, 0)
+            if self.output[node]:
+                found.update(self.output[node])
+        return found
+
+
+class WatchlistIndex:
+    """Precompiled lookup structure for a set of watch entries"""
+
+    def __init__(self, entries):
+        self.entries = {}
+        self.case_keys = {}
+        self.automata = {"party": AhoCorasick(), "advocate": AhoCorasick()}
+
+        for watch_id, kind, value in entries:
+            self.entries[watch_id] = (kind, value)
+            if kind == "case":
+                key = compact_key(value)
+                if key:
+                    self.case_keys.setdefault(key, []).append(watch_id)
+            elif kind in self.automata:
+                pattern = normalize_text(value)
+                if pattern:
+                    self.automata[kind].add(pattern, watch_id)
+
+        for automaton in self.automata.values():
+            automaton.build()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def match_fields(self, case_text, party_text, advocate_text):
+        """Return (watch_id, field) pairs for one cause list row"""
+        matches = []
+        for watch_id in self.case_keys.get(compact_key(case_text), []) if case_text else []:
+            matches.append((watch_id, "case"))
+        if party_text:
+            for watch_id in self.automata["party"].search(normalize_text(party_text)):
+                matches.append((watch_id, "party"))
+        if advocate_text:
+            for watch_id in self.automata["advocate"].search(normalize_text(advocate_text)):
+                matches.append((watch_id, "advocate"))
+        return matches
+
+
+def match_rows(index, headers, rows):
+    """
+    Match parsed cause list rows against a WatchlistIndex.
+    Returns a list of dicts with the row index, watch entry and row text.
+    """
+    if not len(index) or not rows:
+        return []
+
+    columns = cause_list_columns(headers)
+    section_col = columns["section"]
+    case_col = columns["case"]
+    party_col = columns["party"]
+    advocate_col = columns["advocate"]
+
+    def cell(row, col):
+        return str(row[col]) if col is not None and col < len(row) and row[col] is not None else ""
+
+    results = []
+    for row_index, row in enumerate(rows):
+        case_text = cell(row, case_col)
+        party_text = cell(row, party_col)
+        advocate_text = cell(row, advocate_col)
+        for watch_id, field in index.match_fields(case_text, party_text, advocate_text):
+            kind, value = index.entries[watch_id]
+            results.append({
+                "watch_id": watch_id,
+                "kind": kind,
+                "value": value,
+                "row_index": row_index,
+                "matched_field": field,
+                "section": cell(row, section_col),
+                "case_text": case_text,
+                "party_text": party_text,
+                "advocate_text": advocate_text,
+            })
+    return results
+
+
+def add_watch_entry(db_file, kind, value, label=None):
+    if kind not in WATCH_KINDS:
+        raise ValueError(f"Unknown watch kind '{kind}'. Expected one of: {', '.join(WATCH_KINDS)}")
+    conn = sqlite3.connect(db_file)
+    cursor = conn.cursor()
+    cursor.execute(
+        "INSERT INTO watchlist (kind, value, label) VALUES (?, ?, ?)",
+        (kind, value.strip(), label)
+    )
+    conn.commit()
+    conn.close()
+
+
+def remove_watch_entry(db_file, watch_id):
+    conn = sqlite3.connect(db_file)
+    cursor = conn.cursor()
+    cursor.execute("DELETE FROM watchlist WHERE id = ?", (watch_id,))
+    cursor.execute("DELETE FROM watchlist_matches WHERE watch_id = ?", (watch_id,))
+    conn.commit()
+    conn.close()
+
+
+def load_watch_index(db_file):
+    """Return a WatchlistIndex, rebuilding it only when the watchlist changed"""
+    conn = sqlite3.connect(db_file)
+    signature = conn.execute(
+        "SELECT COUNT(*), COALESCE(MAX(id), 0), COALESCE(SUM(id), 0) FROM watchlist"
+    ).fetchone()
+
+    cached = _index_cache.get(db_file)
+    if cached and cached[0] == signature:
+        conn.close()
+        return cached[1]
+
+    entries = conn.execute("SELECT id, kind, value FROM watchlist").fetchall()
+    conn.close()
+
+    index = WatchlistIndex(entries)
+    _index_cache[db_file] = (signature, index)
+    return index
+
+
+def insert_matches(cursor, cause_list_id, court_complex, list_date, list_type, matches):
+    cursor.executemany(
+        """INSERT INTO watchlist_matches
+           (watch_id, cause_list_id, row_index, matched_field, list_date, court_complex,
+            list_type, section, case_text, party_text, advocate_text)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+        [(m["watch_id"], cause_list_id, m["row_index"], m["matched_field"], list_date,
+          court_complex, list_type, m["section"], m["case_text"], m["party_text"],
+          m["advocate_text"]) for m in matches]
+    )
+
+
+def view_watchlist(db_file):
+    conn = sqlite3.connect(db_file)
+    entries_df = pd.read_sql_query(
+        "SELECT id, kind, value, label, timestamp FROM watchlist ORDER BY id DESC",
+        conn
+    )
+    matches_df = pd.read_sql_query(
+        """SELECT m.timestamp, m.list_date, m.court_complex, m.list_type, w.kind, w.value,
+                  m.matched_field, m.section, m.case_text, m.party_text, m.advocate_text
+           FROM watchlist_matches m JOIN watchlist w ON w.id = m.watch_id
+           ORDER BY m.id DESC LIMIT 500""",
+        conn
+    )
+    conn.close()
+    return entries_df, matches_df